@@ -0,0 +1 @@
+"""Standalone performance benchmarks for the dual_smart_thermostat component."""
@@ -0,0 +1,204 @@
+"""Benchmark the control hot path of every device topology.
+
+Each topology from ``benchmarks.topologies`` is built through
+HVACDeviceFactory.create_device. A sensor reading is then fed in and the same
+measured control pass ``DualSmartThermostat._async_control_climate`` runs is
+executed. The readings alternate so the pass switches an actuator every time.
+For each topology the benchmark reports:
+
+- sensor-update-to-command latency (time from the reading to the first
+  service call of the pass)
+- passes per second
+- peak bytes allocated during a pass and memory blocks retained per pass,
+  measured in a separate tracemalloc run
+
+Results can be saved as a JSON baseline and compared against one. The
+comparison exits with status 1 when a topology got slower or allocates more
+than ``--tolerance`` allows.
+
+Usage:
+    python -m benchmarks.bench_control_loop [--iterations N]
+        [--topology NAME ...] [--save FILE] [--compare FILE] [--tolerance F]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+from .topologies import TOPOLOGIES, FakeHass, Thermostat, build_thermostat
+
+WARMUP = 200
+
+# Metric name -> True when higher is better.
+COMPARED = {
+    "latency_p50_us": False,
+    "latency_p95_us": False,
+    "passes_per_second": True,
+    "alloc_peak_bytes": False,
+}
+
+
+async def measure(
+    hass: FakeHass, thermostat: Thermostat, iterations: int
+) -> dict[str, Any]:
+    """Return latency, throughput and command statistics of ``iterations`` passes."""
+    readings = thermostat.topology.readings
+    services = hass.services
+
+    for index in range(WARMUP):
+        thermostat.read_sensor(readings[index % len(readings)])
+        await thermostat.async_control()
+
+    latencies = []
+    calls = services.calls
+    start = perf_counter()
+    for index in range(iterations):
+        services.reset()
+        updated_at = perf_counter()
+        thermostat.read_sensor(readings[index % len(readings)])
+        await thermostat.async_control()
+        if services.first_call_at is not None:
+            latencies.append(services.first_call_at - updated_at)
+    elapsed = perf_counter() - start
+
+    if len(latencies) > 1:
+        cut_points = statistics.quantiles(latencies, n=20)
+        p50, p95 = statistics.median(latencies), cut_points[18]
+    else:
+        p50 = p95 = latencies[0] if latencies else 0.0
+    return {
+        "latency_p50_us": round(p50 * 1e6, 2),
+        "latency_p95_us": round(p95 * 1e6, 2),
+        "passes_per_second": round(iterations / elapsed),
+        "commanding_passes": len(latencies),
+        "commands_per_pass": round((services.calls - calls) / iterations, 3),
+    }
+
+
+async def measure_allocations(
+    thermostat: Thermostat, iterations: int
+) -> dict[str, Any]:
+    """Return peak bytes allocated per pass and blocks retained per pass."""
+    readings = thermostat.topology.readings
+    # Fill the decision trace ring first so it doesn't count as retained.
+    for index in range(WARMUP):
+        thermostat.read_sensor(readings[index % len(readings)])
+        await thermostat.async_control()
+
+    tracemalloc.start()
+    peak_total = 0
+    blocks = sys.getallocatedblocks()
+    for index in range(iterations):
+        thermostat.read_sensor(readings[index % len(readings)])
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await thermostat.async_control()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    retained = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+    return {
+        "alloc_peak_bytes": round(peak_total / iterations),
+        "retained_blocks_per_pass": round(retained / iterations, 3),
+    }
+
+
+async def run(iterations: int, names: list[str] | None) -> dict[str, Any]:
+    """Benchmark the selected topologies, all of them by default."""
+    loop = asyncio.get_running_loop()
+    results = {}
+    for topology in TOPOLOGIES:
+        if names and topology.name not in names:
+            continue
+        hass = FakeHass(loop)
+        result = await measure(hass, build_thermostat(hass, topology), iterations)
+        hass = FakeHass(loop)
+        result |= await measure_allocations(
+            build_thermostat(hass, topology), max(iterations // 10, 1)
+        )
+        results[topology.name] = result
+    return results
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return a line for every metric that regressed beyond ``tolerance``."""
+    regressions = []
+    for name, result in results.items():
+        if (reference := baseline.get(name)) is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = reference.get(metric), result[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument(
+        "--topology",
+        action="append",
+        choices=[topology.name for topology in TOPOLOGIES],
+        help="only run this topology (repeatable)",
+    )
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="JSON baseline to check")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative regression when comparing (default 0.25)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.topology))
+
+    print(
+        f"{'topology':<14}{'p50 us':>10}{'p95 us':>10}{'passes/s':>11}"
+        f"{'peak B':>9}{'blocks':>8}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<14}{result['latency_p50_us']:>10}{result['latency_p95_us']:>10}"
+            f"{result['passes_per_second']:>11}{result['alloc_peak_bytes']:>9}"
+            f"{result['retained_blocks_per_pass']:>8}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "iterations": args.iterations,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        if regressions := compare(results, baseline, args.tolerance):
+            print("regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
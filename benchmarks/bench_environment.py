@@ -0,0 +1,160 @@
+"""Micro-benchmark of the EnvironmentManager checks made by one control pass.
+
+Times the is_too_cold / is_too_hot calls a HEAT_COOL control pass makes for
+both setpoints, for the EnvironmentManager of this tree and for the one of a
+baseline revision. The baseline is checked out into a temporary git worktree
+and timed in a subprocess, so both run the same pass against their own code.
+It defaults to the revision before this benchmark was added, which is the
+EnvironmentManager before the state record and the tolerance table.
+
+The "uncached" run of this tree clears the tolerance table before every pass,
+which is what re-deriving the tolerance pair on each call costs.
+
+Usage:
+    python -m benchmarks.bench_environment [--iterations N] [--baseline REV]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+from types import SimpleNamespace
+
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.const import UnitOfTemperature
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_COLD_TOLERANCE,
+    CONF_COOL_TOLERANCE,
+    CONF_HEAT_TOLERANCE,
+    CONF_HOT_TOLERANCE,
+    CONF_SENSOR,
+    CONF_TARGET_TEMP_HIGH,
+    CONF_TARGET_TEMP_LOW,
+)
+from custom_components.dual_smart_thermostat.managers.environment_manager import (
+    EnvironmentManager,
+)
+
+FAKE_HASS = SimpleNamespace(
+    config=SimpleNamespace(
+        units=SimpleNamespace(temperature_unit=UnitOfTemperature.CELSIUS)
+    )
+)
+
+CONFIG = {
+    CONF_SENSOR: "sensor.room_temperature",
+    CONF_COLD_TOLERANCE: 0.3,
+    CONF_HOT_TOLERANCE: 0.3,
+    CONF_HEAT_TOLERANCE: 0.5,
+    CONF_COOL_TOLERANCE: 0.5,
+    CONF_TARGET_TEMP_LOW: 20.0,
+    CONF_TARGET_TEMP_HIGH: 24.0,
+}
+
+
+def control_pass(env: EnvironmentManager) -> None:
+    """Run the environment checks of one HEAT_COOL control pass."""
+    for attr in ("_target_temp_low", "_target_temp_high"):
+        env.is_too_cold(attr)
+        env.is_too_hot(attr)
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(iterations: int, cached: bool) -> float:
+    """Return the mean microseconds per control pass."""
+    env = EnvironmentManager(FAKE_HASS, CONFIG)
+    env.set_hvac_mode(HVACMode.HEAT_COOL)
+    env.cur_temp = 22.0
+    # The baseline has no tolerance table, it derives the pair on every call.
+    table = getattr(env, "_tolerance_table", None)
+
+    start = perf_counter()
+    for _ in range(iterations):
+        if not cached and table is not None:
+            table.clear()
+        control_pass(env)
+    return (perf_counter() - start) / iterations * 1e6
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def default_baseline() -> str:
+    """Return the revision before this benchmark was added."""
+    added = _git(
+        "log",
+        "--diff-filter=A",
+        "--format=%H",
+        "-1",
+        "--",
+        "benchmarks/bench_environment.py",
+    )
+    return f"{added}~1" if added else "HEAD"
+
+
+def run_baseline(revision: str, iterations: int) -> float:
+    """Time the control pass against the EnvironmentManager of ``revision``."""
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = os.path.join(tmp, "baseline")
+        _git("worktree", "add", "--detach", worktree, revision)
+        try:
+            # Run this file as a script, so custom_components is imported
+            # from the worktree on PYTHONPATH and not from this tree.
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    str(Path(__file__).resolve()),
+                    "--worker",
+                    "--iterations",
+                    str(iterations),
+                ],
+                cwd=worktree,
+                env={**os.environ, "PYTHONPATH": worktree},
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        finally:
+            _git("worktree", "remove", "--force", worktree)
+    return float(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument(
+        "--baseline",
+        help="git revision to compare against, the one before this benchmark "
+        "was added by default",
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(run(args.iterations, cached=True))
+        return
+
+    revision = args.baseline or default_baseline()
+    baseline = run_baseline(revision, args.iterations)
+    uncached = run(args.iterations, cached=False)
+    cached = run(args.iterations, cached=True)
+
+    print(f"baseline ({revision}): {baseline:.3f} us/pass")
+    print(f"uncached:   {uncached:.3f} us/pass")
+    print(f"cached:     {cached:.3f} us/pass")
+    print(f"speedup:    {baseline / cached:.2f}x over the baseline")
+
+
+if __name__ == "__main__":
+    main()
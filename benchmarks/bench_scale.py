@@ -0,0 +1,224 @@
+"""Load harness: many thermostats on one event loop.
+
+Builds N thermostats (up to 1000) on one fake ``hass``. Each has its own
+temperature sensor. All of them share one outside sensor, and they are split
+into opening groups that each share one window sensor. State changes are
+fanned out to the thermostats as tasks, the same way the climate entity's
+state change handlers run. Each handler updates the environment and runs a
+measured control pass under the thermostat's lock.
+
+For ``--duration`` seconds the driver sends synthetic streams:
+
+- every thermostat sensor does a random walk around the target, at
+  ``--sensor-rate`` updates per minute
+- the outside sensor changes every ``--shared-interval`` seconds, which
+  wakes every thermostat at once
+- a random window group opens or closes every ``--window-interval`` seconds
+
+A monitor task measures event loop lag, the delay of a 10 ms sleep past its
+deadline. The report shows lag percentiles, memory per thermostat (traced
+while building them), control passes, pass time and total service calls.
+
+Usage:
+    python -m benchmarks.bench_scale [--thermostats N] [--duration S]
+        [--topology NAME|mixed] [--group-size N] [--sensor-rate R]
+        [--shared-interval S] [--window-interval S] [--seed N] [--save FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tracemalloc
+from typing import Any
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import State
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_OPENINGS,
+    CONF_OUTSIDE_SENSOR,
+)
+from custom_components.dual_smart_thermostat.control_metrics import ControlTrigger
+
+from .topologies import SENSOR, TOPOLOGIES, FakeHass, Thermostat, build_thermostat
+
+MAX_THERMOSTATS = 1000
+OUTSIDE_SENSOR = "sensor.outside_temperature"
+WINDOW_GROUP = "binary_sensor.window_group_{}"
+LAG_INTERVAL = 0.01
+TICK = 0.1
+
+
+def _thermostat_count(value: str) -> int:
+    count = int(value)
+    if not 1 <= count <= MAX_THERMOSTATS:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {MAX_THERMOSTATS}")
+    return count
+
+
+def build_site(
+    hass: FakeHass, count: int, topology_name: str, group_size: int
+) -> list[Thermostat]:
+    """Build ``count`` thermostats and subscribe them to their sensors."""
+    topologies = (
+        list(TOPOLOGIES)
+        if topology_name == "mixed"
+        else [t for t in TOPOLOGIES if t.name == topology_name]
+    )
+    hass.states.async_set(OUTSIDE_SENSOR, "5.0")
+    thermostats = []
+    for index in range(count):
+        window = WINDOW_GROUP.format(index // group_size)
+        if hass.states.get(window) is None:
+            hass.states.async_set(window, STATE_OFF)
+        thermostat = build_thermostat(
+            hass,
+            topologies[index % len(topologies)],
+            suffix=f"_{index}",
+            extra_config={CONF_OUTSIDE_SENSOR: OUTSIDE_SENSOR, CONF_OPENINGS: [window]},
+        )
+        _subscribe(hass, thermostat, f"{SENSOR}_{index}", window)
+        thermostats.append(thermostat)
+    return thermostats
+
+
+def _subscribe(
+    hass: FakeHass, thermostat: Thermostat, sensor: str, window: str
+) -> None:
+    environment = thermostat.environment
+
+    async def sensor_changed(new_state: State) -> None:
+        environment.update_temp_from_state(new_state)
+        await thermostat.async_control(ControlTrigger.SENSOR)
+
+    async def outside_changed(new_state: State) -> None:
+        environment.update_outside_temp_from_state(new_state)
+        await thermostat.async_control(ControlTrigger.SENSOR)
+
+    async def opening_changed(new_state: State) -> None:
+        await thermostat.async_control(ControlTrigger.OPENING)
+
+    hass.states.async_listen(sensor, sensor_changed)
+    hass.states.async_listen(OUTSIDE_SENSOR, outside_changed)
+    hass.states.async_listen(window, opening_changed)
+
+
+async def monitor_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late a short sleep wakes up until ``stop`` is set."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        deadline = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(max(0.0, loop.time() - deadline))
+
+
+async def drive(
+    hass: FakeHass, count: int, args: argparse.Namespace, rng: random.Random
+) -> None:
+    """Send the synthetic sensor streams for ``args.duration`` seconds."""
+    loop = asyncio.get_running_loop()
+    readings = [21.0] * count
+    groups = (count + args.group_size - 1) // args.group_size
+    per_tick = count * args.sensor_rate / 60 * TICK
+    due = 0.0
+    start = loop.time()
+    next_shared = start + args.shared_interval
+    next_window = start + args.window_interval
+
+    while (now := loop.time()) - start < args.duration:
+        due += per_tick
+        while due >= 1:
+            due -= 1
+            index = rng.randrange(count)
+            readings[index] = min(25.0, max(17.0, readings[index] + rng.uniform(-1, 1)))
+            hass.states.async_set(f"{SENSOR}_{index}", f"{readings[index]:.1f}")
+        if now >= next_shared:
+            next_shared += args.shared_interval
+            hass.states.async_set(OUTSIDE_SENSOR, f"{rng.uniform(-5, 15):.1f}")
+        if now >= next_window:
+            next_window += args.window_interval
+            window = WINDOW_GROUP.format(rng.randrange(groups))
+            is_open = hass.states.is_state(window, STATE_ON)
+            hass.states.async_set(window, STATE_OFF if is_open else STATE_ON)
+        await asyncio.sleep(TICK)
+    await hass.async_block_till_done()
+
+
+def _percentiles_ms(values: list[float]) -> dict[str, float]:
+    if len(values) < 2:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    cut_points = statistics.quantiles(values, n=100)
+    return {
+        "p50": round(statistics.median(values) * 1000, 3),
+        "p95": round(cut_points[94] * 1000, 3),
+        "p99": round(cut_points[98] * 1000, 3),
+        "max": round(max(values) * 1000, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Build the site, drive it and return the report."""
+    rng = random.Random(args.seed)
+    hass = FakeHass(asyncio.get_running_loop())
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    thermostats = build_site(hass, args.thermostats, args.topology, args.group_size)
+    built = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(lags, stop))
+    await drive(hass, args.thermostats, args, rng)
+    stop.set()
+    await monitor
+
+    pass_p95 = [t.metrics.pass_time.percentile(0.95) for t in thermostats]
+    return {
+        "thermostats": args.thermostats,
+        "topology": args.topology,
+        "duration_s": args.duration,
+        "loop_lag_ms": _percentiles_ms(lags),
+        "memory_per_thermostat_kib": round(
+            (built - baseline) / args.thermostats / 1024, 1
+        ),
+        "control_passes": sum(t.metrics.pass_time.count for t in thermostats),
+        "worst_pass_p95_ms": round(max(pass_p95) * 1000, 3),
+        "service_calls": hass.services.calls,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--thermostats", type=_thermostat_count, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--topology",
+        default="heater",
+        choices=["mixed", *(topology.name for topology in TOPOLOGIES)],
+        help="device topology of every thermostat, or mixed to cycle through all",
+    )
+    parser.add_argument("--group-size", type=int, default=10)
+    parser.add_argument(
+        "--sensor-rate", type=float, default=2.0, help="updates per sensor per minute"
+    )
+    parser.add_argument("--shared-interval", type=float, default=5.0)
+    parser.add_argument("--window-interval", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="FILE", help="write the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
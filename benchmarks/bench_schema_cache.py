@@ -0,0 +1,89 @@
+"""Benchmark a full reconfigure walk with and without the schema cache.
+
+Walks every step a user sees when reconfiguring each system type (system type
+selection, core/system schema, features, fan, humidity, floor heating and
+preset selection) and reports the mean wall time per walk.
+
+Usage:
+    python -m benchmarks.bench_schema_cache [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+from types import SimpleNamespace
+
+from homeassistant.const import UnitOfTemperature
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_HEATER,
+    CONF_SENSOR,
+    SYSTEM_TYPES,
+)
+from custom_components.dual_smart_thermostat.schema_cache import SCHEMA_CACHE
+from custom_components.dual_smart_thermostat.schemas import (
+    get_core_schema,
+    get_fan_schema,
+    get_features_schema,
+    get_floor_heating_schema,
+    get_humidity_schema,
+    get_preset_selection_schema,
+    get_system_type_schema,
+)
+
+FAKE_HASS = SimpleNamespace(
+    config=SimpleNamespace(
+        units=SimpleNamespace(temperature_unit=UnitOfTemperature.CELSIUS)
+    )
+)
+
+COLLECTED_CONFIG = {
+    CONF_SENSOR: "sensor.room_temperature",
+    CONF_HEATER: "switch.heater",
+}
+
+
+def reconfigure_walk() -> None:
+    """Render every schema of a reconfigure flow for all system types."""
+    for system_type in SYSTEM_TYPES:
+        get_system_type_schema(system_type)
+        get_core_schema(
+            system_type, defaults=COLLECTED_CONFIG, include_name=False, hass=FAKE_HASS
+        )
+        get_features_schema(system_type, defaults=COLLECTED_CONFIG)
+        get_fan_schema(hass=FAKE_HASS, defaults=COLLECTED_CONFIG)
+        get_humidity_schema(defaults=COLLECTED_CONFIG)
+        get_floor_heating_schema(hass=FAKE_HASS, defaults=COLLECTED_CONFIG)
+        get_preset_selection_schema()
+
+
+def run(iterations: int, enabled: bool) -> float:
+    """Return the mean seconds per reconfigure walk."""
+    SCHEMA_CACHE.clear()
+    SCHEMA_CACHE.enabled = enabled
+    start = perf_counter()
+    for _ in range(iterations):
+        reconfigure_walk()
+    return (perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    uncached = run(args.iterations, enabled=False)
+    cached = run(args.iterations, enabled=True)
+    SCHEMA_CACHE.enabled = True
+
+    print(f"uncached: {uncached * 1000:.3f} ms/walk")
+    print(
+        f"cached:   {cached * 1000:.3f} ms/walk "
+        f"(hits={SCHEMA_CACHE.hits}, misses={SCHEMA_CACHE.misses})"
+    )
+    print(f"speedup:  {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
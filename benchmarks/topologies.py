@@ -0,0 +1,357 @@
+"""Every HVACDeviceFactory topology, built on a lightweight fake ``hass``.
+
+The fake only provides what the device, controller and manager classes use
+during a control pass: a state machine with per-entity listeners, a service
+registry that switches the target entity, the running event loop, the unit
+system and ``hass.data`` with an unthrottled command scheduler. Switch states
+change the moment the service is called, like an ideal actuator.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+    UnitOfTemperature,
+)
+from homeassistant.core import Context, State
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.dual_smart_thermostat.command_scheduler import (
+    DATA_COMMAND_SCHEDULER,
+    CommandScheduler,
+)
+from custom_components.dual_smart_thermostat.const import (
+    CONF_AC_MODE,
+    CONF_AUX_HEATER,
+    CONF_AUX_HEATING_DUAL_MODE,
+    CONF_AUX_HEATING_TIMEOUT,
+    CONF_COLD_TOLERANCE,
+    CONF_COOLER,
+    CONF_DRYER,
+    CONF_FAN,
+    CONF_FAN_MODE,
+    CONF_HEAT_COOL_MODE,
+    CONF_HEAT_PUMP_COOLING,
+    CONF_HEATER,
+    CONF_HOT_TOLERANCE,
+    CONF_HUMIDITY_SENSOR,
+    CONF_SENSOR,
+    CONF_TARGET_HUMIDITY,
+    CONF_TARGET_TEMP,
+    CONF_TARGET_TEMP_HIGH,
+    CONF_TARGET_TEMP_LOW,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.control_metrics import (
+    ControlMetrics,
+    ControlTrigger,
+)
+from custom_components.dual_smart_thermostat.hvac_device.controllable_hvac_device import (
+    ControlableHVACDevice,
+)
+from custom_components.dual_smart_thermostat.hvac_device.hvac_device_factory import (
+    HVACDeviceFactory,
+)
+from custom_components.dual_smart_thermostat.managers.environment_manager import (
+    EnvironmentManager,
+)
+from custom_components.dual_smart_thermostat.managers.feature_manager import (
+    FeatureManager,
+)
+from custom_components.dual_smart_thermostat.managers.hvac_power_manager import (
+    HvacPowerManager,
+)
+from custom_components.dual_smart_thermostat.managers.opening_manager import (
+    OpeningManager,
+)
+
+SENSOR = "sensor.room_temperature"
+HUMIDITY_SENSOR = "sensor.room_humidity"
+HEATER = "switch.heater"
+COOLER = "switch.cooler"
+AUX_HEATER = "switch.aux_heater"
+FAN = "switch.fan"
+DRYER = "switch.dryer"
+HEAT_PUMP_COOLING = "input_boolean.heat_pump_cooling"
+
+BASE_CONFIG = {
+    CONF_SENSOR: SENSOR,
+    CONF_HEATER: HEATER,
+    CONF_COLD_TOLERANCE: 0.3,
+    CONF_HOT_TOLERANCE: 0.3,
+    CONF_TARGET_TEMP: 21.0,
+}
+
+
+StateListener = Callable[[State], Coroutine[Any, Any, None]]
+
+
+class FakeStates:
+    """Minimal state machine.
+
+    Listeners run as tasks, like the async state change handlers of the
+    climate entity.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._states: dict[str, State] = {}
+        self._listeners: dict[str, list[StateListener]] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def is_state(self, entity_id: str, state: str) -> bool:
+        current = self._states.get(entity_id)
+        return current is not None and current.state == state
+
+    def async_set(self, entity_id: str, state: str) -> None:
+        new_state = self._states[entity_id] = State(entity_id, state)
+        for listener in self._listeners.get(entity_id, ()):
+            task = self._loop.create_task(listener(new_state))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    def async_listen(self, entity_id: str, listener: StateListener) -> None:
+        self._listeners.setdefault(entity_id, []).append(listener)
+
+
+class FakeServices:
+    """Service registry that switches the target entity immediately.
+
+    ``calls`` counts every call and ``first_call_at`` holds the
+    ``perf_counter()`` value of the first call since the last ``reset``.
+    """
+
+    def __init__(self, states: FakeStates) -> None:
+        self._states = states
+        self.calls = 0
+        self.first_call_at: float | None = None
+
+    def reset(self) -> None:
+        self.first_call_at = None
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict[str, Any],
+        context: Context | None = None,
+        blocking: bool = False,
+    ) -> None:
+        if self.first_call_at is None:
+            self.first_call_at = perf_counter()
+        self.calls += 1
+        if service in (SERVICE_TURN_ON, SERVICE_TURN_OFF):
+            self._states.async_set(
+                service_data[ATTR_ENTITY_ID],
+                STATE_ON if service == SERVICE_TURN_ON else STATE_OFF,
+            )
+
+
+class FakeHass:
+    """Just enough of HomeAssistant for device construction and control."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.config = SimpleNamespace(
+            units=SimpleNamespace(temperature_unit=UnitOfTemperature.CELSIUS)
+        )
+        self.states = FakeStates(loop)
+        self.services = FakeServices(self.states)
+        self.data: dict[Any, Any] = {
+            er.DATA_REGISTRY: SimpleNamespace(async_get=lambda entity_id: None)
+        }
+        self.data[DOMAIN] = {DATA_COMMAND_SCHEDULER: CommandScheduler(self, rate=0)}
+
+    async def async_block_till_done(self) -> None:
+        """Wait for the listener tasks, including ones they start."""
+        while self.states.tasks:
+            await asyncio.gather(*self.states.tasks)
+
+
+@dataclass(frozen=True)
+class Topology:
+    """A device topology and the sensor readings that make it switch.
+
+    Cycling through ``readings`` turns at least one actuator on or off on
+    every step. Readings are temperatures, or humidities when ``humidity``
+    is set.
+    """
+
+    name: str
+    config: dict[str, Any]
+    hvac_mode: HVACMode
+    readings: tuple[float, ...]
+    switches: tuple[str, ...] = (HEATER,)
+    humidity: bool = False
+    extra_states: dict[str, str] = field(default_factory=dict)
+
+
+TOPOLOGIES = (
+    Topology("heater", BASE_CONFIG, HVACMode.HEAT, (16.0, 26.0)),
+    Topology(
+        "cooler", {**BASE_CONFIG, CONF_AC_MODE: True}, HVACMode.COOL, (26.0, 16.0)
+    ),
+    Topology(
+        "heater_cooler",
+        {
+            **BASE_CONFIG,
+            CONF_COOLER: COOLER,
+            CONF_HEAT_COOL_MODE: True,
+            CONF_TARGET_TEMP_LOW: 19.0,
+            CONF_TARGET_TEMP_HIGH: 23.0,
+        },
+        HVACMode.HEAT_COOL,
+        (16.0, 21.0, 26.0, 21.0),
+        switches=(HEATER, COOLER),
+    ),
+    Topology(
+        "heat_pump",
+        {**BASE_CONFIG, CONF_HEAT_PUMP_COOLING: HEAT_PUMP_COOLING},
+        HVACMode.HEAT,
+        (16.0, 26.0),
+        extra_states={HEAT_PUMP_COOLING: STATE_OFF},
+    ),
+    Topology(
+        "aux_heater",
+        {
+            **BASE_CONFIG,
+            CONF_AUX_HEATER: AUX_HEATER,
+            CONF_AUX_HEATING_TIMEOUT: timedelta(hours=1),
+            CONF_AUX_HEATING_DUAL_MODE: False,
+        },
+        HVACMode.HEAT,
+        (16.0, 26.0),
+        switches=(HEATER, AUX_HEATER),
+    ),
+    Topology(
+        "fan", {**BASE_CONFIG, CONF_FAN_MODE: True}, HVACMode.FAN_ONLY, (26.0, 16.0)
+    ),
+    Topology(
+        "dryer",
+        {
+            **BASE_CONFIG,
+            CONF_AC_MODE: True,
+            CONF_DRYER: DRYER,
+            CONF_HUMIDITY_SENSOR: HUMIDITY_SENSOR,
+            CONF_TARGET_HUMIDITY: 50.0,
+        },
+        HVACMode.DRY,
+        (70.0, 40.0),
+        switches=(HEATER, DRYER),
+        humidity=True,
+    ),
+    Topology(
+        "multi",
+        {
+            **BASE_CONFIG,
+            CONF_COOLER: COOLER,
+            CONF_FAN: FAN,
+            CONF_DRYER: DRYER,
+            CONF_HUMIDITY_SENSOR: HUMIDITY_SENSOR,
+            CONF_TARGET_HUMIDITY: 50.0,
+            CONF_HEAT_COOL_MODE: True,
+            CONF_TARGET_TEMP_LOW: 19.0,
+            CONF_TARGET_TEMP_HIGH: 23.0,
+        },
+        HVACMode.HEAT_COOL,
+        (16.0, 21.0, 26.0, 21.0),
+        switches=(HEATER, COOLER, FAN, DRYER),
+    ),
+)
+
+
+@dataclass
+class Thermostat:
+    """A device built by the factory together with its environment."""
+
+    topology: Topology
+    environment: EnvironmentManager
+    device: ControlableHVACDevice
+    metrics: ControlMetrics = field(default_factory=ControlMetrics)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def read_sensor(self, value: float) -> None:
+        """Feed a reading the way a sensor state change does."""
+        if self.topology.humidity:
+            self.environment.update_humidity_from_state(
+                State(HUMIDITY_SENSOR, str(value))
+            )
+        else:
+            self.environment.update_temp_from_state(State(SENSOR, str(value)))
+
+    async def async_control(
+        self, trigger: ControlTrigger = ControlTrigger.SENSOR
+    ) -> None:
+        """Run a measured pass the way ``_async_control_climate`` does."""
+        device = self.device
+        environment = self.environment
+        requested_at = perf_counter()
+        async with self.lock:
+            with self.metrics.measure_pass(trigger, requested_at) as run:
+                run.inputs = (
+                    environment.cur_temp,
+                    environment.cur_humidity,
+                    environment.target_temp,
+                    environment.target_temp_low,
+                    environment.target_temp_high,
+                    device.hvac_mode,
+                    False,
+                )
+                await device.async_control_hvac(None, False)
+                run.action = device.hvac_action
+                run.reason = device.HVACActionReason or "none"
+
+
+def build_thermostat(
+    hass: FakeHass,
+    topology: Topology,
+    suffix: str = "",
+    extra_config: dict[str, Any] | None = None,
+) -> Thermostat:
+    """Build ``topology`` through HVACDeviceFactory.create_device.
+
+    ``suffix`` is appended to every entity id so several thermostats can
+    share one fake ``hass`` without sharing actuators. ``extra_config`` is
+    added as is, for entities shared between thermostats.
+    """
+    config = {
+        key: f"{value}{suffix}" if isinstance(value, str) and "." in value else value
+        for key, value in topology.config.items()
+    }
+    config.update(extra_config or {})
+    for entity_id in topology.switches:
+        hass.states.async_set(f"{entity_id}{suffix}", STATE_OFF)
+    for entity_id, state in topology.extra_states.items():
+        hass.states.async_set(f"{entity_id}{suffix}", state)
+
+    environment = EnvironmentManager(hass, config)
+    features = FeatureManager(hass, config, environment)
+    device = HVACDeviceFactory(hass, config, features).create_device(
+        environment,
+        OpeningManager(hass, config),
+        HvacPowerManager(hass, config, environment),
+    )
+    device.set_context(Context())
+    environment.set_hvac_mode(topology.hvac_mode)
+    device.hvac_mode = topology.hvac_mode
+
+    environment.update_temp_from_state(State(SENSOR, "21.0"))
+    if topology.humidity or CONF_HUMIDITY_SENSOR in config:
+        environment.update_humidity_from_state(State(HUMIDITY_SENSOR, "50.0"))
+    return Thermostat(topology, environment, device)
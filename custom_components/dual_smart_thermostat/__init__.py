@@ -1,16 +1,81 @@
 """The dual_smart_thermostat component."""
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.typing import ConfigType
+import voluptuous as vol
+
+from .command_scheduler import async_get_command_scheduler
+from .const import (
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_POWER_BUDGET,
+    CONF_STARTUP_JITTER,
+    CONF_STARTUP_RATE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_STARTUP_JITTER,
+    DEFAULT_STARTUP_RATE,
+)
+from .power_budget import async_get_power_budget
+from .startup_coordinator import async_get_startup_coordinator
 
 DOMAIN = "dual_smart_thermostat"
 PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_STARTUP_JITTER, default=DEFAULT_STARTUP_JITTER
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(CONF_STARTUP_RATE, default=DEFAULT_STARTUP_RATE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(CONF_COMMAND_RATE, default=DEFAULT_COMMAND_RATE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(
+                    CONF_COMMAND_BURST, default=DEFAULT_COMMAND_BURST
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_POWER_BUDGET): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration-wide settings from the top-level YAML key."""
+    coordinator = async_get_startup_coordinator(hass)
+    scheduler = async_get_command_scheduler(hass)
+    if (domain_config := config.get(DOMAIN)) is not None:
+        coordinator.jitter = domain_config[CONF_STARTUP_JITTER]
+        coordinator.rate = domain_config[CONF_STARTUP_RATE]
+        scheduler.async_configure(
+            domain_config[CONF_COMMAND_RATE], domain_config[CONF_COMMAND_BURST]
+        )
+        async_get_power_budget(hass).limit = domain_config.get(CONF_POWER_BUDGET)
+
+    @callback
+    def _async_shutdown(_: Event) -> None:
+        scheduler.async_shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # The sensors read the actuators from the climate's hvac device, so the
+    # climate is set up first.
+    await hass.config_entries.async_forward_entry_setups(entry, [Platform.CLIMATE])
+    await hass.config_entries.async_forward_entry_setups(entry, [Platform.SENSOR])
     entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
     return True
 
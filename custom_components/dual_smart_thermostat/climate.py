@@ -4,6 +4,7 @@ import asyncio
 from collections.abc import Callable
 from datetime import datetime, timedelta
 import logging
+import time as time_module
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -14,17 +15,25 @@ from homeassistant.components.climate import (
 )
 from homeassistant.components.climate.const import (
     ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
     ATTR_TARGET_TEMP_HIGH,
     ATTR_TARGET_TEMP_LOW,
     PRESET_NONE,
 )
+from homeassistant.components.fan import DOMAIN as FAN_DOMAIN
 from homeassistant.components.humidifier import ATTR_HUMIDITY
+from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
+from homeassistant.components.valve import DOMAIN as VALVE_DOMAIN
+from homeassistant.components.weather import DOMAIN as WEATHER_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_TEMPERATURE,
+    CONF_AT,
+    CONF_ENTITY_ID,
     CONF_NAME,
     CONF_UNIQUE_ID,
+    CONF_WEEKDAY,
     EVENT_HOMEASSISTANT_START,
     PRECISION_HALVES,
     PRECISION_TENTHS,
@@ -33,6 +42,7 @@ from homeassistant.const import (
     STATE_OPEN,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    WEEKDAYS,
     Platform,
     UnitOfTemperature,
 )
@@ -42,11 +52,14 @@ from homeassistant.core import (
     EventStateChangedData,
     HomeAssistant,
     ServiceCall,
+    ServiceResponse,
     State,
+    SupportsResponse,
     callback,
 )
-from homeassistant.helpers import discovery
+from homeassistant.helpers import discovery, entity_platform
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect, dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
@@ -56,12 +69,16 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers.service import extract_entity_ids
+from homeassistant.helpers.service import (
+    async_extract_entity_ids,
+    extract_entity_ids,
+)
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.util.unit_conversion import TemperatureConverter
 import voluptuous as vol
 
 from . import DOMAIN, PLATFORMS
+from .command_scheduler import CommandPriority, command_priority
 from .config_validation import validate_config_with_models
 from .const import (
     ATTR_CLOSING_TIMEOUT,
@@ -75,7 +92,10 @@ from .const import (
     ATTR_PREV_TARGET,
     ATTR_PREV_TARGET_HIGH,
     ATTR_PREV_TARGET_LOW,
+    COMPRESSOR_PROTECTION_SIGNAL,
     CONF_AC_MODE,
+    CONF_ACTUATOR_POWER,
+    CONF_APPARENT_TEMP_LOOKUP,
     CONF_AUTO_OUTSIDE_DELTA_BOOST,
     CONF_AUX_HEATER,
     CONF_AUX_HEATING_DUAL_MODE,
@@ -83,6 +103,8 @@ from .const import (
     CONF_COLD_TOLERANCE,
     CONF_COOL_TOLERANCE,
     CONF_COOLER,
+    CONF_COOLER_STAGES,
+    CONF_COP,
     CONF_DRY_TOLERANCE,
     CONF_DRYER,
     CONF_FAN,
@@ -93,47 +115,90 @@ from .const import (
     CONF_FAN_ON_WITH_AC,
     CONF_FAN_ON_WITH_HEATER,
     CONF_FLOOR_SENSOR,
+    CONF_FORECAST_COMFORT_WEIGHT,
+    CONF_FORECAST_WEATHER,
     CONF_HEAT_COOL_MODE,
+    CONF_HEAT_PUMP_BALANCE_POINT,
     CONF_HEAT_PUMP_COOLING,
+    CONF_HEAT_PUMP_COP_CURVE,
+    CONF_HEAT_PUMP_MIN_COP,
     CONF_HEAT_TOLERANCE,
     CONF_HEATER,
+    CONF_HEATER_STAGES,
     CONF_HOT_TOLERANCE,
     CONF_HUMIDITY_SENSOR,
+    CONF_HUMIDITY_SENSORS,
     CONF_HVAC_POWER_LEVELS,
     CONF_HVAC_POWER_MAX,
     CONF_HVAC_POWER_MIN,
+    CONF_HVAC_POWER_OUTPUT,
+    CONF_HVAC_POWER_OUTPUT_DEADBAND,
+    CONF_HVAC_POWER_OUTPUT_SLEW_RATE,
     CONF_HVAC_POWER_TOLERANCE,
     CONF_INITIAL_HVAC_MODE,
     CONF_KEEP_ALIVE,
     CONF_MAX_FLOOR_TEMP,
     CONF_MAX_HUMIDITY,
+    CONF_MAX_STARTS_PER_HOUR,
     CONF_MAX_TEMP,
     CONF_MIN_DUR,
     CONF_MIN_FLOOR_TEMP,
     CONF_MIN_HUMIDITY,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
     CONF_MIN_TEMP,
     CONF_MOIST_TOLERANCE,
     CONF_OPENINGS,
     CONF_OPENINGS_SCOPE,
     CONF_OUTSIDE_SENSOR,
+    CONF_OUTSIDE_TEMP,
+    CONF_PLANT,
+    CONF_PLANT_MIN_DUR,
     CONF_PRECISION,
     CONF_PRESETS,
     CONF_PRESETS_OLD,
+    CONF_SCHEDULE,
     CONF_SENSOR,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_WEIGHT,
+    CONF_SENSORS,
+    CONF_STAGE_DEFICIT,
+    CONF_STAGE_DELAY,
+    CONF_STAGE_HYSTERESIS,
     CONF_STALE_DURATION,
     CONF_TARGET_HUMIDITY,
     CONF_TARGET_TEMP,
     CONF_TARGET_TEMP_HIGH,
     CONF_TARGET_TEMP_LOW,
+    CONF_TARIFF_COMFORT_BAND,
+    CONF_TARIFF_SENSOR,
     CONF_TEMP_STEP,
     CONF_USE_APPARENT_TEMP,
+    DEFAULT_HEAT_PUMP_MIN_COP,
+    DEFAULT_HVAC_POWER_OUTPUT_DEADBAND,
     DEFAULT_MAX_FLOOR_TEMP,
     DEFAULT_NAME,
+    DEFAULT_STAGE_DELAY,
+    DEFAULT_STAGE_HYSTERESIS,
     DEFAULT_TOLERANCE,
     MIN_CYCLE_KEEP_ALIVE,
+    POWER_BUDGET_SIGNAL,
     SET_HVAC_ACTION_REASON_SENSOR_SIGNAL,
     TIMED_OPENING_SCHEMA,
 )
+from .control_metrics import ControlMetrics, ControlTrigger
+from .control_profiler import (
+    ATTR_DURATION,
+    ATTR_MEMORY,
+    ATTR_PASSES,
+    DEFAULT_DURATION,
+    DEFAULT_PASSES,
+    MAX_DURATION,
+    MAX_PASSES,
+    ControlProfiler,
+    async_start_profiler,
+)
+from .decision_trace import trace_step
 from .hvac_action_reason.hvac_action_reason import (
     SERVICE_SET_HVAC_ACTION_REASON,
     SET_HVAC_ACTION_REASON_SIGNAL,
@@ -145,13 +210,27 @@ from .hvac_device.hvac_device_factory import HVACDeviceFactory
 from .managers.auto_mode_evaluator import AutoDecision, AutoModeEvaluator
 from .managers.environment_manager import EnvironmentManager, TargetTemperatures
 from .managers.feature_manager import FeatureManager
+from .managers.forecast_manager import ForecastManager
 from .managers.hvac_power_manager import HvacPowerManager
 from .managers.opening_manager import OpeningHvacModeScope, OpeningManager
 from .managers.preset_manager import PresetManager
+from .managers.schedule_manager import ScheduleManager, TargetChange
+from .managers.sensor_aggregator import Aggregation
+from .managers.tariff_manager import TariffManager
+from .power_budget import async_get_power_budget
+from .runtime_stats import async_get_runtime_store
 from .schemas import validate_template_or_number
+from .startup_coordinator import async_get_startup_coordinator
+from .zone_coordinator import ZoneCoordinator, async_join_zone, async_leave_zone
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_THERMOSTATS = "thermostats"
+
+SERVICE_GET_DECISION_TRACE = "get_decision_trace"
+SERVICE_PROFILE_CONTROL = "profile_control"
+SERVICE_APPLY_BULK = "apply_bulk"
+
 # Preset schema supports both static numbers and templates
 PRESET_SCHEMA = {
     vol.Optional(ATTR_TEMPERATURE): validate_template_or_number,
@@ -170,6 +249,24 @@ SECONDARY_HEATING_SCHEMA = {
     ),
 }
 
+STAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_STAGE_DEFICIT, default=0): vol.Coerce(float),
+        vol.Optional(CONF_STAGE_DELAY, default=DEFAULT_STAGE_DELAY): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
+)
+
+MULTI_STAGE_SCHEMA = {
+    vol.Optional(CONF_HEATER_STAGES): vol.All(cv.ensure_list, [STAGE_SCHEMA]),
+    vol.Optional(CONF_COOLER_STAGES): vol.All(cv.ensure_list, [STAGE_SCHEMA]),
+    vol.Optional(CONF_STAGE_HYSTERESIS, default=DEFAULT_STAGE_HYSTERESIS): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+}
+
 FLOOR_TEMPERATURE_SCHEMA = {
     vol.Optional(CONF_FLOOR_SENSOR): cv.entity_id,
     vol.Optional(CONF_MAX_FLOOR_TEMP): vol.Coerce(float),
@@ -195,9 +292,25 @@ OPENINGS_SCHEMA = {
     ),
 }
 
+SENSOR_LIST_SCHEMA = vol.All(
+    cv.ensure_list,
+    [
+        vol.Any(
+            cv.entity_id,
+            {
+                vol.Required(CONF_ENTITY_ID): cv.entity_id,
+                vol.Optional(CONF_SENSOR_WEIGHT, default=1.0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            },
+        )
+    ],
+)
+
 DEHUMIDIFYER_SCHEMA = {
     vol.Optional(CONF_DRYER): cv.entity_id,
     vol.Optional(CONF_HUMIDITY_SENSOR): cv.entity_id,
+    vol.Optional(CONF_HUMIDITY_SENSORS): SENSOR_LIST_SCHEMA,
     vol.Optional(CONF_MIN_HUMIDITY): vol.Coerce(float),
     vol.Optional(CONF_MAX_HUMIDITY): vol.Coerce(float),
     vol.Optional(CONF_TARGET_HUMIDITY): vol.Coerce(float),
@@ -205,8 +318,22 @@ DEHUMIDIFYER_SCHEMA = {
     vol.Optional(CONF_MOIST_TOLERANCE): vol.Coerce(float),
 }
 
+COP_POINT_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_OUTSIDE_TEMP): vol.Coerce(float),
+        vol.Required(CONF_COP): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
 HEAT_PUMP_SCHEMA = {
     vol.Optional(CONF_HEAT_PUMP_COOLING): cv.entity_id,
+    vol.Optional(CONF_HEAT_PUMP_COP_CURVE): vol.All(
+        cv.ensure_list, [COP_POINT_SCHEMA], vol.Length(min=2)
+    ),
+    vol.Optional(CONF_HEAT_PUMP_BALANCE_POINT): vol.Coerce(float),
+    vol.Optional(CONF_HEAT_PUMP_MIN_COP, default=DEFAULT_HEAT_PUMP_MIN_COP): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
 }
 
 HVAC_POWER_SCHEMA = {
@@ -214,6 +341,44 @@ HVAC_POWER_SCHEMA = {
     vol.Optional(CONF_HVAC_POWER_MIN): vol.Coerce(int),
     vol.Optional(CONF_HVAC_POWER_MAX): vol.Coerce(int),
     vol.Optional(CONF_HVAC_POWER_TOLERANCE): vol.Coerce(float),
+    vol.Optional(CONF_HVAC_POWER_OUTPUT): cv.entity_domain(
+        [VALVE_DOMAIN, NUMBER_DOMAIN, FAN_DOMAIN]
+    ),
+    vol.Optional(
+        CONF_HVAC_POWER_OUTPUT_DEADBAND, default=DEFAULT_HVAC_POWER_OUTPUT_DEADBAND
+    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=50)),
+    vol.Optional(CONF_HVAC_POWER_OUTPUT_SLEW_RATE): vol.All(
+        vol.Coerce(float), vol.Range(min=0.1)
+    ),
+}
+
+TARGET_CHANGE_KEYS = (
+    ATTR_PRESET_MODE,
+    ATTR_TEMPERATURE,
+    ATTR_TARGET_TEMP_LOW,
+    ATTR_TARGET_TEMP_HIGH,
+)
+
+TARGET_CHANGE_SCHEMA = {
+    vol.Optional(ATTR_PRESET_MODE): cv.string,
+    vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+    vol.Optional(ATTR_TARGET_TEMP_LOW): vol.Coerce(float),
+    vol.Optional(ATTR_TARGET_TEMP_HIGH): vol.Coerce(float),
+}
+
+SCHEDULE_ENTRY_SCHEMA = vol.All(
+    {
+        vol.Optional(CONF_WEEKDAY, default=WEEKDAYS): vol.All(
+            cv.ensure_list, [vol.In(WEEKDAYS)]
+        ),
+        vol.Required(CONF_AT): cv.time,
+        **TARGET_CHANGE_SCHEMA,
+    },
+    cv.has_at_least_one_key(*TARGET_CHANGE_KEYS),
+)
+
+SCHEDULE_SCHEMA = {
+    vol.Optional(CONF_SCHEDULE): vol.All(cv.ensure_list, [SCHEDULE_ENTRY_SCHEMA]),
 }
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
@@ -221,17 +386,39 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Required(CONF_HEATER): cv.entity_id,
         vol.Optional(CONF_COOLER): cv.entity_id,
         vol.Required(CONF_SENSOR): cv.entity_id,
+        vol.Optional(CONF_SENSORS): SENSOR_LIST_SCHEMA,
+        vol.Optional(CONF_SENSOR_AGGREGATION): vol.In(list(Aggregation)),
         vol.Optional(CONF_STALE_DURATION): vol.All(
             cv.time_period, cv.positive_timedelta
         ),
         vol.Optional(CONF_OUTSIDE_SENSOR): cv.entity_id,
         vol.Optional(CONF_AUTO_OUTSIDE_DELTA_BOOST): vol.Coerce(float),
         vol.Optional(CONF_USE_APPARENT_TEMP): cv.boolean,
+        vol.Optional(CONF_APPARENT_TEMP_LOOKUP): cv.boolean,
         vol.Optional(CONF_AC_MODE): cv.boolean,
         vol.Optional(CONF_HEAT_COOL_MODE): cv.boolean,
         vol.Optional(CONF_MAX_TEMP): vol.Coerce(float),
         vol.Optional(CONF_MIN_DUR): vol.All(cv.time_period, cv.positive_timedelta),
+        vol.Optional(CONF_MIN_ON_TIME): vol.All(cv.time_period, cv.positive_timedelta),
+        vol.Optional(CONF_MIN_OFF_TIME): vol.All(cv.time_period, cv.positive_timedelta),
+        vol.Optional(CONF_MAX_STARTS_PER_HOUR): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=60)
+        ),
         vol.Optional(CONF_MIN_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_ACTUATOR_POWER): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        # Both plans move the target offset, so only one of them can be used.
+        vol.Exclusive(CONF_TARIFF_SENSOR, "plan"): cv.entity_id,
+        vol.Optional(CONF_TARIFF_COMFORT_BAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=10)
+        ),
+        vol.Exclusive(CONF_FORECAST_WEATHER, "plan"): cv.entity_domain(WEATHER_DOMAIN),
+        vol.Optional(CONF_FORECAST_COMFORT_WEIGHT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.01, max=100)
+        ),
+        vol.Optional(CONF_PLANT): cv.entity_id,
+        vol.Optional(CONF_PLANT_MIN_DUR): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Optional(CONF_COLD_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
         vol.Optional(CONF_HOT_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
@@ -263,6 +450,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(SECONDARY_HEATING_SCHEMA)
 
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(MULTI_STAGE_SCHEMA)
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(FLOOR_TEMPERATURE_SCHEMA)
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(OPENINGS_SCHEMA)
@@ -275,6 +464,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(HEAT_PUMP_SCHEMA)
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(HVAC_POWER_SCHEMA)
 
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(SCHEDULE_SCHEMA)
+
 # Add the old presets schema to avoid breaking change
 # Now supports both static numbers and templates
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
@@ -305,6 +496,10 @@ async def async_setup_entry(
         config,
         config_entry.entry_id,
         async_add_entities,
+        device_info=DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config[CONF_NAME],
+        ),
     )
 
 
@@ -330,7 +525,10 @@ async def async_setup_platform(
             hass,
             Platform.SENSOR,
             DOMAIN,
-            {"name": config[CONF_NAME], "sensor_key": sensor_key},
+            {
+                "name": config[CONF_NAME],
+                "sensor_key": sensor_key,
+            },
             config,
         )
     )
@@ -370,7 +568,14 @@ def _normalize_config_numeric_values(config: dict[str, Any]) -> dict[str, Any]:
     # Time-based keys that need conversion from seconds to timedelta
     # Config flow stores these as int/float (seconds) but code expects timedelta
     # After storage, Home Assistant may deserialize timedelta as dict with days/seconds/microseconds
-    time_keys = [CONF_KEEP_ALIVE, CONF_MIN_DUR, CONF_STALE_DURATION]
+    time_keys = [
+        CONF_KEEP_ALIVE,
+        CONF_MIN_DUR,
+        CONF_MIN_OFF_TIME,
+        CONF_MIN_ON_TIME,
+        CONF_PLANT_MIN_DUR,
+        CONF_STALE_DURATION,
+    ]
 
     for key in time_keys:
         if key in config and config[key] is not None:
@@ -413,6 +618,7 @@ async def _async_setup_config(
     config: dict[str, Any],
     unique_id: str | None,
     async_add_entities: AddEntitiesCallback,
+    device_info: DeviceInfo | None = None,
 ) -> str:
     """Set up the smart dual thermostat platform. Returns the sensor_key."""
 
@@ -463,12 +669,27 @@ async def _async_setup_config(
 
     preset_manager = PresetManager(hass, config, environment_manager, feature_manager)
 
+    await async_get_runtime_store(hass).async_load()
     device_factory = HVACDeviceFactory(hass, config, feature_manager)
 
     hvac_device = device_factory.create_device(
         environment_manager, opening_manager, hvac_power_manager
     )
 
+    tariff_manager = (
+        TariffManager(hass, config, environment_manager)
+        if CONF_TARIFF_SENSOR in config
+        else None
+    )
+    forecast_manager = (
+        ForecastManager(hass, config, environment_manager, feature_manager)
+        if CONF_FORECAST_WEATHER in config
+        else None
+    )
+    schedule_manager = (
+        ScheduleManager(hass, config) if config.get(CONF_SCHEDULE) else None
+    )
+
     has_min_cycle = CONF_MIN_DUR in config
     thermostat = DualSmartThermostat(
         name,
@@ -490,9 +711,16 @@ async def _async_setup_config(
         feature_manager,
         hvac_power_manager,
         auto_outside_delta_boost=auto_outside_delta_boost,
+        plant_entity_id=config.get(CONF_PLANT),
+        plant_min_cycle_duration=config.get(CONF_PLANT_MIN_DUR),
+        tariff_manager=tariff_manager,
+        forecast_manager=forecast_manager,
+        schedule_manager=schedule_manager,
     )
     sensor_key = unique_id or name
     thermostat._action_reason_sensor_key = sensor_key
+    thermostat._attr_device_info = device_info
+    async_get_thermostats(hass)[sensor_key] = thermostat
     async_add_entities([thermostat])
 
     # Service to set HVACActionReason.
@@ -523,6 +751,41 @@ async def _async_setup_config(
         DOMAIN, SERVICE_SET_HVAC_ACTION_REASON, set_hvac_action_reason_service
     )
 
+    async def apply_bulk_service(call: ServiceCall) -> None:
+        """Apply one target change to all targeted thermostats."""
+        entity_ids = await async_extract_entity_ids(hass, call)
+        await async_apply_bulk(hass, entity_ids, TargetChange.from_data(call.data))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_BULK,
+        apply_bulk_service,
+        schema=vol.All(
+            cv.make_entity_service_schema(TARGET_CHANGE_SCHEMA),
+            cv.has_at_least_one_key(*TARGET_CHANGE_KEYS),
+        ),
+    )
+
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_GET_DECISION_TRACE,
+        {},
+        "async_get_decision_trace",
+        supports_response=SupportsResponse.ONLY,
+    )
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_PROFILE_CONTROL,
+        {
+            vol.Optional(ATTR_PASSES, default=DEFAULT_PASSES): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_PASSES)
+            ),
+            vol.Optional(ATTR_DURATION, default=DEFAULT_DURATION): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_DURATION)
+            ),
+            vol.Optional(ATTR_MEMORY, default=False): cv.boolean,
+        },
+        "async_profile_control",
+    )
+
     return sensor_key
 
 
@@ -551,6 +814,11 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         power_manager: HvacPowerManager,
         *,
         auto_outside_delta_boost: float | None = None,
+        plant_entity_id: str | None = None,
+        plant_min_cycle_duration: timedelta | None = None,
+        tariff_manager: TariffManager | None = None,
+        forecast_manager: ForecastManager | None = None,
+        schedule_manager: ScheduleManager | None = None,
     ) -> None:
         """Initialize the thermostat."""
         self._attr_name = name
@@ -575,6 +843,15 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         # power manager
         self.power_manager = power_manager
 
+        # tariff manager
+        self.tariff = tariff_manager
+
+        # forecast manager
+        self.forecast = forecast_manager
+
+        # schedule manager
+        self.schedule = schedule_manager
+
         # sensors
         self.sensor_entity_id = sensor_entity_id
         self.sensor_floor_entity_id = sensor_floor_entity_id
@@ -587,6 +864,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         self._sensor_stale_duration = sensor_stale_duration
         self._remove_stale_tracking: Callable[[], None] | None = None
+        self._remove_startup_control: Callable[[], None] | None = None
         self._remove_humidity_stale_tracking: Callable[[], None] | None = None
         self._remove_outside_stale_tracking: Callable[[], None] | None = None
         self._sensor_stalled = False
@@ -646,6 +924,13 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         self._last_auto_decision: AutoDecision | None = None
 
         self._temp_lock = asyncio.Lock()
+        self.control_metrics = ControlMetrics()
+        self._profiler: ControlProfiler | None = None
+
+        # shared plant
+        self._plant_entity_id = plant_entity_id
+        self._plant_min_cycle_duration = plant_min_cycle_duration
+        self._zone: ZoneCoordinator | None = None
 
         # Template listener tracking
         self._template_listeners: list[Callable[[], None]] = []
@@ -774,20 +1059,36 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         # Trigger control cycle to respond to new temperature
         self.async_write_ha_state()
-        await self._async_control_climate(force=True)
+        await self._async_control_climate(force=True, trigger=ControlTrigger.TEMPLATE)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
 
+        startup = async_get_startup_coordinator(self.hass)
+        startup.async_begin(self.entity_id)
+
         # Add listener
         self.async_on_remove(
             async_track_state_change_event(
-                self.hass, [self.sensor_entity_id], self._async_sensor_changed_event
+                self.hass,
+                self.environment.temp_sensor_ids,
+                self._async_sensor_changed_event,
             )
         )
 
         switch_entities = self.hvac_device.get_device_ids()
+        runtime_store = async_get_runtime_store(self.hass)
+        for entity_id in switch_entities:
+            runtime_store.async_record(entity_id, self.hass.states.get(entity_id))
+            for signal in (COMPRESSOR_PROTECTION_SIGNAL, POWER_BUDGET_SIGNAL):
+                self.async_on_remove(
+                    async_dispatcher_connect(
+                        self.hass,
+                        signal.format(entity_id),
+                        self._async_deferred_request_ready,
+                    )
+                )
         if switch_entities:
             _LOGGER.debug("Adding switch listener: %s", switch_entities)
             self.async_on_remove(
@@ -798,6 +1099,24 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         # register device's on-remove
         self.async_on_remove(self.hvac_device.call_on_remove_callbacks)
+        self.async_on_remove(self.power_manager.async_cancel_output)
+
+        if self.tariff is not None:
+            self.async_on_remove(
+                self.tariff.async_start(self._async_tariff_plan_changed)
+            )
+        if self.forecast is not None:
+            self.async_on_remove(
+                self.forecast.async_start(self._async_forecast_plan_changed)
+            )
+
+        if self._plant_entity_id is not None:
+            self._zone = async_join_zone(
+                self.hass,
+                self._plant_entity_id,
+                self.entity_id,
+                self._plant_min_cycle_duration,
+            )
 
         if self.sensor_floor_entity_id is not None:
             _LOGGER.debug(
@@ -830,7 +1149,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             self.async_on_remove(
                 async_track_state_change_event(
                     self.hass,
-                    [self.sensor_humidity_entity_id],
+                    self.environment.humidity_sensor_ids,
                     self._async_sensor_humidity_changed_event,
                 )
             )
@@ -897,17 +1216,12 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         async def _async_startup(*_) -> None:
             """Init on startup."""
 
-            sensor_state = self.hass.states.get(self.sensor_entity_id)
             if self.sensor_floor_entity_id:
                 floor_sensor_state = self.hass.states.get(self.sensor_floor_entity_id)
             else:
                 floor_sensor_state = None
 
-            if sensor_state and sensor_state.state not in (
-                STATE_UNAVAILABLE,
-                STATE_UNKNOWN,
-            ):
-                self.environment.update_temp_from_state(sensor_state)
+            if self._update_temp_from_sensors():
                 self.async_write_ha_state()
 
             if floor_sensor_state and floor_sensor_state.state not in (
@@ -989,22 +1303,47 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         # Set correct support flag
         self._set_support_flags()
 
+        if self.schedule is not None:
+            # A transition may have passed while Home Assistant was down.
+            if (action := self.schedule.current()) is not None:
+                await self._async_apply_target_change(action)
+            self.async_on_remove(
+                self.schedule.async_start(self._async_schedule_transition)
+            )
+
         # Reads sensor and triggers an initial control of climate
         should_control_climate = await self._async_update_sensors_initial_state()
+        startup.async_mark_prepared(self.entity_id)
 
         if should_control_climate:
-            await self._async_control_climate(force=True)
+            # The coordinator staggers first passes across all thermostats
+            # while Home Assistant is starting up.
+            self._remove_startup_control = await startup.async_run_first_control(
+                self.entity_id, self._async_startup_control_climate
+            )
 
         # Set up template listeners for preset temperatures
         await self._setup_template_listeners()
 
         self.async_write_ha_state()
 
+    async def _async_startup_control_climate(self) -> None:
+        """Run the first, forced control pass after startup."""
+        self._remove_startup_control = None
+        await self._async_control_climate(force=True, trigger=ControlTrigger.STARTUP)
+
     async def async_will_remove_from_hass(self) -> None:
         """Call when entity will be removed from hass."""
         # Remove template listeners
         await self._remove_template_listeners()
 
+        if self._remove_startup_control:
+            self._remove_startup_control()
+            self._remove_startup_control = None
+        async_get_startup_coordinator(self.hass).async_forget(self.entity_id)
+        if self._action_reason_sensor_key is not None:
+            async_get_thermostats(self.hass).pop(self._action_reason_sensor_key, None)
+
         if self._remove_signal_hvac_action_reason:
             self._remove_signal_hvac_action_reason()
         if self._remove_stale_tracking:
@@ -1013,8 +1352,24 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             self._remove_humidity_stale_tracking()
         if self._remove_outside_stale_tracking:
             self._remove_outside_stale_tracking()
+        if self._profiler is not None:
+            self._profiler.async_stop()
+        if self._zone is not None:
+            await async_leave_zone(self.hass, self._plant_entity_id, self.entity_id)
+            self._zone = None
         return await super().async_will_remove_from_hass()
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and report the zone demand to the shared plant."""
+        super().async_write_ha_state()
+        if self._zone is not None:
+            self._zone.async_update(
+                self.entity_id,
+                self.hvac_action,
+                self.power_manager.hvac_power_percent,
+            )
+
     @property
     def should_poll(self) -> bool:
         """Return the polling state."""
@@ -1213,14 +1568,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
     async def _async_update_sensors_initial_state(self) -> bool:
         """Update sensors initial state."""
-        should_contorl_climate = False
-        sensor_state = self.hass.states.get(self.sensor_entity_id)
-        if sensor_state and sensor_state.state not in (
-            STATE_UNAVAILABLE,
-            STATE_UNKNOWN,
-        ):
-            self.environment.update_temp_from_state(sensor_state)
-            should_contorl_climate = True
+        should_contorl_climate = self._update_temp_from_sensors()
 
         if self.sensor_floor_entity_id:
             sensor_floor_state = self.hass.states.get(self.sensor_floor_entity_id)
@@ -1240,8 +1588,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 self.environment.update_outside_temp_from_state(sensor_outside_state)
                 should_contorl_climate = True
 
-        if self.sensor_humidity_entity_id:
-            sensor_humidity_state = self.hass.states.get(self.sensor_humidity_entity_id)
+        for entity_id in self.environment.humidity_sensor_ids:
+            sensor_humidity_state = self.hass.states.get(entity_id)
             if sensor_humidity_state and sensor_humidity_state.state not in (
                 STATE_UNAVAILABLE,
                 STATE_UNKNOWN,
@@ -1254,6 +1602,19 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         return should_contorl_climate
 
+    def _update_temp_from_sensors(self) -> bool:
+        """Read every temperature sensor, returning whether any had a state."""
+        updated = False
+        for entity_id in self.environment.temp_sensor_ids:
+            sensor_state = self.hass.states.get(entity_id)
+            if sensor_state and sensor_state.state not in (
+                STATE_UNAVAILABLE,
+                STATE_UNKNOWN,
+            ):
+                self.environment.update_temp_from_state(sensor_state)
+                updated = True
+        return updated
+
     async def async_set_hvac_mode(
         self, hvac_mode: HVACMode, is_restore: bool = False
     ) -> None:
@@ -1333,19 +1694,25 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             _LOGGER.debug("Setting hvac mode with temperature: %s", hvac_mode)
             await self.async_set_hvac_mode(hvac_mode)
 
+        if not await self._async_apply_temperatures(temperatures):
+            return
+
+        await self._async_control_climate(force=True, trigger=ControlTrigger.SERVICE)
+        self.async_write_ha_state()
+
+    async def _async_apply_temperatures(self, temperatures: TargetTemperatures) -> bool:
+        """Set new target temperatures, returning whether any was set."""
         if self.features.is_configured_for_heat_cool_mode:
             self._set_temperatures_dual_mode(temperatures)
         else:
-            if temperature is None:
-                return
-            self.environment.set_temperature_target(temperature)
+            if temperatures.temperature is None:
+                return False
+            self.environment.set_temperature_target(temperatures.temperature)
             self._target_temp = self.environment.target_temp
 
         # Check for auto-preset selection after setting temperature
         await self._check_auto_preset_selection()
-
-        await self._async_control_climate(force=True)
-        self.async_write_ha_state()
+        return True
 
     async def async_set_humidity(self, humidity: float) -> None:
         """Set new target humidity."""
@@ -1357,7 +1724,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         # Check for auto-preset selection after setting humidity
         await self._check_auto_preset_selection()
 
-        await self._async_control_climate(force=True)
+        await self._async_control_climate(force=True, trigger=ControlTrigger.SERVICE)
         self.async_write_ha_state()
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
@@ -1433,7 +1800,14 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         _LOGGER.debug(
             "Sensor change: %s, trigger_control: %s", new_state, trigger_control
         )
-        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        if new_state is None:
+            return
+        if new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # The other sensors of an aggregate keep the temperature going.
+            if self.environment.discard_temp_sensor(new_state.entity_id):
+                if trigger_control:
+                    await self._async_control_climate()
+                self.async_write_ha_state()
             return
 
         if self._sensor_stale_duration:
@@ -1458,6 +1832,10 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             )
 
         self.environment.update_temp_from_state(new_state)
+        if self.tariff is not None:
+            self.tariff.observe(self.hvac_device.is_active)
+        if self.forecast is not None:
+            self.forecast.observe(self.hvac_device.is_active)
         if trigger_control:
             await self._async_control_climate()
         self.async_write_ha_state()
@@ -1476,7 +1854,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 self.unique_id,
                 self.sensor_entity_id,
             )
-            await self.hvac_device.async_turn_off()
+            with command_priority(CommandPriority.SAFETY):
+                await self.hvac_device.async_turn_off()
             self._hvac_action_reason = HVACActionReason.TEMPERATURE_SENSOR_STALLED
             self._publish_hvac_action_reason(self._hvac_action_reason)
             self._sensor_stalled = True
@@ -1498,7 +1877,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 self.unique_id,
                 self.sensor_entity_id,
             )
-            await self.hvac_device.async_turn_off()
+            with command_priority(CommandPriority.SAFETY):
+                await self.hvac_device.async_turn_off()
             self._hvac_action_reason = HVACActionReason.HUMIDITY_SENSOR_STALLED
             self._publish_hvac_action_reason(self._hvac_action_reason)
             self._humidity_sensor_stalled = True
@@ -1597,7 +1977,13 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
     ) -> None:
         """Handle humidity changes."""
         _LOGGER.debug("Sensor humidity change: %s", new_state)
-        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        if new_state is None:
+            return
+        if new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            if self.environment.discard_humidity_sensor(new_state.entity_id):
+                if trigger_control:
+                    await self._async_control_climate()
+                self.async_write_ha_state()
             return
 
         if self._sensor_stale_duration:
@@ -1694,43 +2080,84 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 )
             )
         else:
-            await self._async_control_climate(force=True)
+            await self._async_control_climate(
+                force=True, trigger=ControlTrigger.OPENING
+            )
 
         self.async_write_ha_state()
 
-    async def _async_control_climate(self, time=None, force=False) -> None:
+    async def _async_control_climate(
+        self, time=None, force=False, trigger: ControlTrigger | None = None
+    ) -> None:
         """Control the climate device based on config."""
 
         _LOGGER.debug("Attempting to control climate, time %s, force %s", time, force)
 
-        async with self._temp_lock:
-            if self._hvac_mode == HVACMode.AUTO and self._auto_evaluator is not None:
-                await self._async_evaluate_auto_and_dispatch(time=time, force=force)
-                return
+        if trigger is None:
+            trigger = (
+                ControlTrigger.SENSOR if time is None else ControlTrigger.KEEP_ALIVE
+            )
+        if self._profiler is not None:
+            with self._profiler.profile_pass():
+                await self._async_control_pass(time, force, trigger)
+            return
+        await self._async_control_pass(time, force, trigger)
 
-            if self.hvac_device.hvac_mode == HVACMode.OFF and time is None:
-                _LOGGER.debug("Climate is off, skipping control")
-                return
+    async def _async_control_pass(
+        self, time, force: bool, trigger: ControlTrigger
+    ) -> None:
+        """Run one measured control pass under the temperature lock."""
+        requested_at = time_module.perf_counter()
+        if self.tariff is not None:
+            self.tariff.async_check()
+        if self.forecast is not None:
+            self.forecast.async_check(self._hvac_mode)
+        async with self._temp_lock:
+            with self.control_metrics.measure_pass(trigger, requested_at) as run:
+                environment = self.environment
+                run.inputs = (
+                    environment.cur_temp,
+                    environment.cur_humidity,
+                    environment.target_temp,
+                    environment.target_temp_low,
+                    environment.target_temp_high,
+                    self.hvac_device.hvac_mode,
+                    force,
+                )
+                if (
+                    self._hvac_mode == HVACMode.AUTO
+                    and self._auto_evaluator is not None
+                ):
+                    await self._async_evaluate_auto_and_dispatch(time=time, force=force)
+                    run.action = self.hvac_device.hvac_action
+                    run.reason = self._hvac_action_reason or "none"
+                    return
 
-            await self.hvac_device.async_control_hvac(time, force)
+                if self.hvac_device.hvac_mode == HVACMode.OFF and time is None:
+                    trace_step(self.entity_id, "off, skipped")
+                    return
 
-            _LOGGER.debug(
-                "updating HVACActionReason: %s", self.hvac_device.HVACActionReason
-            )
+                await self.hvac_device.async_control_hvac(time, force)
 
-            self._hvac_action_reason = self.hvac_device.HVACActionReason
-            self._publish_hvac_action_reason(self._hvac_action_reason)
+                self._hvac_action_reason = self.hvac_device.HVACActionReason
+                self._publish_hvac_action_reason(self._hvac_action_reason)
+                run.action = self.hvac_device.hvac_action
+                run.reason = self._hvac_action_reason or "none"
 
     async def _async_control_climate_forced(self, time=None) -> None:
         """Forcefully control the climate device based on config."""
         _LOGGER.debug("Attempting to forcefully control climate, time %s", time)
-        await self._async_control_climate(time=None, force=True)
+        await self._async_control_climate(
+            time=None, force=True, trigger=ControlTrigger.OPENING
+        )
 
         self.async_write_ha_state()
 
     async def _async_control_climate_no_time(self, time=None, force=False) -> None:
         """Control the climate device based on config removing time param."""
-        await self._async_control_climate(time=None, force=force)
+        await self._async_control_climate(
+            time=None, force=force, trigger=ControlTrigger.KEEP_ALIVE
+        )
 
     async def _async_evaluate_auto_and_dispatch(
         self, *, time=None, force: bool = False, is_restore: bool = False
@@ -1750,6 +2177,9 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             humidity_sensor_stalled=self._humidity_sensor_stalled,
             outside_temp=self.environment.cur_outside_temp,
             outside_sensor_stalled=self._outside_sensor_stalled,
+            planned_mode=(
+                self.forecast.planned_mode if self.forecast is not None else None
+            ),
         )
         self._last_auto_decision = decision
 
@@ -1761,6 +2191,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             # correct mode-aware tolerance and tied targets. We do not touch
             # self._hvac_mode (which stays AUTO) — only the underlying device's
             # mode is transitioned to the picked sub-mode.
+            trace_step(self.entity_id, "auto switches to %s", decision.next_mode)
             self.environment.set_hvac_mode(decision.next_mode)
             if not is_restore:
                 self.environment.set_temepratures_from_hvac_mode_and_presets(
@@ -1786,11 +2217,32 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         self.async_write_ha_state()
 
+    async def _async_deferred_request_ready(self) -> None:
+        """Retry a start or stop deferred by protection or the power budget."""
+        await self._async_control_climate(trigger=ControlTrigger.DEVICE)
+        self.async_write_ha_state()
+
+    async def _async_tariff_plan_changed(self) -> None:
+        """Follow the planned temperature of the new tariff slot."""
+        await self._async_control_climate(trigger=ControlTrigger.TARIFF)
+        self.async_write_ha_state()
+
+    async def _async_forecast_plan_changed(self) -> None:
+        """Follow the planned mode and temperature of the new forecast slot."""
+        await self._async_control_climate(trigger=ControlTrigger.FORECAST)
+        self.async_write_ha_state()
+
     @callback
     def _async_switch_changed_event(self, event: Event[EventStateChangedData]) -> None:
         """Handle heater switch state changes."""
 
         data = event.data
+        async_get_runtime_store(self.hass).async_record(
+            data["entity_id"], data["new_state"]
+        )
+        async_get_power_budget(self.hass).async_state_changed(
+            data["entity_id"], data["new_state"]
+        )
         self._async_switch_changed(data["old_state"], data["new_state"])
 
     @callback
@@ -1818,7 +2270,9 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             _LOGGER.debug(
                 "Resuming from state. Old state is None, New State: %s", new_state
             )
-            self.hass.create_task(self._async_control_climate())
+            self.hass.create_task(
+                self._async_control_climate(trigger=ControlTrigger.DEVICE)
+            )
 
         if old_state is not None and new_state is not None:
             _LOGGER.debug(
@@ -1833,7 +2287,9 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 STATE_UNAVAILABLE,
                 STATE_UNKNOWN,
             ):
-                self.hass.create_task(self._async_control_climate())
+                self.hass.create_task(
+                    self._async_control_climate(trigger=ControlTrigger.DEVICE)
+                )
 
     @property
     def _is_device_active(self) -> bool:
@@ -1842,6 +2298,13 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
+        await self._async_apply_preset_mode(preset_mode)
+
+        await self._async_control_climate(force=True, trigger=ControlTrigger.SERVICE)
+        self.async_write_ha_state()
+
+    async def _async_apply_preset_mode(self, preset_mode: str) -> None:
+        """Set the targets of ``preset_mode`` without running a control pass."""
         old_preset_mode = self.presets.preset_mode
 
         _LOGGER.info(
@@ -1873,8 +2336,40 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         # Update template listeners for new preset
         await self._setup_template_listeners()
 
-        await self._async_control_climate(force=True)
-        self.async_write_ha_state()
+    async def _async_apply_target_change(self, change: TargetChange) -> bool:
+        """Set a preset or target temperatures without a control pass.
+
+        Returns whether any target changed.
+        """
+        changed = False
+        if change.preset_mode is not None:
+            if change.preset_mode not in (self.preset_modes or []):
+                _LOGGER.warning(
+                    "Preset %s is not configured for %s",
+                    change.preset_mode,
+                    self.entity_id,
+                )
+            elif change.preset_mode != self.presets.preset_mode:
+                await self._async_apply_preset_mode(change.preset_mode)
+                changed = True
+        if change.has_temperatures:
+            changed = (
+                await self._async_apply_temperatures(
+                    TargetTemperatures(
+                        change.temperature,
+                        change.target_temp_high,
+                        change.target_temp_low,
+                    )
+                )
+                or changed
+            )
+        return changed
+
+    async def _async_schedule_transition(self, action: TargetChange) -> None:
+        """Apply the new schedule slot with a regular control pass."""
+        if await self._async_apply_target_change(action):
+            await self._async_control_climate(trigger=ControlTrigger.SCHEDULE)
+            self.async_write_ha_state()
 
     def _publish_hvac_action_reason(self, reason) -> None:
         """Mirror the current hvac_action_reason onto the companion sensor.
@@ -1953,3 +2448,110 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
     async def async_turn_off(self) -> None:
         """Turn off the device."""
         await self.async_set_hvac_mode(HVACMode.OFF)
+
+    async def async_get_decision_trace(self) -> ServiceResponse:
+        """Return the last control passes, oldest first."""
+        return {"records": self.control_metrics.trace.as_list()}
+
+    async def async_profile_control(
+        self, passes: int, duration: int, memory: bool
+    ) -> None:
+        """Profile the next control passes and write the result to the config dir."""
+        self._profiler = async_start_profiler(
+            self.hass, self.entity_id, passes, duration, memory, self._profiling_done
+        )
+
+    @callback
+    def _profiling_done(self) -> None:
+        self._profiler = None
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return a snapshot of the internal state for the diagnostics download."""
+        decision = self._last_auto_decision
+        timing = async_get_startup_coordinator(self.hass).timings.get(self.entity_id)
+        return {
+            "entity_id": self.entity_id,
+            "hvac_mode": self._hvac_mode,
+            "hvac_action_reason": self._hvac_action_reason,
+            "sensors_stalled": {
+                "temperature": self._sensor_stalled,
+                "humidity": self._humidity_sensor_stalled,
+                "outside": self._outside_sensor_stalled,
+            },
+            "features": {
+                "supported_features": self.features.supported_features,
+                "flags": self.features.profile.flags.name,
+            },
+            "environment": self.environment.diagnostics(),
+            "openings": self.openings.diagnostics(),
+            "preset": {
+                "mode": self.presets.preset_mode,
+                "env": self.presets.preset_env.diagnostics(),
+            },
+            "auto_decision": (
+                {"next_mode": decision.next_mode, "reason": decision.reason}
+                if decision is not None
+                else None
+            ),
+            "power": self.power_manager.diagnostics(),
+            "hvac_device": self.hvac_device.diagnostics(),
+            "startup": timing.as_dict() if timing is not None else None,
+            "control_metrics": self.control_metrics.as_dict(),
+            "decision_trace": self.control_metrics.trace.as_list(),
+            "zone": self._zone.diagnostics() if self._zone is not None else None,
+            "tariff": self.tariff.diagnostics() if self.tariff is not None else None,
+            "forecast": (
+                self.forecast.diagnostics() if self.forecast is not None else None
+            ),
+            "schedule": (
+                self.schedule.diagnostics() if self.schedule is not None else None
+            ),
+        }
+
+
+async def async_apply_bulk(
+    hass: HomeAssistant, entity_ids: set[str], change: TargetChange
+) -> list[str]:
+    """Apply ``change`` to many thermostats in one batch.
+
+    All targets are set before any control pass runs. The passes of the
+    thermostats whose targets changed then run concurrently. Their switch and
+    valve commands go through the shared command scheduler, which rate-limits
+    them per integration. Returns the entity ids that changed.
+    """
+    thermostats = [
+        thermostat
+        for thermostat in async_get_thermostats(hass).values()
+        if thermostat.entity_id in entity_ids
+    ]
+    changed = [
+        thermostat
+        for thermostat in thermostats
+        if await thermostat._async_apply_target_change(change)
+    ]
+    results = await asyncio.gather(
+        *(
+            thermostat._async_control_climate(force=True, trigger=ControlTrigger.BULK)
+            for thermostat in changed
+        ),
+        return_exceptions=True,
+    )
+    for thermostat, result in zip(changed, results):
+        if isinstance(result, Exception):
+            _LOGGER.error(
+                "Control pass of %s after bulk change failed: %s",
+                thermostat.entity_id,
+                result,
+            )
+        thermostat.async_write_ha_state()
+    return [thermostat.entity_id for thermostat in changed]
+
+
+@callback
+def async_get_thermostats(hass: HomeAssistant) -> dict[str, DualSmartThermostat]:
+    """Return all thermostats keyed by their sensor key.
+
+    The key is the config entry id for UI entries and the unique id (or the
+    name) for YAML ones.
+    """
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_THERMOSTATS, {})
@@ -0,0 +1,269 @@
+"""Integration-wide rate limiter for actuator service calls.
+
+Thermostats that react to the same trigger (a shared outside sensor, a window
+broadcast, a Home Assistant restart) would otherwise send their turn_on/turn_off
+commands at the same moment, which floods radio meshes such as Zigbee or
+Z-Wave.
+
+All actuator commands of all thermostats go through one ``CommandScheduler``
+stored in ``hass.data[DOMAIN]``. It keeps a token bucket per actuator
+platform (``zha``, ``zwave_js``, ...; the entity domain when the entity is not
+in the registry), so a busy Zigbee network does not delay Wi-Fi plugs. Commands
+run immediately while tokens are available and otherwise wait in a priority
+queue. Safety turn-offs (sensor stall, floor overheat, open window) are never
+queued.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import enum
+import heapq
+import itertools
+import logging
+import time
+from typing import Any
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import Context, HomeAssistant, callback, split_entity_id
+from homeassistant.helpers import entity_registry as er
+
+from .const import DEFAULT_COMMAND_BURST, DEFAULT_COMMAND_RATE, DOMAIN
+from .decision_trace import current_control_pass
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_COMMAND_SCHEDULER = "command_scheduler"
+
+
+class CommandPriority(enum.IntEnum):
+    """Priority class of an actuator command, lower runs first."""
+
+    SAFETY = 0
+    NORMAL = 1
+    KEEP_ALIVE = 2
+
+
+_command_priority: ContextVar[CommandPriority | None] = ContextVar(
+    "dual_smart_thermostat_command_priority", default=None
+)
+
+
+@contextmanager
+def command_priority(priority: CommandPriority) -> Iterator[None]:
+    """Run actuator commands issued inside the block with ``priority``."""
+    token = _command_priority.set(priority)
+    try:
+        yield
+    finally:
+        _command_priority.reset(token)
+
+
+def current_command_priority() -> CommandPriority | None:
+    """Return the priority set by an enclosing ``command_priority`` block."""
+    return _command_priority.get()
+
+
+class _TokenBucket:
+    """Token bucket with a priority wait queue for one actuator platform."""
+
+    def __init__(self, hass: HomeAssistant, name: str, rate: float, burst: int) -> None:
+        self.hass = hass
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = hass.loop.time()
+        self._queue: list[tuple[CommandPriority, int, Any]] = []
+        self._sequence = itertools.count()
+        self._drain_handle = None
+
+        self.commands = 0
+        self.queued = 0
+        self.bypassed = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = self.hass.loop.time()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def async_acquire(self, priority: CommandPriority) -> None:
+        """Wait until a command of ``priority`` may be sent."""
+        self.commands += 1
+        if self.rate <= 0:
+            return
+
+        self._refill()
+        if priority is CommandPriority.SAFETY:
+            if self._tokens >= 1:
+                self._tokens -= 1
+            else:
+                self.bypassed += 1
+            return
+
+        if not self._queue and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        loop = self.hass.loop
+        enqueued_at = loop.time()
+        future = loop.create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        _LOGGER.debug(
+            "%s: out of tokens, queued %s command (depth %d)",
+            self.name,
+            priority.name,
+            len(self._queue),
+        )
+        self._schedule_drain()
+
+        await future
+
+        wait = loop.time() - enqueued_at
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _schedule_drain(self) -> None:
+        if self._drain_handle is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._drain_handle = self.hass.loop.call_later(delay, self._drain)
+
+    @callback
+    def _drain(self) -> None:
+        self._drain_handle = None
+        self._refill()
+        while self._queue and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                # The waiting caller was cancelled.
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        if self._queue:
+            self._schedule_drain()
+
+    def cancel(self) -> None:
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+        for _, _, future in self._queue:
+            future.cancel()
+        self._queue.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        waited = self.queued - len(self._queue)
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "commands": self.commands,
+            "queued": self.queued,
+            "safety_bypassed": self.bypassed,
+            "mean_wait": self.total_wait / waited if waited else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class CommandScheduler:
+    """Send actuator service calls through per-platform token buckets."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rate: float = DEFAULT_COMMAND_RATE,
+        burst: int = DEFAULT_COMMAND_BURST,
+    ) -> None:
+        self.hass = hass
+        self._rate = rate
+        self._burst = burst
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._bucket_names: dict[str, str] = {}
+
+    @callback
+    def async_configure(self, rate: float, burst: int) -> None:
+        """Change the rate and burst size of all buckets."""
+        self._rate = rate
+        self._burst = burst
+        for bucket in self._buckets.values():
+            bucket.rate = rate
+            bucket.burst = burst
+
+    def _bucket_name(self, entity_id: str | None) -> str:
+        if entity_id is None:
+            return "unknown"
+        if (name := self._bucket_names.get(entity_id)) is None:
+            entry = er.async_get(self.hass).async_get(entity_id)
+            name = entry.platform if entry else split_entity_id(entity_id)[0]
+            self._bucket_names[entity_id] = name
+        return name
+
+    def _bucket(self, entity_id: str | None) -> _TokenBucket:
+        name = self._bucket_name(entity_id)
+        if (bucket := self._buckets.get(name)) is None:
+            bucket = _TokenBucket(self.hass, name, self._rate, self._burst)
+            self._buckets[name] = bucket
+        return bucket
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict[str, Any],
+        context: Context | None = None,
+        priority: CommandPriority = CommandPriority.NORMAL,
+    ) -> None:
+        """Call a service once the actuator's bucket allows it.
+
+        Priority set by an enclosing ``command_priority`` block wins over
+        ``priority``.
+        """
+        if (scoped := current_command_priority()) is not None:
+            priority = scoped
+        await self._bucket(service_data.get(ATTR_ENTITY_ID)).async_acquire(priority)
+        if (control_pass := current_control_pass()) is None:
+            await self.hass.services.async_call(
+                domain, service, service_data, context=context, blocking=True
+            )
+            return
+
+        control_pass.commands.append((service, service_data.get(ATTR_ENTITY_ID)))
+        started = time.perf_counter()
+        try:
+            await self.hass.services.async_call(
+                domain, service, service_data, context=context, blocking=True
+            )
+        finally:
+            control_pass.service_time.append(time.perf_counter() - started)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel pending commands."""
+        for bucket in self._buckets.values():
+            bucket.cancel()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return queue depth and wait-time metrics per platform."""
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "buckets": {
+                name: bucket.as_dict() for name, bucket in self._buckets.items()
+            },
+        }
+
+
+@callback
+def async_get_command_scheduler(hass: HomeAssistant) -> CommandScheduler:
+    """Return the shared scheduler, creating it with defaults if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_COMMAND_SCHEDULER)) is None:
+        scheduler = CommandScheduler(hass)
+        domain_data[DATA_COMMAND_SCHEDULER] = scheduler
+    return scheduler
@@ -58,6 +58,14 @@ CONF_HEATER = "heater"
 CONF_AUX_HEATER = "secondary_heater"
 CONF_AUX_HEATING_TIMEOUT = "secondary_heater_timeout"
 CONF_AUX_HEATING_DUAL_MODE = "secondary_heater_dual_mode"
+# Heating and cooling stages on top of the heater or cooler
+CONF_HEATER_STAGES = "heater_stages"
+CONF_COOLER_STAGES = "cooler_stages"
+CONF_STAGE_DEFICIT = "deficit"
+CONF_STAGE_DELAY = "delay"
+CONF_STAGE_HYSTERESIS = "stage_hysteresis"
+DEFAULT_STAGE_DELAY = 600
+DEFAULT_STAGE_HYSTERESIS = 0.5
 CONF_COOLER = "cooler"
 
 CONF_DRYER = "dryer"
@@ -98,10 +106,16 @@ PERCENTAGE_TO_FAN_MODE = {
 
 CONF_SENSOR = "target_sensor"
 CONF_STALE_DURATION = "sensor_stale_duration"
+# Extra temperature and humidity sensors combined with the main ones
+CONF_SENSORS = "target_sensors"
+CONF_HUMIDITY_SENSORS = "humidity_sensors"
+CONF_SENSOR_AGGREGATION = "sensor_aggregation"
+CONF_SENSOR_WEIGHT = "weight"
 CONF_FLOOR_SENSOR = "floor_sensor"
 CONF_OUTSIDE_SENSOR = "outside_sensor"
 CONF_AUTO_OUTSIDE_DELTA_BOOST = "auto_outside_delta_boost"
 CONF_USE_APPARENT_TEMP = "use_apparent_temp"
+CONF_APPARENT_TEMP_LOOKUP = "apparent_temp_lookup"
 CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
 CONF_MAX_FLOOR_TEMP = "max_floor_temp"
@@ -123,15 +137,58 @@ CONF_OPENINGS = "openings"
 CONF_OPENINGS_SCOPE = "openings_scope"
 CONF_HEAT_COOL_MODE = "heat_cool_mode"
 CONF_HEAT_PUMP_COOLING = "heat_pump_cooling"
+# Choice between the heat pump and the secondary heater by efficiency
+CONF_HEAT_PUMP_COP_CURVE = "heat_pump_cop_curve"
+CONF_HEAT_PUMP_BALANCE_POINT = "heat_pump_balance_point"
+CONF_HEAT_PUMP_MIN_COP = "heat_pump_min_cop"
+CONF_OUTSIDE_TEMP = "outside_temp"
+CONF_COP = "cop"
+DEFAULT_HEAT_PUMP_MIN_COP = 1.0
+# Compressor protection of the heating and cooling actuators
+CONF_MIN_ON_TIME = "min_on_time"
+CONF_MIN_OFF_TIME = "min_off_time"
+CONF_MAX_STARTS_PER_HOUR = "max_starts_per_hour"
+# Shared boiler or heat pump switched on while any zone calls
+CONF_PLANT = "plant"
+CONF_PLANT_MIN_DUR = "plant_min_cycle_duration"
+# Load of the heating or cooling actuator in watts, see CONF_POWER_BUDGET
+CONF_ACTUATOR_POWER = "actuator_power"
+# Time-of-use price sensor and the comfort band the tariff plan may use
+CONF_TARIFF_SENSOR = "tariff_sensor"
+CONF_TARIFF_COMFORT_BAND = "tariff_comfort_band"
+# Weather entity whose hourly forecast is planned against, and the weight of
+# comfort against runtime in that plan
+CONF_FORECAST_WEATHER = "forecast_weather"
+CONF_FORECAST_COMFORT_WEIGHT = "forecast_comfort_weight"
+# Weekly schedule of presets and target temperatures
+CONF_SCHEDULE = "schedule"
 
 # HVAC power levels
 CONF_HVAC_POWER_LEVELS = "hvac_power_levels"
 CONF_HVAC_POWER_MIN = "hvac_power_min"
 CONF_HVAC_POWER_MAX = "hvac_power_max"
 CONF_HVAC_POWER_TOLERANCE = "hvac_power_tolerance"
+# Modulating output driven by the power percent
+CONF_HVAC_POWER_OUTPUT = "hvac_power_output"
+CONF_HVAC_POWER_OUTPUT_DEADBAND = "hvac_power_output_deadband"
+CONF_HVAC_POWER_OUTPUT_SLEW_RATE = "hvac_power_output_slew_rate"
+DEFAULT_HVAC_POWER_OUTPUT_DEADBAND = 5
 ATTR_HVAC_POWER_LEVEL = "hvac_power_level"
 ATTR_HVAC_POWER_PERCENT = "hvac_power_percent"
 
+# Integration-wide startup staggering (top-level `dual_smart_thermostat:` key)
+CONF_STARTUP_JITTER = "startup_jitter"
+CONF_STARTUP_RATE = "startup_rate"
+DEFAULT_STARTUP_JITTER = 2.0
+DEFAULT_STARTUP_RATE = 2.0
+# Integration-wide actuator command rate limit, per actuator platform
+CONF_COMMAND_RATE = "command_rate"
+CONF_COMMAND_BURST = "command_burst"
+DEFAULT_COMMAND_RATE = 5.0
+DEFAULT_COMMAND_BURST = 10
+# Integration-wide limit of the summed actuator loads, in watts
+CONF_POWER_BUDGET = "power_budget"
+
 ATTR_PREV_TARGET = "prev_target_temp"
 ATTR_PREV_TARGET_LOW = "prev_target_temp_low"
 ATTR_PREV_TARGET_HIGH = "prev_target_temp_high"
@@ -144,6 +201,12 @@ ATTR_LAST_HVAC_MODE = "last_hvac_mode"
 # onto its companion HvacActionReasonSensor entity. Formatted with the
 # climate's sensor_key (config_entry.entry_id or CONF_UNIQUE_ID or CONF_NAME).
 SET_HVAC_ACTION_REASON_SENSOR_SIGNAL = "set_hvac_action_reason_sensor_signal_{}"
+# Dispatcher signal sent when a deferred compressor start or stop may run.
+# Formatted with the actuator entity id.
+COMPRESSOR_PROTECTION_SIGNAL = "dual_smart_thermostat_compressor_protection_{}"
+# Dispatcher signal sent when the power budget has room for a waiting start.
+# Formatted with the actuator entity id.
+POWER_BUDGET_SIGNAL = "dual_smart_thermostat_power_budget_{}"
 ATTR_OPENING_TIMEOUT = "timeout"
 ATTR_CLOSING_TIMEOUT = "closing_timeout"
 
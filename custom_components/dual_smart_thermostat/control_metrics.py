@@ -0,0 +1,162 @@
+"""Per-thermostat instrumentation of the control loop.
+
+Every call of ``DualSmartThermostat._async_control_climate`` is measured:
+how long it waited for the control lock, how long the pass took, how long
+the actuator service calls issued from it took, what triggered it and which
+HVACActionReason it ended with.
+
+Latencies go into log2-bucketed histograms and pass timestamps into a
+fixed-size ring, so memory stays constant however long Home Assistant runs.
+The metrics are exposed through the diagnostics download and two optional
+(disabled by default) diagnostic sensors. Each finished pass is also added
+to the thermostat's decision trace.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import enum
+import math
+import time
+from typing import Any
+
+from .decision_trace import ControlPass, DecisionTrace
+
+
+class ControlTrigger(enum.StrEnum):
+    """What started a control pass."""
+
+    SENSOR = "sensor"
+    OPENING = "opening"
+    KEEP_ALIVE = "keep_alive"
+    TEMPLATE = "template"
+    SERVICE = "service"
+    STARTUP = "startup"
+    DEVICE = "device"
+    TARIFF = "tariff"
+    FORECAST = "forecast"
+    SCHEDULE = "schedule"
+    BULK = "bulk"
+
+
+class LatencyHistogram:
+    """Histogram of durations in power-of-two buckets.
+
+    Bucket ``i`` holds values up to ``BASE * 2**i`` seconds (100 µs up to
+    ~13 s); longer values land in the last bucket. Percentiles are reported
+    as the upper bound of the bucket they fall in, capped by the maximum.
+    """
+
+    BASE = 0.0001
+    BUCKETS = 18
+
+    __slots__ = ("_counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self._counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add a duration in seconds."""
+        index = math.frexp(value / self.BASE)[1] if value > self.BASE else 0
+        self._counts[min(index, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Return the approximate ``fraction`` (0-1) percentile in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * fraction))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts[:-1]):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.BASE * 2**index, self.max)
+        # The last bucket is unbounded.
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return summary statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets_ms": {
+                f"<={self.BASE * 2**index * 1000:g}": bucket_count
+                for index, bucket_count in enumerate(self._counts)
+                if bucket_count
+            },
+        }
+
+
+class ControlMetrics:
+    """Control loop counters and latency histograms of one thermostat."""
+
+    RECENT_PASSES = 120
+
+    def __init__(self) -> None:
+        self.pass_time = LatencyHistogram()
+        self.lock_wait = LatencyHistogram()
+        self.service_call = LatencyHistogram()
+        self.triggers: dict[str, int] = dict.fromkeys(ControlTrigger, 0)
+        self.decisions: dict[str, int] = {}
+        self.trace = DecisionTrace()
+        self._recent: deque[float] = deque(maxlen=self.RECENT_PASSES)
+
+    @contextmanager
+    def measure_pass(
+        self, trigger: ControlTrigger, requested_at: float
+    ) -> Iterator[ControlPass]:
+        """Measure a pass that asked for the control lock at ``requested_at``.
+
+        ``requested_at`` is a ``time.perf_counter()`` value; the block is
+        entered once the lock is held.
+        """
+        started = time.perf_counter()
+        self.lock_wait.record(started - requested_at)
+        self.triggers[trigger] += 1
+        self._recent.append(time.monotonic())
+        control_pass = ControlPass(trigger)
+        token = control_pass.activate()
+        try:
+            yield control_pass
+        finally:
+            ControlPass.deactivate(token)
+            self.pass_time.record(time.perf_counter() - started)
+            for duration in control_pass.service_time:
+                self.service_call.record(duration)
+            reason = control_pass.reason
+            self.decisions[reason] = self.decisions.get(reason, 0) + 1
+            self.trace.append(control_pass)
+
+    @property
+    def passes_per_minute(self) -> int:
+        """Return the number of passes that started in the last minute.
+
+        Saturates at ``RECENT_PASSES``.
+        """
+        horizon = time.monotonic() - 60
+        return sum(1 for started in self._recent if started >= horizon)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "passes_per_minute": self.passes_per_minute,
+            "pass_time": self.pass_time.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+            "service_call": self.service_call.as_dict(),
+            "triggers": {str(key): count for key, count in self.triggers.items()},
+            "decisions": dict(self.decisions),
+        }
@@ -0,0 +1,181 @@
+"""On-demand profiling of the control passes of one thermostat.
+
+The ``profile_control`` service attaches a ``ControlProfiler`` to a
+thermostat. While attached, every control pass runs under cProfile and,
+optionally, with tracemalloc measuring the peak memory it allocates. After
+``passes`` passes or ``duration`` seconds, whichever comes first, the
+profiler detaches. It then writes the aggregated profile to the config
+directory, in an executor job:
+
+- ``<name>.prof`` is a pstats dump for snakeviz, gprof2dot and similar tools
+- ``<name>.txt`` holds the top functions by cumulative time, per-pass
+  memory peaks and the biggest allocation growth since profiling started
+
+cProfile sees the whole event loop thread. Anything the loop runs while a
+pass awaits a service call shows up in the profile too.
+
+When no profiler is attached, a thermostat only pays for one attribute
+check per pass. Only one thermostat can be profiled at a time, because
+Python allows a single active profiler.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CONTROL_PROFILER = "control_profiler"
+
+ATTR_PASSES = "passes"
+ATTR_DURATION = "duration"
+ATTR_MEMORY = "memory"
+
+DEFAULT_PASSES = 50
+DEFAULT_DURATION = 300
+MAX_PASSES = 10_000
+MAX_DURATION = 3600
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+
+class ControlProfiler:
+    """Profile the next ``passes`` control passes, for at most ``duration`` s."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        passes: int,
+        duration: float,
+        memory: bool,
+        on_done: Callable[[], None],
+    ) -> None:
+        self.hass = hass
+        self.entity_id = entity_id
+        self.passes = 0
+        self._limit = passes
+        self._memory = memory
+        self._on_done = on_done
+        self._stopped = False
+        self._profile = cProfile.Profile()
+        self._pass_peaks: list[int] = []
+        self._started_tracing = False
+        self._first_snapshot: tracemalloc.Snapshot | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = async_call_later(
+            hass, duration, self._async_timeout
+        )
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._first_snapshot = tracemalloc.take_snapshot()
+
+    @contextmanager
+    def profile_pass(self) -> Iterator[None]:
+        """Profile the control pass run inside the block."""
+        if self._memory:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            # A pass that was still waiting when the session ended is not counted.
+            if not self._stopped:
+                self._profile.disable()
+                if self._memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    self._pass_peaks.append(peak - before)
+                self.passes += 1
+                if self.passes >= self._limit:
+                    self.async_stop()
+
+    @callback
+    def _async_timeout(self, _now) -> None:
+        self._cancel_timer = None
+        self.async_stop()
+
+    @callback
+    def async_stop(self) -> None:
+        """Detach from the thermostat and write what was collected."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._profile.disable()
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._on_done()
+        self.hass.data[DOMAIN].pop(DATA_CONTROL_PROFILER, None)
+
+        last_snapshot = None
+        if self._memory:
+            last_snapshot = tracemalloc.take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        base = self.hass.config.path(
+            f"{DOMAIN}_profile_{self.entity_id.split('.')[-1]}_"
+            f"{dt_util.now().strftime('%Y%m%d_%H%M%S')}"
+        )
+        self.hass.async_add_executor_job(self._write, base, last_snapshot)
+
+    def _write(self, base: str, last_snapshot: tracemalloc.Snapshot | None) -> None:
+        self._profile.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"{self.entity_id}: {self.passes} control passes\n\n")
+        if self.passes:
+            stats = pstats.Stats(self._profile, stream=report)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        if self._pass_peaks:
+            peaks = sorted(self._pass_peaks)
+            report.write(
+                "Peak bytes allocated per pass: "
+                f"median {peaks[len(peaks) // 2]}, max {peaks[-1]}\n\n"
+            )
+        if last_snapshot is not None and self._first_snapshot is not None:
+            report.write("Allocation growth while profiling:\n")
+            for stat in last_snapshot.compare_to(self._first_snapshot, "lineno")[
+                :TOP_ALLOCATIONS
+            ]:
+                report.write(f"{stat}\n")
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+        _LOGGER.info("Control profile of %s written to %s.*", self.entity_id, base)
+
+
+@callback
+def async_start_profiler(
+    hass: HomeAssistant,
+    entity_id: str,
+    passes: int,
+    duration: float,
+    memory: bool,
+    on_done: Callable[[], None],
+) -> ControlProfiler:
+    """Start profiling ``entity_id`` unless another thermostat is profiled."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (active := domain_data.get(DATA_CONTROL_PROFILER)) is not None:
+        raise HomeAssistantError(
+            f"Control passes of {active.entity_id} are already being profiled"
+        )
+    profiler = ControlProfiler(hass, entity_id, passes, duration, memory, on_done)
+    domain_data[DATA_CONTROL_PROFILER] = profiler
+    return profiler
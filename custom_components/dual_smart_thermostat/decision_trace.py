@@ -0,0 +1,137 @@
+"""Structured, bounded trace of the control decisions of one thermostat.
+
+The control path used to explain itself through 5-15 debug log lines per
+pass, several of which evaluated sensor comparisons or entity states just to
+format the message. Instead, each pass now collects a few compact steps
+(``trace_step``) and the actuator commands it sent, and the thermostat keeps
+the last ``TRACE_CAPACITY`` passes in a ring buffer. The trace is part of
+the diagnostics download and is returned by the ``get_decision_trace``
+service, so debug logging can stay off in production.
+
+Outside a control pass ``trace_step`` is a single context variable lookup.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextvars import ContextVar, Token
+from datetime import UTC, datetime
+import time
+from typing import Any, NamedTuple
+
+TRACE_CAPACITY = 50
+
+DECISION_SKIPPED = "skipped"
+
+INPUT_FIELDS = (
+    "cur_temp",
+    "cur_humidity",
+    "target_temp",
+    "target_temp_low",
+    "target_temp_high",
+    "hvac_mode",
+    "force",
+)
+
+
+class ControlPass:
+    """Inputs, steps and outcome of one control pass, filled in as it runs."""
+
+    __slots__ = (
+        "trigger",
+        "inputs",
+        "action",
+        "reason",
+        "steps",
+        "commands",
+        "service_time",
+    )
+
+    def __init__(self, trigger: str) -> None:
+        self.trigger = trigger
+        self.inputs: tuple = ()
+        self.action: str | None = None
+        self.reason: str = DECISION_SKIPPED
+        self.steps: list[tuple[str, str]] = []
+        self.commands: list[tuple[str, str | None]] = []
+        self.service_time: list[float] = []
+
+    def activate(self) -> Token:
+        """Make this the pass seen by ``trace_step`` in the current task."""
+        return _active_pass.set(self)
+
+    @staticmethod
+    def deactivate(token: Token) -> None:
+        _active_pass.reset(token)
+
+
+_active_pass: ContextVar[ControlPass | None] = ContextVar(
+    "dual_smart_thermostat_control_pass", default=None
+)
+
+
+def current_control_pass() -> ControlPass | None:
+    """Return the control pass running in this task, if any."""
+    return _active_pass.get()
+
+
+def trace_step(source: str | None, step: str, *args) -> None:
+    """Note a decision step of ``source`` (usually an entity id).
+
+    ``args`` are merged into ``step`` %-style, and only while a pass is
+    traced, so an untraced control pass does not pay for the formatting.
+    """
+    if (control_pass := _active_pass.get()) is not None:
+        control_pass.steps.append((source or "", step % args if args else step))
+
+
+class TraceRecord(NamedTuple):
+    """One finished control pass."""
+
+    time: float
+    trigger: str
+    inputs: tuple
+    action: str | None
+    reason: str
+    steps: tuple[tuple[str, str], ...]
+    commands: tuple[tuple[str, str | None], ...]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "time": datetime.fromtimestamp(self.time, UTC).isoformat(),
+            "trigger": self.trigger,
+            "inputs": dict(zip(INPUT_FIELDS, self.inputs)),
+            "decision": self.action,
+            "reason": self.reason,
+            "steps": [f"{source}: {step}" for source, step in self.steps],
+            "commands": [
+                f"{service} {entity_id}" for service, entity_id in self.commands
+            ],
+        }
+
+
+class DecisionTrace:
+    """Ring buffer of the last control passes."""
+
+    def __init__(self, capacity: int = TRACE_CAPACITY) -> None:
+        self._records: deque[TraceRecord] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, control_pass: ControlPass) -> None:
+        self._records.append(
+            TraceRecord(
+                time.time(),
+                control_pass.trigger,
+                control_pass.inputs,
+                control_pass.action,
+                control_pass.reason,
+                tuple(control_pass.steps),
+                tuple(control_pass.commands),
+            )
+        )
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the records, oldest first."""
+        return [record.as_dict() for record in self._records]
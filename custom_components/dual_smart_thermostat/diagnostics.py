@@ -0,0 +1,57 @@
+"""Diagnostics support for dual_smart_thermostat.
+
+The snapshot covers what is otherwise only visible with debug logging:
+environment readings and targets, debounced opening state, the last Auto
+Mode decision, preset template sources and values, power levels, the state
+of every actuator controller, the control loop metrics and the power budget
+queue.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .climate import async_get_thermostats
+from .command_scheduler import async_get_command_scheduler
+from .power_budget import async_get_power_budget
+from .startup_coordinator import async_get_startup_coordinator
+
+# Names the user gave the thermostat, which tend to describe their home.
+TO_REDACT = {CONF_NAME, CONF_UNIQUE_ID}
+
+
+def _thermostat_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any] | None:
+    thermostat = async_get_thermostats(hass).get(entry.entry_id)
+    return thermostat.diagnostics() if thermostat is not None else None
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    startup = async_get_startup_coordinator(hass)
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "thermostat": _thermostat_diagnostics(hass, entry),
+        "startup": {"jitter": startup.jitter, "rate": startup.rate},
+        "command_scheduler": async_get_command_scheduler(hass).diagnostics(),
+        "power_budget": async_get_power_budget(hass).diagnostics(),
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for the thermostat device of a config entry."""
+    return {"thermostat": _thermostat_diagnostics(hass, entry)}
@@ -27,3 +27,13 @@ class HVACActionReasonInternal(enum.StrEnum):
     TEMPERATURE_SENSOR_STALLED = "temperature_sensor_stalled"
 
     HUMIDITY_SENSOR_STALLED = "humidity_sensor_stalled"
+
+    COMPRESSOR_PROTECTION = "compressor_protection"
+
+    POWER_BUDGET = "power_budget"
+
+    HEAT_PUMP_EFFICIENT = "heat_pump_efficient"
+
+    BALANCE_POINT = "balance_point"
+
+    LOW_COP = "low_cop"
@@ -0,0 +1,161 @@
+"""Start and stop limits for compressors and other cycling-sensitive actuators.
+
+``min_cycle_duration`` is one symmetric duration the controllers check with
+``condition.state``. Heat pumps and compressors need more than that:
+
+- ``min_on_time``: once started, keep running at least this long
+- ``min_off_time``: once stopped, stay off at least this long
+- ``max_starts_per_hour``: at most this many starts in any rolling hour
+
+``CompressorProtection`` sits between a GenericHvacController and its
+turn_on/turn_off callbacks. A start or stop that would break a limit is
+deferred rather than sent. One timer is armed for the exact moment the
+request becomes allowed. When it fires, the protection sends
+``COMPRESSOR_PROTECTION_SIGNAL`` and the climate entity runs a control pass,
+which asks again if the request still applies. A control pass that no
+longer wants the deferred request withdraws it. While a request is deferred,
+the controller reports ``HVACActionReason.COMPRESSOR_PROTECTION``.
+
+Recent starts are kept in a ring of ``max_starts_per_hour`` timestamps, so
+the check is one comparison against the oldest slot. Times are wall clock
+seconds, and on/off durations come from the entity state's
+``last_changed``, so the limits also hold across a restart of the
+integration.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import enum
+
+from homeassistant.const import STATE_ON, STATE_OPEN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from ..const import COMPRESSOR_PROTECTION_SIGNAL
+from ..decision_trace import trace_step
+
+START_WINDOW = 3600.0
+# Requests that would wait less than this run right away.
+MIN_DEFERRAL = 1.0
+
+
+class DeferredRequest(enum.StrEnum):
+    """The request held back by the protection."""
+
+    START = "start"
+    STOP = "stop"
+
+
+class CompressorProtection:
+    """Minimum on/off times and a start cap for one actuator entity."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        min_on_time: timedelta | None = None,
+        min_off_time: timedelta | None = None,
+        max_starts_per_hour: int | None = None,
+    ) -> None:
+        self.hass = hass
+        self.entity_id = entity_id
+        self.min_on_time = min_on_time.total_seconds() if min_on_time else 0.0
+        self.min_off_time = min_off_time.total_seconds() if min_off_time else 0.0
+        self._starts: list[float | None] = [None] * (max_starts_per_hour or 0)
+        self._oldest = 0
+        self.deferred: DeferredRequest | None = None
+        self._cancel_wake: CALLBACK_TYPE | None = None
+
+    def _state_age(self, now: float) -> tuple[bool, float | None]:
+        """Return whether the entity is on and for how long it has been so."""
+        state = self.hass.states.get(self.entity_id)
+        if state is None:
+            return False, None
+        is_on = state.state in (STATE_ON, STATE_OPEN)
+        return is_on, now - state.last_changed.timestamp()
+
+    def start_delay(self, now: float) -> float:
+        """Return the seconds until a start is allowed, 0 if it is now."""
+        is_on, age = self._state_age(now)
+        if is_on:
+            return 0.0
+        delay = 0.0
+        if age is not None:
+            delay = self.min_off_time - age
+        if self._starts and (oldest := self._starts[self._oldest]) is not None:
+            delay = max(delay, oldest + START_WINDOW - now)
+        return max(delay, 0.0)
+
+    def stop_delay(self, now: float) -> float:
+        """Return the seconds until a stop is allowed, 0 if it is now."""
+        is_on, age = self._state_age(now)
+        if not is_on or age is None:
+            return 0.0
+        return max(self.min_on_time - age, 0.0)
+
+    @callback
+    def async_allow_start(self) -> bool:
+        """Return whether the actuator may be started now, deferring if not."""
+        now = dt_util.utcnow().timestamp()
+        if (delay := self.start_delay(now)) >= MIN_DEFERRAL:
+            self._defer(DeferredRequest.START, delay)
+            return False
+        self.async_cancel()
+        if self._starts and not self._state_age(now)[0]:
+            self._starts[self._oldest] = now
+            self._oldest = (self._oldest + 1) % len(self._starts)
+        return True
+
+    @callback
+    def async_allow_stop(self) -> bool:
+        """Return whether the actuator may be stopped now, deferring if not."""
+        if (delay := self.stop_delay(dt_util.utcnow().timestamp())) >= MIN_DEFERRAL:
+            self._defer(DeferredRequest.STOP, delay)
+            return False
+        self.async_cancel()
+        return True
+
+    def _defer(self, request: DeferredRequest, delay: float) -> None:
+        trace_step(self.entity_id, "%s deferred %.0f s", request, delay)
+        if self._cancel_wake is not None:
+            self._cancel_wake()
+        self.deferred = request
+        self._cancel_wake = async_call_later(self.hass, delay, self._async_wake)
+
+    @callback
+    def _async_wake(self, _now) -> None:
+        self._cancel_wake = None
+        self.deferred = None
+        async_dispatcher_send(
+            self.hass, COMPRESSOR_PROTECTION_SIGNAL.format(self.entity_id)
+        )
+
+    @callback
+    def async_withdraw(self, request: DeferredRequest) -> None:
+        """Drop the deferred request if it is ``request``."""
+        if self.deferred == request:
+            self.async_cancel()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the deferred request and its timer."""
+        if self._cancel_wake is not None:
+            self._cancel_wake()
+            self._cancel_wake = None
+        self.deferred = None
+
+    def diagnostics(self) -> dict:
+        return {
+            "min_on_time": self.min_on_time,
+            "min_off_time": self.min_off_time,
+            "max_starts_per_hour": len(self._starts) or None,
+            "recent_starts": sorted(
+                dt_util.utc_from_timestamp(start).isoformat()
+                for start in self._starts
+                if start is not None
+            ),
+            "deferred": self.deferred,
+        }
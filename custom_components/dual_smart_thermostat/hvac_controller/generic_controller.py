@@ -1,6 +1,6 @@
 from datetime import timedelta
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from homeassistant.components.climate import HVACMode
 from homeassistant.components.valve import DOMAIN as VALVE_DOMAIN
@@ -8,12 +8,24 @@ from homeassistant.const import STATE_ON, STATE_OPEN
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConditionError
 from homeassistant.helpers import condition
-import homeassistant.util.dt as dt_util
+from homeassistant.util import dt as dt_util
 
+from ..command_scheduler import CommandPriority, command_priority
+from ..decision_trace import trace_step
 from ..hvac_action_reason.hvac_action_reason import HVACActionReason
+from ..hvac_controller.compressor_protection import (
+    CompressorProtection,
+    DeferredRequest,
+)
 from ..hvac_controller.hvac_controller import HvacController, HvacEnvStrategy
 from ..managers.environment_manager import EnvironmentManager
 from ..managers.opening_manager import OpeningManager
+from ..power_budget import PowerBudget
+from ..runtime_stats import (
+    DEFAULT_SHORT_CYCLE,
+    ActuatorRuntime,
+    async_get_runtime_store,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +59,83 @@ class GenericHvacController(HvacController):
         )
 
         self._hvac_action_reason = HVACActionReason.NONE
+        self.protection: CompressorProtection | None = None
+        self.budget: PowerBudget | None = None
+        self._async_turn_on = turn_on_callback
+        self._async_turn_off = turn_off_callback
+        self.async_turn_on_callback = self._async_protected_turn_on
+        self.async_turn_off_callback = self._async_protected_turn_off
+        self.runtime: ActuatorRuntime | None = None
+        if entity_id is not None:
+            self.runtime = async_get_runtime_store(hass).async_track(
+                entity_id, min_cycle_duration or DEFAULT_SHORT_CYCLE
+            )
+
+    def diagnostics(self) -> dict[str, Any]:
+        runtime = self.runtime
+        return {
+            **super().diagnostics(),
+            "runtime": (
+                runtime.summary(dt_util.utcnow().timestamp()) if runtime else None
+            ),
+            "protection": self.protection.diagnostics() if self.protection else None,
+            "waiting_for_budget": self._waiting_for_budget,
+        }
+
+    @property
+    def _waiting_for_budget(self) -> bool:
+        return self.budget is not None and self.budget.is_waiting(self.entity_id)
+
+    def _comfort_deficit(self) -> float:
+        """Return how many degrees the room is off its nearest target."""
+        environment = self._environment
+        if environment.cur_temp is None:
+            return 0.0
+        deficits = [
+            abs(target - environment.cur_temp)
+            for target in (
+                environment.target_temp,
+                environment.target_temp_low,
+                environment.target_temp_high,
+            )
+            if target is not None
+        ]
+        return min(deficits, default=0.0)
+
+    def _withdraw_start(self) -> None:
+        """Drop a deferred or queued start that is not wanted anymore."""
+        if self.protection is not None:
+            self.protection.async_withdraw(DeferredRequest.START)
+        if self.budget is not None:
+            self.budget.async_withdraw(self.entity_id)
+
+    def _withdraw_stop(self) -> None:
+        """Drop a deferred stop when the actuator should keep running."""
+        if self.protection is not None:
+            self.protection.async_withdraw(DeferredRequest.STOP)
+
+    async def _async_protected_turn_on(self) -> None:
+        if self.budget is not None and not self.budget.async_request(
+            self.entity_id, self._comfort_deficit()
+        ):
+            return
+        if self.protection is None or self.protection.async_allow_start():
+            await self._async_turn_on()
+        elif self.budget is not None:
+            self.budget.async_release(self.entity_id)
+
+    async def _async_protected_turn_off(self, safety: bool = False) -> None:
+        """Stop the actuator once the protection allows it.
+
+        A ``safety`` stop, for an open window or a hot floor, is sent right
+        away and drops any request the protection held back.
+        """
+        if safety and self.protection is not None:
+            self.protection.async_cancel()
+        if safety or self.protection is None or self.protection.async_allow_stop():
+            await self._async_turn_off()
+            if self.budget is not None:
+                self.budget.async_release(self.entity_id)
 
     @property
     def _is_valve(self) -> bool:
@@ -56,6 +145,10 @@ class GenericHvacController(HvacController):
 
     @property
     def hvac_action_reason(self) -> HVACActionReason:
+        if self.protection is not None and self.protection.deferred is not None:
+            return HVACActionReason.COMPRESSOR_PROTECTION
+        if self._waiting_for_budget:
+            return HVACActionReason.POWER_BUDGET
         return self._hvac_action_reason
 
     @property
@@ -63,11 +156,6 @@ class GenericHvacController(HvacController):
         """If the toggleable hvac device is currently active."""
         on_state = STATE_OPEN if self._is_valve else STATE_ON
 
-        _LOGGER.debug(
-            "Checking if device is active: %s, on_state: %s",
-            self.entity_id,
-            on_state,
-        )
         if self.entity_id is not None and self.hass.states.is_state(
             self.entity_id, on_state
         ):
@@ -80,11 +168,6 @@ class GenericHvacController(HvacController):
         else:
             current_state = HVACMode.OFF
 
-        _LOGGER.debug("Checking if device ran long enough: %s", self.entity_id)
-        _LOGGER.debug("current_state: %s", current_state)
-        _LOGGER.debug("min_cycle_duration: %s", self.min_cycle_duration)
-        _LOGGER.debug("time: %s", dt_util.utcnow())
-
         try:
             long_enough = condition.state(
                 self.hass,
@@ -105,16 +188,11 @@ class GenericHvacController(HvacController):
         # This prevents devices from turning on when thermostat is in OFF state,
         # but allows keep-alive to enforce OFF state (turn devices off periodically)
         if hvac_mode == HVACMode.OFF and time is None:
-            _LOGGER.debug(
-                "HVAC mode is OFF and not keep-alive, skipping control (force=%s)",
-                force,
-            )
+            trace_step(self.entity_id, "mode off, no control")
             return False
 
         if not active and time is None:
-            _LOGGER.debug(
-                "Device not active and time is None, skipping control",
-            )
+            trace_step(self.entity_id, "inactive, no control")
             return False
 
         if not force and time is None:
@@ -123,10 +201,9 @@ class GenericHvacController(HvacController):
             # If the `time` argument is not none, we were invoked for
             # keep-alive purposes, and `min_cycle_duration` is irrelevant.
             if self.min_cycle_duration:
-                _LOGGER.debug(
-                    "Checking if device ran long enough: %s", self.ran_long_enough()
-                )
-                return self.ran_long_enough()
+                if not self.ran_long_enough():
+                    trace_step(self.entity_id, "min cycle not elapsed")
+                    return False
         return True
 
     async def async_control_device_when_on(
@@ -136,28 +213,23 @@ class GenericHvacController(HvacController):
         time=None,
     ) -> None:
         """Check if we need to turn heating on or off when theheater is on."""
-        _LOGGER.debug(
-            "%s Controlling hvac entity %s while on",
-            self.__class__.__name__,
-            self.entity_id,
-        )
-        _LOGGER.debug("below_env_attr: %s", strategy.hvac_goal_reached)
-        _LOGGER.debug("any_opening_open: %s", any_opening_open)
-        _LOGGER.debug("hvac_goal_reached: %s", strategy.hvac_goal_reached)
+        goal_reached = strategy.hvac_goal_reached
 
-        if strategy.hvac_goal_reached or any_opening_open:
+        if goal_reached or any_opening_open:
             _LOGGER.info(
                 "Turning off entity due to hvac goal reached or opening is open %s",
                 self.entity_id,
             )
+            trace_step(
+                self.entity_id,
+                "on, goal reached" if goal_reached else "on, opening open",
+            )
 
-            await self.async_turn_off_callback()
+            await self.async_turn_off_callback(safety=any_opening_open)
 
-            if strategy.hvac_goal_reached:
-                _LOGGER.debug("setting hvac_action_reason goal reached")
+            if goal_reached:
                 self._hvac_action_reason = strategy.goal_reached_reason()
             if any_opening_open:
-                _LOGGER.debug("setting hvac_action_reason opening")
                 self._hvac_action_reason = HVACActionReason.OPENING
 
         elif time is not None and not any_opening_open:
@@ -166,10 +238,14 @@ class GenericHvacController(HvacController):
                 "Keep-alive - Turning on entity (from active) %s",
                 self.entity_id,
             )
-            await self.async_turn_on_callback()
+            trace_step(self.entity_id, "on, keep-alive")
+            with command_priority(CommandPriority.KEEP_ALIVE):
+                await self.async_turn_on_callback()
             self._hvac_action_reason = strategy.goal_not_reached_reason()
         else:
-            _LOGGER.debug("No case matched when - keep device on")
+            self._withdraw_stop()
+            trace_step(self.entity_id, "on, goal not reached")
+            self._hvac_action_reason = strategy.goal_not_reached_reason()
 
     async def async_control_device_when_off(
         self,
@@ -178,39 +254,32 @@ class GenericHvacController(HvacController):
         time=None,
     ) -> None:
         """Check if we need to turn heating on or off when the heater is off."""
-        _LOGGER.debug(
-            "%s Controlling hvac entity %s while off",
-            self.__class__.__name__,
-            self.entity_id,
-        )
-        _LOGGER.debug("above_env_attr: %s", strategy.hvac_goal_reached)
-        _LOGGER.debug("below_env_attr: %s", strategy.hvac_goal_not_reached)
-        _LOGGER.debug("any_opening_open: %s", any_opening_open)
-        _LOGGER.debug("is_active: %s", True)
-        _LOGGER.debug("time: %s", time)
-
         if strategy.hvac_goal_not_reached and not any_opening_open:
             _LOGGER.info(
                 "Turning on entity (from inactive) due to hvac goal is not reached %s",
                 self.entity_id,
             )
+            trace_step(self.entity_id, "off, goal not reached")
 
             await self.async_turn_on_callback()
             self._hvac_action_reason = strategy.goal_not_reached_reason()
 
         elif time is not None:
+            self._withdraw_start()
             # The time argument is passed only in keep-alive case
             # Keep-alive should only send turn_off if device is unexpectedly ON
             if self.is_active:
                 _LOGGER.info("Keep-alive - Turning off entity %s", self.entity_id)
-                await self.async_turn_off_callback()
+                trace_step(self.entity_id, "off, keep-alive turn off")
+                await self.async_turn_off_callback(safety=any_opening_open)
             else:
-                _LOGGER.debug("Keep-alive - Entity already off %s", self.entity_id)
+                trace_step(self.entity_id, "off, keep-alive already off")
 
             if any_opening_open:
                 self._hvac_action_reason = HVACActionReason.OPENING
         else:
-            _LOGGER.debug("No case matched when - keeping device off")
+            self._withdraw_start()
+            trace_step(self.entity_id, "off, no change")
             if strategy.hvac_goal_reached:
                 self._hvac_action_reason = strategy.goal_reached_reason()
             else:
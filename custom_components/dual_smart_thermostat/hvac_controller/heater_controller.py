@@ -4,6 +4,8 @@ from typing import Callable
 
 from homeassistant.core import HomeAssistant
 
+from ..command_scheduler import CommandPriority, command_priority
+from ..decision_trace import trace_step
 from ..hvac_action_reason.hvac_action_reason import HVACActionReason
 from ..hvac_controller.generic_controller import GenericHvacController
 from ..hvac_controller.hvac_controller import HvacEnvStrategy
@@ -43,21 +45,19 @@ class HeaterHvacConroller(GenericHvacController):
         time=None,
     ) -> None:
         """Check if we need to turn heating on or off when theheater is on."""
-
-        _LOGGER.info("%s Controlling hvac while on", self.__class__.__name__)
-
         too_hot = strategy.hvac_goal_reached
         is_floor_hot = self._environment.is_floor_hot
         is_floor_cold = self._environment.is_floor_cold
 
-        _LOGGER.debug("_async_control_device_when_on, floor cold: %s", is_floor_cold)
-        _LOGGER.debug("_async_control_device_when_on, floor hot: %s", is_floor_hot)
-        _LOGGER.debug("_async_control_device_when_on, too_hot: %s", too_hot)
-
         if ((too_hot or is_floor_hot) or any_opening_open) and not is_floor_cold:
-            _LOGGER.debug("Turning off heater %s", self.entity_id)
+            if is_floor_hot:
+                trace_step(self.entity_id, "on, floor hot")
+            elif any_opening_open:
+                trace_step(self.entity_id, "on, opening open")
+            else:
+                trace_step(self.entity_id, "on, goal reached")
 
-            await self.async_turn_off_callback()
+            await self.async_turn_off_callback(safety=is_floor_hot or any_opening_open)
 
             if too_hot:
                 self._hvac_action_reason = HVACActionReason.TARGET_TEMP_REACHED
@@ -72,8 +72,17 @@ class HeaterHvacConroller(GenericHvacController):
                 "Keep-alive - Turning on heater (from active) %s",
                 self.entity_id,
             )
+            trace_step(self.entity_id, "on, keep-alive")
             self._hvac_action_reason = HVACActionReason.TARGET_TEMP_NOT_REACHED
-            await self.async_turn_on_callback()
+            with command_priority(CommandPriority.KEEP_ALIVE):
+                await self.async_turn_on_callback()
+        else:
+            self._withdraw_stop()
+            trace_step(self.entity_id, "on, goal not reached")
+            if is_floor_cold:
+                self._hvac_action_reason = HVACActionReason.LIMIT
+            else:
+                self._hvac_action_reason = HVACActionReason.TARGET_TEMP_NOT_REACHED
 
     # override
     async def async_control_device_when_off(
@@ -83,16 +92,16 @@ class HeaterHvacConroller(GenericHvacController):
         time=None,
     ) -> None:
         """Check if we need to turn heating on or off when the heater is off."""
-        _LOGGER.info("%s Controlling hvac while off", self.__class__.__name__)
-
         too_cold = strategy.hvac_goal_not_reached
-        _LOGGER.debug("too_cold: %s", strategy.hvac_goal_reached)
-
         is_floor_hot = self._environment.is_floor_hot
         is_floor_cold = self._environment.is_floor_cold
 
         if (too_cold and not any_opening_open and not is_floor_hot) or is_floor_cold:
             _LOGGER.info("Turning on heater (from inactive) %s", self.entity_id)
+            trace_step(
+                self.entity_id,
+                "off, floor cold" if is_floor_cold else "off, goal not reached",
+            )
 
             await self.async_turn_on_callback()
 
@@ -102,13 +111,16 @@ class HeaterHvacConroller(GenericHvacController):
                 self._hvac_action_reason = HVACActionReason.TARGET_TEMP_NOT_REACHED
 
         elif time is not None or any_opening_open or is_floor_hot:
+            self._withdraw_start()
             # The time argument is passed only in keep-alive case
             # Keep-alive should only send turn_off if device is unexpectedly ON
             if self.is_active:
-                _LOGGER.debug("Keep-alive - Turning off heater %s", self.entity_id)
-                await self.async_turn_off_callback()
+                trace_step(self.entity_id, "off, turn off")
+                await self.async_turn_off_callback(
+                    safety=is_floor_hot or any_opening_open
+                )
             else:
-                _LOGGER.debug("Keep-alive - Heater already off %s", self.entity_id)
+                trace_step(self.entity_id, "off, already off")
 
             if is_floor_hot:
                 self._hvac_action_reason = HVACActionReason.OVERHEAT
@@ -116,19 +128,8 @@ class HeaterHvacConroller(GenericHvacController):
                 self._hvac_action_reason = HVACActionReason.OPENING
 
         else:
-            _LOGGER.debug(
-                "No case matched - keeping device off - too_cold: %s, any_opening_open: %s, is_floor_hot: %s, is_floor_cold: %s, time: %s. Taking default action to turn off heater.",
-                too_cold,
-                any_opening_open,
-                is_floor_hot,
-                is_floor_cold,
-                time,
-            )
-            # await self.async_turn_off_callback()
-            _LOGGER.debug(
-                "Setting hvac_action_reason. Target temp recached: %s",
-                strategy.hvac_goal_reached,
-            )
+            self._withdraw_start()
+            trace_step(self.entity_id, "off, no change")
             if strategy.hvac_goal_reached:
                 self._hvac_action_reason = strategy.goal_reached_reason()
             else:
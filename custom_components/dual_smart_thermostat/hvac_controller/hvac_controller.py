@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import timedelta
 import enum
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from homeassistant.components.climate import HVACMode
 from homeassistant.core import HomeAssistant
@@ -40,12 +40,6 @@ class HvacEnvStrategy:
 
     @property
     def hvac_goal_reached(self) -> bool:
-        _LOGGER.debug(
-            "Checking if goal reached. Goal: %s, Above: %s, Below: %s",
-            self.goal,
-            self.above(),
-            self.below(),
-        )
         if self.goal == HvacGoal.LOWER:
             return self.above()
         return self.below()
@@ -95,6 +89,20 @@ class HvacController(ABC):
     def hvac_action_reason(self) -> HVACActionReason:
         return self._hvac_action_reason
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the actuator state and when its current cycle started."""
+        state = self.hass.states.get(self.entity_id) if self.entity_id else None
+        return {
+            "type": self._controller_type,
+            "entity_id": self.entity_id,
+            "min_cycle_duration": (
+                str(self.min_cycle_duration) if self.min_cycle_duration else None
+            ),
+            "state": state.state if state else None,
+            "cycle_started": state.last_changed.isoformat() if state else None,
+            "hvac_action_reason": self._hvac_action_reason,
+        }
+
     @abstractmethod
     def async_control_device_when_on(
         self,
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import logging
+from typing import Any
 
 from homeassistant.components.climate import HVACAction, HVACMode
 from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, State, callback
@@ -114,6 +115,15 @@ class ControlableHVACDevice(ABC):
     def HVACActionReason(self, hvac_action_reason: HVACActionReason):
         self._hvac_action_reason = hvac_action_reason
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the mode, activity and last decision of the device."""
+        return {
+            "type": self.__class__.__name__,
+            "hvac_mode": self.hvac_mode,
+            "hvac_action_reason": self.HVACActionReason,
+            "is_active": self.is_active,
+        }
+
     def on_entity_state_changed(self, entity_id: str, new_state: State) -> None:
         """Handle entity state changes. Currently only for specific cases when the devices needs"""
         pass
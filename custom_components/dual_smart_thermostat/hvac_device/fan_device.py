@@ -4,6 +4,7 @@ import logging
 from homeassistant.components.climate import HVACAction, HVACMode
 from homeassistant.core import HomeAssistant
 
+from ..command_scheduler import async_get_command_scheduler
 from ..const import FAN_MODE_TO_PERCENTAGE
 from ..hvac_device.cooler_device import CoolerDevice
 from ..managers.environment_manager import EnvironmentManager
@@ -160,11 +161,10 @@ class FanDevice(CoolerDevice):
 
         if self._uses_preset_modes:
             # Use preset_mode service
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 "fan",
                 "set_preset_mode",
                 {"entity_id": self.entity_id, "preset_mode": fan_mode},
-                blocking=True,
             )
         else:
             # Use percentage service
@@ -173,11 +173,10 @@ class FanDevice(CoolerDevice):
                 _LOGGER.error("No percentage mapping for fan mode %s", fan_mode)
                 return
 
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 "fan",
                 "set_percentage",
                 {"entity_id": self.entity_id, "percentage": percentage},
-                blocking=True,
             )
 
         self._current_fan_mode = fan_mode
@@ -1,6 +1,6 @@
 from datetime import timedelta
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from homeassistant.components.climate import HVACAction, HVACMode
 from homeassistant.components.valve import DOMAIN as VALVE_DOMAIN, ValveEntityFeature
@@ -16,7 +16,10 @@ from homeassistant.const import (
 )
 from homeassistant.core import DOMAIN as HA_DOMAIN, Context, HomeAssistant
 
+from ..command_scheduler import CommandPriority, async_get_command_scheduler
+from ..decision_trace import trace_step
 from ..hvac_action_reason.hvac_action_reason import HVACActionReason
+from ..hvac_controller.compressor_protection import CompressorProtection
 from ..hvac_controller.generic_controller import GenericHvacController
 from ..hvac_controller.hvac_controller import HvacController, HvacEnvStrategy, HvacGoal
 from ..hvac_device.controllable_hvac_device import ControlableHVACDevice
@@ -29,6 +32,7 @@ from ..managers.environment_manager import EnvironmentManager
 from ..managers.feature_manager import FeatureManager
 from ..managers.hvac_power_manager import HvacPowerManager
 from ..managers.opening_manager import OpeningManager
+from ..power_budget import PowerBudget
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,9 +95,31 @@ class GenericHVACDevice(
     def set_context(self, context: Context):
         self._context = context
 
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            **super().diagnostics(),
+            "controller": self.hvac_controller.diagnostics(),
+        }
+
     def get_device_ids(self) -> list[str]:
         return [self.entity_id]
 
+    def _actuator_controllers(self) -> list[HvacController]:
+        """Return the controllers switching ``entity_id``."""
+        return [self.hvac_controller]
+
+    def set_compressor_protection(self, protection: CompressorProtection) -> None:
+        """Guard the starts and stops of the controller with ``protection``."""
+        for controller in self._actuator_controllers():
+            controller.protection = protection
+        self.async_on_remove(protection.async_cancel)
+
+    def set_power_budget(self, budget: PowerBudget, watts: float) -> None:
+        """Admit the starts of the controller against ``budget``."""
+        for controller in self._actuator_controllers():
+            controller.budget = budget
+        self.async_on_remove(budget.async_register(self.entity_id, watts))
+
     @property
     def _entity_state(self) -> str:
         return self.hass.states.get(self.entity_id)
@@ -150,62 +176,32 @@ class GenericHVACDevice(
     def _set_self_active(self) -> None:
         """Checks if active state needs to be set true."""
 
-        target_temp = getattr(self.environment, self.target_env_attr)
-
-        _LOGGER.debug("_active: %s", self._active)
-        _LOGGER.debug("cur_temp: %s", self.environment.cur_temp)
-        _LOGGER.debug("target_env_attr: %s", self.target_env_attr)
-        _LOGGER.debug("hvac_mode: %s", self.hvac_mode)
-        _LOGGER.debug("target_temp: %s", target_temp)
+        if self._active or self._hvac_mode == HVACMode.OFF:
+            return
 
-        if (
-            not self._active
-            and None not in (self.environment.cur_temp, target_temp)
-            and self._hvac_mode != HVACMode.OFF
-        ):
+        target_temp = getattr(self.environment, self.target_env_attr)
+        if None not in (self.environment.cur_temp, target_temp):
             self._active = True
-            _LOGGER.debug(
-                "Obtained current and target temperature. Device active. %s, %s",
-                self.environment.cur_temp,
-                target_temp,
-            )
+            trace_step(self.entity_id, "active, temperatures known")
 
     async def async_control_hvac(self, time=None, force=False):
         """Controls the HVAC of the device."""
-
-        _LOGGER.debug(
-            "%s - async_control_hvac time: %s. force: %s",
-            self._device_type,
-            time,
-            force,
-        )
-
         self._set_self_active()
 
-        _LOGGER.debug("Check if needs control.")
         if not self.hvac_controller.needs_control(
             self._active, self.hvac_mode, time, force
         ):
-            _LOGGER.debug("Control not needed. exit.")
             return
 
         any_opening_open = self.openings.any_opening_open(self.hvac_mode)
-
-        _LOGGER.debug(
-            "%s - async_control_hvac - is device active: %s, %s, strategy: %s, is opening open: %s",
-            self._device_type,
-            self.entity_id,
-            self.hvac_controller.is_active,
-            self.strategy,
-            any_opening_open,
-        )
+        is_active = self.hvac_controller.is_active
 
         # When the climate is OFF, keep-alive bypasses `needs_control` so it can
         # enforce the device staying off. We must never run goal-based logic
         # here — only turn the switch off if it ended up on externally.
         # See issue #587.
         if self._hvac_mode == HVACMode.OFF:
-            if self.hvac_controller.is_active:
+            if is_active:
                 _LOGGER.info(
                     "Climate mode is OFF but %s is on; turning it off",
                     self.entity_id,
@@ -213,7 +209,7 @@ class GenericHVACDevice(
                 await self.async_turn_off()
             return
 
-        if self.hvac_controller.is_active:
+        if is_active:
             await self.hvac_controller.async_control_device_when_on(
                 self.strategy,
                 any_opening_open,
@@ -226,15 +222,11 @@ class GenericHVACDevice(
                 time,
             )
 
-        _LOGGER.debug(
-            "hvac action reason after control: %s",
-            self.hvac_controller.hvac_action_reason,
-        )
-
         self._hvac_action_reason = self.hvac_controller.hvac_action_reason
         self.hvac_power.update_hvac_power(
-            self.strategy, self.target_env_attr, self.hvac_action
+            self.strategy, self.target_env_attr, self.hvac_action, self.entity_id
         )
+        await self.hvac_power.async_update_output(self._context, self.entity_id)
 
     async def async_on_startup(self, async_write_ha_state_cb: Callable = None):
 
@@ -257,12 +249,6 @@ class GenericHVACDevice(
             await self.async_turn_off()
 
     async def async_turn_on(self):
-        _LOGGER.debug(
-            "%s. Turning on or opening entity %s",
-            self.__class__.__name__,
-            self.entity_id,
-        )
-
         if self.entity_id is None:
             return
 
@@ -272,11 +258,6 @@ class GenericHVACDevice(
             await self._async_turn_on_entity()
 
     async def async_turn_off(self):
-        _LOGGER.debug(
-            "%s. Turning off or closing entity %s",
-            self.__class__.__name__,
-            self.entity_id,
-        )
         if self.entity_id is None:
             return
 
@@ -286,8 +267,17 @@ class GenericHVACDevice(
             await self._async_turn_off_entity()
 
         self.hvac_power.update_hvac_power(
-            self.strategy, self.target_env_attr, HVACAction.OFF
+            self.strategy, self.target_env_attr, HVACAction.OFF, self.entity_id
         )
+        await self.hvac_power.async_update_output(self._context, self.entity_id)
+
+    def _turn_off_priority(self) -> CommandPriority:
+        """Let turn-offs forced by an open window or a hot floor skip the queue."""
+        if self.openings.any_opening_open(self.hvac_mode) or (
+            self.environment.is_floor_hot
+        ):
+            return CommandPriority.SAFETY
+        return CommandPriority.NORMAL
 
     async def _async_turn_on_entity(self) -> None:
         """Turn on the entity."""
@@ -313,12 +303,12 @@ class GenericHVACDevice(
                 return
 
         try:
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 HA_DOMAIN,
                 SERVICE_TURN_ON,
                 {ATTR_ENTITY_ID: self.entity_id},
                 context=self._context,
-                blocking=True,
+                priority=CommandPriority.NORMAL,
             )
         except Exception as e:
             _LOGGER.error("Error turning on entity %s. Error: %s", self.entity_id, e)
@@ -344,12 +334,12 @@ class GenericHVACDevice(
                 return
 
         try:
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 HA_DOMAIN,
                 SERVICE_TURN_OFF,
                 {ATTR_ENTITY_ID: self.entity_id},
                 context=self._context,
-                blocking=True,
+                priority=self._turn_off_priority(),
             )
         except Exception as e:
             _LOGGER.error("Error turning off entity %s. Error: %s", self.entity_id, e)
@@ -359,12 +349,12 @@ class GenericHVACDevice(
         _LOGGER.info("%s. Opening entity %s", self.__class__.__name__, self.entity_id)
 
         try:
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 HA_DOMAIN,
                 SERVICE_OPEN_VALVE,
                 {ATTR_ENTITY_ID: self.entity_id},
                 context=self._context,
-                blocking=True,
+                priority=CommandPriority.NORMAL,
             )
         except Exception as e:
             _LOGGER.error("Error opening entity %s. Error: %s", self.entity_id, e)
@@ -374,12 +364,12 @@ class GenericHVACDevice(
         _LOGGER.info("%s. Closing entity %s", self.__class__.__name__, self.entity_id)
 
         try:
-            await self.hass.services.async_call(
+            await async_get_command_scheduler(self.hass).async_call(
                 HA_DOMAIN,
                 SERVICE_CLOSE_VALVE,
                 {ATTR_ENTITY_ID: self.entity_id},
                 context=self._context,
-                blocking=True,
+                priority=self._turn_off_priority(),
             )
         except Exception as e:
             _LOGGER.error("Error closing entity %s. Error: %s", self.entity_id, e)
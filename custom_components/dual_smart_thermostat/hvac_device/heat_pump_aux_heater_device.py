@@ -0,0 +1,176 @@
+"""Heat pump with resistive aux heat, chosen by efficiency.
+
+With ``heat_pump_cop_curve`` or ``heat_pump_balance_point`` set next to a
+``secondary_heater``, the thermostat does not stage the aux heater after a
+timeout. It heats with one of the two, picked from the outside temperature:
+
+- below the balance point the heat pump cannot carry the load, so the aux
+  heater heats;
+- where the heat pump's COP falls under ``heat_pump_min_cop`` (1.0 by
+  default, the COP of resistive heat) the aux heater is the cheaper one;
+- otherwise the heat pump heats.
+
+The COP curve is linear between the configured points and flat beyond them.
+It is tabulated once in ``COP_TABLE_STEP`` degree steps, so a decision is one
+index into a list. Going back to the heat pump needs the outside to be
+``SELECTION_HYSTERESIS`` degrees warmer than the point where it was left, so
+the choice does not flap around the threshold.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+import logging
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant
+
+from ..const import CONF_COP, CONF_OUTSIDE_TEMP
+from ..decision_trace import trace_step
+from ..hvac_action_reason.hvac_action_reason import HVACActionReason
+from ..hvac_device.generic_hvac_device import GenericHVACDevice
+from ..hvac_device.multi_hvac_device import MultiHvacDevice
+from ..managers.environment_manager import EnvironmentManager
+from ..managers.feature_manager import FeatureManager
+from ..managers.opening_manager import OpeningManager
+
+_LOGGER = logging.getLogger(__name__)
+
+COP_TABLE_STEP = 0.1
+SELECTION_HYSTERESIS = 1.0
+
+
+class CopCurve:
+    """COP of a heat pump by outside temperature, as a lookup table."""
+
+    def __init__(self, points: list[dict[str, float]]) -> None:
+        curve = dict(
+            sorted((point[CONF_OUTSIDE_TEMP], point[CONF_COP]) for point in points)
+        )
+        temps = list(curve)
+        cops = list(curve.values())
+        self._low = temps[0]
+        if len(temps) == 1:
+            self._table = cops
+            return
+        size = round((temps[-1] - self._low) / COP_TABLE_STEP) + 1
+        self._table = []
+        for index in range(size):
+            temp = self._low + index * COP_TABLE_STEP
+            upper = min(bisect_right(temps, temp), len(temps) - 1)
+            lower = upper - 1
+            fraction = min((temp - temps[lower]) / (temps[upper] - temps[lower]), 1.0)
+            self._table.append(cops[lower] + fraction * (cops[upper] - cops[lower]))
+
+    def cop(self, outside_temp: float) -> float:
+        """Return the COP at ``outside_temp``."""
+        index = round((outside_temp - self._low) / COP_TABLE_STEP)
+        return self._table[min(max(index, 0), len(self._table) - 1)]
+
+
+class HeatPumpAuxHeaterDevice(MultiHvacDevice):
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        devices: list[GenericHVACDevice],
+        cop_curve: CopCurve | None,
+        balance_point: float | None,
+        min_cop: float,
+        initial_hvac_mode: HVACMode,
+        environment: EnvironmentManager,
+        openings: OpeningManager,
+        features: FeatureManager,
+    ) -> None:
+        super().__init__(
+            hass, devices, initial_hvac_mode, environment, openings, features
+        )
+
+        self._device_type = self.__class__.__name__
+        self.heat_pump_device = devices[0]
+        self.aux_heater_device = devices[1]
+        self._cop_curve = cop_curve
+        self._balance_point = balance_point
+        self._min_cop = min_cop
+
+        self._use_aux = False
+        self._selection_reason = HVACActionReason.HEAT_PUMP_EFFICIENT
+        self._cop: float | None = None
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            **super().diagnostics(),
+            "selected": (
+                self.aux_heater_device if self._use_aux else self.heat_pump_device
+            ).entity_id,
+            "selection_reason": self._selection_reason,
+            "cop": round(self._cop, 2) if self._cop is not None else None,
+            "balance_point": self._balance_point,
+        }
+
+    def _select(self) -> None:
+        """Choose between the heat pump and the aux heater."""
+        outside = self.environment.cur_outside_temp
+        if outside is None:
+            return
+        if self._use_aux:
+            outside -= SELECTION_HYSTERESIS
+        self._cop = self._cop_curve.cop(outside) if self._cop_curve else None
+
+        if self._balance_point is not None and outside < self._balance_point:
+            use_aux, reason = True, HVACActionReason.BALANCE_POINT
+        elif self._cop is not None and self._cop < self._min_cop:
+            use_aux, reason = True, HVACActionReason.LOW_COP
+        else:
+            use_aux, reason = False, HVACActionReason.HEAT_PUMP_EFFICIENT
+
+        if use_aux != self._use_aux:
+            trace_step(
+                self.heat_pump_device.entity_id,
+                "outside %s, cop %s: %s",
+                outside,
+                self._cop,
+                reason,
+            )
+        self._use_aux = use_aux
+        self._selection_reason = reason
+
+    async def async_control_hvac(self, time=None, force=False):
+        if self._hvac_mode != HVACMode.HEAT:
+            # Cooling and the other modes are the heat pump's alone.
+            await super().async_control_hvac(time, force)
+            return
+
+        self._select()
+        reason = self._selection_reason
+        if self._use_aux:
+            selected, other = self.aux_heater_device, self.heat_pump_device
+        elif HVACMode.HEAT not in self.heat_pump_device.hvac_modes:
+            # A heat pump switched to cooling leaves the heating to the aux.
+            selected, other = self.aux_heater_device, self.heat_pump_device
+            reason = None
+        else:
+            selected, other = self.heat_pump_device, self.aux_heater_device
+
+        if other.is_active:
+            safety = (
+                self.openings.any_opening_open(self.hvac_mode)
+                or self.environment.is_floor_hot
+            )
+            await other.hvac_controller.async_turn_off_callback(safety=safety)
+            protection = other.hvac_controller.protection
+            if protection is not None and protection.deferred is not None:
+                # Held on by its protection, it heats until it may stop.
+                self._hvac_action_reason = other.hvac_controller.hvac_action_reason
+                return
+        await selected.async_control_hvac(time, force)
+
+        self._hvac_action_reason = selected.HVACActionReason
+        if (
+            reason is not None
+            and selected.is_active
+            and self._hvac_action_reason == HVACActionReason.TARGET_TEMP_NOT_REACHED
+        ):
+            # Report why this device heats instead of the other one.
+            self._hvac_action_reason = reason
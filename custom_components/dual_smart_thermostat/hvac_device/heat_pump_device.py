@@ -7,7 +7,11 @@ from homeassistant.core import HomeAssistant, State, callback
 
 from ..hvac_controller.cooler_controller import CoolerHvacController
 from ..hvac_controller.heater_controller import HeaterHvacConroller
-from ..hvac_controller.hvac_controller import HvacEnvStrategy, HvacGoal
+from ..hvac_controller.hvac_controller import (
+    HvacController,
+    HvacEnvStrategy,
+    HvacGoal,
+)
 from ..hvac_device.generic_hvac_device import GenericHVACDevice
 from ..hvac_device.hvac_device import merge_hvac_modes
 from ..managers.environment_manager import EnvironmentManager, TargetTemperatures
@@ -98,6 +102,9 @@ class HeatPumpDevice(GenericHVACDevice):
         if initial_hvac_mode in self.hvac_modes:
             self._hvac_mode = initial_hvac_mode
 
+    def _actuator_controllers(self) -> list[HvacController]:
+        return [self.heating_controller, self.cooling_controller]
+
     @property
     def target_env_attr(self) -> str:
 
@@ -4,11 +4,12 @@ import logging
 
 from homeassistant.components.climate import HVACMode
 from homeassistant.const import STATE_ON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import condition
 from homeassistant.helpers.event import async_call_later
-from homeassistant.util import dt
+from homeassistant.util import dt as dt_util
 
+from ..decision_trace import trace_step
 from ..hvac_action_reason.hvac_action_reason import HVACActionReason
 from ..hvac_device.multi_hvac_device import MultiHvacDevice
 from ..managers.environment_manager import EnvironmentManager
@@ -40,13 +41,14 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
         self._aux_heater_dual_mode = self._features.aux_heater_dual_mode
 
         self._aux_heater_last_run: datetime = None
+        self._cancel_aux_check: CALLBACK_TYPE | None = None
+        self.async_on_remove(self._async_cancel_aux_check)
 
     @property
     def _target_env_attr(self) -> str:
         return "_target_temp_low" if self._features.is_range_mode else "_target_temp"
 
     async def async_control_hvac(self, time=None, force=False):
-        _LOGGER.debug({self.__class__.__name__})
         match self._hvac_mode:
             case HVACMode.HEAT:
                 # await self.heater_device.async_control_hvac(time, force)
@@ -57,8 +59,6 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
                 _LOGGER.warning("Invalid HVAC mode: %s", self._hvac_mode)
 
     async def async_control_devices(self, time=None, force=False):
-        _LOGGER.debug("async_control_devices at: %s", dt.utcnow())
-        _LOGGER.debug("is_active: %s", self.is_active)
         if self.is_active:
             await self._async_control_devices_when_on(time)
         else:
@@ -66,30 +66,15 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
 
     async def async_control_devices_forced(self, time=None) -> None:
         """Control the heater and aux heater when forced."""
-        _LOGGER.debug("Forced control of devices")
         await self.async_control_devices(time, force=True)
 
     async def _async_control_devices_when_off(self, time=None) -> None:
         """Check if we need to turn heating on or off when the heater is off."""
-        _LOGGER.info("%s Controlling hvac while off", self.__class__.__name__)
-
         too_cold = self.environment.is_too_cold(self._target_env_attr)
         is_floor_hot = self.environment.is_floor_hot
         is_floor_cold = self.environment.is_floor_cold
         any_opening_open = self.openings.any_opening_open(self.hvac_mode)
 
-        _LOGGER.debug(
-            "_target_env_attr: %s, too_cold: %s, is_floor_hot: %s, is_floor_cold: %s, any_opening_open: %s, time: %s",
-            self._target_env_attr,
-            too_cold,
-            is_floor_hot,
-            is_floor_cold,
-            any_opening_open,
-            time,
-        )
-
-        _LOGGER.debug("is_range-Mode: %s", self._features.is_range_mode)
-
         if (too_cold and not any_opening_open and not is_floor_hot) or is_floor_cold:
 
             if self._has_aux_heating_ran_today:
@@ -115,10 +100,10 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
                 self._hvac_action_reason = HVACActionReason.OPENING
 
         else:
-            _LOGGER.debug("No case matched when - keep device off")
+            trace_step(self.heater_device.entity_id, "off, no change")
 
     async def _async_handle_aux_heater_ran_today(self) -> None:
-        _LOGGER.info("Aux heater has already ran today")
+        trace_step(self.aux_heater_device.entity_id, "off, aux ran today")
         if self._aux_heater_dual_mode:
             await self.heater_device.async_turn_on()
         await self.aux_heater_device.async_turn_on()
@@ -128,47 +113,34 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
             await self.heater_device.async_turn_on()
         await self.heater_device.async_turn_on()
 
-        _LOGGER.info("Scheduling aux heater check")
+        trace_step(self.heater_device.entity_id, "off, aux check scheduled")
 
-        # can we move this to the climate entity?
-        self.async_on_remove(
-            async_call_later(
-                self.hass,
-                self._aux_heater_timeout,
-                self.async_control_devices_forced,
-            )
+        # A single check is armed; a later pass replaces it.
+        self._async_cancel_aux_check()
+        self._cancel_aux_check = async_call_later(
+            self.hass, self._aux_heater_timeout, self._async_aux_check
         )
 
+    async def _async_aux_check(self, time=None) -> None:
+        self._cancel_aux_check = None
+        await self.async_control_devices_forced(time)
+
+    @callback
+    def _async_cancel_aux_check(self) -> None:
+        if self._cancel_aux_check is not None:
+            self._cancel_aux_check()
+            self._cancel_aux_check = None
+
     async def _async_control_devices_when_on(self, time=None) -> None:
         """Check if we need to turn heating on or off when the heater is off."""
-        _LOGGER.info("%s Controlling hvac while on", self.__class__.__name__)
-
         too_hot = self.environment.is_too_hot(self._target_env_attr)
         is_floor_hot = self.environment.is_floor_hot
         is_floor_cold = self.environment.is_floor_cold
         any_opening_open = self.openings.any_opening_open(self.hvac_mode)
         first_stage_timed_out = self._first_stage_heating_timed_out()
 
-        _LOGGER.debug(
-            "too_hot: %s, is_floor_hot: %s, is_floor_cold: %s, any_opening_open: %s, time: %s",
-            too_hot,
-            is_floor_hot,
-            is_floor_cold,
-            any_opening_open,
-            time,
-        )
-
-        _LOGGER.info(
-            "_first_stage_heating_timed_out: %s",
-            first_stage_timed_out,
-        )
-        _LOGGER.debug("aux_heater_timeout: %s", self._aux_heater_timeout)
-        _LOGGER.debug(
-            "aux_heater_device.is_active: %s", self.aux_heater_device.is_active
-        )
-
         if ((too_hot or is_floor_hot) or any_opening_open) and not is_floor_cold:
-            _LOGGER.info("Turning off heaters when on")
+            trace_step(self.heater_device.entity_id, "on, turning off heaters")
 
             # maybe call device -> async_control_hvac?
             await self.heater_device.async_turn_off()
@@ -181,15 +153,12 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
             if any_opening_open:
                 self._hvac_action_reason = HVACActionReason.OPENING
 
-        elif (
-            self._first_stage_heating_timed_out()
-            and not self.aux_heater_device.is_active
-        ):
-            _LOGGER.debug("Turning on aux heater %s", self.aux_heater_device.entity_id)
+        elif first_stage_timed_out and not self.aux_heater_device.is_active:
+            trace_step(self.aux_heater_device.entity_id, "on, first stage timed out")
             if not self._aux_heater_dual_mode:
                 await self.heater_device.async_turn_off()
             await self.aux_heater_device.async_turn_on()
-            self._aux_heater_last_run = datetime.datetime.now()
+            self._aux_heater_last_run = dt_util.now()
             self._hvac_action_reason = HVACActionReason.TARGET_TEMP_NOT_REACHED
 
         else:
@@ -223,7 +192,7 @@ class HeaterAUXHeaterDevice(MultiHvacDevice):
         if self._aux_heater_last_run is None:
             return False
 
-        if self._aux_heater_last_run.date() == datetime.datetime.now().date():
+        if self._aux_heater_last_run.date() == dt_util.now().date():
             return True
 
         return False
@@ -1,37 +1,60 @@
 from datetime import timedelta
 import logging
 
+from homeassistant.const import CONF_ENTITY_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 
 from ..const import (
+    CONF_ACTUATOR_POWER,
     CONF_AUX_HEATER,
     CONF_AUX_HEATING_DUAL_MODE,
     CONF_AUX_HEATING_TIMEOUT,
     CONF_COOLER,
+    CONF_COOLER_STAGES,
     CONF_DRYER,
     CONF_FAN,
     CONF_FAN_ON_WITH_AC,
+    CONF_HEAT_PUMP_BALANCE_POINT,
     CONF_HEAT_PUMP_COOLING,
+    CONF_HEAT_PUMP_COP_CURVE,
+    CONF_HEAT_PUMP_MIN_COP,
     CONF_HEATER,
+    CONF_HEATER_STAGES,
     CONF_INITIAL_HVAC_MODE,
+    CONF_MAX_STARTS_PER_HOUR,
     CONF_MIN_DUR,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
+    CONF_STAGE_DEFICIT,
+    CONF_STAGE_DELAY,
+    CONF_STAGE_HYSTERESIS,
+    DEFAULT_HEAT_PUMP_MIN_COP,
+    DEFAULT_STAGE_HYSTERESIS,
 )
+from ..hvac_controller.compressor_protection import CompressorProtection
 from ..hvac_device.controllable_hvac_device import ControlableHVACDevice
 from ..hvac_device.cooler_device import CoolerDevice
 from ..hvac_device.cooler_fan_device import CoolerFanDevice
 from ..hvac_device.dryer_device import DryerDevice
 from ..hvac_device.fan_device import FanDevice
+from ..hvac_device.generic_hvac_device import GenericHVACDevice
+from ..hvac_device.heat_pump_aux_heater_device import (
+    CopCurve,
+    HeatPumpAuxHeaterDevice,
+)
 from ..hvac_device.heat_pump_device import HeatPumpDevice
 from ..hvac_device.heater_aux_heater_device import HeaterAUXHeaterDevice
 from ..hvac_device.heater_cooler_device import HeaterCoolerDevice
 from ..hvac_device.heater_device import HeaterDevice
 from ..hvac_device.heater_fan_device import HeaterFanDevice
 from ..hvac_device.multi_hvac_device import MultiHvacDevice
+from ..hvac_device.multi_stage_device import MultiStageDevice, Stage
 from ..managers.environment_manager import EnvironmentManager
 from ..managers.feature_manager import FeatureManager
 from ..managers.hvac_power_manager import HvacPowerManager
 from ..managers.opening_manager import OpeningManager
+from ..power_budget import async_get_power_budget
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,7 +90,28 @@ class HVACDeviceFactory:
         self._aux_heater_dual_mode = config.get(CONF_AUX_HEATING_DUAL_MODE)
         self._aux_heater_timeout = config.get(CONF_AUX_HEATING_TIMEOUT)
 
+        cop_curve = config.get(CONF_HEAT_PUMP_COP_CURVE)
+        self._cop_curve = CopCurve(cop_curve) if cop_curve else None
+        self._balance_point: float | None = config.get(CONF_HEAT_PUMP_BALANCE_POINT)
+        self._min_cop: float = config.get(
+            CONF_HEAT_PUMP_MIN_COP, DEFAULT_HEAT_PUMP_MIN_COP
+        )
+        # The aux heater is chosen by efficiency instead of after a timeout.
+        self._aux_by_efficiency = self._aux_heater_entity_id is not None and (
+            self._cop_curve is not None or self._balance_point is not None
+        )
+
+        self._heater_stages: list[dict] = config.get(CONF_HEATER_STAGES) or []
+        self._cooler_stages: list[dict] = config.get(CONF_COOLER_STAGES) or []
+        self._stage_hysteresis: float = config.get(
+            CONF_STAGE_HYSTERESIS, DEFAULT_STAGE_HYSTERESIS
+        )
+
         self._min_cycle_duration: timedelta = config.get(CONF_MIN_DUR)
+        self._min_on_time: timedelta | None = config.get(CONF_MIN_ON_TIME)
+        self._min_off_time: timedelta | None = config.get(CONF_MIN_OFF_TIME)
+        self._max_starts_per_hour: int | None = config.get(CONF_MAX_STARTS_PER_HOUR)
+        self._actuator_power: float | None = config.get(CONF_ACTUATOR_POWER)
 
         self._initial_hvac_mode = config.get(CONF_INITIAL_HVAC_MODE)
 
@@ -120,7 +164,15 @@ class HVACDeviceFactory:
                 hvac_power,
             )
 
-        if self._features.is_configured_for_aux_heating_mode:
+        uses_aux_heater = (
+            self._features.is_configured_for_aux_heating_mode or self._aux_by_efficiency
+        )
+        if uses_aux_heater and self._heater_stages:
+            _LOGGER.warning(
+                "'secondary_heater' is ignored when 'heater_stages' is configured. "
+                "Add the secondary heater as a stage instead"
+            )
+        elif uses_aux_heater:
             aux_heater_device = HeaterDevice(
                 self.hass,
                 self._aux_heater_entity_id,
@@ -167,6 +219,7 @@ class HVACDeviceFactory:
                 self._features,
                 hvac_power,
             )
+            self._guard(heater_device)
 
         if (
             self._heater_entity_id
@@ -185,8 +238,30 @@ class HVACDeviceFactory:
                 self._features,
                 hvac_power,
             )
+            self._guard(heater_device)
+            if self._heater_stages:
+                heater_device = self._create_multi_stage_device(
+                    HeaterDevice,
+                    heater_device,
+                    self._heater_stages,
+                    environment,
+                    openings,
+                )
 
-        if aux_heater_device and heater_device:
+        if aux_heater_device and heater_device and self._aux_by_efficiency:
+            _LOGGER.info("Creating heat pump aux heater device")
+            heater_device = HeatPumpAuxHeaterDevice(
+                self.hass,
+                [heater_device, aux_heater_device],
+                self._cop_curve,
+                self._balance_point,
+                self._min_cop,
+                self._initial_hvac_mode,
+                environment,
+                openings,
+                self._features,
+            )
+        elif aux_heater_device and heater_device:
             _LOGGER.info("Creating heater aux heater device")
             heater_device = HeaterAUXHeaterDevice(
                 self.hass,
@@ -293,6 +368,15 @@ class HVACDeviceFactory:
             self._features,
             hvac_power,
         )
+        self._guard(cooler_device)
+        if self._cooler_stages:
+            cooler_device = self._create_multi_stage_device(
+                CoolerDevice,
+                cooler_device,
+                self._cooler_stages,
+                environment,
+                openings,
+            )
 
         if fan_device:
             cooler_device = CoolerFanDevice(
@@ -305,3 +389,61 @@ class HVACDeviceFactory:
             )
 
         return cooler_device
+
+    def _create_multi_stage_device(
+        self,
+        device_class: type[GenericHVACDevice],
+        first_stage: GenericHVACDevice,
+        stages: list[dict],
+        environment: EnvironmentManager,
+        openings: OpeningManager,
+    ) -> MultiStageDevice:
+        """Put the ``stages`` on top of ``first_stage``."""
+        # The first stage alone reports the power, the others only add to it.
+        stage_power = HvacPowerManager(self.hass, {}, environment)
+        devices = [first_stage]
+        for stage in stages:
+            device = device_class(
+                self.hass,
+                stage[CONF_ENTITY_ID],
+                self._min_cycle_duration,
+                self._initial_hvac_mode,
+                environment,
+                openings,
+                self._features,
+                stage_power,
+            )
+            self._guard(device)
+            devices.append(device)
+
+        return MultiStageDevice(
+            self.hass,
+            devices,
+            [
+                Stage(stage[CONF_STAGE_DEFICIT], stage[CONF_STAGE_DELAY])
+                for stage in stages
+            ],
+            self._stage_hysteresis,
+            self._initial_hvac_mode,
+            environment,
+            openings,
+            self._features,
+        )
+
+    def _guard(self, device: GenericHVACDevice) -> None:
+        """Add compressor protection and the power budget to a device."""
+        if self._actuator_power:
+            device.set_power_budget(
+                async_get_power_budget(self.hass), self._actuator_power
+            )
+        if not (self._min_on_time or self._min_off_time or self._max_starts_per_hour):
+            return
+        device.set_compressor_protection(
+            CompressorProtection(
+                self.hass,
+                device.entity_id,
+                self._min_on_time,
+                self._min_off_time,
+                self._max_starts_per_hour,
+            )
+        )
@@ -1,5 +1,5 @@
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from homeassistant.components.climate import HVACAction, HVACMode
 from homeassistant.core import Context, HomeAssistant, State, callback
@@ -46,6 +46,19 @@ class MultiHvacDevice(HVACDevice, ControlableHVACDevice):
         for device in self.hvac_devices:
             device.set_context(context)
 
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            **super().diagnostics(),
+            "devices": [device.diagnostics() for device in self.hvac_devices],
+        }
+
+    @callback
+    def call_on_remove_callbacks(self) -> None:
+        """Call the callbacks of this device and of every sub-device."""
+        super().call_on_remove_callbacks()
+        for device in self.hvac_devices:
+            device.call_on_remove_callbacks()
+
     @callback
     def on_entity_state_changed(self, entity_id: str, new_state: State) -> None:
         """Forward state-change notifications to every sub-device.
@@ -0,0 +1,272 @@
+"""Heating or cooling with any number of stages.
+
+The first stage is the ``heater`` (or the cooler) and is controlled like a
+single-stage device: tolerances, openings, floor limits and cycle durations
+all apply to it. The stages listed in ``heater_stages`` or ``cooler_stages``
+run on top of it. A stage starts when the stage below it has been on for the
+stage's ``delay`` and the room is at least ``deficit`` degrees from the
+target. It stops again once the deficit has dropped ``stage_hysteresis``
+below that, or together with the first stage.
+
+Stages are switched through their controller, so ``min_on_time``,
+``min_off_time``, ``max_starts_per_hour`` and the power budget hold for each
+of them like for the first stage. Switching the thermostat off stops all
+stages right away.
+
+When a stage waits for its delay, one timer is armed for the moment it is due.
+A later pass replaces it instead of adding another one. How long each stage
+has been on, and its runtime, come from the timestamps of its state change
+events, so no pass has to look back at the state history.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Callable
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+from ..decision_trace import trace_step
+from ..hvac_controller.hvac_controller import HvacGoal
+from ..hvac_device.generic_hvac_device import GenericHVACDevice
+from ..hvac_device.multi_hvac_device import MultiHvacDevice
+from ..managers.environment_manager import EnvironmentManager
+from ..managers.feature_manager import FeatureManager
+from ..managers.opening_manager import OpeningManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """When a stage above the first one runs."""
+
+    deficit: float
+    delay: timedelta
+
+
+class MultiStageDevice(MultiHvacDevice):
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        devices: list[GenericHVACDevice],
+        stages: list[Stage],
+        hysteresis: float,
+        initial_hvac_mode: HVACMode,
+        environment: EnvironmentManager,
+        openings: OpeningManager,
+        features: FeatureManager,
+    ) -> None:
+        super().__init__(
+            hass, devices, initial_hvac_mode, environment, openings, features
+        )
+
+        self._device_type = self.__class__.__name__
+        self.first_stage = devices[0]
+        # stage n of the thermostat is _stages[n - 2], the first one has none
+        self._stages = stages
+        self._hysteresis = hysteresis
+
+        self._on_since: dict[str, datetime | None] = {}
+        self._runtime: dict[str, timedelta] = {}
+        self._cancel_stage_timer: CALLBACK_TYPE | None = None
+        self.stage_due: datetime | None = None
+        self._async_write_ha_state_cb: Callable | None = None
+
+    @property
+    def entity_id(self) -> str:
+        return self.first_stage.entity_id
+
+    @property
+    def hvac_controller(self):
+        return self.first_stage.hvac_controller
+
+    @property
+    def is_on(self) -> bool:
+        return self.first_stage.is_on
+
+    @property
+    def target_env_attr(self) -> str:
+        return self.first_stage.target_env_attr
+
+    @property
+    def active_stages(self) -> int:
+        """Return how many stages run, counting up from the first one."""
+        count = 0
+        for device in self.hvac_devices:
+            if not device.is_active:
+                break
+            count += 1
+        return count
+
+    def diagnostics(self) -> dict[str, Any]:
+        now = dt_util.utcnow()
+        return {
+            **super().diagnostics(),
+            "active_stages": self.active_stages,
+            "stage_due": self.stage_due.isoformat() if self.stage_due else None,
+            "stages": {
+                device.entity_id: {
+                    "on_for": (
+                        round((now - on_since).total_seconds())
+                        if (on_since := self._on_since.get(device.entity_id))
+                        else None
+                    ),
+                    "runtime": round(self._runtime_of(device.entity_id, now)),
+                }
+                for device in self.hvac_devices
+            },
+        }
+
+    def _runtime_of(self, entity_id: str, now: datetime) -> float:
+        runtime = self._runtime.get(entity_id, timedelta())
+        if on_since := self._on_since.get(entity_id):
+            runtime += now - on_since
+        return runtime.total_seconds()
+
+    async def async_on_startup(self, async_write_ha_state_cb: Callable = None) -> None:
+        await super().async_on_startup(async_write_ha_state_cb)
+
+        for device in self.hvac_devices:
+            state = self.hass.states.get(device.entity_id)
+            self._on_since[device.entity_id] = (
+                state.last_changed if state and device.is_active else None
+            )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, self.get_device_ids(), self._async_stage_changed
+            )
+        )
+        self.async_on_remove(self._async_cancel_stage_timer)
+
+    @callback
+    def _async_stage_changed(self, event: Event[EventStateChangedData]) -> None:
+        entity_id = event.data["entity_id"]
+        device = next(d for d in self.hvac_devices if d.entity_id == entity_id)
+        on_since = self._on_since.get(entity_id)
+        if device.is_active:
+            if on_since is None:
+                self._on_since[entity_id] = event.time_fired
+        elif on_since is not None:
+            self._runtime[entity_id] = (
+                self._runtime.get(entity_id, timedelta()) + event.time_fired - on_since
+            )
+            self._on_since[entity_id] = None
+
+    def _deficit(self) -> float | None:
+        """Return how far the room is from the target, positive when short."""
+        target = getattr(self.environment, self.target_env_attr)
+        current = self.environment.cur_temp
+        if None in (target, current):
+            return None
+        if self.first_stage.hvac_goal == HvacGoal.LOWER:
+            return current - target
+        return target - current
+
+    async def async_control_hvac(self, time=None, force=False):
+        if self._hvac_mode == HVACMode.OFF or (
+            self._hvac_mode not in self.first_stage.hvac_modes
+        ):
+            await super().async_control_hvac(time, force)
+            self._async_cancel_stage_timer()
+            return
+
+        await self.first_stage.async_control_hvac(time, force)
+        self._hvac_action_reason = self.first_stage.HVACActionReason
+
+        if not self.first_stage.is_active:
+            self._async_cancel_stage_timer()
+            safety = (
+                self.openings.any_opening_open(self.hvac_mode)
+                or self.environment.is_floor_hot
+            )
+            for device in reversed(self.hvac_devices[1:]):
+                if device.is_active:
+                    trace_step(device.entity_id, "first stage off, destaging")
+                    await device.hvac_controller.async_turn_off_callback(safety=safety)
+                else:
+                    self._withdraw_start(device)
+            return
+
+        await self._async_control_stages()
+
+    async def _async_control_stages(self) -> None:
+        if (deficit := self._deficit()) is None:
+            return
+        active = self.active_stages
+
+        # Destage from the top while the deficit is well below the threshold.
+        while active > 1 and (
+            deficit <= self._stages[active - 2].deficit - self._hysteresis
+        ):
+            device = self.hvac_devices[active - 1]
+            trace_step(device.entity_id, "deficit %.2f, destaging", deficit)
+            await device.hvac_controller.async_turn_off_callback()
+            protection = device.hvac_controller.protection
+            if protection is not None and protection.deferred is not None:
+                # Held on by its protection, the stages below stay too.
+                return
+            active -= 1
+
+        if active == len(self.hvac_devices):
+            self._async_cancel_stage_timer()
+            return
+        stage = self._stages[active - 1]
+        if deficit < stage.deficit:
+            self._async_cancel_stage_timer()
+            self._withdraw_start(self.hvac_devices[active])
+            return
+
+        now = dt_util.utcnow()
+        below = self.hvac_devices[active - 1].entity_id
+        if (on_since := self._on_since.get(below)) is None:
+            # Running before its state change was seen, count from now.
+            on_since = self._on_since[below] = now
+        due = on_since + stage.delay
+        if due <= now:
+            device = self.hvac_devices[active]
+            trace_step(device.entity_id, "deficit %.2f, staging up", deficit)
+            self._async_cancel_stage_timer()
+            await device.hvac_controller.async_turn_on_callback()
+        elif due != self.stage_due:
+            trace_step(self.hvac_devices[active].entity_id, "stage due later")
+            self._async_cancel_stage_timer()
+            self.stage_due = due
+            self._cancel_stage_timer = async_track_point_in_utc_time(
+                self.hass, self._async_stage_timer, due
+            )
+
+    @staticmethod
+    def _withdraw_start(device: GenericHVACDevice) -> None:
+        """Take a stage that is not due anymore out of the power budget queue."""
+        if (budget := device.hvac_controller.budget) is not None:
+            budget.async_withdraw(device.entity_id)
+
+    async def _async_stage_timer(self, _now) -> None:
+        self._cancel_stage_timer = None
+        self.stage_due = None
+        await self.async_control_hvac()
+        if self._async_write_ha_state_cb is not None:
+            self._async_write_ha_state_cb()
+
+    @callback
+    def _async_cancel_stage_timer(self) -> None:
+        if self._cancel_stage_timer is not None:
+            self._cancel_stage_timer()
+            self._cancel_stage_timer = None
+        self.stage_due = None
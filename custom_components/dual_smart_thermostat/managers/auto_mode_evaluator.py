@@ -134,8 +134,13 @@ class AutoModeEvaluator:
         humidity_sensor_stalled: bool = False,
         outside_temp: float | None = None,
         outside_sensor_stalled: bool = False,
+        planned_mode: HVACMode | None = None,
     ) -> AutoDecision:
-        """Return the next AutoDecision based on the priority table."""
+        """Return the next AutoDecision based on the priority table.
+
+        ``planned_mode`` is the mode a forecast plan picked for now, OFF when
+        it plans to idle. It replaces the normal-tier temperature priorities.
+        """
         env = self._environment
 
         # Safety preempts everything (no flap protection for safety).
@@ -155,8 +160,16 @@ class AutoModeEvaluator:
         cold_tolerance, hot_tolerance = env._get_active_tolerance_for_mode()
 
         # Flap prevention: if last_decision is set and that mode's goal is
-        # still pending, only an urgent-tier priority can preempt.
-        if last_decision is not None and last_decision.next_mode is not None:
+        # still pending, only an urgent-tier priority can preempt. A plan
+        # holds its temperature mode for a whole slot already.
+        if (
+            last_decision is not None
+            and last_decision.next_mode is not None
+            and not (
+                planned_mode is not None
+                and last_decision.next_mode in (HVACMode.HEAT, HVACMode.COOL)
+            )
+        ):
             if self._goal_pending(
                 last_decision.next_mode,
                 humidity_available,
@@ -181,6 +194,7 @@ class AutoModeEvaluator:
             last_decision,
             outside_temp=outside_temp,
             outside_sensor_stalled=outside_sensor_stalled,
+            planned_mode=planned_mode,
         )
 
     def _goal_pending(
@@ -238,6 +252,7 @@ class AutoModeEvaluator:
         *,
         outside_temp: float | None = None,
         outside_sensor_stalled: bool = False,
+        planned_mode: HVACMode | None = None,
     ) -> AutoDecision:
         env = self._environment
 
@@ -258,8 +273,21 @@ class AutoModeEvaluator:
                 reason=HVACActionReason.AUTO_PRIORITY_HUMIDITY,
             )
 
+        # Priorities 7 and 8 follow the forecast plan when there is one.
+        if planned_mode is not None:
+            if planned_mode == HVACMode.HEAT and self._can_heat:
+                return AutoDecision(
+                    next_mode=HVACMode.HEAT,
+                    reason=HVACActionReason.AUTO_PRIORITY_TEMPERATURE,
+                )
+            if planned_mode == HVACMode.COOL and self._can_cool:
+                return AutoDecision(
+                    next_mode=HVACMode.COOL,
+                    reason=HVACActionReason.AUTO_PRIORITY_TEMPERATURE,
+                )
+
         # Priority 7 (normal cold).
-        if self._can_heat and self._temp_too_cold(env, cold_tolerance, multiplier=1):
+        elif self._can_heat and self._temp_too_cold(env, cold_tolerance, multiplier=1):
             return AutoDecision(
                 next_mode=HVACMode.HEAT,
                 reason=HVACActionReason.AUTO_PRIORITY_TEMPERATURE,
@@ -267,7 +295,7 @@ class AutoModeEvaluator:
 
         # Priority 8 (normal hot) — free cooling preempts COOL when outside is
         # cool enough AND the priority is NOT promoted to urgent by outside-delta.
-        if self._can_cool and self._temp_too_hot(env, hot_tolerance, multiplier=1):
+        elif self._can_cool and self._temp_too_hot(env, hot_tolerance, multiplier=1):
             promoted = self._outside_promotes_to_urgent(
                 HVACMode.COOL,
                 outside_temp=outside_temp,
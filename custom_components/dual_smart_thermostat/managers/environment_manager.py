@@ -1,7 +1,10 @@
+from collections.abc import Callable
 from datetime import timedelta
 import enum
+import functools
 import logging
 import math
+from typing import Any
 
 from homeassistant.components.climate import (
     ATTR_TARGET_TEMP_HIGH,
@@ -21,6 +24,7 @@ from ..const import (
     ATTR_PREV_TARGET,
     ATTR_PREV_TARGET_HIGH,
     ATTR_PREV_TARGET_LOW,
+    CONF_APPARENT_TEMP_LOOKUP,
     CONF_COLD_TOLERANCE,
     CONF_COOL_TOLERANCE,
     CONF_DRY_TOLERANCE,
@@ -29,6 +33,8 @@ from ..const import (
     CONF_HEAT_COOL_MODE,
     CONF_HEAT_TOLERANCE,
     CONF_HOT_TOLERANCE,
+    CONF_HUMIDITY_SENSOR,
+    CONF_HUMIDITY_SENSORS,
     CONF_MAX_FLOOR_TEMP,
     CONF_MAX_HUMIDITY,
     CONF_MAX_TEMP,
@@ -39,6 +45,7 @@ from ..const import (
     CONF_OUTSIDE_SENSOR,
     CONF_PRECISION,
     CONF_SENSOR,
+    CONF_SENSORS,
     CONF_STALE_DURATION,
     CONF_TARGET_HUMIDITY,
     CONF_TARGET_TEMP,
@@ -49,6 +56,11 @@ from ..const import (
     DEFAULT_MAX_FLOOR_TEMP,
     DEFAULT_TOLERANCE,
 )
+from ..managers.sensor_aggregator import (
+    HUMIDITY_MIN_SPREAD,
+    TEMPERATURE_MIN_SPREAD,
+    aggregator_from_config,
+)
 from ..managers.state_manager import StateManager
 from ..preset_env.preset_env import PresetEnv
 
@@ -95,83 +107,328 @@ def _rothfusz_heat_index_f(t_f: float, rh: float) -> float:
     )
 
 
+def _heat_index_c(t_c: float, rh: float) -> float:
+    """Rothfusz heat index for a Celsius dry-bulb temperature, in Celsius."""
+    return (_rothfusz_heat_index_f(t_c * 9 / 5 + 32, rh) - 32) * 5 / 9
+
+
+class HeatIndexTable:
+    """Precomputed heat index grid over the Rothfusz validity range.
+
+    Covers 27-50 °C in 0.25 °C steps and 0-100 % relative humidity in 1 %
+    steps and answers with bilinear interpolation. The polynomial is smooth,
+    so the interpolation error stays well below sensor resolution (< 0.01 °C).
+    """
+
+    T_MIN = 27.0
+    T_MAX = 50.0
+    T_STEP = 0.25
+    RH_STEP = 1.0
+
+    def __init__(self) -> None:
+        t_count = int(round((self.T_MAX - self.T_MIN) / self.T_STEP)) + 1
+        rh_count = int(round(100 / self.RH_STEP)) + 1
+        self._rows = [
+            [
+                _heat_index_c(self.T_MIN + i * self.T_STEP, j * self.RH_STEP)
+                for j in range(rh_count)
+            ]
+            for i in range(t_count)
+        ]
+
+    def lookup(self, t_c: float, rh: float) -> float | None:
+        """Return the interpolated heat index in °C, or None when off-grid."""
+        if not (self.T_MIN <= t_c <= self.T_MAX and 0 <= rh <= 100):
+            return None
+        rows = self._rows
+        t_pos = (t_c - self.T_MIN) / self.T_STEP
+        rh_pos = rh / self.RH_STEP
+        i = min(int(t_pos), len(rows) - 2)
+        j = min(int(rh_pos), len(rows[0]) - 2)
+        dt = t_pos - i
+        drh = rh_pos - j
+        low = rows[i][j] + (rows[i][j + 1] - rows[i][j]) * drh
+        high = rows[i + 1][j] + (rows[i + 1][j + 1] - rows[i + 1][j]) * drh
+        return low + (high - low) * dt
+
+
+@functools.lru_cache(maxsize=1)
+def _get_heat_index_table() -> HeatIndexTable:
+    """Return the shared heat index table, building it on first use."""
+    return HeatIndexTable()
+
+
+class EnvironmentState:
+    """Mutable readings, targets and tolerances of one thermostat.
+
+    Kept in a slotted record so the control path reads fixed-offset slots
+    instead of instance dict entries.
+    """
+
+    __slots__ = (
+        "cur_temp",
+        "cur_floor_temp",
+        "cur_outside_temp",
+        "cur_humidity",
+        "target_temp",
+        "target_temp_low",
+        "target_temp_high",
+        "target_humidity",
+        "saved_target_temp",
+        "saved_target_temp_low",
+        "saved_target_temp_high",
+        "saved_target_humidity",
+        "hvac_mode",
+        "humidity_sensor_stalled",
+        "cold_tolerance",
+        "hot_tolerance",
+        "heat_tolerance",
+        "cool_tolerance",
+        "target_offset",
+    )
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.humidity_sensor_stalled = False
+        self.target_offset = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _StateField:
+    """Expose an ``EnvironmentState`` slot as a private manager attribute.
+
+    ``EnvironmentManager._cur_temp`` reads and writes
+    ``EnvironmentManager._state.cur_temp``. The manager itself reads and
+    writes ``self._state`` and sets the range targets through their
+    properties. The descriptors only keep the private names working for code
+    outside the manager, such as a device's ``target_env_attr``.
+    """
+
+    __slots__ = ("_slot",)
+
+    def __set_name__(self, owner, name: str) -> None:
+        self._slot = name.lstrip("_")
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj._state, self._slot)
+
+    def __set__(self, obj, value) -> None:
+        setattr(obj._state, self._slot, value)
+
+
+class _ToleranceField(_StateField):
+    """State field whose writes invalidate the tolerance table.
+
+    The manager sets the tolerances once, before the table is first filled.
+    """
+
+    __slots__ = ()
+
+    def __set__(self, obj, value) -> None:
+        setattr(obj._state, self._slot, value)
+        obj._tolerance_table.clear()
+
+
+class _RangeTargetField(_StateField):
+    """State field that notifies listeners when a range target is set or cleared."""
+
+    __slots__ = ()
+
+    def __set__(self, obj, value) -> None:
+        obj._set_range_target(self._slot, value)
+
+
+def _compute_active_tolerance(
+    state: EnvironmentState, hvac_mode: HVACMode | None, target_attr: str
+) -> tuple[float, float]:
+    """Select the (cold, hot) tolerance pair, see ``_get_active_tolerance_for_mode``."""
+    legacy_cold = (
+        state.cold_tolerance if state.cold_tolerance is not None else DEFAULT_TOLERANCE
+    )
+    legacy_hot = (
+        state.hot_tolerance if state.hot_tolerance is not None else DEFAULT_TOLERANCE
+    )
+    heat_tolerance = state.heat_tolerance
+    cool_tolerance = state.cool_tolerance
+
+    if hvac_mode == HVACMode.HEAT_COOL:
+        if target_attr == "_target_temp_low":
+            hot = heat_tolerance if heat_tolerance is not None else legacy_hot
+            return (legacy_cold, hot)
+        if target_attr == "_target_temp_high":
+            cold = cool_tolerance if cool_tolerance is not None else legacy_cold
+            return (cold, legacy_hot)
+        return (legacy_cold, legacy_hot)
+
+    if hvac_mode == HVACMode.HEAT and heat_tolerance is not None:
+        return (heat_tolerance, heat_tolerance)
+
+    if hvac_mode in (HVACMode.COOL, HVACMode.FAN_ONLY) and cool_tolerance is not None:
+        return (cool_tolerance, cool_tolerance)
+
+    return (legacy_cold, legacy_hot)
+
+
 class EnvironmentManager(StateManager):
     """Class to manage the temperatures of the thermostat."""
 
+    _cur_temp = _StateField()
+    _cur_floor_temp = _StateField()
+    _cur_outside_temp = _StateField()
+    _cur_humidity = _StateField()
+    _target_temp = _StateField()
+    _target_temp_low = _RangeTargetField()
+    _target_temp_high = _RangeTargetField()
+    _target_humidity = _StateField()
+    _saved_target_temp = _StateField()
+    _saved_target_temp_low = _StateField()
+    _saved_target_temp_high = _StateField()
+    _saved_target_humidity = _StateField()
+    _hvac_mode = _StateField()
+    _humidity_sensor_stalled = _StateField()
+    _cold_tolerance = _ToleranceField()
+    _hot_tolerance = _ToleranceField()
+    _heat_tolerance = _ToleranceField()
+    _cool_tolerance = _ToleranceField()
+    _target_offset = _StateField()
+
     def __init__(self, hass: HomeAssistant, config: ConfigType):
+        self._state = EnvironmentState()
+        self._range_target_listeners: list[Callable[[], None]] = []
+        # (hvac_mode, target_attr) -> (cold, hot); cleared when a tolerance
+        # changes. Mode changes need no invalidation as the mode is in the key.
+        self._tolerance_table: dict[
+            tuple[HVACMode | None, str], tuple[float, float]
+        ] = {}
         self.hass = hass
         self._sensor_floor = config.get(CONF_FLOOR_SENSOR)
         self._sensor = config.get(CONF_SENSOR)
         self._outside_sensor = config.get(CONF_OUTSIDE_SENSOR)
         self._sensor_stale_duration: timedelta | None = config.get(CONF_STALE_DURATION)
+        self._sensor_humidity = config.get(CONF_HUMIDITY_SENSOR)
+        self._temp_sensors = aggregator_from_config(
+            config, CONF_SENSOR, CONF_SENSORS, TEMPERATURE_MIN_SPREAD
+        )
+        self._humidity_sensors = aggregator_from_config(
+            config, CONF_HUMIDITY_SENSOR, CONF_HUMIDITY_SENSORS, HUMIDITY_MIN_SPREAD
+        )
 
         self._min_temp = config.get(CONF_MIN_TEMP)
         self._max_temp = config.get(CONF_MAX_TEMP)
 
         self._min_humidity = config.get(CONF_MIN_HUMIDITY)
         self._max_himidity = config.get(CONF_MAX_HUMIDITY)
-        self._target_humidity = config.get(CONF_TARGET_HUMIDITY)
+        self._state.target_humidity = config.get(CONF_TARGET_HUMIDITY)
         self._moist_tolerance = config.get(CONF_MOIST_TOLERANCE) or 0
         self._dry_tolerance = config.get(CONF_DRY_TOLERANCE) or 0
 
         self._max_floor_temp = config.get(CONF_MAX_FLOOR_TEMP)
         self._min_floor_temp = config.get(CONF_MIN_FLOOR_TEMP)
 
-        self._target_temp = config.get(CONF_TARGET_TEMP)
-        self._target_temp_high = config.get(CONF_TARGET_TEMP_HIGH)
-        self._target_temp_low = config.get(CONF_TARGET_TEMP_LOW)
+        self._state.target_temp = config.get(CONF_TARGET_TEMP)
+        self.target_temp_high = config.get(CONF_TARGET_TEMP_HIGH)
+        self.target_temp_low = config.get(CONF_TARGET_TEMP_LOW)
         self._temp_target_temperature_step = config.get(CONF_TEMP_STEP)
 
-        self._cold_tolerance = config.get(CONF_COLD_TOLERANCE)
-        self._hot_tolerance = config.get(CONF_HOT_TOLERANCE)
-        self._heat_tolerance = config.get(CONF_HEAT_TOLERANCE)
-        self._cool_tolerance = config.get(CONF_COOL_TOLERANCE)
+        self._state.cold_tolerance = config.get(CONF_COLD_TOLERANCE)
+        self._state.hot_tolerance = config.get(CONF_HOT_TOLERANCE)
+        self._state.heat_tolerance = config.get(CONF_HEAT_TOLERANCE)
+        self._state.cool_tolerance = config.get(CONF_COOL_TOLERANCE)
         self._fan_hot_tolerance = config.get(CONF_FAN_HOT_TOLERANCE)
 
-        self._hvac_mode = None
-        self._saved_target_temp = self.target_temp or None
-        self._saved_target_temp_low = None
-        self._saved_target_temp_high = None
+        self._state.hvac_mode = None
+        self._state.saved_target_temp = self._state.target_temp or None
+        self._state.saved_target_temp_low = None
+        self._state.saved_target_temp_high = None
         self._temp_precision = config.get(CONF_PRECISION)
 
         self._temperature_unit = hass.config.units.temperature_unit
 
-        self._cur_temp = None
-        self._cur_floor_temp = None
-        self._cur_outside_temp = None
-        self._cur_humidity = None
-        self._saved_target_humidity = None
+        self._state.cur_temp = None
+        self._state.cur_floor_temp = None
+        self._state.cur_outside_temp = None
+        self._state.cur_humidity = None
+        self._state.saved_target_humidity = None
         self._config_heat_cool_mode = config.get(CONF_HEAT_COOL_MODE) or False
         self._config = config
 
         self._use_apparent_temp = config.get(CONF_USE_APPARENT_TEMP, False)
-        self._humidity_sensor_stalled = False
+        self._heat_index_table = (
+            _get_heat_index_table()
+            if self._use_apparent_temp and config.get(CONF_APPARENT_TEMP_LOOKUP)
+            else None
+        )
+        # ((cur_temp, cur_humidity, unit, humidity stalled), apparent temp)
+        self._apparent_temp_cache: tuple[tuple, float | None] | None = None
+        self._state.humidity_sensor_stalled = False
 
     @property
     def sensor_entity_id(self) -> str | None:
         """Return the temperature sensor entity id (CONF_SENSOR)."""
         return self._sensor
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the current readings, targets and tolerances."""
+        return {
+            "state": self._state.as_dict(),
+            "sensors": {
+                "temperature": self._sensor,
+                "floor": self._sensor_floor,
+                "outside": self._outside_sensor,
+            },
+            "aggregates": {
+                "temperature": (
+                    self._temp_sensors.diagnostics() if self._temp_sensors else None
+                ),
+                "humidity": (
+                    self._humidity_sensors.diagnostics()
+                    if self._humidity_sensors
+                    else None
+                ),
+            },
+            "apparent_temp": self.apparent_temp if self._use_apparent_temp else None,
+            "active_tolerance": self._get_active_tolerance_for_mode(),
+        }
+
+    @property
+    def temp_sensor_ids(self) -> list[str]:
+        """Return all temperature sensors the current temperature is read from."""
+        if self._temp_sensors is not None:
+            return self._temp_sensors.entity_ids
+        return [self._sensor]
+
+    @property
+    def humidity_sensor_ids(self) -> list[str]:
+        """Return all humidity sensors the current humidity is read from."""
+        if self._humidity_sensors is not None:
+            return self._humidity_sensors.entity_ids
+        return [self._sensor_humidity] if self._sensor_humidity else []
+
     @property
     def cur_temp(self) -> float:
-        return self._cur_temp
+        return self._state.cur_temp
 
     @cur_temp.setter
     def cur_temp(self, temp: float) -> None:
         _LOGGER.debug("Setting current temperature: %s", temp)
-        self._cur_temp = temp
+        self._state.cur_temp = temp
 
     @property
     def cur_floor_temp(self) -> float:
-        return self._cur_floor_temp
+        return self._state.cur_floor_temp
 
     @cur_floor_temp.setter
     def cur_floor_temp(self, temperature) -> None:
-        self._cur_floor_temp = temperature
+        self._state.cur_floor_temp = temperature
 
     @property
     def cur_outside_temp(self) -> float:
-        return self._cur_outside_temp
+        return self._state.cur_outside_temp
 
     @property
     def apparent_temp(self) -> float | None:
@@ -185,22 +442,47 @@ class EnvironmentManager(StateManager):
 
         Otherwise returns the NWS Rothfusz heat index, computed in °F and
         converted back to the user's unit.
+
+        The result is memoized on (cur_temp, cur_humidity, unit, stall flag),
+        so repeated reads within and across control passes cost one tuple
+        comparison until a sensor changes.
         """
         if not self._use_apparent_temp:
-            return self._cur_temp
-        if self._cur_temp is None or self._cur_humidity is None:
-            return self._cur_temp
-        if self._humidity_sensor_stalled:
-            return self._cur_temp
+            return self._state.cur_temp
+        state = self._state
+        key = (
+            state.cur_temp,
+            state.cur_humidity,
+            self._temperature_unit,
+            state.humidity_sensor_stalled,
+        )
+        cache = self._apparent_temp_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        value = self._compute_apparent_temp()
+        self._apparent_temp_cache = (key, value)
+        return value
+
+    def _compute_apparent_temp(self) -> float | None:
+        if self._state.cur_temp is None or self._state.cur_humidity is None:
+            return self._state.cur_temp
+        if self._state.humidity_sensor_stalled:
+            return self._state.cur_temp
         cur_c = TemperatureConverter.convert(
-            self._cur_temp, self._temperature_unit, UnitOfTemperature.CELSIUS
+            self._state.cur_temp, self._temperature_unit, UnitOfTemperature.CELSIUS
         )
         if cur_c < 27.0:
-            return self._cur_temp
+            return self._state.cur_temp
+        if self._heat_index_table is not None:
+            hi_c = self._heat_index_table.lookup(cur_c, self._state.cur_humidity)
+            if hi_c is not None:
+                return TemperatureConverter.convert(
+                    hi_c, UnitOfTemperature.CELSIUS, self._temperature_unit
+                )
         cur_f = TemperatureConverter.convert(
-            self._cur_temp, self._temperature_unit, UnitOfTemperature.FAHRENHEIT
+            self._state.cur_temp, self._temperature_unit, UnitOfTemperature.FAHRENHEIT
         )
-        hi_f = _rothfusz_heat_index_f(cur_f, self._cur_humidity)
+        hi_f = _rothfusz_heat_index_f(cur_f, self._state.cur_humidity)
         return TemperatureConverter.convert(
             hi_f, UnitOfTemperature.FAHRENHEIT, self._temperature_unit
         )
@@ -214,33 +496,66 @@ class EnvironmentManager(StateManager):
         """
         if mode == HVACMode.COOL:
             return self.apparent_temp
-        return self._cur_temp
+        return self._state.cur_temp
 
     @property
     def target_temp(self) -> float:
-        return self._target_temp
+        return self._state.target_temp
 
     @target_temp.setter
     def target_temp(self, temp: float) -> None:
         _LOGGER.debug("Setting target temperature property: %s", temp)
-        self._target_temp = temp
+        self._state.target_temp = temp
+
+    @property
+    def target_offset(self) -> float:
+        """Return the planned shift of the targets used in the comparisons."""
+        return self._state.target_offset
+
+    @target_offset.setter
+    def target_offset(self, offset: float) -> None:
+        self._state.target_offset = offset
+
+    @property
+    def hvac_mode(self) -> HVACMode | None:
+        """Return the mode set for tolerance selection."""
+        return self._state.hvac_mode
 
     @property
     def target_temp_high(self) -> float:
-        return self._target_temp_high
+        return self._state.target_temp_high
 
     @target_temp_high.setter
     def target_temp_high(self, temp: float) -> None:
-        self._target_temp_high = temp
+        self._set_range_target("target_temp_high", temp)
 
     @property
     def target_temp_low(self) -> float:
-        return self._target_temp_low
+        return self._state.target_temp_low
 
     @target_temp_low.setter
     def target_temp_low(self, temp: float) -> None:
         _LOGGER.debug("Setting target temperature low: %s", temp)
-        self._target_temp_low = temp
+        self._set_range_target("target_temp_low", temp)
+
+    def _set_range_target(self, slot: str, temp: float | None) -> None:
+        """Set a range target, notifying the listeners when it is set or cleared."""
+        state = self._state
+        was_set = getattr(state, slot) is not None
+        setattr(state, slot, temp)
+        if was_set != (temp is not None):
+            for listener in self._range_target_listeners:
+                listener()
+
+    @property
+    def has_target_temp_range(self) -> bool:
+        """Return True when both range targets are set."""
+        state = self._state
+        return state.target_temp_low is not None and state.target_temp_high is not None
+
+    def add_range_target_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` whenever a range target is set or cleared."""
+        self._range_target_listeners.append(listener)
 
     @property
     def target_temperature_step(self) -> float:
@@ -280,37 +595,37 @@ class EnvironmentManager(StateManager):
 
     @property
     def saved_target_temp(self) -> float:
-        return self._saved_target_temp
+        return self._state.saved_target_temp
 
     @saved_target_temp.setter
     def saved_target_temp(self, temp: float) -> None:
         _LOGGER.debug("Setting saved target temp: %s", temp)
-        self._saved_target_temp = temp
+        self._state.saved_target_temp = temp
 
     @property
     def saved_target_temp_low(self) -> float:
-        return self._saved_target_temp_low
+        return self._state.saved_target_temp_low
 
     @saved_target_temp_low.setter
     def saved_target_temp_low(self, temp: float) -> None:
         _LOGGER.debug("Setting saved target temp low: %s", temp)
-        self._saved_target_temp_low = temp
+        self._state.saved_target_temp_low = temp
 
     @property
     def saved_target_temp_high(self) -> float:
-        return self._saved_target_temp_high
+        return self._state.saved_target_temp_high
 
     @saved_target_temp_high.setter
     def saved_target_temp_high(self, temp: float) -> None:
-        self._saved_target_temp_high = temp
+        self._state.saved_target_temp_high = temp
 
     @property
     def saved_target_humidity(self) -> float:
-        return self._saved_target_humidity
+        return self._state.saved_target_humidity
 
     @saved_target_humidity.setter
     def saved_target_humidity(self, humidity: float) -> None:
-        self._saved_target_humidity = humidity
+        self._state.saved_target_humidity = humidity
 
     @property
     def fan_hot_tolerance(self) -> float:
@@ -326,23 +641,23 @@ class EnvironmentManager(StateManager):
 
     @property
     def target_humidity(self) -> float:
-        return self._target_humidity
+        return self._state.target_humidity
 
     @target_humidity.setter
     def target_humidity(self, humidity: float) -> None:
-        self._target_humidity = humidity
+        self._state.target_humidity = humidity
 
     @property
     def cur_humidity(self) -> float:
-        return self._cur_humidity
+        return self._state.cur_humidity
 
     @property
     def humidity_sensor_stalled(self) -> bool:
-        return self._humidity_sensor_stalled
+        return self._state.humidity_sensor_stalled
 
     @humidity_sensor_stalled.setter
     def humidity_sensor_stalled(self, value: bool) -> None:
-        self._humidity_sensor_stalled = bool(value)
+        self._state.humidity_sensor_stalled = bool(value)
 
     def get_env_attr_type(self, attr: str) -> EnvironmentAttributeType:
         return (
@@ -362,7 +677,7 @@ class EnvironmentManager(StateManager):
             hvac_mode (HVACMode): Current HVAC mode from Home Assistant climate platform.
         """
         _LOGGER.debug("Setting HVAC mode for tolerance selection: %s", hvac_mode)
-        self._hvac_mode = hvac_mode
+        self._state.hvac_mode = hvac_mode
 
     def _get_active_tolerance_for_mode(
         self, target_attr: str = "_target_temp"
@@ -388,48 +703,17 @@ class EnvironmentManager(StateManager):
             - Otherwise: legacy directional tolerances.
         Both returned values are always valid floats (never None).
         """
-        legacy_cold = (
-            self._cold_tolerance
-            if self._cold_tolerance is not None
-            else DEFAULT_TOLERANCE
-        )
-        legacy_hot = (
-            self._hot_tolerance
-            if self._hot_tolerance is not None
-            else DEFAULT_TOLERANCE
-        )
-
-        if self._hvac_mode == HVACMode.HEAT_COOL:
-            if target_attr == "_target_temp_low":
-                hot = (
-                    self._heat_tolerance
-                    if self._heat_tolerance is not None
-                    else legacy_hot
-                )
-                return (legacy_cold, hot)
-            if target_attr == "_target_temp_high":
-                cold = (
-                    self._cool_tolerance
-                    if self._cool_tolerance is not None
-                    else legacy_cold
-                )
-                return (cold, legacy_hot)
-            return (legacy_cold, legacy_hot)
-
-        if self._hvac_mode == HVACMode.HEAT and self._heat_tolerance is not None:
-            return (self._heat_tolerance, self._heat_tolerance)
-
-        if (
-            self._hvac_mode in (HVACMode.COOL, HVACMode.FAN_ONLY)
-            and self._cool_tolerance is not None
-        ):
-            return (self._cool_tolerance, self._cool_tolerance)
-
-        return (legacy_cold, legacy_hot)
+        key = (self._state.hvac_mode, target_attr)
+        try:
+            return self._tolerance_table[key]
+        except KeyError:
+            tolerances = _compute_active_tolerance(self._state, *key)
+            self._tolerance_table[key] = tolerances
+            return tolerances
 
     def set_temperature_range_from_saved(self) -> None:
-        self.target_temp_low = self.saved_target_temp_low
-        self.target_temp_high = self.saved_target_temp_high
+        self.target_temp_low = self._state.saved_target_temp_low
+        self.target_temp_high = self._state.saved_target_temp_high
 
     def set_temperature_range_from_hvac_mode(
         self, temperature: float, hvac_mode: HVACMode
@@ -438,18 +722,22 @@ class EnvironmentManager(StateManager):
         self.set_temperature_target(temperature)
 
         if hvac_mode == HVACMode.HEAT:
-            self.set_temperature_range(temperature, temperature, self.target_temp_high)
+            self.set_temperature_range(
+                temperature, temperature, self._state.target_temp_high
+            )
 
         else:
-            self.set_temperature_range(temperature, self.target_temp_low, temperature)
+            self.set_temperature_range(
+                temperature, self._state.target_temp_low, temperature
+            )
 
     def set_temperature_target(self, temperature: float) -> None:
         _LOGGER.info("Setting target temperature: %s", temperature)
         if temperature is None:
             return
 
-        self._target_temp = temperature
-        # self._saved_target_temp = temperature
+        self._state.target_temp = temperature
+        # self._state.saved_target_temp = temperature
 
     def set_temperature_range(
         self, temperature: float, temp_low: float, temp_high: float
@@ -474,39 +762,43 @@ class EnvironmentManager(StateManager):
         if temp_high < temp_low:
             temp_high = temp_low + PRECISION_WHOLE
 
-        self._target_temp = temperature
-        self._target_temp_low = temp_low
-        self._target_temp_high = temp_high
+        self._state.target_temp = temperature
+        self.target_temp_low = temp_low
+        self.target_temp_high = temp_high
+
+    def _target(self, target_attr: str) -> float | None:
+        """Return the target a device names by its ``target_env_attr``."""
+        return getattr(self._state, target_attr[1:])
 
     def is_within_fan_tolerance(self, target_attr="_target_temp") -> bool:
         """Checks if the current temperature is below target."""
-        if self._cur_temp is None or self._fan_hot_tolerance is None:
+        if self._state.cur_temp is None or self._fan_hot_tolerance is None:
             return False
         if self._fan_hot_tolerance <= 0:
             return False
-        target_temp = getattr(self, target_attr)
+        target_temp = self._target(target_attr)
 
-        too_hot_for_ac_temp = target_temp + self._hot_tolerance
+        too_hot_for_ac_temp = target_temp + self._state.hot_tolerance
         too_hot_for_fan_temp = (
-            target_temp + self._hot_tolerance + self._fan_hot_tolerance
+            target_temp + self._state.hot_tolerance + self._fan_hot_tolerance
         )
 
         _LOGGER.info(
             "is_within_fan_tolerance, cur_temp: %s,  %s, %s",
-            self._cur_temp,
+            self._state.cur_temp,
             too_hot_for_ac_temp,
             too_hot_for_fan_temp,
         )
 
         return (
-            self._cur_temp >= too_hot_for_ac_temp
-            and self._cur_temp <= too_hot_for_fan_temp
+            self._state.cur_temp >= too_hot_for_ac_temp
+            and self._state.cur_temp <= too_hot_for_fan_temp
         )
 
     @property
     def is_warmer_outside(self) -> bool:
         """Checks if the outside temperature is warmer or equal than the inside temperature."""
-        if self._cur_temp is None or self._outside_sensor is None:
+        if self._state.cur_temp is None or self._outside_sensor is None:
             return False
 
         outside_state = self.hass.states.get(self._outside_sensor)
@@ -514,13 +806,15 @@ class EnvironmentManager(StateManager):
             return False
 
         outside_temp = float(outside_state.state)
-        return outside_temp >= self._cur_temp
+        return outside_temp >= self._state.cur_temp
 
     def is_too_cold(self, target_attr="_target_temp") -> bool:
         """Checks if the current temperature is below target."""
-        target_temp = getattr(self, target_attr)
-        if self._cur_temp is None or target_temp is None:
+        cur_temp = self._state.cur_temp
+        target_temp = self._target(target_attr)
+        if cur_temp is None or target_temp is None:
             return False
+        target_temp += self._state.target_offset
 
         cold_tolerance, _ = self._get_active_tolerance_for_mode(target_attr)
 
@@ -528,23 +822,25 @@ class EnvironmentManager(StateManager):
             "is_too_cold - target temp attr: %s, Target temp: %s, current temp: %s, tolerance: %s",
             target_attr,
             target_temp,
-            self._cur_temp,
+            cur_temp,
             cold_tolerance,
         )
-        return self._cur_temp <= target_temp - cold_tolerance
+        return cur_temp <= target_temp - cold_tolerance
 
     def is_too_hot(self, target_attr="_target_temp") -> bool:
         """Checks if the current temperature is above target.
 
-        Uses ``effective_temp_for_mode(self._hvac_mode)`` so that COOL mode
+        Uses ``effective_temp_for_mode(self._state.hvac_mode)`` so that COOL mode
         with ``CONF_USE_APPARENT_TEMP`` enabled compares against the heat
         index. All other modes compare against raw ``cur_temp`` (the
         selector returns ``cur_temp`` for them).
         """
-        target_temp = getattr(self, target_attr)
-        active_temp = self.effective_temp_for_mode(self._hvac_mode)
+        state = self._state
+        target_temp = self._target(target_attr)
+        active_temp = self.effective_temp_for_mode(state.hvac_mode)
         if active_temp is None or target_temp is None:
             return False
+        target_temp += state.target_offset
 
         _, hot_tolerance = self._get_active_tolerance_for_mode(target_attr)
 
@@ -554,39 +850,45 @@ class EnvironmentManager(StateManager):
             target_attr,
             target_temp,
             active_temp,
-            self._cur_temp,
-            self._hvac_mode,
+            state.cur_temp,
+            state.hvac_mode,
             hot_tolerance,
         )
         return active_temp >= target_temp + hot_tolerance
 
     def is_equal_to_target(self, target_attr="_target_temp") -> bool:
         """Checks if the current temperature is equal to target."""
-        target_temp = getattr(self, target_attr)
-        if self._cur_temp is None or target_temp is None:
+        target_temp = self._target(target_attr)
+        if self._state.cur_temp is None or target_temp is None:
             return False
 
-        return self._cur_temp == target_temp
+        return self._state.cur_temp == target_temp
 
     @property
     def is_too_moist(self) -> bool:
         """Checks if the current humidity is above target."""
-        if self._cur_humidity is None or self._target_humidity is None:
+        if self._state.cur_humidity is None or self._state.target_humidity is None:
             return False
-        return self._cur_humidity >= self._target_humidity + self._moist_tolerance
+        return (
+            self._state.cur_humidity
+            >= self._state.target_humidity + self._moist_tolerance
+        )
 
     @property
     def is_too_dry(self) -> bool:
         """Checks if the current humidity is below target."""
-        if self._cur_humidity is None or self._target_humidity is None:
+        if self._state.cur_humidity is None or self._state.target_humidity is None:
             return False
         _LOGGER.debug(
             "is_too_dry - Target humidity: %s, current humidity: %s, tolerance: %s",
-            self._target_humidity,
-            self._cur_humidity,
+            self._state.target_humidity,
+            self._state.cur_humidity,
             self._dry_tolerance,
         )
-        return self._cur_humidity <= self._target_humidity - self._dry_tolerance
+        return (
+            self._state.cur_humidity
+            <= self._state.target_humidity - self._dry_tolerance
+        )
 
     @property
     def is_floor_hot(self) -> bool:
@@ -594,8 +896,8 @@ class EnvironmentManager(StateManager):
         if (
             (self._sensor_floor is not None)
             and (self._max_floor_temp is not None)
-            and (self._cur_floor_temp is not None)
-            and (self.cur_floor_temp >= self.max_floor_temp)
+            and (self._state.cur_floor_temp is not None)
+            and (self._state.cur_floor_temp >= self._max_floor_temp)
         ):
             return True
         return False
@@ -606,8 +908,8 @@ class EnvironmentManager(StateManager):
         if (
             (self._sensor_floor is not None)
             and (self._min_floor_temp is not None)
-            and (self._cur_floor_temp is not None)
-            and (self.cur_floor_temp <= self.min_floor_temp)
+            and (self._state.cur_floor_temp is not None)
+            and (self._state.cur_floor_temp <= self._min_floor_temp)
         ):
             return True
         return False
@@ -619,10 +921,28 @@ class EnvironmentManager(StateManager):
             cur_temp = float(state.state)
             if not math.isfinite(cur_temp):
                 raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_temp = cur_temp
+            if self._temp_sensors is not None:
+                cur_temp = self._temp_sensors.update(state.entity_id, cur_temp)
+            self._state.cur_temp = cur_temp
+            self._apparent_temp_cache = None
         except ValueError as ex:
             _LOGGER.error("Unable to update from sensor: %s", ex)
 
+    @callback
+    def discard_temp_sensor(self, entity_id: str) -> bool:
+        """Drop an unavailable temperature sensor from the aggregate.
+
+        Returns whether the current temperature changed.
+        """
+        if self._temp_sensors is None:
+            return False
+        cur_temp = self._temp_sensors.discard(entity_id)
+        if cur_temp is None or cur_temp == self._state.cur_temp:
+            return False
+        self._state.cur_temp = cur_temp
+        self._apparent_temp_cache = None
+        return True
+
     @callback
     def update_floor_temp_from_state(self, state: State):
         """Update ermostat with latest floor temp state from floor temp sensor."""
@@ -630,7 +950,7 @@ class EnvironmentManager(StateManager):
             cur_floor_temp = float(state.state)
             if not math.isfinite(cur_floor_temp):
                 raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_floor_temp = cur_floor_temp
+            self._state.cur_floor_temp = cur_floor_temp
         except ValueError as ex:
             _LOGGER.error("Unable to update from floor temp sensor: %s", ex)
 
@@ -641,7 +961,7 @@ class EnvironmentManager(StateManager):
             cur_outside_temp = float(state.state)
             if not math.isfinite(cur_outside_temp):
                 raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_outside_temp = cur_outside_temp
+            self._state.cur_outside_temp = cur_outside_temp
         except ValueError as ex:
             _LOGGER.error("Unable to update from outside temp sensor: %s", ex)
 
@@ -652,17 +972,37 @@ class EnvironmentManager(StateManager):
             cur_humidity = float(state.state)
             if not math.isfinite(cur_humidity):
                 raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_humidity = cur_humidity
+            if self._humidity_sensors is not None:
+                cur_humidity = self._humidity_sensors.update(
+                    state.entity_id, cur_humidity
+                )
+            self._state.cur_humidity = cur_humidity
+            self._apparent_temp_cache = None
         except ValueError as ex:
             _LOGGER.error("Unable to update from humidity sensor: %s", ex)
 
+    @callback
+    def discard_humidity_sensor(self, entity_id: str) -> bool:
+        """Drop an unavailable humidity sensor from the aggregate.
+
+        Returns whether the current humidity changed.
+        """
+        if self._humidity_sensors is None:
+            return False
+        cur_humidity = self._humidity_sensors.discard(entity_id)
+        if cur_humidity is None or cur_humidity == self._state.cur_humidity:
+            return False
+        self._state.cur_humidity = cur_humidity
+        self._apparent_temp_cache = None
+        return True
+
     def set_default_target_humidity(self) -> None:
         """Set default values for target humidity."""
-        if self._target_humidity is not None:
+        if self._state.target_humidity is not None:
             return
 
         _LOGGER.info("Setting default target humidity")
-        self._target_humidity = 50
+        self._state.target_humidity = 50
 
     def set_default_target_temps(
         self, is_target_mode: bool, is_range_mode: bool, hvac_mode: HVACMode
@@ -685,70 +1025,73 @@ class EnvironmentManager(StateManager):
         _LOGGER.info(
             "Setting default target temperature target mode: %s, target_temp: %s",
             hvac_mode,
-            self._target_temp,
+            self._state.target_temp,
         )
         _LOGGER.debug(
             "saved target temp low: %s, saved target temp high: %s",
-            self._saved_target_temp_low,
-            self._saved_target_temp_high,
+            self._state.saved_target_temp_low,
+            self._state.saved_target_temp_high,
         )
 
         if hvac_mode == HVACMode.COOL or hvac_mode == HVACMode.FAN_ONLY:
-            if self._saved_target_temp_high is None:
-                if self._target_temp is not None:
+            if self._state.saved_target_temp_high is None:
+                if self._state.target_temp is not None:
                     return
-                self._target_temp = self.max_temp
+                self._state.target_temp = self.max_temp
                 _LOGGER.warning(
                     "Undefined target high temperature, falling back to %s",
-                    self._target_temp,
+                    self._state.target_temp,
                 )
             else:
                 _LOGGER.debug(
                     "Setting target temp to saved target temp high: %s",
-                    self._saved_target_temp_high,
+                    self._state.saved_target_temp_high,
                 )
-                self._target_temp = self._saved_target_temp_high
+                self._state.target_temp = self._state.saved_target_temp_high
             # return
 
         if hvac_mode == HVACMode.HEAT:
-            if self._saved_target_temp_low is None:
-                if self._target_temp is not None:
+            if self._state.saved_target_temp_low is None:
+                if self._state.target_temp is not None:
                     return
-                self._target_temp = self.min_temp
+                self._state.target_temp = self.min_temp
                 _LOGGER.warning(
                     "Undefined target low temperature, falling back to %s",
-                    self._target_temp,
+                    self._state.target_temp,
                 )
             else:
                 _LOGGER.debug(
                     "Setting target temp to saved target temp low: %s",
-                    self._saved_target_temp_low,
+                    self._state.saved_target_temp_low,
                 )
-                self._target_temp = self._saved_target_temp_low
+                self._state.target_temp = self._state.saved_target_temp_low
 
     def _set_default_temps_range_mode(self) -> None:
-        if self._target_temp_low is not None and self._target_temp_high is not None:
+        if (
+            self._state.target_temp_low is not None
+            and self._state.target_temp_high is not None
+        ):
             return
         _LOGGER.info("Setting default target temperature range mode")
 
-        if self._target_temp is None:
-            self._target_temp = self.min_temp
-            self._target_temp_low = self.min_temp
-            self._target_temp_high = self.max_temp
+        if self._state.target_temp is None:
+            self._state.target_temp = self.min_temp
+            self.target_temp_low = self.min_temp
+            self.target_temp_high = self.max_temp
             _LOGGER.warning(
                 "Undefined target temperature range, fell back to %s-%s-%s",
-                self._target_temp,
-                self._target_temp_low,
-                self._target_temp_high,
+                self._state.target_temp,
+                self._state.target_temp_low,
+                self._state.target_temp_high,
             )
             return
 
-        self._target_temp_low = self._target_temp
-        self._target_temp_high = self._target_temp
-        if self._target_temp + PRECISION_WHOLE >= self.max_temp:
-            self._target_temp_low -= PRECISION_WHOLE
+        self.target_temp_low = self._state.target_temp
+        self.target_temp_high = self._state.target_temp
+        if self._state.target_temp + PRECISION_WHOLE >= self.max_temp:
+            self.target_temp_low -= PRECISION_WHOLE
         else:
-            self._target_temp_high += PRECISION_WHOLE
+            self.target_temp_high += PRECISION_WHOLE
 
     def set_humidity_from_preset(
         self,
@@ -765,14 +1108,14 @@ class EnvironmentManager(StateManager):
         )
 
         if preset_mode == PRESET_NONE:
-            if self.saved_target_humidity:
-                self.target_humidity = self.saved_target_humidity
+            if self._state.saved_target_humidity:
+                self._state.target_humidity = self._state.saved_target_humidity
 
         else:
             if preset_env.to_dict[ATTR_HUMIDITY] is not None:
                 if old_preset_mode != preset_mode:
-                    self.saved_target_humidity = self.target_humidity
-                self.target_humidity = preset_env.to_dict[ATTR_HUMIDITY]
+                    self._state.saved_target_humidity = self._state.target_humidity
+                self._state.target_humidity = preset_env.to_dict[ATTR_HUMIDITY]
 
     def set_temepratures_from_hvac_mode_and_presets(
         self,
@@ -885,7 +1228,7 @@ class EnvironmentManager(StateManager):
                 _LOGGER.debug(
                     "Setting temperatures from preset target mode if target_temp set"
                 )
-                self.target_temp = preset_temp
+                self._state.target_temp = preset_temp
                 return
 
             # Only needed past the single-temp early return; the getters may
@@ -896,9 +1239,9 @@ class EnvironmentManager(StateManager):
             if preset_temp_low is None and preset_temp_high is None:
                 _LOGGER.debug(
                     "Setting temperatures from preset target mode when preset not in presets_range. Saved temp: %s",
-                    self._saved_target_temp,
+                    self._state.saved_target_temp,
                 )
-                self.target_temp = self._saved_target_temp
+                self._state.target_temp = self._state.saved_target_temp
 
             # handles when temperature is not set in preset but temp range is set
             else:
@@ -913,19 +1256,19 @@ class EnvironmentManager(StateManager):
                             "Setting temperatures from preset range mode if HVACMode.HEAT. Preset: %s",
                             preset_temp_low,
                         )
-                        self._target_temp = preset_temp_low
+                        self._state.target_temp = preset_temp_low
                 elif hvac_mode in [HVACMode.COOL, HVACMode.FAN_ONLY] and (
                     preset_temp_high is not None
                 ):
                     _LOGGER.debug(
                         "Setting temperatures from preset range mode if HVACMode.COOL, HVACMode.FAN_ONLY. Preset: %s, sved_target_temp: %s",
                         preset_temp_high,
-                        self._saved_target_temp,
+                        self._state.saved_target_temp,
                     )
                     preset_match_old = old_preset_mode == preset_mode
-                    self._target_temp = (
-                        self._saved_target_temp
-                        if preset_match_old and self._saved_target_temp
+                    self._state.target_temp = (
+                        self._state.saved_target_temp
+                        if preset_match_old and self._state.saved_target_temp
                         else preset_temp_high
                     )
                 else:
@@ -937,30 +1280,30 @@ class EnvironmentManager(StateManager):
             _LOGGER.debug(
                 "Setting temperatures from no preset range mode. Old preset: %s, target temp low: %s, target temp high: %s, saved target temp low: %s, saved target temp high: %s",
                 old_preset_mode,
-                self.target_temp_low,
-                self.target_temp_high,
-                self.saved_target_temp_low,
-                self.saved_target_temp_high,
+                self._state.target_temp_low,
+                self._state.target_temp_high,
+                self._state.saved_target_temp_low,
+                self._state.saved_target_temp_high,
             )
             self.target_temp_low = (
-                self.saved_target_temp_low
-                if self.saved_target_temp_low
-                else self.target_temp_low
+                self._state.saved_target_temp_low
+                if self._state.saved_target_temp_low
+                else self._state.target_temp_low
             )
             self.target_temp_high = (
-                self.saved_target_temp_high
-                if self.saved_target_temp_high
-                else self.target_temp_high
+                self._state.saved_target_temp_high
+                if self._state.saved_target_temp_high
+                else self._state.target_temp_high
             )
         else:
             _LOGGER.debug(
                 "Setting temperatures from no preset range mode. Old preset: %s, target temp low: %s, target temp high: %s",
                 old_preset_mode,
-                self.target_temp_low,
-                self.target_temp_high,
+                self._state.target_temp_low,
+                self._state.target_temp_high,
             )
-            self.saved_target_temp_low = self.target_temp_low
-            self.saved_target_temp_high = self.target_temp_high
+            self._state.saved_target_temp_low = self._state.target_temp_low
+            self._state.saved_target_temp_high = self._state.target_temp_high
 
     def _set_temps_when_target_mode(
         self,
@@ -971,37 +1314,37 @@ class EnvironmentManager(StateManager):
         if (
             old_preset_mode is not PRESET_NONE
             and old_preset_mode is not None
-            and self.saved_target_temp is not None
+            and self._state.saved_target_temp is not None
         ):
             _LOGGER.debug(
                 "Setting temperatures from no preset target mode. Old preset: %s, saved target temp: %s",
                 old_preset_mode,
-                self.saved_target_temp,
+                self._state.saved_target_temp,
             )
-            self.target_temp = self.saved_target_temp
+            self._state.target_temp = self._state.saved_target_temp
         # switching from preset NONE to NONE
         elif supports_temp_range:
             if (
                 hvac_mode in [HVACMode.COOL, HVACMode.FAN_ONLY]
-                and self.target_temp_high is not None
+                and self._state.target_temp_high is not None
             ):
                 _LOGGER.debug(
                     "Setting temperatures from no preset target mode. HVACMode.COOL, target temp: %s",
-                    self.target_temp,
+                    self._state.target_temp,
                 )
-                self.target_temp = self.target_temp_high
+                self._state.target_temp = self._state.target_temp_high
 
-            elif hvac_mode == HVACMode.HEAT and self.target_temp_low is not None:
+            elif hvac_mode == HVACMode.HEAT and self._state.target_temp_low is not None:
                 _LOGGER.debug(
                     "Setting temperatures from no preset target mode. HVACMode.HEAT, target temp: %s",
-                    self.target_temp,
+                    self._state.target_temp,
                 )
-                self.target_temp = self.target_temp_low
+                self._state.target_temp = self._state.target_temp_low
         else:
             _LOGGER.debug(
                 "Setting temperatures from no preset target mode. Fallback to target_temp"
             )
-            self.saved_target_temp = self.target_temp
+            self._state.saved_target_temp = self._state.target_temp
 
     def _set_floor_temp_limits_from_preset(self, preset_env: PresetEnv) -> None:
         _LOGGER.debug("Setting floor temp limits from preset: %s", preset_env.to_dict)
@@ -1016,8 +1359,8 @@ class EnvironmentManager(StateManager):
                 "min_floor_temp"
             ] or self._config.get(CONF_MIN_FLOOR_TEMP)
 
-            self.max_floor_temp = preset_max_floor_temp
-            self.min_floor_temp = preset_min_floor_temp
+            self._max_floor_temp = preset_max_floor_temp
+            self._min_floor_temp = preset_min_floor_temp
 
     def _set_floor_temp_limits_from_config(self) -> None:
         _LOGGER.debug("Setting floor temp limits from config")
@@ -1036,19 +1379,19 @@ class EnvironmentManager(StateManager):
         _LOGGER.debug("Old state attributes: %s", old_state.attributes)
 
         # If we have no initial temperature, restore
-        if self._target_temp_low is None and self._config_heat_cool_mode:
+        if self._state.target_temp_low is None and self._config_heat_cool_mode:
             old_target_min = old_state.attributes.get(
                 ATTR_PREV_TARGET_LOW
             ) or old_state.attributes.get(ATTR_TARGET_TEMP_LOW)
             if old_target_min is not None:
-                self._target_temp_low = float(old_target_min)
-        if self._target_temp_high is None and self._config_heat_cool_mode:
+                self.target_temp_low = float(old_target_min)
+        if self._state.target_temp_high is None and self._config_heat_cool_mode:
             old_target_max = old_state.attributes.get(
                 ATTR_PREV_TARGET_HIGH
             ) or old_state.attributes.get(ATTR_TARGET_TEMP_HIGH)
             if old_target_max is not None:
-                self._target_temp_high = float(old_target_max)
-        if self._target_temp is None:
+                self.target_temp_high = float(old_target_max)
+        if self._state.target_temp is None:
             _LOGGER.info("Restoring previous target temperature")
             old_target = old_state.attributes.get(ATTR_PREV_TARGET)
             if old_target is None:
@@ -1060,14 +1403,14 @@ class EnvironmentManager(StateManager):
             if old_target is not None:
                 _LOGGER.info("Restoring previous target temperature: %s", old_target)
 
-                self._target_temp = float(old_target)
+                self._state.target_temp = float(old_target)
 
-        if self._target_humidity is None:
+        if self._state.target_humidity is None:
             old_humidity = old_state.attributes.get(ATTR_PREV_HUMIDITY)
             if old_humidity is None:
                 old_humidity = old_state.attributes.get(ATTR_HUMIDITY)
             if old_humidity is not None:
-                self._target_humidity = float(old_humidity)
+                self._state.target_humidity = float(old_humidity)
 
         # do we actually need this?
         self._max_floor_temp = (
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from functools import cached_property
+from dataclasses import dataclass
+import enum
 import logging
 from typing import TYPE_CHECKING
 
@@ -45,6 +46,41 @@ from ..preset_env.preset_env import PresetEnv
 _LOGGER = logging.getLogger(__name__)
 
 
+class FeatureFlag(enum.IntFlag):
+    """Capabilities derived from the configuration and current support flags."""
+
+    NONE = 0
+    HEATER = enum.auto()
+    COOLER = enum.auto()
+    DUAL = enum.auto()
+    HEAT_COOL = enum.auto()
+    AUX_HEATING = enum.auto()
+    FAN = enum.auto()
+    FAN_MODE_TOLERANCE = enum.auto()
+    FAN_ONLY = enum.auto()
+    DRYER = enum.auto()
+    HEAT_PUMP = enum.auto()
+    HVAC_POWER_LEVELS = enum.auto()
+    AUTO = enum.auto()
+    TARGET_MODE = enum.auto()
+    RANGE_MODE = enum.auto()
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureProfile:
+    """Immutable snapshot of what a thermostat is configured to do.
+
+    Rebuilt whenever the supported features or the presence of range targets
+    change, so the control path only tests bits.
+    """
+
+    flags: FeatureFlag
+    supported_features: int
+
+    def __contains__(self, flag: FeatureFlag) -> bool:
+        return bool(self.flags & flag)
+
+
 class FeatureManager(StateManager):
 
     def __init__(
@@ -79,14 +115,89 @@ class FeatureManager(StateManager):
             ClimateEntityFeature.TURN_OFF | ClimateEntityFeature.TURN_ON
         )
 
-        self._supported_features = self._default_support_flags
-
         self._hvac_power_levels = config.get(CONF_HVAC_POWER_LEVELS)
         self._hvac_power_tolerance = config.get(CONF_HVAC_POWER_TOLERANCE)
 
         # Fan device reference for speed control
         self._fan_device = None
 
+        self._static_flags = self._build_static_flags()
+        self._profile = FeatureProfile(FeatureFlag.NONE, 0)
+        self._supported_features = self._default_support_flags
+        environment.add_range_target_listener(self._refresh_profile)
+
+    def _build_static_flags(self) -> FeatureFlag:
+        """Compute the flags that only depend on the configuration."""
+        flags = FeatureFlag.NONE
+        if self._heater_entity_id is not None:
+            flags |= FeatureFlag.COOLER if self._ac_mode is True else FeatureFlag.HEATER
+            if self._cooler_entity_id is not None:
+                flags |= FeatureFlag.DUAL
+            if self._fan_mode is True and self._fan_entity_id is None:
+                flags |= FeatureFlag.FAN_ONLY
+        if self._heat_cool_mode:
+            flags |= FeatureFlag.HEAT_COOL
+        if (
+            self._aux_heater_entity_id is not None
+            and self._aux_heater_timeout is not None
+        ):
+            flags |= FeatureFlag.AUX_HEATING
+        if self._fan_entity_id is not None:
+            flags |= FeatureFlag.FAN
+            if self._fan_tolerance is not None:
+                flags |= FeatureFlag.FAN_MODE_TOLERANCE
+        if (
+            self._dryer_entity_id is not None
+            and self._humidity_sensor_entity_id is not None
+        ):
+            flags |= FeatureFlag.DRYER
+        if self._heat_pump_cooling_entity_id is not None:
+            flags |= FeatureFlag.HEAT_PUMP
+        if (
+            self._hvac_power_levels is not None
+            or self._hvac_power_tolerance is not None
+        ):
+            flags |= FeatureFlag.HVAC_POWER_LEVELS
+
+        # Auto Mode requires a temperature sensor and at least two distinct
+        # climate capabilities (heat / cool / dry / fan).
+        if self.environment.sensor_entity_id is not None:
+            can_heat = bool(flags & (FeatureFlag.HEATER | FeatureFlag.HEAT_PUMP))
+            can_cool = bool(
+                flags & (FeatureFlag.HEAT_PUMP | FeatureFlag.COOLER | FeatureFlag.DUAL)
+            )
+            can_dry = bool(flags & FeatureFlag.DRYER)
+            can_fan = bool(flags & FeatureFlag.FAN)
+            if sum((can_heat, can_cool, can_dry, can_fan)) >= 2:
+                flags |= FeatureFlag.AUTO
+        return flags
+
+    def _refresh_profile(self) -> None:
+        """Rebuild the profile from the static flags and the current state."""
+        flags = self._static_flags
+        features = self._supported_features
+        if self.environment.has_target_temp_range:
+            flags |= FeatureFlag.HEAT_COOL
+        if features & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE:
+            flags |= FeatureFlag.RANGE_MODE
+        elif features & ClimateEntityFeature.TARGET_TEMPERATURE:
+            flags |= FeatureFlag.TARGET_MODE
+        self._profile = FeatureProfile(flags, features)
+
+    @property
+    def _supported_features(self) -> int:
+        return self._profile.supported_features
+
+    @_supported_features.setter
+    def _supported_features(self, value: int) -> None:
+        self._profile = FeatureProfile(self._profile.flags, value)
+        self._refresh_profile()
+
+    @property
+    def profile(self) -> FeatureProfile:
+        """Return the current feature profile."""
+        return self._profile
+
     @property
     def heat_pump_cooling_entity_id(self) -> str:
         return self._heat_pump_cooling_entity_id
@@ -94,24 +205,17 @@ class FeatureManager(StateManager):
     @property
     def supported_features(self) -> int:
         """Return the supported features."""
-        return self._supported_features
+        return self._profile.supported_features
 
     @property
     def is_target_mode(self) -> bool:
         """Check if current support flag is for target temp mode."""
-        return (
-            self._supported_features & ClimateEntityFeature.TARGET_TEMPERATURE
-            and not (
-                self._supported_features & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
-            )
-        )
+        return FeatureFlag.TARGET_MODE in self._profile
 
     @property
     def is_range_mode(self) -> bool:
         """Check if current support flag is for range temp mode."""
-        return bool(
-            self._supported_features & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
-        )
+        return FeatureFlag.RANGE_MODE in self._profile
 
     @property
     def is_configured_for_heater_mode(self) -> bool:
@@ -120,12 +224,12 @@ class FeatureManager(StateManager):
         True when a heater entity exists and is not operating as an AC
         (``ac_mode`` disabled). Returned independently of heat-pump mode.
         """
-        return self._heater_entity_id is not None and self._ac_mode is not True
+        return FeatureFlag.HEATER in self._profile
 
     @property
     def is_configured_for_cooler_mode(self) -> bool:
         """Determines if the cooler mode is configured."""
-        return self._heater_entity_id is not None and self._ac_mode is True
+        return FeatureFlag.COOLER in self._profile
 
     @property
     def is_configured_for_dual_mode(self) -> bool:
@@ -133,31 +237,17 @@ class FeatureManager(StateManager):
 
         """NOTE: this doesn't mean heat/cool mode is configured, just that the dual mode is configured"""
 
-        return self._heater_entity_id is not None and self._cooler_entity_id is not None
+        return FeatureFlag.DUAL in self._profile
 
     @property
     def is_configured_for_heat_cool_mode(self) -> bool:
         """Checks if the configuration is complete for heat/cool mode."""
-        _LOGGER.info("is_configured_for_heat_cool_mode")
-        _LOGGER.info("heat_cool_mode: %s", self._heat_cool_mode)
-        _LOGGER.info("target_temp_high: %s", self.environment.target_temp_high)
-        _LOGGER.info("target_temp_low: %s", self.environment.target_temp_low)
-
-        return self._heat_cool_mode or (
-            self.environment.target_temp_high is not None
-            and self.environment.target_temp_low is not None
-        )
+        return FeatureFlag.HEAT_COOL in self._profile
 
     @property
     def is_configured_for_aux_heating_mode(self) -> bool:
         """Determines if the aux heater is configured."""
-        if self._aux_heater_entity_id is None:
-            return False
-
-        if self._aux_heater_timeout is None:
-            return False
-
-        return True
+        return FeatureFlag.AUX_HEATING in self._profile
 
     @property
     def aux_heater_timeout(self) -> int:
@@ -172,21 +262,17 @@ class FeatureManager(StateManager):
     @property
     def is_configured_for_fan_mode(self) -> bool:
         """Determines if the fan mode is configured."""
-        return self._fan_entity_id is not None
+        return FeatureFlag.FAN in self._profile
 
     @property
     def is_configured_fan_mode_tolerance(self) -> bool:
         """Determines if the fan mode is configured."""
-        return self._is_configured_for_fan_mode() and self._fan_tolerance is not None
+        return FeatureFlag.FAN_MODE_TOLERANCE in self._profile
 
     @property
     def is_configured_for_fan_only_mode(self) -> bool:
         """Determines if the fan mode is configured."""
-        return (
-            self._heater_entity_id is not None
-            and self._fan_mode is True
-            and self._fan_entity_id is None
-        )
+        return FeatureFlag.FAN_ONLY in self._profile
 
     @property
     def is_configured_for_fan_on_with_cooler(self) -> bool:
@@ -209,46 +295,26 @@ class FeatureManager(StateManager):
     @property
     def is_configured_for_dryer_mode(self) -> bool:
         """Determines if the dryer mode is configured."""
-        return (
-            self._dryer_entity_id is not None
-            and self._humidity_sensor_entity_id is not None
-        )
+        return FeatureFlag.DRYER in self._profile
 
     @property
     def is_configured_for_heat_pump_mode(self) -> bool:
         """Determines if the heat pump cooling is configured."""
-        return self._heat_pump_cooling_entity_id is not None
+        return FeatureFlag.HEAT_PUMP in self._profile
 
     @property
     def is_configured_for_hvac_power_levels(self) -> bool:
         """Determines if the HVAC power levels are configured."""
-        return (
-            self._hvac_power_levels is not None
-            or self._hvac_power_tolerance is not None
-        )
+        return FeatureFlag.HVAC_POWER_LEVELS in self._profile
 
-    @cached_property
+    @property
     def is_configured_for_auto_mode(self) -> bool:
         """Determine if the configuration supports Auto Mode.
 
         Auto Mode requires a temperature sensor and at least two distinct
         climate capabilities (heat / cool / dry / fan).
         """
-        if self.environment.sensor_entity_id is None:
-            return False
-
-        can_heat = (
-            self.is_configured_for_heater_mode or self.is_configured_for_heat_pump_mode
-        )
-        can_cool = (
-            self.is_configured_for_heat_pump_mode
-            or self.is_configured_for_cooler_mode
-            or self.is_configured_for_dual_mode
-        )
-        can_dry = self.is_configured_for_dryer_mode
-        can_fan = self.is_configured_for_fan_mode
-
-        return sum((can_heat, can_cool, can_dry, can_fan)) >= 2
+        return FeatureFlag.AUTO in self._profile
 
     def set_support_flags(
         self,
@@ -0,0 +1,604 @@
+"""Model-predictive planning against a weather forecast.
+
+With ``forecast_weather`` pointing at a ``weather`` entity, the thermostat
+plans the next hours against the entity's hourly outside temperatures
+instead of reacting to the current temperature only. The forecast is read
+from the ``forecast`` attribute of the entity's state, or from the
+``weather.get_forecasts`` service of entities that no longer carry it. No
+forecast is fetched from anywhere else.
+
+The room is modeled with a loss rate towards the outside temperature and
+one gain per mode::
+
+    dT/dt = loss * (outside - T) + heat_gain * heat - cool_gain * cool
+
+All three rates start at defaults and are learned from the temperature
+sensor as an exponential moving average, the loss only while the device is
+off and the room is at least ``MIN_DRIFT_DELTA`` degrees from the outside.
+
+``solve_forecast_plan`` is a dynamic program over 15 minute slots and a
+temperature grid, interpolating the cost-to-go between grid points. Each
+slot costs its runtime in hours plus ``forecast_comfort_weight`` times the
+squared degrees outside the comfort band, per hour. In heat or cool mode it
+chooses when to run. In auto mode it also chooses between heating and
+cooling, and the thermostat follows the planned mode unless a temperature or
+humidity priority is urgent.
+
+The solver runs in the executor under a hard ``SOLVE_BUDGET``. It plans a
+short horizon first and doubles it while time is left, keeping the longest
+plan that finished, so a slow host gets a shorter plan instead of a late one.
+Plans are cached by their inputs, so switching back to a previous target
+within the same forecast does not solve again. When to re-plan and how the
+slots are followed is shared with the tariff plan, see ``SlotPlanManager``.
+
+The current slot is applied as ``EnvironmentManager.target_offset``, like the
+tariff plan, so the target the user set is left untouched. The offset moves
+the target the device compares at least a tolerance past the current
+temperature, so the controllers switch the device on in a running slot and
+off in an idle one. With a target range the offset moves the whole range:
+it is measured from the low target in a heating slot and from the high one
+in a cooling slot.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.components.weather import (
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TIME,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    DOMAIN as WEATHER_DOMAIN,
+    SERVICE_GET_FORECASTS,
+)
+from homeassistant.const import ATTR_ENTITY_ID, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from ..const import CONF_FORECAST_COMFORT_WEIGHT, CONF_FORECAST_WEATHER
+from ..managers.environment_manager import EnvironmentManager
+from ..managers.feature_manager import FeatureManager
+from ..managers.slot_planner import (
+    LEARN_ALPHA,
+    MAX_LEARN_INTERVAL,
+    MIN_LEARN_INTERVAL,
+    SLOT,
+    SlotPlanManager,
+    current_slot_start,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FORECAST_ATTRIBUTE = "forecast"
+HORIZON_SLOTS = 96
+FIRST_HORIZON_SLOTS = 8
+GRID_STEP = 0.1
+GRID_MARGIN = 3.0
+MAX_GRID = 201
+SOLVE_BUDGET = 0.25
+PLAN_CACHE_SIZE = 16
+SWITCH_MARGIN = 0.05
+
+DEFAULT_COMFORT_WEIGHT = 1.0
+# Per hour towards the outside temperature, and degrees per hour while running
+DEFAULT_LOSS = 0.05
+DEFAULT_HEAT_GAIN = 2.0
+DEFAULT_COOL_GAIN = 2.0
+MAX_LOSS = 1.0
+MIN_DRIFT_DELTA = 2.0
+
+# Plan actions: idle, heat and cool
+IDLE = 0
+HEAT = 1
+COOL = -1
+_ACTIONS = {HVACMode.HEAT: (IDLE, HEAT), HVACMode.COOL: (IDLE, COOL)}
+_MODES = {IDLE: HVACMode.OFF, HEAT: HVACMode.HEAT, COOL: HVACMode.COOL}
+
+
+def parse_weather_forecast(
+    items: Any, from_unit: str | None, to_unit: str
+) -> list[tuple[datetime, float]]:
+    """Return the ``(time, outside temperature)`` points of a forecast, sorted."""
+    if not isinstance(items, list):
+        return []
+    points = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        at = item.get(ATTR_FORECAST_TIME)
+        if isinstance(at, str):
+            at = dt_util.parse_datetime(at)
+        if not isinstance(at, datetime):
+            continue
+        try:
+            temp = float(item[ATTR_FORECAST_TEMP])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if from_unit is not None and from_unit != to_unit:
+            temp = TemperatureConverter.convert(temp, from_unit, to_unit)
+        points.append((dt_util.as_utc(at), temp))
+    points.sort()
+    return points
+
+
+def outside_at(
+    points: list[tuple[datetime, float]], at: datetime, current: float | None
+) -> float | None:
+    """Return the outside temperature at ``at``, linear between the points.
+
+    Before the first point it is the current outside temperature, if known,
+    and after the last point the last forecast one.
+    """
+    if not points:
+        return current
+    if at < points[0][0]:
+        return current if current is not None else points[0][1]
+    for (start, low), (end, high) in zip(points, points[1:]):
+        if at < end:
+            return low + (high - low) * ((at - start) / (end - start))
+    return points[-1][1]
+
+
+def slot_outside(
+    points: list[tuple[datetime, float]], current: float | None, start: datetime
+) -> list[float]:
+    """Return the outside temperature in the middle of each slot from ``start``.
+
+    The horizon ends with the last forecast point and has at most
+    ``HORIZON_SLOTS`` slots.
+    """
+    if not points:
+        return []
+    count = min(HORIZON_SLOTS, int((points[-1][0] - start) / SLOT) + 1)
+    return [
+        outside_at(points, start + (slot + 0.5) * SLOT, current)
+        for slot in range(count)
+    ]
+
+
+def _solve(
+    outside: list[float],
+    start: float,
+    low: float,
+    high: float,
+    actions: tuple[int, ...],
+    rates: dict[int, tuple[float, float]],
+    comfort_weight: float,
+    deadline: float,
+) -> list[tuple[int, float]] | None:
+    """Return the plan over ``outside``, or None when ``deadline`` passed."""
+    hours = SLOT.total_seconds() / 3600
+    grid_low = min(low, start) - GRID_MARGIN
+    grid_high = max(high, start) + GRID_MARGIN
+    count = min(MAX_GRID, int(round((grid_high - grid_low) / GRID_STEP)) + 1)
+    step = (grid_high - grid_low) / (count - 1)
+    grid = [grid_low + i * step for i in range(count)]
+
+    def cost_of(temp: float, out: float, action: int, later: list[float]):
+        loss, gain = rates[action]
+        end = temp + hours * (loss * (out - temp) + gain)
+        deviation = max(low - end, end - high, 0.0)
+        x = min(max((end - grid_low) / step, 0.0), count - 1.0)
+        i = min(int(x), count - 2)
+        cost = (
+            abs(action) * hours
+            + comfort_weight * hours * deviation * deviation
+            + later[i]
+            + (later[i + 1] - later[i]) * (x - i)
+        )
+        return cost, end
+
+    # costs[slot]: cheapest cost of the slots from ``slot`` at each grid point
+    costs = [[0.0] * count]
+    for out in reversed(outside):
+        if time.perf_counter() > deadline:
+            return None
+        later = costs[-1]
+        costs.append(
+            [
+                min(cost_of(temp, out, action, later)[0] for action in actions)
+                for temp in grid
+            ]
+        )
+    costs.reverse()
+
+    plan = []
+    temp = start
+    for slot, out in enumerate(outside):
+        best = None
+        # Idle comes first, so it wins a tie.
+        for action in actions:
+            cost, end = cost_of(temp, out, action, costs[slot + 1])
+            if best is None or cost < best[0]:
+                best = (cost, action, end)
+        plan.append((best[1], best[2]))
+        temp = best[2]
+    return plan
+
+
+def solve_forecast_plan(
+    outside: list[float],
+    start: float,
+    low: float,
+    high: float,
+    actions: tuple[int, ...],
+    loss: float,
+    heat_gain: float,
+    cool_gain: float,
+    comfort_weight: float,
+    budget: float = SOLVE_BUDGET,
+) -> list[tuple[int, float]]:
+    """Return the ``(action, temperature)`` of each slot end.
+
+    Each slot costs its runtime in hours plus ``comfort_weight`` times the
+    squared degrees the room ends outside ``[low, high]``, per hour. The
+    horizon starts at ``FIRST_HORIZON_SLOTS`` and doubles up to the whole
+    forecast while ``budget`` seconds last. The longest finished plan is
+    returned, an empty one if none finished.
+    """
+    deadline = time.perf_counter() + budget
+    rates = {IDLE: (loss, 0.0), HEAT: (loss, heat_gain), COOL: (loss, -cool_gain)}
+    plan: list[tuple[int, float]] = []
+    horizon = min(FIRST_HORIZON_SLOTS, len(outside))
+    while horizon:
+        result = _solve(
+            outside[:horizon],
+            start,
+            low,
+            high,
+            actions,
+            rates,
+            comfort_weight,
+            deadline,
+        )
+        if result is None:
+            break
+        plan = result
+        if horizon == len(outside):
+            break
+        horizon = min(horizon * 2, len(outside))
+    return plan
+
+
+class RoomModel:
+    """Rates of the room, learned from the temperature sensor."""
+
+    __slots__ = ("loss", "heat_gain", "cool_gain", "_last")
+
+    def __init__(self) -> None:
+        self.loss = DEFAULT_LOSS
+        self.heat_gain = DEFAULT_HEAT_GAIN
+        self.cool_gain = DEFAULT_COOL_GAIN
+        self._last: tuple[float, float, int, float] | None = None
+
+    def observe(self, temp: float, outside: float, action: int, now: float) -> None:
+        """Learn from the change since the last reading with the same action."""
+        last = self._last
+        self._last = (temp, outside, action, now)
+        if last is None or last[2] != action:
+            return
+        elapsed = now - last[3]
+        if not MIN_LEARN_INTERVAL <= elapsed <= MAX_LEARN_INTERVAL:
+            if elapsed < MIN_LEARN_INTERVAL:
+                self._last = last
+            return
+        rate = (temp - last[0]) * 3600 / elapsed
+        drift = (outside + last[1] - temp - last[0]) / 2
+        if action == IDLE:
+            if abs(drift) >= MIN_DRIFT_DELTA and rate * drift > 0:
+                self.loss += LEARN_ALPHA * (min(rate / drift, MAX_LOSS) - self.loss)
+            return
+        gain = (rate - self.loss * drift) * action
+        if gain <= 0:
+            return
+        if action == HEAT:
+            self.heat_gain += LEARN_ALPHA * (gain - self.heat_gain)
+        else:
+            self.cool_gain += LEARN_ALPHA * (gain - self.cool_gain)
+
+
+class ForecastManager(SlotPlanManager):
+    """Plan heating and cooling against the outside temperature forecast."""
+
+    _plan: list[tuple[int, float]]
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigType,
+        environment: EnvironmentManager,
+        features: FeatureManager,
+    ) -> None:
+        super().__init__(hass, environment)
+        self.features = features
+        self._weather = config.get(CONF_FORECAST_WEATHER)
+        self._comfort_weight = config.get(
+            CONF_FORECAST_COMFORT_WEIGHT, DEFAULT_COMFORT_WEIGHT
+        )
+        self._unit = hass.config.units.temperature_unit
+        self.model = RoomModel()
+
+        self._points: list[tuple[datetime, float]] = []
+        self._forecast_version = 0
+        self._hvac_mode: HVACMode | None = None
+
+        self._applied_action: int | None = None
+        self._cache: OrderedDict[tuple, list[tuple[int, float]]] = OrderedDict()
+        self.cache_hits = 0
+
+    @callback
+    def async_start(
+        self, on_plan_changed: Callable[[], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        """Follow the weather entity, calling ``on_plan_changed`` on new slots."""
+        self._on_plan_changed = on_plan_changed
+        self.hass.async_create_task(
+            self._async_update_forecast(self.hass.states.get(self._weather))
+        )
+        remove_listener = async_track_state_change_event(
+            self.hass, [self._weather], self._async_weather_changed
+        )
+
+        @callback
+        def _async_stop() -> None:
+            remove_listener()
+            self._cancel_slot_timer()
+
+        return _async_stop
+
+    @callback
+    def _async_weather_changed(self, event: Event[EventStateChangedData]) -> None:
+        self.hass.async_create_task(
+            self._async_update_forecast(event.data["new_state"])
+        )
+
+    async def _async_update_forecast(self, state: State | None) -> None:
+        """Store the forecast of ``state`` and re-plan if it changed."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        items = state.attributes.get(FORECAST_ATTRIBUTE)
+        if items is None and self.hass.services.has_service(
+            WEATHER_DOMAIN, SERVICE_GET_FORECASTS
+        ):
+            try:
+                response = await self.hass.services.async_call(
+                    WEATHER_DOMAIN,
+                    SERVICE_GET_FORECASTS,
+                    {ATTR_ENTITY_ID: self._weather, "type": "hourly"},
+                    blocking=True,
+                    return_response=True,
+                )
+            except HomeAssistantError as err:
+                _LOGGER.debug("No hourly forecast from %s: %s", self._weather, err)
+                return
+            items = (response or {}).get(self._weather, {}).get(FORECAST_ATTRIBUTE)
+        points = parse_weather_forecast(
+            items, state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT), self._unit
+        )
+        if points == self._points:
+            return
+        self._points = points
+        self._forecast_version += 1
+        self.async_check()
+
+    def _outside_now(self) -> float | None:
+        return outside_at(
+            self._points, dt_util.utcnow(), self.environment.cur_outside_temp
+        )
+
+    @callback
+    def observe(self, running: bool) -> None:
+        """Feed the current temperature to the room model."""
+        direction = _ACTIONS.get(self.environment.hvac_mode, (IDLE, IDLE))[1]
+        outside = self._outside_now()
+        if self.environment.cur_temp is None or outside is None:
+            return
+        self.model.observe(
+            self.environment.cur_temp,
+            outside,
+            direction if running else IDLE,
+            dt_util.utcnow().timestamp(),
+        )
+
+    def _actions(self, hvac_mode: HVACMode | None) -> tuple[int, ...] | None:
+        if hvac_mode in _ACTIONS:
+            return _ACTIONS[hvac_mode]
+        if hvac_mode != HVACMode.AUTO:
+            return None
+        features = self.features
+        actions = [IDLE]
+        if (
+            features.is_configured_for_heater_mode
+            or features.is_configured_for_heat_pump_mode
+        ):
+            actions.append(HEAT)
+        if (
+            features.is_configured_for_heat_pump_mode
+            or features.is_configured_for_cooler_mode
+            or features.is_configured_for_dual_mode
+        ):
+            actions.append(COOL)
+        return tuple(actions)
+
+    def _comfort_band(self, hvac_mode: HVACMode) -> tuple[float | None, float | None]:
+        environment = self.environment
+        if (
+            hvac_mode == HVACMode.AUTO
+            and self.features.is_range_mode
+            and environment.target_temp_low is not None
+            and environment.target_temp_high is not None
+        ):
+            return environment.target_temp_low, environment.target_temp_high
+        return environment.target_temp, environment.target_temp
+
+    def _key(self) -> tuple | None:
+        actions = self._actions(self._hvac_mode)
+        if actions is None or not self._points or self.environment.cur_temp is None:
+            return None
+        low, high = self._comfort_band(self._hvac_mode)
+        if low is None or high is None:
+            return None
+        return (self._forecast_version, self._hvac_mode, low, high, actions)
+
+    @property
+    def planned_mode(self) -> HVACMode | None:
+        """Return the mode planned for the current slot, OFF for idle."""
+        if (index := self._slot_index()) is None:
+            return None
+        return _MODES[self._plan[index][0]]
+
+    @callback
+    def async_check(self, hvac_mode: HVACMode | None = None) -> None:
+        """Re-plan on a new forecast, target or mode, or when off the plan."""
+        if hvac_mode is not None:
+            self._hvac_mode = hvac_mode
+        super().async_check()
+
+    async def _async_plan(self, key: tuple) -> tuple[list, float, datetime] | None:
+        _, _, low, high, actions = key
+        start = current_slot_start()
+        outside = slot_outside(self._points, self.environment.cur_outside_temp, start)
+        if not outside:
+            return None
+        origin = self.environment.cur_temp
+        model = self.model
+        inputs = (
+            key,
+            start,
+            round(origin, 1),
+            round(model.loss, 3),
+            round(model.heat_gain, 2),
+            round(model.cool_gain, 2),
+        )
+        if (plan := self._cache.get(inputs)) is not None:
+            self._cache.move_to_end(inputs)
+            self.cache_hits += 1
+            return plan, origin, start
+
+        started = time.perf_counter()
+        plan = await self.hass.async_add_executor_job(
+            solve_forecast_plan,
+            outside,
+            origin,
+            low,
+            high,
+            actions,
+            model.loss,
+            model.heat_gain,
+            model.cool_gain,
+            self._comfort_weight,
+        )
+        self.solve_time = time.perf_counter() - started
+        if not plan:
+            _LOGGER.warning(
+                "No forecast plan finished within %s s, keeping the last one",
+                SOLVE_BUDGET,
+            )
+            return plan, origin, start
+        self._cache[inputs] = plan
+        if len(self._cache) > PLAN_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        _LOGGER.debug(
+            "Forecast plan for %s of %s slots solved in %s s",
+            len(plan),
+            len(outside),
+            self.solve_time,
+        )
+        return plan, origin, start
+
+    def _slot_temp(self, index: int) -> float:
+        return self._plan[index][1]
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._applied_action = None
+
+    def _slot_target(self, action: int) -> tuple[str, float | None] | None:
+        """Return the target the device of a slot compares, and its value."""
+        environment = self.environment
+        if not self.features.is_range_mode:
+            return "_target_temp", environment.target_temp
+        mode = environment.hvac_mode
+        if action == HEAT or (action == IDLE and mode == HVACMode.HEAT):
+            return "_target_temp_low", environment.target_temp_low
+        if action == COOL or (action == IDLE and mode == HVACMode.COOL):
+            return "_target_temp_high", environment.target_temp_high
+        # Nothing runs between the two targets.
+        return None
+
+    def _slot_offset(self, index: int) -> float:
+        """Return the target offset that makes the controllers follow a slot."""
+        environment = self.environment
+        action, temp = self._plan[index]
+        if (slot_target := self._slot_target(action)) is None:
+            return 0.0
+        target_attr, target = slot_target
+        if target is None or environment.cur_temp is None:
+            return 0.0
+        current = environment.cur_temp
+        # Past the tolerance from the current temperature, a running slot
+        # switches the device on and an idle one switches it off.
+        cold_tolerance, hot_tolerance = environment._get_active_tolerance_for_mode(
+            target_attr
+        )
+        above = current + cold_tolerance + SWITCH_MARGIN
+        below = current - hot_tolerance - SWITCH_MARGIN
+        if action == HEAT:
+            temp = max(temp, above)
+        elif action == COOL:
+            temp = min(temp, below)
+        elif environment.hvac_mode == HVACMode.HEAT:
+            temp = min(temp, below)
+        elif environment.hvac_mode == HVACMode.COOL:
+            temp = max(temp, above)
+        return round(temp - target, 2)
+
+    def _apply_slot(self, index: int, offset: float) -> bool:
+        """Apply slot ``index``, also reporting a change of the planned action."""
+        action = self._plan[index][0]
+        changed = super()._apply_slot(index, offset)
+        if action == self._applied_action:
+            return changed
+        self._applied_action = action
+        return True
+
+    def diagnostics(self) -> dict[str, Any]:
+        index = self._slot_index()
+        return {
+            "weather": self._weather,
+            "comfort_weight": self._comfort_weight,
+            "model": {
+                "loss": self.model.loss,
+                "heat_gain": self.model.heat_gain,
+                "cool_gain": self.model.cool_gain,
+            },
+            "forecast_points": len(self._points),
+            "plan_start": self._plan_start.isoformat() if self._plan_start else None,
+            "plan": (
+                [[_MODES[action], temp] for action, temp in self._plan[index:]]
+                if index is not None
+                else []
+            ),
+            "planned_mode": self.planned_mode,
+            "target_offset": self.environment.target_offset,
+            "solve_time": self.solve_time,
+            "cached_plans": len(self._cache),
+            "cache_hits": self.cache_hits,
+        }
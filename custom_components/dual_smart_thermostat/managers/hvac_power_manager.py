@@ -1,21 +1,58 @@
 import logging
+import time
+from typing import Any
 
 from homeassistant.components.climate import HVACAction
-from homeassistant.core import HomeAssistant
+from homeassistant.components.fan import (
+    ATTR_PERCENTAGE,
+    DOMAIN as FAN_DOMAIN,
+    SERVICE_SET_PERCENTAGE,
+)
+from homeassistant.components.number import (
+    ATTR_MAX,
+    ATTR_MIN,
+    ATTR_VALUE,
+    DOMAIN as NUMBER_DOMAIN,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.components.valve import ATTR_POSITION, DOMAIN as VALVE_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_SET_VALVE_POSITION,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.unit_system import US_CUSTOMARY_SYSTEM
 
+from ..command_scheduler import CommandPriority, async_get_command_scheduler
 from ..const import (
     CONF_HVAC_POWER_LEVELS,
     CONF_HVAC_POWER_MAX,
     CONF_HVAC_POWER_MIN,
+    CONF_HVAC_POWER_OUTPUT,
+    CONF_HVAC_POWER_OUTPUT_DEADBAND,
+    CONF_HVAC_POWER_OUTPUT_SLEW_RATE,
     CONF_HVAC_POWER_TOLERANCE,
+    DEFAULT_HVAC_POWER_OUTPUT_DEADBAND,
 )
+from ..decision_trace import trace_step
 from ..hvac_controller.hvac_controller import HvacEnvStrategy
 from ..managers.environment_manager import EnvironmentAttributeType, EnvironmentManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Service and value attribute that set a modulating output, per domain
+OUTPUT_SERVICES = {
+    VALVE_DOMAIN: (SERVICE_SET_VALVE_POSITION, ATTR_POSITION),
+    NUMBER_DOMAIN: (SERVICE_SET_VALUE, ATTR_VALUE),
+    FAN_DOMAIN: (SERVICE_SET_PERCENTAGE, ATTR_PERCENTAGE),
+}
+# Shortest wait before a slew-limited output takes its next step, in seconds
+MIN_OUTPUT_STEP_DELAY = 5
+
 
 class HvacPowerManager:
 
@@ -69,10 +106,44 @@ class HvacPowerManager:
             self._hvac_power_max / self._hvac_power_levels * 100
         )
 
+        self._output_entity_id: str | None = config.get(CONF_HVAC_POWER_OUTPUT)
+        self._output_deadband = config.get(
+            CONF_HVAC_POWER_OUTPUT_DEADBAND, DEFAULT_HVAC_POWER_OUTPUT_DEADBAND
+        )
+        # percent per minute, None for no limit
+        self._output_slew_rate: float | None = config.get(
+            CONF_HVAC_POWER_OUTPUT_SLEW_RATE
+        )
+        self._output_percent: int | None = None
+        self._output_sent_at = 0.0
+        self._output_context: Context | None = None
+        self._output_owner: str | None = None
+        self._cancel_output_step: CALLBACK_TYPE | None = None
+
     @property
     def hvac_power_level(self) -> int:
         return self._hvac_power_level
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the configured power range and the current power."""
+        return {
+            "levels": self._hvac_power_levels,
+            "min": self._hvac_power_min,
+            "max": self._hvac_power_max,
+            "tolerance": self._hvac_power_tolerance,
+            "level": self._hvac_power_level,
+            "percent": self._hvac_power_percent,
+            "output": (
+                {
+                    "entity_id": self._output_entity_id,
+                    "percent": self._output_percent,
+                    "ramping": self._cancel_output_step is not None,
+                }
+                if self._output_entity_id is not None
+                else None
+            ),
+        }
+
     @property
     def hvac_power_percent(self) -> int:
         return self._hvac_power_percent
@@ -100,32 +171,35 @@ class HvacPowerManager:
         )
 
     def update_hvac_power(
-        self, strategy: HvacEnvStrategy, target_env_attr: str, hvac_action: HVACAction
+        self,
+        strategy: HvacEnvStrategy,
+        target_env_attr: str,
+        hvac_action: HVACAction,
+        owner: str | None = None,
     ) -> None:
-        """updates the hvac power level based on the strategy and the target environment attribute"""
-
-        _LOGGER.debug("Updating hvac power")
+        """updates the hvac power level based on the strategy and the target environment attribute
 
-        goal_reached = strategy.hvac_goal_reached
-        goal_not_reached = strategy.hvac_goal_not_reached
-
-        _LOGGER.debug("goal reached: %s", goal_reached)
-        _LOGGER.debug("goal not reached: %s", goal_not_reached)
-        _LOGGER.debug("hvac_action: %s", hvac_action)
+        ``owner`` is the entity id of the device the power is for, used in
+        the decision trace.
+        """
 
         if (
-            goal_reached
-            or hvac_action == HVACAction.OFF
+            hvac_action == HVACAction.OFF
             or hvac_action == HVACAction.IDLE
+            or strategy.hvac_goal_reached
         ):
-            _LOGGER.debug("Updating hvac power because goal reached")
             self._hvac_power_level = 0
             self._hvac_power_percent = 0
             return
 
-        if goal_not_reached:
-            _LOGGER.debug("Updating hvac power because goal not reached")
+        if strategy.hvac_goal_not_reached:
             self._calculate_power(target_env_attr)
+            trace_step(
+                owner,
+                "power level %s, %s%%",
+                self._hvac_power_level,
+                self._hvac_power_percent,
+            )
 
     def _calculate_power(self, target_env_attr: str):
         env_attribute_type = self.environment.get_env_attr_type(target_env_attr)
@@ -149,9 +223,6 @@ class HvacPowerManager:
 
         env_difference = abs(curr_env_value - target_env_value)
 
-        _LOGGER.debug("step value: %s", step_value)
-        _LOGGER.debug("env difference: %s", env_difference)
-
         self._hvac_power_level = self._calculate_power_level(step_value, env_difference)
         self._hvac_power_percent = self._calculate_power_percent(
             env_difference, power_tolerance
@@ -160,17 +231,8 @@ class HvacPowerManager:
     def _calculate_power_level(self, step_value: float, env_difference: float) -> int:
         # calculate the power level
         # should increase or decrease the power level based on the difference between the current and target temperature
-        _LOGGER.debug("Calculating hvac power level")
-
         calculated_power_level = round(env_difference / step_value)
 
-        _LOGGER.debug(
-            "calculated power level, max_power_level, min_power_Level: %s, %s, %s",
-            calculated_power_level,
-            self._hvac_power_max,
-            self._hvac_power_min,
-        )
-
         return max(
             self._hvac_power_min, min(calculated_power_level, self._hvac_power_max)
         )
@@ -180,8 +242,6 @@ class HvacPowerManager:
     ) -> int:
         # calculate the power percent
         # should increase or decrease the power level based on the difference between the current and target temperature
-        _LOGGER.debug("Calculating hvac power percent")
-
         calculated_power_percent = round(env_difference / power_tolerance * 100)
 
         return max(
@@ -192,4 +252,90 @@ class HvacPowerManager:
             ),
         )
 
+    async def async_update_output(
+        self, context: Context | None = None, owner: str | None = None
+    ) -> None:
+        """Move the modulating output towards the power percent.
+
+        A change smaller than the deadband is not sent, unless it reaches 0
+        or 100 %. With a slew rate the output moves at most that many percent
+        per minute and takes the remaining steps on a timer. Going to 0 is
+        sent right away, so the output closes as soon as the device stops.
+        """
+        if self._output_entity_id is None:
+            return
+        self._output_context = context
+        self._output_owner = owner
+        self.async_cancel_output()
+
+        requested = self._hvac_power_percent
+        last = self._output_percent
+        if requested == last:
+            return
+        if last is None or requested == 0:
+            await self._async_send_output(requested)
+            return
+
+        percent = requested
+        if self._output_slew_rate is not None:
+            # Seconds the slew rate needs for a step the deadband lets through.
+            # A step never builds up beyond that, also after a long rest.
+            step_seconds = max(self._output_deadband, 1) / self._output_slew_rate * 60
+            elapsed = min(time.monotonic() - self._output_sent_at, step_seconds)
+            max_step = self._output_slew_rate * elapsed / 60
+            percent = round(last + max(-max_step, min(requested - last, max_step)))
+
+        if percent != last and (
+            abs(percent - last) >= self._output_deadband or percent == requested == 100
+        ):
+            await self._async_send_output(percent)
+            elapsed = 0.0
+        if percent != requested:
+            self._cancel_output_step = async_call_later(
+                self.hass,
+                max(step_seconds - elapsed, MIN_OUTPUT_STEP_DELAY),
+                self._async_output_step,
+            )
+
+    async def _async_output_step(self, _now) -> None:
+        self._cancel_output_step = None
+        await self.async_update_output(self._output_context, self._output_owner)
+
+    @callback
+    def async_cancel_output(self) -> None:
+        """Cancel the next step of a slew-limited output."""
+        if self._cancel_output_step is not None:
+            self._cancel_output_step()
+            self._cancel_output_step = None
+
+    async def _async_send_output(self, percent: int) -> None:
+        entity_id = self._output_entity_id
+        state = self.hass.states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            _LOGGER.debug("Skipping output for unavailable entity %s", entity_id)
+            return
+
+        domain = state.domain
+        service, attribute = OUTPUT_SERVICES[domain]
+        value: float = percent
+        if domain == NUMBER_DOMAIN:
+            low = state.attributes.get(ATTR_MIN, 0)
+            high = state.attributes.get(ATTR_MAX, 100)
+            value = low + (high - low) * percent / 100
+
+        trace_step(self._output_owner, "power output %s to %s%%", entity_id, percent)
+        try:
+            await async_get_command_scheduler(self.hass).async_call(
+                domain,
+                service,
+                {ATTR_ENTITY_ID: entity_id, attribute: value},
+                context=self._output_context,
+                priority=CommandPriority.NORMAL,
+            )
+        except Exception as e:
+            _LOGGER.error("Error setting output %s. Error: %s", entity_id, e)
+            return
+        self._output_percent = percent
+        self._output_sent_at = time.monotonic()
+
     # TODO: apply preset (verify min/max)
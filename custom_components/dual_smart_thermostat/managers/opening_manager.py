@@ -1,9 +1,10 @@
 """Opening Manager for Dual Smart Thermostat."""
 
+from datetime import timedelta
 import enum
 from itertools import chain
 import logging
-from typing import List
+from typing import Any, List
 
 from homeassistant.components.climate import HVACMode
 from homeassistant.const import (
@@ -58,6 +59,20 @@ class OpeningManager:
         )
         self._opening_curr_state = {k: None for k in self.opening_entities}
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the configured openings and their debounced state."""
+        return {
+            "scope": [str(scope) for scope in self.openings_scope],
+            "openings": [
+                {
+                    key: str(value) if isinstance(value, timedelta) else value
+                    for key, value in opening.items()
+                }
+                for opening in self.openings
+            ],
+            "debounced_state": dict(self._opening_curr_state),
+        }
+
     @staticmethod
     def conform_openings_list(openings: list) -> list:
         """Return a list of openings from a list of entities."""
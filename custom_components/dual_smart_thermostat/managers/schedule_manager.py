@@ -0,0 +1,171 @@
+"""Weekly schedule of presets and target temperatures.
+
+A ``schedule`` is a list of transitions, each with the weekdays it applies
+to, the time of day (``at``) and what it sets: a ``preset_mode``, a
+``temperature`` or a ``target_temp_low``/``target_temp_high`` range. The
+entries are compiled once into a sorted array of minutes of the week, so the
+slot active at any moment is a bisect and not a scan of the entries. A
+transition that is listed twice for the same minute keeps the last entry.
+
+Exactly one timer is armed, for the next transition. When it fires the action
+of the new slot is handed to the thermostat and the timer is armed again.
+Because the active slot can be found for any time, the thermostat re-applies
+it on restore, so a transition missed while Home Assistant was down is not
+lost.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, time, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
+)
+from homeassistant.const import ATTR_TEMPERATURE, CONF_AT, CONF_WEEKDAY, WEEKDAYS
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from ..const import CONF_SCHEDULE
+
+_LOGGER = logging.getLogger(__name__)
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+
+@dataclass(frozen=True, slots=True)
+class TargetChange:
+    """Preset and target temperatures to set on a thermostat."""
+
+    preset_mode: str | None = None
+    temperature: float | None = None
+    target_temp_low: float | None = None
+    target_temp_high: float | None = None
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> TargetChange:
+        """Create the change from schedule entry or service data."""
+        return cls(
+            data.get(ATTR_PRESET_MODE),
+            data.get(ATTR_TEMPERATURE),
+            data.get(ATTR_TARGET_TEMP_LOW),
+            data.get(ATTR_TARGET_TEMP_HIGH),
+        )
+
+    @property
+    def has_temperatures(self) -> bool:
+        """Return whether the change sets any target temperature."""
+        return (
+            self.temperature is not None
+            or self.target_temp_low is not None
+            or self.target_temp_high is not None
+        )
+
+
+def minute_of_week(now: datetime) -> int:
+    """Return the minutes since Monday 00:00 of the local time ``now``."""
+    return now.weekday() * DAY_MINUTES + now.hour * 60 + now.minute
+
+
+def compile_schedule(
+    entries: list[dict[str, Any]],
+) -> tuple[list[int], list[TargetChange]]:
+    """Return the sorted transition minutes of the week and their actions."""
+    transitions: dict[int, TargetChange] = {}
+    for entry in entries:
+        at: time = entry[CONF_AT]
+        action = TargetChange.from_data(entry)
+        for day in entry.get(CONF_WEEKDAY, WEEKDAYS):
+            minute = WEEKDAYS.index(day) * DAY_MINUTES + at.hour * 60 + at.minute
+            transitions[minute] = action
+    minutes = sorted(transitions)
+    return minutes, [transitions[minute] for minute in minutes]
+
+
+class ScheduleManager:
+    """Follow a compiled weekly schedule with a single timer."""
+
+    def __init__(self, hass: HomeAssistant, config: ConfigType) -> None:
+        self.hass = hass
+        self._minutes, self._actions = compile_schedule(config[CONF_SCHEDULE])
+        self._on_transition: Callable[[TargetChange], Awaitable[None]] | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self.next_transition: datetime | None = None
+
+    def _index(self, now: datetime) -> int:
+        """Return the index of the slot active at ``now``.
+
+        Before the first transition of the week the last slot of the previous
+        week is still active, which is index ``-1``.
+        """
+        return bisect_right(self._minutes, minute_of_week(now)) - 1
+
+    def current(self, now: datetime | None = None) -> TargetChange | None:
+        """Return the action of the slot active at ``now``."""
+        if not self._actions:
+            return None
+        now = dt_util.as_local(now or dt_util.now())
+        return self._actions[self._index(now)]
+
+    def _next_transition(self, now: datetime) -> datetime:
+        now = dt_util.as_local(now)
+        index = self._index(now) + 1
+        if index < len(self._minutes):
+            minute = self._minutes[index]
+        else:
+            minute = self._minutes[0] + WEEK_MINUTES
+        week_start = dt_util.start_of_local_day(now - timedelta(days=now.weekday()))
+        return week_start + timedelta(minutes=minute)
+
+    @callback
+    def async_start(
+        self, on_transition: Callable[[TargetChange], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        """Call ``on_transition`` with the action of each new slot."""
+        self._on_transition = on_transition
+        self._arm(dt_util.now())
+        return self._async_stop
+
+    @callback
+    def _async_stop(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self.next_transition = None
+
+    def _arm(self, now: datetime) -> None:
+        if not self._minutes:
+            return
+        self.next_transition = self._next_transition(now)
+        self._cancel_timer = async_track_point_in_time(
+            self.hass, self._async_transition, self.next_transition
+        )
+
+    async def _async_transition(self, now: datetime) -> None:
+        self._cancel_timer = None
+        # The transition is due even if the timer fired a little early.
+        now = max(dt_util.as_local(now), self.next_transition)
+        self._arm(now)
+        action = self.current(now)
+        _LOGGER.debug("Schedule transition at %s: %s", now, action)
+        if action is not None and self._on_transition is not None:
+            await self._on_transition(action)
+
+    def diagnostics(self) -> dict[str, Any]:
+        current = self.current()
+        return {
+            "transitions": len(self._minutes),
+            "current": asdict(current) if current is not None else None,
+            "next_transition": (
+                self.next_transition.isoformat() if self.next_transition else None
+            ),
+        }
@@ -0,0 +1,211 @@
+"""Aggregation of several temperature or humidity sensors into one reading.
+
+A large room often has more than one sensor. With ``target_sensors`` (and
+``humidity_sensors``) the thermostat reads them all directly and combines them
+as ``sensor_aggregation`` says: a weighted ``mean`` (the default), the
+``median``, the ``min`` or the ``max``. No template or min_max helper sensor
+has to sit in front of the thermostat.
+
+Only the latest reading of each sensor is kept. An update touches only the
+sensor that reported: the running weighted sum is adjusted by the difference,
+and the reading is moved within a list kept sorted with ``bisect``. Readings
+older than ``sensor_stale_duration`` are excluded. Sensors are kept in update
+order, so the stale ones are always at the front.
+
+With three or more fresh readings, outliers are rejected with the median
+absolute deviation (MAD). A reading further than ``OUTLIER_THRESHOLD`` scaled
+MADs from the median is left out of the result. The MAD never goes below the
+aggregator's ``min_spread``, so sensors that agree closely do not turn a
+small difference into an outlier. The sorted list gives the median and the
+bounds of the inliers by bisection. Only the MAD itself looks at every
+reading, and a room has a handful of them.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import timedelta
+import enum
+from operator import itemgetter
+import time
+from typing import Any
+
+from homeassistant.const import CONF_ENTITY_ID
+
+from ..const import CONF_SENSOR_AGGREGATION, CONF_SENSOR_WEIGHT, CONF_STALE_DURATION
+
+# Scales the MAD to the standard deviation of normally distributed readings.
+MAD_SCALE = 1.4826
+OUTLIER_THRESHOLD = 3.0
+MIN_OUTLIER_SENSORS = 3
+# Smallest spread, in degrees and in percent, an outlier is measured against
+TEMPERATURE_MIN_SPREAD = 0.5
+HUMIDITY_MIN_SPREAD = 3.0
+
+_VALUE = itemgetter(0)
+
+
+class Aggregation(enum.StrEnum):
+    """How the readings of several sensors are combined."""
+
+    MEAN = "mean"
+    MEDIAN = "median"
+    MIN = "min"
+    MAX = "max"
+
+
+def _median(values: list[float]) -> float:
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class SensorAggregator:
+    """Combine the latest readings of several sensors."""
+
+    def __init__(
+        self,
+        weights: dict[str, float],
+        aggregation: Aggregation = Aggregation.MEAN,
+        stale_duration: timedelta | None = None,
+        min_spread: float = 0.5,
+    ) -> None:
+        self._weights = weights
+        self.aggregation = aggregation
+        self._stale_seconds = (
+            stale_duration.total_seconds() if stale_duration is not None else None
+        )
+        self.min_spread = min_spread
+        # entity_id -> (value, monotonic time of the reading), oldest first
+        self._readings: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._sorted: list[tuple[float, str]] = []
+        self._weighted_sum = 0.0
+        self._weight_total = 0.0
+        self.outliers: frozenset[str] = frozenset()
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the aggregated sensors."""
+        return list(self._weights)
+
+    def update(self, entity_id: str, value: float) -> float | None:
+        """Record a reading and return the new aggregate."""
+        self._remove(entity_id)
+        self._readings[entity_id] = (value, time.monotonic())
+        insort(self._sorted, (value, entity_id))
+        weight = self._weights.get(entity_id, 1.0)
+        self._weighted_sum += weight * value
+        self._weight_total += weight
+        return self.value()
+
+    def discard(self, entity_id: str) -> float | None:
+        """Drop the reading of an unavailable sensor and return the aggregate."""
+        self._remove(entity_id)
+        return self.value()
+
+    def _remove(self, entity_id: str) -> None:
+        if (reading := self._readings.pop(entity_id, None)) is None:
+            return
+        value = reading[0]
+        del self._sorted[bisect_left(self._sorted, (value, entity_id))]
+        weight = self._weights.get(entity_id, 1.0)
+        self._weighted_sum -= weight * value
+        self._weight_total -= weight
+        if not self._readings:
+            # Start over from exact zeros instead of accumulated rounding.
+            self._weighted_sum = 0.0
+            self._weight_total = 0.0
+
+    def _expire(self) -> None:
+        if self._stale_seconds is None:
+            return
+        oldest = time.monotonic() - self._stale_seconds
+        while self._readings:
+            entity_id, (_, updated) = next(iter(self._readings.items()))
+            if updated >= oldest:
+                break
+            self._remove(entity_id)
+
+    def _inliers(self) -> tuple[int, int]:
+        """Return the slice of ``_sorted`` that is not rejected as outliers."""
+        count = len(self._sorted)
+        if count < MIN_OUTLIER_SENSORS:
+            return 0, count
+        values = [value for value, _ in self._sorted]
+        median = _median(values)
+        mad = _median(sorted(abs(value - median) for value in values))
+        limit = OUTLIER_THRESHOLD * max(mad * MAD_SCALE, self.min_spread)
+        return (
+            bisect_left(self._sorted, median - limit, key=_VALUE),
+            bisect_right(self._sorted, median + limit, key=_VALUE),
+        )
+
+    def value(self) -> float | None:
+        """Return the aggregate of the fresh, non-outlier readings."""
+        self._expire()
+        if not self._sorted:
+            self.outliers = frozenset()
+            return None
+        low, high = self._inliers()
+        rejected = self._sorted[:low] + self._sorted[high:]
+        self.outliers = frozenset(entity_id for _, entity_id in rejected)
+        inliers = self._sorted[low:high]
+
+        if self.aggregation == Aggregation.MIN:
+            return inliers[0][0]
+        if self.aggregation == Aggregation.MAX:
+            return inliers[-1][0]
+        if self.aggregation == Aggregation.MEDIAN:
+            return _median([value for value, _ in inliers])
+
+        weighted_sum = self._weighted_sum
+        weight_total = self._weight_total
+        for value, entity_id in rejected:
+            weight = self._weights.get(entity_id, 1.0)
+            weighted_sum -= weight * value
+            weight_total -= weight
+        if weight_total <= 0:
+            return _median([value for value, _ in inliers])
+        return weighted_sum / weight_total
+
+    def diagnostics(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "aggregation": self.aggregation,
+            "readings": {
+                entity_id: {
+                    "value": value,
+                    "age": round(now - updated, 1),
+                    "weight": self._weights.get(entity_id, 1.0),
+                }
+                for entity_id, (value, updated) in self._readings.items()
+            },
+            "outliers": sorted(self.outliers),
+        }
+
+
+def aggregator_from_config(
+    config: dict[str, Any],
+    sensor_key: str,
+    sensors_key: str,
+    min_spread: float,
+) -> SensorAggregator | None:
+    """Return the aggregator of a sensor and its extra sensors, if any."""
+    if not (extra := config.get(sensors_key)):
+        return None
+    weights: dict[str, float] = {}
+    if (primary := config.get(sensor_key)) is not None:
+        weights[primary] = 1.0
+    for sensor in extra:
+        if isinstance(sensor, str):
+            weights.setdefault(sensor, 1.0)
+        else:
+            weights[sensor[CONF_ENTITY_ID]] = sensor[CONF_SENSOR_WEIGHT]
+    return SensorAggregator(
+        weights,
+        Aggregation(config.get(CONF_SENSOR_AGGREGATION, Aggregation.MEAN)),
+        config.get(CONF_STALE_DURATION),
+        min_spread,
+    )
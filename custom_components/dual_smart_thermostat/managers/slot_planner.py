@@ -0,0 +1,177 @@
+"""Shared lifecycle of the slot plans applied as a target offset.
+
+The tariff and the forecast planner both plan the next hours in 15 minute
+slots and apply the planned temperature of the current slot as
+``EnvironmentManager.target_offset``. ``SlotPlanManager`` keeps what they
+have in common: when to re-plan, the solve loop that runs again while the
+inputs changed underneath it, and the single timer that moves the offset to
+the next slot.
+
+A new plan is only solved when the key of its inputs changed, when the room
+left the planned trajectory by more than ``REPLAN_DEVIATION`` or when the
+plan ran out. The old offset stays in place while the new plan is solved.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from ..managers.environment_manager import EnvironmentManager
+
+SLOT = timedelta(minutes=15)
+REPLAN_DEVIATION = 0.5
+
+# Learning of the room models: smoothing, and the readings it learns from
+LEARN_ALPHA = 0.2
+MIN_LEARN_INTERVAL = 300.0
+MAX_LEARN_INTERVAL = 7200.0
+
+
+def current_slot_start() -> datetime:
+    """Return the start of the slot the current time is in."""
+    now = dt_util.utcnow()
+    return now.replace(minute=now.minute - now.minute % 15, second=0, microsecond=0)
+
+
+class SlotPlanManager(ABC):
+    """Solve, follow and re-plan a plan of ``SLOT`` long slots."""
+
+    def __init__(self, hass: HomeAssistant, environment: EnvironmentManager) -> None:
+        self.hass = hass
+        self.environment = environment
+
+        self._plan: list[Any] = []
+        self._plan_origin: float | None = None
+        self._plan_start: datetime | None = None
+        self._plan_key: tuple | None = None
+        self._solving = False
+        self._solving_key: tuple | None = None
+        self._dirty = False
+        self.solve_time: float | None = None
+
+        self._on_plan_changed: Callable[[], Awaitable[None]] | None = None
+        self._cancel_slot: CALLBACK_TYPE | None = None
+
+    @abstractmethod
+    def _key(self) -> tuple | None:
+        """Return the inputs a plan is made for, None when there is none."""
+
+    @abstractmethod
+    async def _async_plan(self, key: tuple) -> tuple[list, float, datetime] | None:
+        """Solve a plan for ``key``.
+
+        Returns the plan with the temperature and the slot it starts from,
+        None when there is nothing to plan. An empty plan keeps the last one.
+        """
+
+    @abstractmethod
+    def _slot_temp(self, index: int) -> float:
+        """Return the planned temperature at the end of slot ``index``."""
+
+    @abstractmethod
+    def _slot_offset(self, index: int) -> float:
+        """Return the target offset of slot ``index``."""
+
+    @callback
+    def async_check(self) -> None:
+        """Re-plan if the inputs changed or the room is off the plan."""
+        if (key := self._key()) is None:
+            if self._plan_key is not None:
+                self._clear()
+            return
+        if key == self._plan_key and not self._off_plan():
+            return
+        if self._solving:
+            self._dirty = self._dirty or key != self._solving_key
+            return
+        self._solving = True
+        self.hass.async_create_task(self._async_solve())
+
+    async def _async_solve(self) -> None:
+        try:
+            while True:
+                self._dirty = False
+                if (key := self._key()) is None:
+                    self._clear()
+                    return
+                self._solving_key = key
+                if (result := await self._async_plan(key)) is None:
+                    self._clear()
+                    return
+                if not self._dirty:
+                    break
+        finally:
+            self._solving = False
+
+        plan, origin, start = result
+        if not plan:
+            return
+        self._plan = plan
+        self._plan_origin = origin
+        self._plan_start = start
+        self._plan_key = key
+        await self._async_apply_slot()
+
+    def _slot_index(self) -> int | None:
+        if self._plan_start is None:
+            return None
+        index = int((dt_util.utcnow() - self._plan_start) / SLOT)
+        return index if 0 <= index < len(self._plan) else None
+
+    def _off_plan(self) -> bool:
+        """Return whether the plan ran out or the room left its trajectory."""
+        if (index := self._slot_index()) is None:
+            return True
+        begin = self._slot_temp(index - 1) if index else self._plan_origin
+        end = self._slot_temp(index)
+        temp = self.environment.cur_temp
+        return not (
+            min(begin, end) - REPLAN_DEVIATION
+            <= temp
+            <= max(begin, end) + REPLAN_DEVIATION
+        )
+
+    def _clear(self) -> None:
+        self._cancel_slot_timer()
+        self._plan = []
+        self._plan_origin = None
+        self._plan_start = None
+        self._plan_key = None
+        self.environment.target_offset = 0.0
+
+    def _cancel_slot_timer(self) -> None:
+        if self._cancel_slot is not None:
+            self._cancel_slot()
+            self._cancel_slot = None
+
+    def _apply_slot(self, index: int, offset: float) -> bool:
+        """Apply slot ``index``, returning whether the offset changed."""
+        if offset == self.environment.target_offset:
+            return False
+        self.environment.target_offset = offset
+        return True
+
+    async def _async_slot_due(self, _now: datetime) -> None:
+        self._cancel_slot = None
+        await self._async_apply_slot()
+
+    async def _async_apply_slot(self) -> None:
+        """Apply the current slot and arm the next one."""
+        # A new plan replaces the timer of the old one.
+        self._cancel_slot_timer()
+        if (index := self._slot_index()) is None:
+            self.async_check()
+            return
+        offset = self._slot_offset(index)
+        self._cancel_slot = async_track_point_in_utc_time(
+            self.hass, self._async_slot_due, self._plan_start + (index + 1) * SLOT
+        )
+        if self._apply_slot(index, offset) and self._on_plan_changed is not None:
+            await self._on_plan_changed()
@@ -0,0 +1,344 @@
+"""Time-of-use tariff planning of heater and cooler runtime.
+
+With a ``tariff_sensor`` configured, the thermostat plans its runtime over
+the next 24 hours so that it runs in the cheap slots and coasts through the
+expensive ones. The room stays within ``tariff_comfort_band`` degrees of the
+target the user set.
+
+Prices come from the sensor only. The state is the current price. The
+forecast is read from a list attribute (``forecast``, ``prices``,
+``raw_today``/``raw_tomorrow``, ``today``/``tomorrow``) of items with a start
+time (``start``, ``starts_at``, ``time``, ``datetime`` or ``hour``) and a price
+(``value``, ``price`` or ``total``), which covers the common price
+integrations.
+
+The room is modeled with two rates per mode: how fast the running device
+moves the temperature towards the target, and how fast it drifts back while
+the device is off. Both start at ``DEFAULT_GAIN`` and ``DEFAULT_LOSS`` and are
+learned from the temperature sensor as an exponential moving average.
+
+``solve_plan`` is a dynamic program over 15 minute slots and a 0.1 degree
+temperature grid. Its cost is bounded by ``HORIZON_SLOTS * MAX_GRID * 2``
+steps, and it runs in the executor so it never blocks the event loop. The plan
+is applied as ``EnvironmentManager.target_offset``, so the user's target is
+left untouched. Only the comparisons of the controllers see the planned
+temperature.
+
+Planning is incremental, see ``SlotPlanManager``. A new plan is solved when
+the prices, the target or the mode changed, and between slots a single timer
+moves the offset to the next planned temperature.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from ..const import CONF_TARIFF_COMFORT_BAND, CONF_TARIFF_SENSOR
+from ..managers.environment_manager import EnvironmentManager
+from ..managers.slot_planner import (
+    LEARN_ALPHA,
+    MAX_LEARN_INTERVAL,
+    MIN_LEARN_INTERVAL,
+    SLOT,
+    SlotPlanManager,
+    current_slot_start,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HORIZON_SLOTS = 96
+GRID_STEP = 0.1
+MAX_GRID = 201
+
+DEFAULT_COMFORT_BAND = 1.0
+# Degrees per hour while the device runs, and while it is off
+DEFAULT_GAIN = 2.0
+DEFAULT_LOSS = 0.5
+
+PRICE_LIST_ATTRIBUTES = (
+    "forecast",
+    "prices",
+    "raw_today",
+    "raw_tomorrow",
+    "today",
+    "tomorrow",
+)
+PRICE_START_KEYS = ("start", "starts_at", "time", "datetime", "hour")
+PRICE_VALUE_KEYS = ("value", "price", "total")
+
+# Plan coordinates grow in the direction the device moves the temperature.
+_DIRECTIONS = {HVACMode.HEAT: 1, HVACMode.COOL: -1}
+
+
+def parse_price_forecast(state: State) -> list[tuple[datetime, float]]:
+    """Return the ``(start, price)`` points of a price sensor, sorted."""
+    points = []
+    for attribute in PRICE_LIST_ATTRIBUTES:
+        items = state.attributes.get(attribute)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            start = next(
+                (item[key] for key in PRICE_START_KEYS if item.get(key) is not None),
+                None,
+            )
+            value = next(
+                (item[key] for key in PRICE_VALUE_KEYS if item.get(key) is not None),
+                None,
+            )
+            if isinstance(start, str):
+                start = dt_util.parse_datetime(start)
+            if not isinstance(start, datetime) or value is None:
+                continue
+            try:
+                points.append((dt_util.as_utc(start), float(value)))
+            except (TypeError, ValueError):
+                continue
+    points.sort()
+    return points
+
+
+def slot_prices(
+    points: list[tuple[datetime, float]], current: float | None, start: datetime
+) -> list[float]:
+    """Return the price of each slot from ``start``.
+
+    The horizon ends an hour after the last known price and has at most
+    ``HORIZON_SLOTS`` slots.
+    """
+    price = current if current is not None else (points[0][1] if points else None)
+    if price is None:
+        return []
+    count = HORIZON_SLOTS
+    if points:
+        count = min(count, max(4, int((points[-1][0] - start) / SLOT) + 4))
+    prices = []
+    index = 0
+    for slot in range(count):
+        at = start + slot * SLOT
+        while index < len(points) and points[index][0] <= at:
+            price = points[index][1]
+            index += 1
+        prices.append(price)
+    return prices
+
+
+def solve_plan(
+    prices: list[float],
+    start: float,
+    low: float,
+    high: float,
+    gain: float,
+    loss: float,
+) -> list[float]:
+    """Return the cheapest temperature trajectory, one value per slot end.
+
+    Temperatures are plan coordinates: running the device raises them by
+    ``gain`` per hour, and they fall by ``loss`` per hour while it is off. The
+    trajectory never leaves ``[low, high]``. Running at the top of the band
+    holds the temperature there, and the device must run where falling
+    would leave the band.
+    """
+    count = min(MAX_GRID, int(round((high - low) / GRID_STEP)) + 1)
+    if count < 2:
+        return [high] * len(prices)
+    step = (high - low) / (count - 1)
+    hours = SLOT.total_seconds() / 3600
+    up = max(1, round(gain * hours / step))
+    down = round(loss * hours / step)
+
+    # cost[i]: cheapest cost of the remaining slots when starting at grid i
+    cost = [0.0] * count
+    choices: list[list[bool]] = []
+    for price in reversed(prices):
+        step_cost = [0.0] * count
+        run = [False] * count
+        for i in range(count):
+            best = cost[i - down] if i >= down else float("inf")
+            running = price + cost[min(i + up, count - 1)]
+            if running < best:
+                best = running
+                run[i] = True
+            step_cost[i] = best
+        cost = step_cost
+        choices.append(run)
+    choices.reverse()
+
+    i = min(max(round((start - low) / step), 0), count - 1)
+    plan = []
+    for run in choices:
+        i = min(i + up, count - 1) if run[i] else i - down
+        plan.append(low + i * step)
+    return plan
+
+
+class ThermalModel:
+    """Rates of the room in plan coordinates, in degrees per hour."""
+
+    __slots__ = ("gain", "loss", "_last")
+
+    def __init__(self) -> None:
+        self.gain = DEFAULT_GAIN
+        self.loss = DEFAULT_LOSS
+        self._last: tuple[float, bool, float] | None = None
+
+    def observe(self, temp: float, running: bool, now: float) -> None:
+        """Learn from the change since the last reading with the same state."""
+        last = self._last
+        self._last = (temp, running, now)
+        if last is None or last[1] != running:
+            return
+        elapsed = now - last[2]
+        if not MIN_LEARN_INTERVAL <= elapsed <= MAX_LEARN_INTERVAL:
+            if elapsed < MIN_LEARN_INTERVAL:
+                self._last = last
+            return
+        rate = (temp - last[0]) * 3600 / elapsed
+        if running and rate > 0:
+            self.gain += LEARN_ALPHA * (rate - self.gain)
+        elif not running and rate <= 0:
+            self.loss += LEARN_ALPHA * (-rate - self.loss)
+
+
+class TariffManager(SlotPlanManager):
+    """Plan heater or cooler runtime against time-of-use prices."""
+
+    _plan: list[float]
+
+    def __init__(
+        self, hass: HomeAssistant, config: ConfigType, environment: EnvironmentManager
+    ) -> None:
+        super().__init__(hass, environment)
+        self._sensor = config.get(CONF_TARIFF_SENSOR)
+        self._band = config.get(CONF_TARIFF_COMFORT_BAND, DEFAULT_COMFORT_BAND)
+        self._models = {mode: ThermalModel() for mode in _DIRECTIONS}
+
+        self._points: list[tuple[datetime, float]] = []
+        self._current_price: float | None = None
+        self._prices_version = 0
+
+    @callback
+    def async_start(
+        self, on_plan_changed: Callable[[], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        """Follow the price sensor, calling ``on_plan_changed`` on new offsets."""
+        self._on_plan_changed = on_plan_changed
+        self._update_prices(self.hass.states.get(self._sensor))
+        remove_listener = async_track_state_change_event(
+            self.hass, [self._sensor], self._async_prices_changed
+        )
+
+        @callback
+        def _async_stop() -> None:
+            remove_listener()
+            self._cancel_slot_timer()
+
+        return _async_stop
+
+    def _update_prices(self, state: State | None) -> bool:
+        """Store the prices of ``state``, returning whether they changed."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return False
+        try:
+            current = float(state.state)
+        except ValueError:
+            current = None
+        points = parse_price_forecast(state)
+        # With a forecast the current price is part of it.
+        if points == self._points and (points or current == self._current_price):
+            return False
+        self._points = points
+        self._current_price = current
+        self._prices_version += 1
+        return True
+
+    @callback
+    def _async_prices_changed(self, event: Event[EventStateChangedData]) -> None:
+        if self._update_prices(event.data["new_state"]):
+            self.async_check()
+
+    @callback
+    def observe(self, running: bool) -> None:
+        """Feed the current temperature to the thermal model of the mode."""
+        model = self._models.get(self.environment.hvac_mode)
+        if model is not None and self.environment.cur_temp is not None:
+            direction = _DIRECTIONS[self.environment.hvac_mode]
+            model.observe(
+                self.environment.cur_temp * direction,
+                running,
+                dt_util.utcnow().timestamp(),
+            )
+
+    def _key(self) -> tuple | None:
+        environment = self.environment
+        if (
+            environment.hvac_mode not in _DIRECTIONS
+            or environment.target_temp is None
+            or environment.cur_temp is None
+        ):
+            return None
+        return (self._prices_version, environment.target_temp, environment.hvac_mode)
+
+    async def _async_plan(self, key: tuple) -> tuple[list, float, datetime] | None:
+        _, target, mode = key
+        direction = _DIRECTIONS[mode]
+        start = current_slot_start()
+        prices = slot_prices(self._points, self._current_price, start)
+        if not prices:
+            return None
+        low, high = sorted(
+            ((target - self._band) * direction, (target + self._band) * direction)
+        )
+        model = self._models[mode]
+        origin = self.environment.cur_temp
+        started = time.perf_counter()
+        plan = await self.hass.async_add_executor_job(
+            solve_plan, prices, origin * direction, low, high, model.gain, model.loss
+        )
+        self.solve_time = time.perf_counter() - started
+        _LOGGER.debug(
+            "Tariff plan for %s slots solved in %.3f s", len(plan), self.solve_time
+        )
+        return [temp * direction for temp in plan], origin, start
+
+    def _slot_temp(self, index: int) -> float:
+        return self._plan[index]
+
+    def _slot_offset(self, index: int) -> float:
+        return round(self._plan[index] - self._plan_key[1], 2)
+
+    def diagnostics(self) -> dict[str, Any]:
+        index = self._slot_index()
+        return {
+            "sensor": self._sensor,
+            "comfort_band": self._band,
+            "models": {
+                mode: {"gain": model.gain, "loss": model.loss}
+                for mode, model in self._models.items()
+            },
+            "price_points": len(self._points),
+            "plan_start": self._plan_start.isoformat() if self._plan_start else None,
+            "plan": self._plan[index:] if index is not None else [],
+            "target_offset": self.environment.target_offset,
+            "solve_time": self.solve_time,
+        }
@@ -0,0 +1,250 @@
+"""Site-wide electrical power budget for the switched actuators.
+
+Sites with a hard supply limit trip the main breaker when many electric
+heaters start together. With ``power_budget`` set under the top-level
+``dual_smart_thermostat:`` key, every thermostat with an ``actuator_power``
+registers the load of its heater or cooler here, and GenericHvacController
+asks the budget before each start.
+
+A start is admitted when its load fits in what is left of the budget and no
+zone is waiting ahead of it. Otherwise the zone waits in a heap ordered by
+
+    key = waiting since - comfort deficit * DEFICIT_WEIGHT
+
+so a zone 2 degrees below its target is served as if it had waited
+``2 * DEFICIT_WEIGHT`` seconds longer. A key never changes once queued, so a
+zone that keeps waiting eventually overtakes newer zones with a larger
+deficit and no zone starves. A zone that started and stopped joins the back
+of the queue again, which rotates the budget between the zones of a busy
+site. Admission and release are O(log n).
+
+When load is released, the zone at the head of the queue is offered the
+freed capacity through ``POWER_BUDGET_SIGNAL`` and runs a control pass, which
+asks again. Entries are removed lazily: a zone that stops waiting is skipped
+when it reaches the head, and an offer not taken within ``OFFER_TIMEOUT`` is
+dropped so a zone that no longer needs to run does not block the others.
+A load larger than the whole budget can never be admitted; it is not queued
+at all, so it does not hold up the zones behind it either.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import heapq
+import itertools
+import logging
+from typing import Any
+
+from homeassistant.const import STATE_ON, STATE_OPEN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN, POWER_BUDGET_SIGNAL
+from .decision_trace import trace_step
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POWER_BUDGET = "power_budget"
+
+# Seconds of waiting one degree of comfort deficit is worth.
+DEFICIT_WEIGHT = 600.0
+OFFER_TIMEOUT = 60.0
+
+
+class _Waiter:
+    """Queue entry of a zone waiting for budget."""
+
+    __slots__ = ("key", "sequence", "entity_id", "since", "offered_at")
+
+    def __init__(self, key: float, sequence: int, entity_id: str, since: float):
+        self.key = key
+        self.sequence = sequence
+        self.entity_id = entity_id
+        self.since = since
+        self.offered_at: float | None = None
+
+    def __lt__(self, other: _Waiter) -> bool:
+        return (self.key, self.sequence) < (other.key, other.sequence)
+
+
+class PowerBudget:
+    """Admit actuator starts against a site-wide power limit in watts."""
+
+    def __init__(self, hass: HomeAssistant, limit: float | None = None) -> None:
+        self.hass = hass
+        self.limit = limit
+        self._loads: dict[str, float] = {}
+        self._running: dict[str, float] = {}
+        self._used = 0.0
+        self._queue: list[_Waiter] = []
+        self._waiting: dict[str, _Waiter] = {}
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.deferred = 0
+
+    @property
+    def used(self) -> float:
+        """Return the watts of the admitted loads."""
+        return self._used
+
+    @callback
+    def async_register(self, entity_id: str, watts: float) -> CALLBACK_TYPE:
+        """Register the load of an actuator, returning its unregister callback."""
+        if self.limit is not None and watts > self.limit:
+            _LOGGER.error(
+                "The actuator_power of %s (%.0f W) exceeds the power_budget "
+                "(%.0f W), it will never be started",
+                entity_id,
+                watts,
+                self.limit,
+            )
+        self._loads[entity_id] = watts
+        return partial(self.async_unregister, entity_id)
+
+    @callback
+    def async_unregister(self, entity_id: str) -> None:
+        self.async_release(entity_id)
+        self._loads.pop(entity_id, None)
+
+    def is_waiting(self, entity_id: str) -> bool:
+        """Return whether ``entity_id`` waits for budget."""
+        return entity_id in self._waiting
+
+    def _is_on(self, entity_id: str) -> bool:
+        state = self.hass.states.get(entity_id)
+        return state is not None and state.state in (STATE_ON, STATE_OPEN)
+
+    def _fits(self, load: float) -> bool:
+        return self._used + load <= self.limit
+
+    def _never_fits(self, entity_id: str) -> bool:
+        return self._loads.get(entity_id, 0.0) > self.limit
+
+    def _head(self) -> _Waiter | None:
+        """Return the first live waiter, dropping withdrawn and stale ones."""
+        now = self.hass.loop.time()
+        while self._queue:
+            head = self._queue[0]
+            if self._waiting.get(head.entity_id) is not head:
+                heapq.heappop(self._queue)
+            elif self._never_fits(head.entity_id):
+                # The budget was lowered below the load after it queued.
+                heapq.heappop(self._queue)
+                del self._waiting[head.entity_id]
+            elif head.offered_at is not None and now - head.offered_at > OFFER_TIMEOUT:
+                heapq.heappop(self._queue)
+                del self._waiting[head.entity_id]
+            else:
+                return head
+        return None
+
+    @callback
+    def async_request(self, entity_id: str, deficit: float = 0.0) -> bool:
+        """Return whether ``entity_id`` may start now, queueing it if not."""
+        load = self._loads.get(entity_id)
+        if self.limit is None or load is None or entity_id in self._running:
+            return True
+        # An actuator that is already on draws its load anyway.
+        if self._is_on(entity_id):
+            self._admit(entity_id, load)
+            return True
+        if load > self.limit:
+            trace_step(entity_id, "load %.0f W over power budget", load)
+            return False
+
+        now = self.hass.loop.time()
+        if (waiter := self._waiting.get(entity_id)) is None:
+            waiter = _Waiter(
+                now - deficit * DEFICIT_WEIGHT, next(self._sequence), entity_id, now
+            )
+            self._waiting[entity_id] = waiter
+            heapq.heappush(self._queue, waiter)
+        waiter.offered_at = None
+
+        if self._head() is waiter and self._fits(load):
+            heapq.heappop(self._queue)
+            del self._waiting[entity_id]
+            self._admit(entity_id, load)
+            return True
+
+        self.deferred += 1
+        trace_step(
+            entity_id,
+            "power budget %.0f/%.0f W, %d waiting",
+            self._used,
+            self.limit,
+            len(self._waiting),
+        )
+        self._async_offer()
+        return False
+
+    def _admit(self, entity_id: str, load: float) -> None:
+        self._running[entity_id] = load
+        self._used += load
+        self.admitted += 1
+
+    @callback
+    def async_withdraw(self, entity_id: str) -> None:
+        """Stop waiting, the zone no longer needs to start."""
+        if self._waiting.pop(entity_id, None) is not None:
+            self._async_offer()
+
+    @callback
+    def async_release(self, entity_id: str) -> None:
+        """Return the load of a stopped actuator to the budget."""
+        self._waiting.pop(entity_id, None)
+        if (load := self._running.pop(entity_id, None)) is None:
+            return
+        self._used -= load
+        self._async_offer()
+
+    @callback
+    def async_state_changed(self, entity_id: str, new_state: State | None) -> None:
+        """Release the load of an actuator that was switched off elsewhere."""
+        if new_state is not None and new_state.state not in (STATE_ON, STATE_OPEN):
+            self.async_release(entity_id)
+
+    @callback
+    def _async_offer(self) -> None:
+        """Wake the head of the queue when its load fits."""
+        if (head := self._head()) is None or head.offered_at is not None:
+            return
+        if not self._fits(self._loads[head.entity_id]):
+            return
+        head.offered_at = self.hass.loop.time()
+        async_dispatcher_send(self.hass, POWER_BUDGET_SIGNAL.format(head.entity_id))
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the budget use and the queue in admission order."""
+        now = self.hass.loop.time()
+        queue = sorted(
+            waiter
+            for waiter in self._queue
+            if self._waiting.get(waiter.entity_id) is waiter
+        )
+        return {
+            "limit": self.limit,
+            "used": self._used,
+            "running": dict(self._running),
+            "queue": [
+                {
+                    "entity_id": waiter.entity_id,
+                    "load": self._loads.get(waiter.entity_id),
+                    "waiting": round(now - waiter.since, 1),
+                    "offered": waiter.offered_at is not None,
+                }
+                for waiter in queue
+            ],
+            "admitted": self.admitted,
+            "deferred": self.deferred,
+        }
+
+
+@callback
+def async_get_power_budget(hass: HomeAssistant) -> PowerBudget:
+    """Return the shared power budget, creating an unlimited one if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (budget := domain_data.get(DATA_POWER_BUDGET)) is None:
+        budget = PowerBudget(hass)
+        domain_data[DATA_POWER_BUDGET] = budget
+    return budget
@@ -70,7 +70,7 @@ class FloorTempLimitEnv:
 
     def __init__(self, **kwargs) -> None:
         super(FloorTempLimitEnv, self).__init__(**kwargs)
-        _LOGGER.debug(f"FloorTempLimitEnv kwargs: {kwargs}")
+        _LOGGER.debug("FloorTempLimitEnv kwargs: %s", kwargs)
         self.min_floor_temp = kwargs.get(CONF_MIN_FLOOR_TEMP) or None
         self.max_floor_temp = kwargs.get(CONF_MAX_FLOOR_TEMP) or None
 
@@ -78,7 +78,7 @@ class FloorTempLimitEnv:
 class TempEnv(TargeTempEnv, RangeTempEnv, FloorTempLimitEnv):
     def __init__(self, **kwargs) -> None:
         super(TempEnv, self).__init__(**kwargs)
-        _LOGGER.debug(f"TempEnv kwargs: {kwargs}")
+        _LOGGER.debug("TempEnv kwargs: %s", kwargs)
 
 
 class HumidityEnv:
@@ -86,7 +86,7 @@ class HumidityEnv:
 
     def __init__(self, **kwargs) -> None:
         super(HumidityEnv, self).__init__()
-        _LOGGER.debug(f"HumidityEnv kwargs: {kwargs}")
+        _LOGGER.debug("HumidityEnv kwargs: %s", kwargs)
         self.humidity = kwargs.get(ATTR_HUMIDITY) or None
 
 
@@ -102,7 +102,7 @@ class PresetEnv(TempEnv, HumidityEnv):
         )  # entity_ids referenced in templates
 
         super(PresetEnv, self).__init__(**kwargs)
-        _LOGGER.debug(f"kwargs: {kwargs}")
+        _LOGGER.debug("kwargs: %s", kwargs)
 
         # Process temperature fields for template detection
         self._process_field("temperature", kwargs.get(ATTR_TEMPERATURE))
@@ -138,7 +138,7 @@ class PresetEnv(TempEnv, HumidityEnv):
             # Template string - store in template_fields and extract entities
             self._template_fields[field_name] = value
             self._extract_entities(value)
-            _LOGGER.debug(f"PresetEnv: {field_name} detected as template: {value}")
+            _LOGGER.debug("PresetEnv: %s detected as template: %s", field_name, value)
 
     def _extract_entities(self, template_str: str) -> None:
         """Extract entity IDs from template string using regex.
@@ -158,9 +158,11 @@ class PresetEnv(TempEnv, HumidityEnv):
 
             if matches:
                 self._referenced_entities.update(matches)
-                _LOGGER.debug(f"PresetEnv: Extracted entities from template: {matches}")
+                _LOGGER.debug(
+                    "PresetEnv: Extracted entities from template: %s", matches
+                )
         except Exception as e:
-            _LOGGER.debug(f"PresetEnv: Could not extract entities from template: {e}")
+            _LOGGER.debug("PresetEnv: Could not extract entities from template: %s", e)
 
     def get_temperature(self, hass: HomeAssistant) -> float | None:
         """Get temperature, evaluating template if needed.
@@ -228,6 +230,20 @@ class PresetEnv(TempEnv, HumidityEnv):
         """Check if this preset uses any templates."""
         return len(self._template_fields) > 0
 
+    def diagnostics(self) -> dict[str, Any]:
+        """Return static values, template sources and last rendered values."""
+        return {
+            "temperature": self.temperature,
+            "target_temp_low": self.target_temp_low,
+            "target_temp_high": self.target_temp_high,
+            "humidity": self.humidity,
+            "min_floor_temp": self.min_floor_temp,
+            "max_floor_temp": self.max_floor_temp,
+            "templates": dict(self._template_fields),
+            "last_good_values": dict(self._last_good_values),
+            "referenced_entities": sorted(self._referenced_entities),
+        }
+
     @property
     def to_dict(self) -> dict:
         return self.__dict__
@@ -0,0 +1,273 @@
+"""Runtime, cycle and duty-cycle accounting of the switched actuators.
+
+Each GenericHvacController registers its actuator here. Every on/off
+transition of the actuator entity updates its counters as it happens:
+
+- total on-time
+- number of cycles (off to on transitions)
+- number of short cycles (on periods shorter than the controller's
+  ``min_cycle_duration``, or ``DEFAULT_SHORT_CYCLE`` without one)
+- on-time over the last hour and the last 24 hours, kept in fixed-size
+  ring buffers of 1 minute and 15 minute buckets
+
+Memory per actuator is constant. The counters survive restarts through one
+``Store`` for the whole integration. Saves are debounced, so a busy site
+writes at most once per ``SAVE_DELAY``. Diagnostic sensors read the counters
+directly, so dashboards don't need recorder history.
+
+Counters are kept per entity id. Two thermostats or two controllers sharing
+an actuator (the heat pump's heating and cooling controllers) share its
+counters, and a transition reported twice is only counted once.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.const import STATE_ON, STATE_OPEN, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+DATA_RUNTIME_STORE = "runtime_store"
+STORAGE_KEY = f"{DOMAIN}.runtime"
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+DEFAULT_SHORT_CYCLE = timedelta(minutes=5)
+
+
+class DutyCycleWindow:
+    """On-time over the last ``span`` seconds, in ``count`` fixed buckets.
+
+    Bucket ``n`` covers ``[n * width, (n + 1) * width)`` of wall clock time
+    and lives in slot ``n % count``. Moving forward clears the slots of the
+    buckets that fell out of the window.
+    """
+
+    __slots__ = ("_width", "_buckets", "_last")
+
+    def __init__(self, span: float, count: int) -> None:
+        self._width = span / count
+        self._buckets = [0.0] * count
+        self._last: int | None = None
+
+    def _advance(self, now: float) -> int:
+        bucket = int(now // self._width)
+        if self._last is None:
+            self._last = bucket
+        elif bucket > self._last:
+            count = len(self._buckets)
+            for stale in range(self._last + 1, min(bucket, self._last + count) + 1):
+                self._buckets[stale % count] = 0.0
+            self._last = bucket
+        return self._last
+
+    def window_start(self, now: float) -> float:
+        """Return when the oldest bucket of the window starts."""
+        return (self._advance(now) - len(self._buckets) + 1) * self._width
+
+    def add(self, start: float, end: float) -> None:
+        """Add the on period ``[start, end)``."""
+        position = max(start, self.window_start(end))
+        count = len(self._buckets)
+        while position < end:
+            bucket = int(position // self._width)
+            boundary = min(end, (bucket + 1) * self._width)
+            self._buckets[bucket % count] += boundary - position
+            position = boundary
+
+    def on_time(self, now: float) -> float:
+        """Return the on-time within the window ending ``now``."""
+        self._advance(now)
+        return sum(self._buckets)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"last": self._last, "buckets": list(self._buckets)}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        if len(data["buckets"]) == len(self._buckets):
+            self._last = data["last"]
+            self._buckets = list(data["buckets"])
+
+
+class ActuatorRuntime:
+    """Runtime counters of one actuator entity."""
+
+    __slots__ = (
+        "short_cycle",
+        "on_time",
+        "cycles",
+        "short_cycles",
+        "started",
+        "is_on",
+        "_on_since",
+        "_accounted",
+        "_counted_start",
+        "hour",
+        "day",
+    )
+
+    def __init__(self, short_cycle: timedelta = DEFAULT_SHORT_CYCLE) -> None:
+        self.short_cycle = short_cycle.total_seconds()
+        self.on_time = 0.0
+        self.cycles = 0
+        self.short_cycles = 0
+        self.started: float | None = None
+        self.is_on: bool | None = None
+        self._on_since: float | None = None
+        # The current on period is counted up to here.
+        self._accounted: float | None = None
+        self._counted_start = False
+        self.hour = DutyCycleWindow(3600, 60)
+        self.day = DutyCycleWindow(86400, 96)
+
+    def _account(self, now: float) -> None:
+        if self._accounted is None or now <= self._accounted:
+            return
+        self.on_time += now - self._accounted
+        self.hour.add(self._accounted, now)
+        self.day.add(self._accounted, now)
+        self._accounted = now
+
+    def record(self, is_on: bool, at: float) -> bool:
+        """Record the actuator state at ``at``, return whether it changed."""
+        if is_on == self.is_on:
+            return False
+        if self.started is None:
+            self.started = at
+        if is_on:
+            # The state before the first one seen is unknown, so it doesn't
+            # start a cycle.
+            self._counted_start = self.is_on is False
+            if self._counted_start:
+                self.cycles += 1
+            self._on_since = self._accounted = at
+        elif self._on_since is not None:
+            self._account(at)
+            if self._counted_start and at - self._on_since < self.short_cycle:
+                self.short_cycles += 1
+            self._on_since = self._accounted = None
+        self.is_on = is_on
+        return True
+
+    def total_on_time(self, now: float) -> float:
+        """Return the total on-time in seconds, including the running cycle."""
+        self._account(now)
+        return self.on_time
+
+    def duty_cycle(self, window: DutyCycleWindow, now: float) -> float | None:
+        """Return the on fraction (0-1) of ``window``, or None before any data."""
+        if self.started is None:
+            return None
+        self._account(now)
+        covered = now - max(window.window_start(now), self.started)
+        if covered <= 0:
+            return None
+        return min(1.0, window.on_time(now) / covered)
+
+    def summary(self, now: float) -> dict[str, Any]:
+        """Return the counters as the sensors and diagnostics show them."""
+        duty_hour = self.duty_cycle(self.hour, now)
+        duty_day = self.duty_cycle(self.day, now)
+        return {
+            "on_time_h": round(self.total_on_time(now) / 3600, 3),
+            "cycles": self.cycles,
+            "short_cycles": self.short_cycles,
+            "duty_cycle_1h": None if duty_hour is None else round(duty_hour * 100, 1),
+            "duty_cycle_24h": None if duty_day is None else round(duty_day * 100, 1),
+        }
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        self._account(now)
+        return {
+            "on_time": self.on_time,
+            "cycles": self.cycles,
+            "short_cycles": self.short_cycles,
+            "started": self.started,
+            "hour": self.hour.as_dict(),
+            "day": self.day.as_dict(),
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        self.on_time = data["on_time"]
+        self.cycles = data["cycles"]
+        self.short_cycles = data["short_cycles"]
+        self.started = data["started"]
+        self.hour.restore(data["hour"])
+        self.day.restore(data["day"])
+
+
+class RuntimeStore:
+    """The runtime counters of every actuator, persisted in one Store."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.actuators: dict[str, ActuatorRuntime] = {}
+        self._store: Store | None = None
+        self._restored: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved counters; later calls do nothing."""
+        if self._store is not None:
+            return
+        self._store = Store(self.hass, STORAGE_VERSION, STORAGE_KEY)
+        if (data := await self._store.async_load()) is not None:
+            self._restored = data["actuators"]
+        for entity_id, runtime in self.actuators.items():
+            self._restore(entity_id, runtime)
+
+    def _restore(self, entity_id: str, runtime: ActuatorRuntime) -> None:
+        if (data := self._restored.pop(entity_id, None)) is not None:
+            runtime.restore(data)
+
+    @callback
+    def async_track(self, entity_id: str, short_cycle: timedelta) -> ActuatorRuntime:
+        """Return the counters of ``entity_id``, creating them if needed."""
+        if (runtime := self.actuators.get(entity_id)) is None:
+            runtime = ActuatorRuntime(short_cycle)
+            self._restore(entity_id, runtime)
+            self.actuators[entity_id] = runtime
+        else:
+            runtime.short_cycle = short_cycle.total_seconds()
+        return runtime
+
+    @callback
+    def async_record(self, entity_id: str, state: State | None) -> None:
+        """Account a state of a tracked actuator entity."""
+        if (
+            state is None
+            or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+            or (runtime := self.actuators.get(entity_id)) is None
+        ):
+            return
+        is_on = state.state in (STATE_ON, STATE_OPEN)
+        if runtime.record(is_on, state.last_changed.timestamp()):
+            if self._store is not None:
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        now = dt_util.utcnow().timestamp()
+        return {
+            "actuators": {
+                **self._restored,
+                **{
+                    entity_id: runtime.as_dict(now)
+                    for entity_id, runtime in self.actuators.items()
+                },
+            }
+        }
+
+
+@callback
+def async_get_runtime_store(hass: HomeAssistant) -> RuntimeStore:
+    """Return the shared runtime store, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_RUNTIME_STORE)) is None:
+        store = RuntimeStore(hass)
+        domain_data[DATA_RUNTIME_STORE] = store
+    return store
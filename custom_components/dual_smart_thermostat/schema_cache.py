@@ -0,0 +1,151 @@
+"""Bounded LRU cache for config and options flow schemas.
+
+Every render of a config/options/reconfigure step used to rebuild its
+``vol.Schema`` tree from scratch, including all selectors. The builders are
+pure functions of the system type, the feature toggles they are called with,
+the user's temperature unit and the handful of default values they pre-fill,
+so the result can be reused as long as those inputs are unchanged.
+
+Entries are keyed by ``(builder, flags, unit, default fingerprint)``. The
+fingerprint only covers the default keys a builder actually reads, so
+unrelated values in ``collected_config`` do not cause cache misses.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from datetime import timedelta
+import functools
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_CACHE_MAX_SIZE = 64
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable representation of a default value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, timedelta):
+        return ("timedelta", value.total_seconds())
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def defaults_fingerprint(
+    defaults: dict[str, Any] | None, keys: Iterable[str]
+) -> tuple[Hashable, ...]:
+    """Return a hashable fingerprint of ``defaults`` restricted to ``keys``.
+
+    Keys absent from ``defaults`` are left out entirely, so "not set" and
+    "explicitly None" produce different fingerprints.
+    """
+    if not defaults:
+        return ()
+    return tuple((key, _freeze(defaults[key])) for key in keys if key in defaults)
+
+
+def _temperature_unit(hass) -> str | None:
+    """Return the user's temperature unit, or None when hass is not given."""
+    if hass is None:
+        return None
+    try:
+        return hass.config.units.temperature_unit
+    except AttributeError:
+        return None
+
+
+class SchemaCache:
+    """Least-recently-used cache of built schemas with a hard size bound."""
+
+    def __init__(self, max_size: int = SCHEMA_CACHE_MAX_SIZE) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, building it on a miss."""
+        if not self.enabled:
+            return build()
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = build()
+            self._entries[key] = value
+            if len(self._entries) > self._max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                _LOGGER.debug("Schema cache full, evicted %s", evicted[0])
+            return value
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+SCHEMA_CACHE = SchemaCache()
+
+
+def cached_schema(
+    default_keys: Iterable[str],
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Memoize a schema builder in ``SCHEMA_CACHE``.
+
+    The decorated builder must accept ``hass`` and ``defaults`` as keyword or
+    positional arguments named exactly that; every other argument is treated
+    as a structural flag (system type, feature toggles) and becomes part of
+    the key as-is. Builders returning a ``dict`` get a shallow copy so callers
+    may merge into the result without corrupting the cached entry.
+    """
+    keys = tuple(default_keys)
+
+    def decorator(builder: Callable[..., Any]) -> Callable[..., Any]:
+        arg_names = builder.__code__.co_varnames[: builder.__code__.co_argcount]
+
+        @functools.wraps(builder)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = dict(zip(arg_names, args))
+            bound.update(kwargs)
+            hass = bound.pop("hass", None)
+            defaults = bound.pop("defaults", None)
+            key = (
+                builder.__qualname__,
+                tuple(sorted((k, _freeze(v)) for k, v in bound.items())),
+                _temperature_unit(hass),
+                # Builders treat empty and non-empty defaults differently
+                # (vol.UNDEFINED vs. None), so truthiness is part of the key.
+                bool(defaults),
+                defaults_fingerprint(defaults, keys),
+            )
+            result = SCHEMA_CACHE.get_or_build(key, lambda: builder(*args, **kwargs))
+            if isinstance(result, dict):
+                return dict(result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import timedelta
+import functools
 import json
 import logging
 from pathlib import Path
@@ -64,6 +65,7 @@ from .const import (
     SYSTEM_TYPES,
     SystemType,
 )
+from .schema_cache import cached_schema
 from .schema_utils import (
     get_boolean_selector,
     get_entity_selector,
@@ -79,6 +81,49 @@ from .schema_utils import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Default keys each cached builder reads; only these feed the cache key.
+_TOLERANCE_DEFAULT_KEYS = (
+    CONF_COLD_TOLERANCE,
+    CONF_HOT_TOLERANCE,
+    CONF_HEAT_TOLERANCE,
+    CONF_COOL_TOLERANCE,
+)
+_TIMING_DEFAULT_KEYS = (CONF_MIN_DUR, CONF_KEEP_ALIVE)
+_SYSTEM_DEFAULT_KEYS = (
+    CONF_NAME,
+    CONF_SENSOR,
+    CONF_HEATER,
+    CONF_COOLER,
+    CONF_HEAT_COOL_MODE,
+    CONF_HEAT_PUMP_COOLING,
+    CONF_AC_MODE,
+    *_TOLERANCE_DEFAULT_KEYS,
+    *_TIMING_DEFAULT_KEYS,
+)
+_FLOOR_DEFAULT_KEYS = (CONF_FLOOR_SENSOR, CONF_MAX_FLOOR_TEMP, CONF_MIN_FLOOR_TEMP)
+_FAN_DEFAULT_KEYS = (
+    CONF_FAN,
+    CONF_FAN_MODE,
+    CONF_FAN_ON_WITH_AC,
+    CONF_FAN_ON_WITH_HEATER,
+    CONF_FAN_AIR_OUTSIDE,
+    CONF_FAN_HOT_TOLERANCE,
+    CONF_FAN_HOT_TOLERANCE_TOGGLE,
+)
+_HUMIDITY_DEFAULT_KEYS = (
+    CONF_DRYER,
+    CONF_HUMIDITY_SENSOR,
+    CONF_TARGET_HUMIDITY,
+    CONF_MIN_HUMIDITY,
+    CONF_MAX_HUMIDITY,
+    CONF_DRY_TOLERANCE,
+    CONF_MOIST_TOLERANCE,
+)
+_FEATURE_DEFAULT_KEYS = tuple(
+    f"configure_{feature}"
+    for feature in ("floor_heating", "fan", "humidity", "openings", "presets")
+)
+
 
 # Load translations at module import time to avoid blocking I/O in async context
 def _load_translations_sync() -> dict:
@@ -198,6 +243,7 @@ def get_base_schema():
     )
 
 
+@cached_schema(_TOLERANCE_DEFAULT_KEYS)
 def get_tolerance_fields(
     hass=None,
     defaults: dict[str, Any] | None = None,
@@ -256,6 +302,7 @@ def get_tolerance_fields(
     return schema_dict
 
 
+@cached_schema(_TIMING_DEFAULT_KEYS)
 def get_timing_fields_for_section(
     defaults: dict[str, Any] | None = None,
     include_keep_alive: bool = True,
@@ -308,6 +355,7 @@ def get_timing_fields_for_section(
     return schema_dict
 
 
+@cached_schema(_SYSTEM_DEFAULT_KEYS)
 def get_basic_ac_schema(hass=None, defaults=None, include_name=True):
     """Get AC-only configuration schema with advanced settings in collapsible section."""
     defaults = defaults or {}
@@ -357,6 +405,7 @@ def get_basic_ac_schema(hass=None, defaults=None, include_name=True):
     return vol.Schema(core_schema)
 
 
+@cached_schema(_SYSTEM_DEFAULT_KEYS)
 def get_simple_heater_schema(hass=None, defaults=None, include_name=True):
     """Get simple heater configuration schema with advanced settings in collapsible section."""
     defaults = defaults or {}
@@ -407,6 +456,7 @@ def get_simple_heater_schema(hass=None, defaults=None, include_name=True):
     return vol.Schema(core_schema)
 
 
+@cached_schema(_SYSTEM_DEFAULT_KEYS)
 def get_heater_cooler_schema(hass=None, defaults=None, include_name=True):
     """Get heater + cooler configuration schema with advanced settings in collapsible section."""
     defaults = defaults or {}
@@ -474,6 +524,7 @@ def get_heater_cooler_schema(hass=None, defaults=None, include_name=True):
     return vol.Schema(core_schema)
 
 
+@cached_schema(_SYSTEM_DEFAULT_KEYS)
 def get_heat_pump_schema(hass=None, defaults=None, include_name=True):
     """Get heat pump configuration schema with advanced settings in collapsible section.
 
@@ -550,6 +601,7 @@ def get_heat_pump_schema(hass=None, defaults=None, include_name=True):
     return vol.Schema(core_schema)
 
 
+@cached_schema(())
 def get_grouped_schema(
     system_type: str,
     show_heater: bool = True,
@@ -647,6 +699,7 @@ def get_dual_stage_schema():
     )
 
 
+@cached_schema(_FLOOR_DEFAULT_KEYS)
 def get_floor_heating_schema(hass=None, defaults: dict[str, Any] | None = None):
     """Get floor heating configuration schema.
 
@@ -684,6 +737,7 @@ def get_humidity_toggle_schema():
     return vol.Schema({vol.Optional("humidity", default=False): get_boolean_selector()})
 
 
+@cached_schema(_FEATURE_DEFAULT_KEYS)
 def get_features_schema(
     system_type: str | SystemType, defaults: dict[str, Any] | None = None
 ):
@@ -779,6 +833,7 @@ def get_system_features_schema(system_type: str):
     return get_features_schema(system_type)
 
 
+@cached_schema(_SYSTEM_DEFAULT_KEYS)
 def get_core_schema(
     system_type: str,
     defaults: dict[str, Any] | None = None,
@@ -931,6 +986,7 @@ def get_openings_schema(selected_entities: list[str]):
     return vol.Schema(schema_dict)
 
 
+@cached_schema(_FAN_DEFAULT_KEYS)
 def get_fan_schema(hass=None, defaults: dict[str, Any] | None = None):
     """Get fan configuration schema.
 
@@ -983,6 +1039,7 @@ def get_fan_schema(hass=None, defaults: dict[str, Any] | None = None):
     )
 
 
+@cached_schema(_HUMIDITY_DEFAULT_KEYS)
 def get_humidity_schema(defaults: dict[str, Any] | None = None):
     """Get humidity configuration schema.
 
@@ -1090,15 +1147,13 @@ def get_advanced_settings_schema(hass=None):
     )
 
 
-def get_preset_selection_schema(defaults: list[str] | None = None):
-    """Get preset selection schema.
+@functools.lru_cache(maxsize=1)
+def _get_preset_selection_labels() -> dict[str, str]:
+    """Return the merged preset selection labels from the cached translations.
 
-    Accepts an optional list of preset keys to pre-select in the multi-select
-    selector (used by the options flow to pre-check presets that have
-    configuration data stored in the entry).
+    Translations are loaded once at import time, so the merge result never
+    changes and is computed on the first render only.
     """
-    # Load translation labels from cached translations
-    labels: dict[str, str] = {}
     try:
         trans = _load_translations()
 
@@ -1136,9 +1191,19 @@ def get_preset_selection_schema(defaults: list[str] | None = None):
         merged.update(common)
         merged.update(config_labels)
         merged.update(options_labels)
-        labels = merged
+        return merged
     except Exception:
-        labels = {}
+        return {}
+
+
+def get_preset_selection_schema(defaults: list[str] | None = None):
+    """Get preset selection schema.
+
+    Accepts an optional list of preset keys to pre-select in the multi-select
+    selector (used by the options flow to pre-check presets that have
+    configuration data stored in the entry).
+    """
+    labels = _get_preset_selection_labels()
 
     options = []
     for display_name, config_key in CONF_PRESETS.items():
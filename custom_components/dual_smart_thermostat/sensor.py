@@ -3,28 +3,50 @@
 Phase 0 of the Auto Mode roadmap (#563): exposes each climate entity's
 ``hvac_action_reason`` value as a diagnostic enum sensor entity. The sensor
 is dual-exposed alongside the existing (deprecated) climate state attribute.
+
+Each climate also gets two control-loop sensors (pass time and passes per
+minute). They are disabled by default and polled, so they cost nothing
+until enabled.
+
+Every switched actuator gets runtime, cycle and duty-cycle sensors, read
+from the counters in ``runtime_stats``. They are polled and disabled by
+default too.
 """
 
 from __future__ import annotations
 
+from abc import abstractmethod
 from collections.abc import Callable
+from datetime import timedelta
 import logging
+from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfTime
+from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.util import dt as dt_util
 
-from .const import SET_HVAC_ACTION_REASON_SENSOR_SIGNAL
+from .climate import async_get_thermostats
+from .const import DOMAIN, SET_HVAC_ACTION_REASON_SENSOR_SIGNAL
+from .control_metrics import ControlMetrics
 from .hvac_action_reason.hvac_action_reason import HVACActionReason
+from .runtime_stats import ActuatorRuntime, async_get_runtime_store
 
 _LOGGER = logging.getLogger(__name__)
 
+SCAN_INTERVAL = timedelta(seconds=60)
+
 # HVACActionReason.NONE is an empty string — Home Assistant's translation
 # validator rejects empty keys, so the sensor surfaces "none" as the
 # stable, translatable state value for that case.
@@ -108,6 +130,168 @@ class HvacActionReasonSensor(SensorEntity, RestoreEntity):
         self.async_write_ha_state()
 
 
+class _ControlMetricsSensor(SensorEntity):
+    """Base for the polled control-loop sensors, disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_has_entity_name = False
+
+    def __init__(self, sensor_key: str) -> None:
+        self._sensor_key = sensor_key
+
+    @property
+    def _metrics(self) -> ControlMetrics | None:
+        thermostat = async_get_thermostats(self.hass).get(self._sensor_key)
+        return thermostat.control_metrics if thermostat is not None else None
+
+    @property
+    def available(self) -> bool:
+        return self._metrics is not None
+
+
+class ControlPassTimeSensor(_ControlMetricsSensor):
+    """95th percentile duration of the climate's control passes."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+
+    def __init__(self, sensor_key: str, name: str) -> None:
+        super().__init__(sensor_key)
+        self._attr_name = f"{name} Control Pass Time"
+        self._attr_unique_id = f"{sensor_key}_control_pass_time"
+
+    async def async_update(self) -> None:
+        if (metrics := self._metrics) is None:
+            return
+        pass_time = metrics.pass_time.as_dict()
+        self._attr_native_value = pass_time["p95_ms"]
+        self._attr_extra_state_attributes: dict[str, Any] = {
+            "mean_ms": pass_time["mean_ms"],
+            "max_ms": pass_time["max_ms"],
+            "lock_wait_p95_ms": metrics.lock_wait.as_dict()["p95_ms"],
+            "service_call_p95_ms": metrics.service_call.as_dict()["p95_ms"],
+        }
+
+
+class ControlPassRateSensor(_ControlMetricsSensor):
+    """Number of control passes the climate ran in the last minute."""
+
+    _attr_native_unit_of_measurement = "passes/min"
+
+    def __init__(self, sensor_key: str, name: str) -> None:
+        super().__init__(sensor_key)
+        self._attr_name = f"{name} Control Passes"
+        self._attr_unique_id = f"{sensor_key}_control_passes"
+
+    async def async_update(self) -> None:
+        if (metrics := self._metrics) is None:
+            return
+        self._attr_native_value = metrics.passes_per_minute
+        self._attr_extra_state_attributes = {
+            str(trigger): count for trigger, count in metrics.triggers.items()
+        }
+
+
+class _ActuatorRuntimeSensor(SensorEntity):
+    """Base for the polled runtime sensors of one actuator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = False
+    _suffix: str
+
+    def __init__(self, sensor_key: str, name: str, actuator: str) -> None:
+        self._actuator = actuator
+        self._attr_name = f"{name} {split_entity_id(actuator)[1]} {self._suffix}"
+        self._attr_unique_id = (
+            f"{sensor_key}_{actuator}_{self._suffix.lower().replace(' ', '_')}"
+        )
+
+    @property
+    def _runtime(self) -> ActuatorRuntime | None:
+        return async_get_runtime_store(self.hass).actuators.get(self._actuator)
+
+    @property
+    def available(self) -> bool:
+        return self._runtime is not None
+
+    async def async_update(self) -> None:
+        if (runtime := self._runtime) is None:
+            return
+        self._update(runtime.summary(dt_util.utcnow().timestamp()))
+
+    @abstractmethod
+    def _update(self, summary: dict[str, Any]) -> None:
+        """Set the state from the runtime ``summary`` of the actuator."""
+
+
+class ActuatorRuntimeSensor(_ActuatorRuntimeSensor):
+    """Total time the actuator has been on."""
+
+    _suffix = "Runtime"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def _update(self, summary: dict[str, Any]) -> None:
+        self._attr_native_value = summary["on_time_h"]
+
+
+class ActuatorCyclesSensor(_ActuatorRuntimeSensor):
+    """Number of times the actuator was switched on."""
+
+    _suffix = "Cycles"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def _update(self, summary: dict[str, Any]) -> None:
+        self._attr_native_value = summary["cycles"]
+        self._attr_extra_state_attributes = {"short_cycles": summary["short_cycles"]}
+
+
+class ActuatorDutyCycleSensor(_ActuatorRuntimeSensor):
+    """Share of the last hour the actuator was on."""
+
+    _suffix = "Duty Cycle"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def _update(self, summary: dict[str, Any]) -> None:
+        self._attr_native_value = summary["duty_cycle_1h"]
+        self._attr_extra_state_attributes = {
+            "duty_cycle_24h": summary["duty_cycle_24h"]
+        }
+
+
+def _device_actuators(hass: HomeAssistant, sensor_key: str) -> list[str]:
+    """Return the switched entities of a climate, without duplicates.
+
+    UI and YAML climates both read them from their hvac device, so the
+    sensors match the actuators the runtime counters are kept for.
+    """
+    if (thermostat := async_get_thermostats(hass).get(sensor_key)) is None:
+        return []
+    return list(dict.fromkeys(thermostat.hvac_device.get_device_ids()))
+
+
+def _build_sensors(
+    sensor_key: str, name: str, actuators: list[str]
+) -> list[SensorEntity]:
+    sensors: list[SensorEntity] = [
+        HvacActionReasonSensor(sensor_key=sensor_key, name=name),
+        ControlPassTimeSensor(sensor_key, name),
+        ControlPassRateSensor(sensor_key, name),
+    ]
+    for actuator in actuators:
+        sensors += [
+            ActuatorRuntimeSensor(sensor_key, name, actuator),
+            ActuatorCyclesSensor(sensor_key, name, actuator),
+            ActuatorDutyCycleSensor(sensor_key, name, actuator),
+        ]
+    return sensors
+
+
 # Home Assistant's platform API requires ``async def`` for both setup entry
 # points (HA awaits the returned coroutines). Without an actual ``await`` in
 # the body, SonarCloud flags python:S7503 — suppressed explicitly because
@@ -118,12 +302,14 @@ async def async_setup_entry(  # NOSONAR python:S7503 - HA platform API
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Create the companion action-reason sensor for a config entry."""
-    del hass  # HA passes hass positionally but this platform doesn't need it
     config = {**config_entry.data, **config_entry.options}
     name = config.get(CONF_NAME, "dual_smart_thermostat")
     sensor_key = config_entry.entry_id
 
-    async_add_entities([HvacActionReasonSensor(sensor_key=sensor_key, name=name)])
+    sensors = _build_sensors(sensor_key, name, _device_actuators(hass, sensor_key))
+    for sensor in sensors:
+        sensor._attr_device_info = DeviceInfo(identifiers={(DOMAIN, sensor_key)})
+    async_add_entities(sensors)
 
 
 async def async_setup_platform(  # NOSONAR python:S7503 - HA platform API
@@ -133,8 +319,7 @@ async def async_setup_platform(  # NOSONAR python:S7503 - HA platform API
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Create the companion action-reason sensor for a YAML-discovered climate."""
-    # HA passes both positionally but this platform only uses discovery_info.
-    del hass
+    # HA passes config positionally but this platform doesn't need it.
     del config
     if discovery_info is None:
         # This platform is only instantiated via discovery from climate.py.
@@ -143,4 +328,6 @@ async def async_setup_platform(  # NOSONAR python:S7503 - HA platform API
     name = discovery_info["name"]
     sensor_key = discovery_info["sensor_key"]
 
-    async_add_entities([HvacActionReasonSensor(sensor_key=sensor_key, name=name)])
+    async_add_entities(
+        _build_sensors(sensor_key, name, _device_actuators(hass, sensor_key))
+    )
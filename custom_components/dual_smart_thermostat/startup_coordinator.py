@@ -0,0 +1,148 @@
+"""Integration-wide coordinator for thermostat startup.
+
+Every thermostat restores its state and reads its sensors in
+``async_added_to_hass`` and then runs a first, forced control pass. When Home
+Assistant boots with many thermostats those first passes all fire
+turn_on/turn_off commands at the same instant, which floods radio meshes such
+as Zigbee or Z-Wave.
+
+The coordinator lives in ``hass.data[DOMAIN]`` and is shared by all
+instances. Preparation (state restore, sensor reads) still runs concurrently;
+only the first control pass is handed to the coordinator, which releases them
+at most ``rate`` per second. Passes that had to queue get up to ``jitter``
+seconds of additional random spread.
+
+Once Home Assistant is running (reloads, newly added entries) the first pass
+runs immediately, as before.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import random
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_STARTUP_JITTER, DEFAULT_STARTUP_RATE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STARTUP_COORDINATOR = "startup_coordinator"
+
+
+@dataclass
+class StartupTiming:
+    """Startup latency of one thermostat, in seconds since it was added."""
+
+    prepared: float | None = None
+    first_control_delay: float | None = None
+    first_control_done: float | None = None
+
+    def as_dict(self) -> dict[str, float | None]:
+        return {
+            "prepared": self.prepared,
+            "first_control_delay": self.first_control_delay,
+            "first_control_done": self.first_control_done,
+        }
+
+
+class StartupCoordinator:
+    """Stagger the first control pass of all thermostats."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        jitter: float = DEFAULT_STARTUP_JITTER,
+        rate: float = DEFAULT_STARTUP_RATE,
+    ) -> None:
+        self.hass = hass
+        self.jitter = jitter
+        self.rate = rate
+        self._next_slot = 0.0
+        self._started_at: dict[str, float] = {}
+        self._timings: dict[str, StartupTiming] = {}
+
+    @property
+    def timings(self) -> dict[str, StartupTiming]:
+        """Return startup timings keyed by entity_id."""
+        return self._timings
+
+    def _elapsed(self, entity_id: str) -> float:
+        return self.hass.loop.time() - self._started_at[entity_id]
+
+    @callback
+    def async_begin(self, entity_id: str) -> None:
+        """Record that ``entity_id`` started its startup sequence."""
+        self._started_at[entity_id] = self.hass.loop.time()
+        self._timings[entity_id] = StartupTiming()
+
+    @callback
+    def async_mark_prepared(self, entity_id: str) -> None:
+        """Record that ``entity_id`` restored its state and read its sensors."""
+        if entity_id in self._started_at:
+            self._timings[entity_id].prepared = self._elapsed(entity_id)
+
+    def _reserve_delay(self) -> float:
+        """Reserve the next free command slot and return the delay until it."""
+        if self.hass.state == CoreState.running:
+            return 0.0
+
+        now = self.hass.loop.time()
+        slot = max(now, self._next_slot)
+        if self.rate > 0:
+            self._next_slot = slot + 1 / self.rate
+        # Without contention the slot is "now" and the pass runs inline;
+        # jitter only spreads passes that already had to queue.
+        if slot > now and self.jitter > 0:
+            slot += random.uniform(0, self.jitter)
+        return slot - now
+
+    async def async_run_first_control(
+        self, entity_id: str, action: Callable[[], Awaitable[Any]]
+    ) -> CALLBACK_TYPE | None:
+        """Run ``action`` now or in its reserved slot.
+
+        Returns a callback cancelling the pending run, or None when the action
+        already ran inline.
+        """
+        self._started_at.setdefault(entity_id, self.hass.loop.time())
+        timing = self._timings.setdefault(entity_id, StartupTiming())
+        delay = self._reserve_delay()
+        timing.first_control_delay = delay
+
+        async def _async_run(*_: Any) -> None:
+            await action()
+            timing.first_control_done = self._elapsed(entity_id)
+            _LOGGER.debug(
+                "%s startup: prepared after %s s, first control after %.3f s",
+                entity_id,
+                timing.prepared,
+                timing.first_control_done,
+            )
+
+        if delay <= 0:
+            await _async_run()
+            return None
+
+        _LOGGER.debug("%s: delaying first control pass by %.3f s", entity_id, delay)
+        return async_call_later(self.hass, delay, _async_run)
+
+    @callback
+    def async_forget(self, entity_id: str) -> None:
+        """Drop bookkeeping of a removed thermostat."""
+        self._started_at.pop(entity_id, None)
+        self._timings.pop(entity_id, None)
+
+
+@callback
+def async_get_startup_coordinator(hass: HomeAssistant) -> StartupCoordinator:
+    """Return the shared coordinator, creating it with defaults if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (coordinator := domain_data.get(DATA_STARTUP_COORDINATOR)) is None:
+        coordinator = StartupCoordinator(hass)
+        domain_data[DATA_STARTUP_COORDINATOR] = coordinator
+    return coordinator
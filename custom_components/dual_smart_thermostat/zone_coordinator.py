@@ -0,0 +1,273 @@
+"""Shared heat source for several zone thermostats.
+
+A hydronic system often has one thermostat per zone, each driving its own
+valve, and a single boiler or heat pump that must run while any zone calls
+for heat. Every thermostat configured with the same ``plant`` entity joins one
+``ZoneCoordinator`` in ``hass.data[DOMAIN]``.
+
+Members report their ``hvac_action`` and power percent whenever they write
+their state. The coordinator updates the set of calling zones and the summed
+power, so "is any zone calling?" is a set-size check and not a scan of the
+members. The plant is only touched when that answer flips, or when the
+plant's own state stops matching it: a plant that becomes available after
+the zones started calling, or one switched by hand, is corrected. It has its
+own ``CompressorProtection``, using ``plant_min_cycle_duration`` as both the
+minimum on and off time. A switch the protection defers is retried when its
+timer fires.
+
+When the last zone leaves, on a reload or removal, the coordinator is
+dropped. A plant still running then is switched off before it goes, since
+nothing would switch it off later.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.climate import HVACAction
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .command_scheduler import CommandPriority, async_get_command_scheduler
+from .const import COMPRESSOR_PROTECTION_SIGNAL, DOMAIN
+from .decision_trace import trace_step
+from .hvac_controller.compressor_protection import CompressorProtection
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ZONE_COORDINATORS = "zone_coordinators"
+
+CALLING_ACTIONS = frozenset((HVACAction.HEATING, HVACAction.COOLING))
+
+
+class ZoneCoordinator:
+    """Aggregate the demand of member thermostats and drive their plant."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        plant_entity_id: str,
+        min_cycle_duration: timedelta | None = None,
+    ) -> None:
+        self.hass = hass
+        self.plant_entity_id = plant_entity_id
+        self.protection = CompressorProtection(
+            hass, plant_entity_id, min_cycle_duration, min_cycle_duration
+        )
+        self._members: dict[str, int] = {}
+        self._calling: set[str] = set()
+        self._total_power = 0
+        self._apply_task: asyncio.Task | None = None
+        self._reapply = False
+        self._remove_signal = async_dispatcher_connect(
+            hass,
+            COMPRESSOR_PROTECTION_SIGNAL.format(plant_entity_id),
+            self._async_schedule_apply,
+        )
+        self._remove_plant_listener = async_track_state_change_event(
+            hass, [plant_entity_id], self._async_plant_changed
+        )
+
+    @property
+    def any_calling(self) -> bool:
+        """Return whether any member zone calls for the plant."""
+        return bool(self._calling)
+
+    @property
+    def members(self) -> frozenset[str]:
+        """Return the entity ids of the member zones."""
+        return frozenset(self._members)
+
+    @property
+    def calling(self) -> frozenset[str]:
+        """Return the entity ids of the calling zones."""
+        return frozenset(self._calling)
+
+    @property
+    def demand_percent(self) -> int:
+        """Return the mean power percent over all member zones."""
+        if not self._members:
+            return 0
+        return round(self._total_power / len(self._members))
+
+    @callback
+    def async_join(
+        self, entity_id: str, min_cycle_duration: timedelta | None = None
+    ) -> None:
+        """Add a member zone, keeping the longest requested plant cycle."""
+        self._members.setdefault(entity_id, 0)
+        if min_cycle_duration is not None:
+            seconds = min_cycle_duration.total_seconds()
+            self.protection.min_on_time = max(self.protection.min_on_time, seconds)
+            self.protection.min_off_time = max(self.protection.min_off_time, seconds)
+
+    @callback
+    def async_leave(self, entity_id: str) -> None:
+        """Drop a member zone and its demand."""
+        self.async_update(entity_id, HVACAction.OFF, 0)
+        self._members.pop(entity_id, None)
+
+    @callback
+    def async_update(
+        self, entity_id: str, hvac_action: HVACAction | None, power_percent: int
+    ) -> None:
+        """Record the demand of ``entity_id``, switching the plant on a flip."""
+        if entity_id not in self._members:
+            return
+        was_calling = bool(self._calling)
+        if hvac_action in CALLING_ACTIONS:
+            self._calling.add(entity_id)
+        else:
+            self._calling.discard(entity_id)
+        power_percent = power_percent or 0
+        self._total_power += power_percent - self._members[entity_id]
+        self._members[entity_id] = power_percent
+        if bool(self._calling) != was_calling:
+            trace_step(
+                self.plant_entity_id,
+                "zones calling: %d, last change by %s",
+                len(self._calling),
+                entity_id,
+            )
+            self._async_schedule_apply()
+
+    @callback
+    def _async_plant_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Re-apply the demand when the plant state does not match it."""
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        if (new_state.state == STATE_ON) != self.any_calling:
+            trace_step(
+                self.plant_entity_id,
+                "plant %s, not following the zones",
+                new_state.state,
+            )
+            self._async_schedule_apply()
+
+    @callback
+    def _async_schedule_apply(self) -> None:
+        """Run one apply at a time, repeating it if demand changed meanwhile."""
+        if self._apply_task is not None and not self._apply_task.done():
+            self._reapply = True
+            return
+        self._apply_task = self.hass.async_create_task(self._async_apply())
+
+    async def _async_apply(self) -> None:
+        self._reapply = True
+        while self._reapply:
+            self._reapply = False
+            await self._async_apply_once()
+
+    async def _async_apply_once(self) -> None:
+        state = self.hass.states.get(self.plant_entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # Applied again once the plant reports a state.
+            _LOGGER.debug("Plant %s is not available", self.plant_entity_id)
+            return
+        is_on = state.state == STATE_ON
+        if self.any_calling == is_on:
+            self.protection.async_cancel()
+            return
+        if self.any_calling:
+            if not self.protection.async_allow_start():
+                return
+            service = SERVICE_TURN_ON
+        else:
+            if not self.protection.async_allow_stop():
+                return
+            service = SERVICE_TURN_OFF
+
+        _LOGGER.info(
+            "Zone demand changed, calling %s on %s", service, self.plant_entity_id
+        )
+        await self._async_switch(service)
+
+    async def _async_switch(self, service: str) -> None:
+        try:
+            await async_get_command_scheduler(self.hass).async_call(
+                HA_DOMAIN,
+                service,
+                {ATTR_ENTITY_ID: self.plant_entity_id},
+                priority=CommandPriority.NORMAL,
+            )
+        except Exception as e:
+            _LOGGER.error(
+                "Error switching plant %s. Error: %s", self.plant_entity_id, e
+            )
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending switch and switch a running plant off.
+
+        The final stop skips the protection, no zone is left to retry it.
+        """
+        self.protection.async_cancel()
+        self._remove_signal()
+        self._remove_plant_listener()
+        if self._apply_task is not None:
+            self._apply_task.cancel()
+        if self.hass.states.is_state(self.plant_entity_id, STATE_ON):
+            _LOGGER.info("Last zone left, turning off %s", self.plant_entity_id)
+            await self._async_switch(SERVICE_TURN_OFF)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "plant": self.plant_entity_id,
+            "members": sorted(self._members),
+            "calling": sorted(self._calling),
+            "demand_percent": self.demand_percent,
+            "protection": self.protection.diagnostics(),
+        }
+
+
+@callback
+def async_join_zone(
+    hass: HomeAssistant,
+    plant_entity_id: str,
+    entity_id: str,
+    min_cycle_duration: timedelta | None = None,
+) -> ZoneCoordinator:
+    """Add ``entity_id`` to the coordinator of ``plant_entity_id``."""
+    coordinators = async_get_zone_coordinators(hass)
+    if (coordinator := coordinators.get(plant_entity_id)) is None:
+        coordinator = ZoneCoordinator(hass, plant_entity_id)
+        coordinators[plant_entity_id] = coordinator
+    coordinator.async_join(entity_id, min_cycle_duration)
+    return coordinator
+
+
+async def async_leave_zone(
+    hass: HomeAssistant, plant_entity_id: str, entity_id: str
+) -> None:
+    """Remove ``entity_id`` from its coordinator, dropping an empty one."""
+    coordinators = async_get_zone_coordinators(hass)
+    if (coordinator := coordinators.get(plant_entity_id)) is None:
+        return
+    coordinator.async_leave(entity_id)
+    if not coordinator.members:
+        coordinators.pop(plant_entity_id)
+        await coordinator.async_shutdown()
+
+
+@callback
+def async_get_zone_coordinators(hass: HomeAssistant) -> dict[str, ZoneCoordinator]:
+    """Return the shared coordinators keyed by plant entity id."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ZONE_COORDINATORS, {})
@@ -19,12 +19,40 @@
 from homeassistant.core import HomeAssistant
 import pytest
 
+from custom_components.dual_smart_thermostat.managers import slot_planner
+
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
+@pytest.fixture
+def armed_slot_timers(monkeypatch) -> set:
+    """Return the slot timers of the tariff and forecast plans still armed."""
+    armed = set()
+    track = slot_planner.async_track_point_in_utc_time
+
+    def _track(hass, action, point):
+        token = object()
+
+        async def _fired(now):
+            armed.discard(token)
+            await action(now)
+
+        cancel = track(hass, _fired, point)
+
+        def _cancel():
+            armed.discard(token)
+            cancel()
+
+        armed.add(token)
+        return _cancel
+
+    monkeypatch.setattr(slot_planner, "async_track_point_in_utc_time", _track)
+    return armed
+
+
 @pytest.fixture
 async def setup_template_test_entities(hass: HomeAssistant):
     """Set up helper entities for template testing."""
@@ -627,3 +627,68 @@ class TestIsWithinFanTolerance:
         env._cur_temp = None
 
         assert env.is_within_fan_tolerance() is False
+
+
+class TestToleranceTable:
+    """Test the cached (hvac_mode, target_attr) tolerance table."""
+
+    @pytest.mark.asyncio
+    async def test_mode_switch_selects_other_entry(
+        self, hass, environment_manager_with_tolerances
+    ):
+        """Switching modes back and forth reuses the cached entries."""
+        env = environment_manager_with_tolerances
+        env.set_hvac_mode(HVACMode.HEAT)
+        assert env._get_active_tolerance_for_mode() == (0.3, 0.3)
+
+        env.set_hvac_mode(HVACMode.COOL)
+        assert env._get_active_tolerance_for_mode() == (2.0, 2.0)
+
+        env.set_hvac_mode(HVACMode.HEAT)
+        assert env._get_active_tolerance_for_mode() == (0.3, 0.3)
+        assert len(env._tolerance_table) == 2
+
+    @pytest.mark.asyncio
+    async def test_tolerance_change_invalidates_table(
+        self, hass, environment_manager_with_tolerances
+    ):
+        """Writing a tolerance drops previously derived pairs."""
+        env = environment_manager_with_tolerances
+        env.set_hvac_mode(HVACMode.HEAT)
+        assert env._get_active_tolerance_for_mode() == (0.3, 0.3)
+
+        env._heat_tolerance = 1.0
+
+        assert env._get_active_tolerance_for_mode() == (1.0, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_direct_mode_write_is_honored(
+        self, hass, environment_manager_with_tolerances
+    ):
+        """Assigning _hvac_mode directly still selects the right pair."""
+        env = environment_manager_with_tolerances
+        env._hvac_mode = HVACMode.COOL
+
+        assert env._state.hvac_mode == HVACMode.COOL
+        assert env._get_active_tolerance_for_mode() == (2.0, 2.0)
+
+
+class TestRangeTargetListeners:
+    """Test the notification when a range target is set or cleared."""
+
+    @pytest.mark.asyncio
+    async def test_manager_writes_notify_listeners(self, hass, environment_manager):
+        """Range targets the manager sets itself reach the listeners."""
+        env = environment_manager
+        calls = []
+        env.add_range_target_listener(lambda: calls.append(env.has_target_temp_range))
+
+        env.set_temperature_range(21, 19, 23)
+        assert calls == [False, True]
+
+        # Moving a target that is already set is not a change of the range.
+        env.set_temperature_range(21, 18, 24)
+        assert calls == [False, True]
+
+        env.target_temp_high = None
+        assert calls == [False, True, False]
@@ -0,0 +1,98 @@
+"""Tests for the precomputed FeatureManager profile."""
+
+import logging
+from unittest.mock import MagicMock
+
+from homeassistant.components.climate import ClimateEntityFeature
+from homeassistant.const import UnitOfTemperature
+import pytest
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_COOLER,
+    CONF_FAN,
+    CONF_FAN_HOT_TOLERANCE,
+    CONF_HEAT_COOL_MODE,
+    CONF_HEATER,
+    CONF_SENSOR,
+)
+from custom_components.dual_smart_thermostat.managers.environment_manager import (
+    EnvironmentManager,
+)
+from custom_components.dual_smart_thermostat.managers.feature_manager import (
+    FeatureFlag,
+    FeatureManager,
+)
+
+
+def _make_features(**config) -> FeatureManager:
+    hass = MagicMock()
+    hass.config.units.temperature_unit = UnitOfTemperature.CELSIUS
+    config.setdefault(CONF_SENSOR, "sensor.indoor_temp")
+    return FeatureManager(hass, config, EnvironmentManager(hass, config))
+
+
+def test_profile_reflects_configuration() -> None:
+    features = _make_features(
+        **{
+            CONF_HEATER: "switch.heater",
+            CONF_COOLER: "switch.cooler",
+            CONF_FAN: "switch.fan",
+            CONF_FAN_HOT_TOLERANCE: 0.5,
+        }
+    )
+
+    assert features.is_configured_for_heater_mode
+    assert features.is_configured_for_dual_mode
+    assert features.is_configured_fan_mode_tolerance
+    assert features.is_configured_for_auto_mode
+    assert not features.is_configured_for_cooler_mode
+    assert not features.is_configured_for_heat_cool_mode
+
+
+def test_profile_follows_supported_features() -> None:
+    features = _make_features(**{CONF_HEATER: "switch.heater"})
+
+    assert not features.is_target_mode
+    assert not features.is_range_mode
+
+    features._supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
+    assert features.is_target_mode
+    assert not features.is_range_mode
+
+    features._supported_features |= ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
+    assert features.is_range_mode
+    assert not features.is_target_mode
+    assert features.profile.supported_features == features.supported_features
+
+
+def test_heat_cool_follows_range_targets() -> None:
+    features = _make_features(**{CONF_HEATER: "switch.heater"})
+    environment = features.environment
+
+    environment._target_temp_low = 18
+    assert not features.is_configured_for_heat_cool_mode
+
+    environment._target_temp_high = 24
+    assert features.is_configured_for_heat_cool_mode
+
+    environment._target_temp_high = None
+    assert not features.is_configured_for_heat_cool_mode
+
+
+def test_heat_cool_configured_statically() -> None:
+    features = _make_features(
+        **{CONF_HEATER: "switch.heater", CONF_HEAT_COOL_MODE: True}
+    )
+
+    assert FeatureFlag.HEAT_COOL in features.profile
+    assert features.is_configured_for_heat_cool_mode
+
+
+def test_heat_cool_check_does_not_log(caplog: pytest.LogCaptureFixture) -> None:
+    features = _make_features(**{CONF_HEATER: "switch.heater"})
+
+    with caplog.at_level(logging.INFO):
+        for _ in range(3):
+            features.is_configured_for_heat_cool_mode
+
+    assert not caplog.records
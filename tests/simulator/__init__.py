@@ -0,0 +1,6 @@
+"""Closed-loop plant simulator for dual_smart_thermostat tests.
+
+``model`` holds the thermal model of a room and its equipment. ``plant``
+wires the model to Home Assistant as virtual switches, valves and sensors,
+driven by the frozen test clock.
+"""
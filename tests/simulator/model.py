@@ -0,0 +1,203 @@
+"""Lumped thermal model of a room and its HVAC equipment.
+
+The room air and furniture form one heat capacity ``C`` [J/K], connected to
+the outside through the envelope resistance ``R`` [K/W]. An open window adds
+a parallel resistance. Each actuator adds (or removes) heat:
+
+- ``Heater`` and ``Cooler`` act on the air directly
+- ``RadiantSlab`` heats its own capacity, which then warms the room through
+  the floor surface, so the room lags the heating circuit by hours
+- ``HeatPump`` delivers a capacity that falls as the outside gets colder
+  (or hotter, when cooling)
+- ``Fan`` removes a little heat, ``Dryer`` removes moisture
+
+Humidity relaxes towards the outside humidity with a fixed time constant.
+Everything is integrated with explicit Euler steps of at most ``max_step``
+seconds, which is far below the room's time constant.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import math
+
+
+@dataclass
+class Weather:
+    """Outside conditions, with a daily temperature swing."""
+
+    mean: float = 5.0
+    amplitude: float = 4.0
+    coldest_hour: float = 5.0
+    humidity: float = 60.0
+
+    def temperature(self, seconds: float) -> float:
+        """Return the outside temperature ``seconds`` after midnight."""
+        phase = 2 * math.pi * (seconds / 3600 - self.coldest_hour) / 24
+        return self.mean - self.amplitude * math.cos(phase)
+
+
+@dataclass
+class Room:
+    """Air temperature and humidity of one zone."""
+
+    temperature: float = 20.0
+    humidity: float = 50.0
+    capacity: float = 1.5e6
+    resistance: float = 0.01
+    window_resistance: float = 0.01
+    humidity_time_constant: float = 4 * 3600
+    internal_gain: float = 0.0
+
+
+class Actuator:
+    """Equipment switched by one entity."""
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        """Return the heat delivered to the room air in W over the next ``dt``."""
+        return 0.0
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        """Return the electrical draw in W."""
+        return 0.0
+
+    def drying(self, on: bool) -> float:
+        """Return the humidity removed in %RH per second."""
+        return 0.0
+
+
+@dataclass
+class Heater(Actuator):
+    power: float = 2000.0
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        return self.power if on else 0.0
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.power if on else 0.0
+
+
+@dataclass
+class Cooler(Actuator):
+    power: float = 2500.0
+    efficiency: float = 3.0
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        return -self.power if on else 0.0
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.power / self.efficiency if on else 0.0
+
+
+@dataclass
+class Fan(Actuator):
+    cooling: float = 300.0
+    power: float = 50.0
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        return -self.cooling if on else 0.0
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.power if on else 0.0
+
+
+@dataclass
+class Dryer(Actuator):
+    rate: float = 6.0
+    power: float = 300.0
+
+    def drying(self, on: bool) -> float:
+        return self.rate / 3600 if on else 0.0
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.power if on else 0.0
+
+
+@dataclass
+class RadiantSlab(Actuator):
+    """Floor heating: the circuit heats the slab, the slab heats the room."""
+
+    power: float = 3000.0
+    capacity: float = 8e6
+    resistance: float = 0.004
+    temperature: float = 20.0
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        to_room = (self.temperature - room.temperature) / self.resistance
+        self.temperature += dt * ((self.power if on else 0.0) - to_room) / self.capacity
+        return to_room
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.power if on else 0.0
+
+
+@dataclass
+class HeatPump(Actuator):
+    """Air-to-air heat pump whose capacity depends on the outside temperature.
+
+    Heating capacity is ``capacity`` at 7 °C and changes by ``slope`` of it
+    per kelvin; cooling capacity is rated at 35 °C the same way. ``cooling``
+    is switched by the heat pump cooling entity.
+    """
+
+    capacity: float = 5000.0
+    slope: float = 0.03
+    cop: float = 3.5
+    cooling: bool = False
+
+    def output(self, outside: float) -> float:
+        if self.cooling:
+            return max(0.0, self.capacity * (1 - self.slope * (outside - 35)))
+        return max(0.0, self.capacity * (1 + self.slope * (outside - 7)))
+
+    def heat(self, room: Room, outside: float, dt: float, on: bool) -> float:
+        if not on:
+            return 0.0
+        output = self.output(outside)
+        return -output if self.cooling else output
+
+    def electrical_power(self, outside: float, on: bool) -> float:
+        return self.output(outside) / self.cop if on else 0.0
+
+
+@dataclass
+class ThermalModel:
+    """A room, its weather and the actuators keyed by entity id."""
+
+    room: Room = field(default_factory=Room)
+    weather: Weather = field(default_factory=Weather)
+    actuators: dict[str, Actuator] = field(default_factory=dict)
+    max_step: float = 60.0
+    energy: dict[str, float] = field(default_factory=dict)
+
+    def step(
+        self, elapsed: float, dt: float, on: Mapping[str, bool], window_open: bool
+    ) -> None:
+        """Advance the model by ``dt`` seconds starting ``elapsed`` after midnight."""
+        room = self.room
+        steps = max(1, math.ceil(dt / self.max_step))
+        h = dt / steps
+        for index in range(steps):
+            outside = self.weather.temperature(elapsed + index * h)
+            heat = room.internal_gain
+            drying = 0.0
+            for entity_id, actuator in self.actuators.items():
+                is_on = on.get(entity_id, False)
+                heat += actuator.heat(room, outside, h, is_on)
+                drying += actuator.drying(is_on)
+                self.energy[entity_id] = (
+                    self.energy.get(entity_id, 0.0)
+                    + actuator.electrical_power(outside, is_on) * h
+                )
+            conductance = 1 / room.resistance
+            if window_open:
+                conductance += 1 / room.window_resistance
+            room.temperature += (
+                h * (heat - conductance * (room.temperature - outside)) / room.capacity
+            )
+            room.humidity += h * (
+                (self.weather.humidity - room.humidity) / room.humidity_time_constant
+                - drying
+            )
+            room.humidity = min(100.0, max(0.0, room.humidity))
@@ -0,0 +1,253 @@
+"""Virtual equipment and sensors around a ThermalModel, on a virtual clock.
+
+``VirtualPlant`` plays the hardware side of a closed loop. It answers the
+``homeassistant.turn_on/turn_off/open_valve/close_valve`` calls the
+thermostat makes by switching the virtual entity. It advances the model
+with the frozen clock and publishes the temperature, humidity, floor and
+outside sensors. Timers (keep-alive, min cycle duration, aux heater timeout)
+fire as the clock moves, so a whole day runs in a few seconds.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+import math
+from time import perf_counter
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.valve import ValveEntityFeature
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    SERVICE_CLOSE_VALVE,
+    SERVICE_OPEN_VALVE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_CLOSED,
+    STATE_OFF,
+    STATE_ON,
+    STATE_OPEN,
+)
+from homeassistant.core import DOMAIN as HA_DOMAIN, HomeAssistant, ServiceCall, callback
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.command_scheduler import (
+    async_get_command_scheduler,
+)
+
+from .model import HeatPump, RadiantSlab, ThermalModel
+
+_ON_SERVICES = {SERVICE_TURN_ON: STATE_ON, SERVICE_OPEN_VALVE: STATE_OPEN}
+_OFF_SERVICES = {SERVICE_TURN_OFF: STATE_OFF, SERVICE_CLOSE_VALVE: STATE_CLOSED}
+
+
+@dataclass
+class Sample:
+    elapsed: float
+    temperature: float
+    humidity: float
+    target: float | None
+    active: frozenset[str]
+
+
+@dataclass
+class ScenarioResult:
+    """What a closed-loop run did, for assertions and comparisons."""
+
+    samples: list[Sample]
+    cycles: dict[str, int]
+    on_time: dict[str, float]
+    energy_kwh: dict[str, float]
+    wall_time: float
+
+    def after(self, start: timedelta) -> list[Sample]:
+        return [s for s in self.samples if s.elapsed >= start.total_seconds()]
+
+    def rms_error(self, start: timedelta = timedelta()) -> float:
+        """Return the RMS deviation from the thermostat's target after ``start``."""
+        errors = [
+            (s.temperature - s.target) ** 2
+            for s in self.after(start)
+            if s.target is not None
+        ]
+        return math.sqrt(sum(errors) / len(errors)) if errors else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rms_error": round(self.rms_error(), 3),
+            "cycles": dict(self.cycles),
+            "on_time_h": {k: round(v / 3600, 2) for k, v in self.on_time.items()},
+            "energy_kwh": {k: round(v, 3) for k, v in self.energy_kwh.items()},
+            "wall_time_s": round(self.wall_time, 3),
+        }
+
+
+@dataclass
+class VirtualPlant:
+    """Closed loop between a thermostat and a ThermalModel.
+
+    ``actuators`` of the model are the entity ids the thermostat switches.
+    Entities in ``valves`` behave as valves. ``windows`` are opening sensors
+    that ``set_window`` opens and closes, and ``heat_pump_cooling`` is the
+    entity that puts a ``HeatPump`` into cooling.
+    """
+
+    hass: HomeAssistant
+    freezer: FrozenDateTimeFactory
+    model: ThermalModel
+    sensor: str
+    climate: str | None = None
+    floor_sensor: str | None = None
+    humidity_sensor: str | None = None
+    outside_sensor: str | None = None
+    valves: tuple[str, ...] = ()
+    windows: tuple[str, ...] = ()
+    heat_pump_cooling: str | None = None
+    elapsed: float = 0.0
+    samples: list[Sample] = field(default_factory=list)
+    cycles: dict[str, int] = field(default_factory=dict)
+    on_time: dict[str, float] = field(default_factory=dict)
+    _events: list[tuple[float, Callable[[], None]]] = field(default_factory=list)
+
+    async def async_setup(self) -> None:
+        """Create the virtual entities and publish the first readings.
+
+        Commands go out unthrottled: the plant stands in for ideal hardware,
+        and the rate limiter runs on the real clock, not the virtual one.
+        """
+        async_get_command_scheduler(self.hass).async_configure(0, 1)
+        for entity_id in self.model.actuators:
+            if entity_id in self.valves:
+                self.hass.states.async_set(
+                    entity_id,
+                    STATE_CLOSED,
+                    {
+                        "supported_features": ValveEntityFeature.OPEN
+                        | ValveEntityFeature.CLOSE
+                    },
+                )
+            else:
+                self.hass.states.async_set(entity_id, STATE_OFF)
+            self.cycles[entity_id] = 0
+            self.on_time[entity_id] = 0.0
+        for window in self.windows:
+            self.hass.states.async_set(window, STATE_OFF)
+        if self.heat_pump_cooling is not None:
+            self.hass.states.async_set(self.heat_pump_cooling, STATE_OFF)
+        for service in (*_ON_SERVICES, *_OFF_SERVICES):
+            self.hass.services.async_register(HA_DOMAIN, service, self._handle_call)
+        self._publish()
+        await self.hass.async_block_till_done()
+
+    @callback
+    def _handle_call(self, call: ServiceCall) -> None:
+        entity_ids = call.data[ATTR_ENTITY_ID]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            if entity_id not in self.model.actuators:
+                continue
+            new_state = _ON_SERVICES.get(call.service) or _OFF_SERVICES[call.service]
+            state = self.hass.states.get(entity_id)
+            if new_state in (STATE_ON, STATE_OPEN) and not self.is_on(entity_id):
+                self.cycles[entity_id] += 1
+            self.hass.states.async_set(entity_id, new_state, state.attributes)
+
+    def is_on(self, entity_id: str) -> bool:
+        state = self.hass.states.get(entity_id)
+        return state is not None and state.state in (STATE_ON, STATE_OPEN)
+
+    def set_window(self, entity_id: str, is_open: bool) -> None:
+        self.hass.states.async_set(entity_id, STATE_ON if is_open else STATE_OFF)
+
+    def set_heat_pump_cooling(self, cooling: bool) -> None:
+        self.hass.states.async_set(
+            self.heat_pump_cooling, STATE_ON if cooling else STATE_OFF
+        )
+
+    def at(self, offset: timedelta, action: Callable[[], None]) -> None:
+        """Run ``action`` once the run reaches ``offset``."""
+        self._events.append((offset.total_seconds(), action))
+        self._events.sort(key=lambda event: event[0])
+
+    def _publish(self) -> None:
+        room = self.model.room
+        states = self.hass.states
+        states.async_set(self.sensor, f"{room.temperature:.1f}")
+        if self.humidity_sensor is not None:
+            states.async_set(self.humidity_sensor, f"{room.humidity:.0f}")
+        if self.outside_sensor is not None:
+            outside = self.model.weather.temperature(self.elapsed)
+            states.async_set(self.outside_sensor, f"{outside:.1f}")
+        if self.floor_sensor is not None:
+            slab = next(
+                (
+                    actuator
+                    for actuator in self.model.actuators.values()
+                    if isinstance(actuator, RadiantSlab)
+                ),
+                None,
+            )
+            floor = slab.temperature if slab is not None else room.temperature
+            states.async_set(self.floor_sensor, f"{floor:.1f}")
+
+    def _sync_heat_pump(self) -> None:
+        if self.heat_pump_cooling is None:
+            return
+        cooling = self.is_on(self.heat_pump_cooling)
+        for actuator in self.model.actuators.values():
+            if isinstance(actuator, HeatPump):
+                actuator.cooling = cooling
+
+    async def async_run(
+        self, duration: timedelta, step: timedelta = timedelta(minutes=1)
+    ) -> ScenarioResult:
+        """Run the closed loop for ``duration`` of virtual time."""
+        started = perf_counter()
+        dt = step.total_seconds()
+        end = self.elapsed + duration.total_seconds()
+        while self.elapsed < end:
+            while self._events and self._events[0][0] <= self.elapsed:
+                self._events.pop(0)[1]()
+            self._sync_heat_pump()
+            on = {
+                entity_id: self.is_on(entity_id) for entity_id in self.model.actuators
+            }
+            window_open = any(self.is_on(window) for window in self.windows)
+            self.model.step(self.elapsed, dt, on, window_open)
+            for entity_id, is_on in on.items():
+                if is_on:
+                    self.on_time[entity_id] += dt
+            self.elapsed += dt
+
+            self.freezer.tick(step)
+            self._publish()
+            async_fire_time_changed(self.hass)
+            await self.hass.async_block_till_done()
+            self._sample()
+
+        return ScenarioResult(
+            samples=self.samples,
+            cycles=dict(self.cycles),
+            on_time=dict(self.on_time),
+            energy_kwh={k: v / 3.6e6 for k, v in self.model.energy.items()},
+            wall_time=perf_counter() - started,
+        )
+
+    def _sample(self) -> None:
+        target = None
+        if self.climate is not None and (climate := self.hass.states.get(self.climate)):
+            target = climate.attributes.get(ATTR_TEMPERATURE)
+        room = self.model.room
+        self.samples.append(
+            Sample(
+                self.elapsed,
+                room.temperature,
+                room.humidity,
+                target,
+                frozenset(e for e in self.model.actuators if self.is_on(e)),
+            )
+        )
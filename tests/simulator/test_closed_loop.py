@@ -0,0 +1,138 @@
+"""Whole-day closed-loop scenarios against the virtual plant."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.unit_system import METRIC_SYSTEM
+import pytest
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+from .. import common
+from .model import Heater, HeatPump, RadiantSlab, Room, ThermalModel, Weather
+from .plant import VirtualPlant
+
+DAY = timedelta(days=1)
+WARM_UP = timedelta(hours=2)
+
+
+async def _setup_thermostat(hass: HomeAssistant, **config) -> None:
+    hass.config.units = METRIC_SYSTEM
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_HEATER,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 21,
+                "cold_tolerance": 0.3,
+                "hot_tolerance": 0.3,
+                **config,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_heater_holds_target_over_a_day(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    plant = VirtualPlant(
+        hass,
+        freezer,
+        ThermalModel(actuators={common.ENT_HEATER: Heater()}),
+        sensor=common.ENT_SENSOR,
+        climate=common.ENTITY,
+    )
+    await plant.async_setup()
+    await _setup_thermostat(hass)
+
+    result = await plant.async_run(DAY)
+
+    assert result.rms_error(WARM_UP) < 0.5
+    assert all(20 <= s.temperature <= 22 for s in result.after(WARM_UP))
+    assert 10 < result.cycles[common.ENT_HEATER] < 200
+    assert 0 < result.energy_kwh[common.ENT_HEATER] < 48
+
+
+@pytest.mark.asyncio
+async def test_open_window_stops_heating(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    window = "binary_sensor.window"
+    plant = VirtualPlant(
+        hass,
+        freezer,
+        ThermalModel(actuators={common.ENT_HEATER: Heater()}),
+        sensor=common.ENT_SENSOR,
+        windows=(window,),
+    )
+    plant.at(timedelta(hours=12), lambda: plant.set_window(window, True))
+    plant.at(timedelta(hours=13), lambda: plant.set_window(window, False))
+    await plant.async_setup()
+    await _setup_thermostat(hass, openings=[window])
+
+    result = await plant.async_run(timedelta(hours=16))
+
+    during = [s for s in result.samples if 12 * 3600 < s.elapsed <= 13 * 3600]
+    assert all(common.ENT_HEATER not in s.active for s in during)
+    assert during[-1].temperature < during[0].temperature - 1
+    assert result.samples[-1].temperature > 20
+
+
+@pytest.mark.asyncio
+async def test_radiant_floor_respects_max_floor_temp(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    slab = RadiantSlab(power=6000)
+    plant = VirtualPlant(
+        hass,
+        freezer,
+        ThermalModel(room=Room(temperature=16), actuators={common.ENT_HEATER: slab}),
+        sensor=common.ENT_SENSOR,
+        floor_sensor=common.ENT_FLOOR_SENSOR,
+    )
+    await plant.async_setup()
+    await _setup_thermostat(
+        hass, floor_sensor=common.ENT_FLOOR_SENSOR, max_floor_temp=27
+    )
+
+    result = await plant.async_run(timedelta(hours=12))
+
+    assert slab.temperature < 28
+    assert result.samples[-1].temperature > 16
+
+
+@pytest.mark.parametrize(("outside", "holds_target"), [(10.0, True), (-15.0, False)])
+@pytest.mark.asyncio
+async def test_heat_pump_capacity_drops_in_the_cold(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    outside: float,
+    holds_target: bool,
+) -> None:
+    plant = VirtualPlant(
+        hass,
+        freezer,
+        ThermalModel(
+            weather=Weather(mean=outside, amplitude=0),
+            actuators={common.ENT_HEATER: HeatPump()},
+        ),
+        sensor=common.ENT_SENSOR,
+        climate=common.ENTITY,
+        heat_pump_cooling=common.ENT_HEAT_PUMP_COOLING,
+    )
+    await plant.async_setup()
+    await _setup_thermostat(hass, heat_pump_cooling=common.ENT_HEAT_PUMP_COOLING)
+
+    result = await plant.async_run(timedelta(hours=8))
+
+    assert (result.rms_error(WARM_UP) < 0.5) is holds_target
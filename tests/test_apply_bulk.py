@@ -0,0 +1,81 @@
+"""Tests for the apply_bulk service."""
+
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    DOMAIN as CLIMATE,
+    PRESET_AWAY,
+    HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+from . import common, setup_sensor, setup_switch
+
+HEATERS = {"zone1": common.ENT_HEATER, "zone2": common.ENT_SWITCH}
+
+
+async def _setup_zones(hass: HomeAssistant) -> list:
+    setup_sensor(hass, 20)
+    setup_switch(hass, False, common.ENT_HEATER)
+    calls = setup_switch(hass, False, common.ENT_SWITCH)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": [
+                {
+                    "platform": DOMAIN,
+                    "name": name,
+                    "heater": heater,
+                    "target_sensor": common.ENT_SENSOR,
+                    "initial_hvac_mode": HVACMode.HEAT,
+                    "target_temp": 19,
+                    "away": {"temperature": 16},
+                }
+                for name, heater in HEATERS.items()
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_bulk_temperature_starts_all_heaters(hass: HomeAssistant) -> None:
+    calls = await _setup_zones(hass)
+    assert calls == []
+
+    await hass.services.async_call(
+        DOMAIN,
+        "apply_bulk",
+        {ATTR_ENTITY_ID: ["climate.zone1", "climate.zone2"], ATTR_TEMPERATURE: 23},
+        blocking=True,
+    )
+
+    for name in HEATERS:
+        assert hass.states.get(f"climate.{name}").attributes[ATTR_TEMPERATURE] == 23
+    assert sorted(call.data[ATTR_ENTITY_ID] for call in calls) == sorted(
+        HEATERS.values()
+    )
+    assert all(call.service == SERVICE_TURN_ON for call in calls)
+
+
+@pytest.mark.asyncio
+async def test_bulk_preset_only_touches_targets(hass: HomeAssistant) -> None:
+    await _setup_zones(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "apply_bulk",
+        {ATTR_ENTITY_ID: "climate.zone1", ATTR_PRESET_MODE: PRESET_AWAY},
+        blocking=True,
+    )
+
+    zone1 = hass.states.get("climate.zone1").attributes
+    assert zone1[ATTR_PRESET_MODE] == PRESET_AWAY
+    assert zone1[ATTR_TEMPERATURE] == 16
+    assert hass.states.get("climate.zone2").attributes[ATTR_TEMPERATURE] == 19
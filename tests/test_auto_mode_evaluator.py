@@ -869,3 +869,25 @@ def test_full_scan_apparent_only_affects_cool_decisions() -> None:
     ev._environment.effective_temp_for_mode = lambda mode: 22.0
     decision = ev.evaluate(last_decision=None)
     assert decision.next_mode == HVACMode.HEAT
+
+
+def test_planned_mode_replaces_normal_temperature_priorities() -> None:
+    """A forecast plan picks the mode, an urgent priority still wins."""
+    ev = _make_evaluator(**{"features.is_configured_for_cooler_mode": True})
+    ev._environment.cur_temp = 20.4
+
+    decision = ev.evaluate(last_decision=None, planned_mode=HVACMode.OFF)
+    assert decision.next_mode is None
+
+    decision = ev.evaluate(last_decision=None, planned_mode=HVACMode.COOL)
+    assert decision.next_mode == HVACMode.COOL
+
+    ev._environment.cur_temp = 19.9
+    decision = ev.evaluate(
+        last_decision=AutoDecision(
+            next_mode=HVACMode.COOL,
+            reason=HVACActionReason.AUTO_PRIORITY_TEMPERATURE,
+        ),
+        planned_mode=HVACMode.OFF,
+    )
+    assert decision.next_mode == HVACMode.HEAT
@@ -0,0 +1,105 @@
+"""Tests for the integration-wide actuator CommandScheduler."""
+
+import asyncio
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import DOMAIN as HA_DOMAIN, HomeAssistant
+import pytest
+
+from custom_components.dual_smart_thermostat.command_scheduler import (
+    CommandPriority,
+    CommandScheduler,
+    command_priority,
+)
+
+from . import common
+
+
+async def _call(scheduler, service, entity_id, priority=CommandPriority.NORMAL):
+    await scheduler.async_call(
+        HA_DOMAIN, service, {ATTR_ENTITY_ID: entity_id}, priority=priority
+    )
+
+
+@pytest.mark.asyncio
+async def test_commands_within_burst_run_immediately(hass: HomeAssistant) -> None:
+    calls = common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_ON)
+    scheduler = CommandScheduler(hass, rate=1, burst=3)
+
+    for index in range(3):
+        await _call(scheduler, SERVICE_TURN_ON, f"switch.heater_{index}")
+
+    assert len(calls) == 3
+    bucket = scheduler.diagnostics()["buckets"]["switch"]
+    assert bucket["commands"] == 3
+    assert bucket["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_over_burst_are_queued(hass: HomeAssistant) -> None:
+    calls = common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_ON)
+    scheduler = CommandScheduler(hass, rate=20, burst=1)
+
+    await _call(scheduler, SERVICE_TURN_ON, "switch.heater_1")
+    pending = hass.async_create_task(
+        _call(scheduler, SERVICE_TURN_ON, "switch.heater_2")
+    )
+    await asyncio.sleep(0)
+
+    assert len(calls) == 1
+    assert scheduler.diagnostics()["buckets"]["switch"]["queue_depth"] == 1
+
+    await pending
+
+    assert len(calls) == 2
+    bucket = scheduler.diagnostics()["buckets"]["switch"]
+    assert bucket["queue_depth"] == 0
+    assert bucket["max_queue_depth"] == 1
+    assert bucket["max_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_safety_turn_off_is_never_queued(hass: HomeAssistant) -> None:
+    common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_ON)
+    calls_off = common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_OFF)
+    scheduler = CommandScheduler(hass, rate=0.01, burst=1)
+
+    await _call(scheduler, SERVICE_TURN_ON, "switch.heater_1")
+    pending = hass.async_create_task(
+        _call(scheduler, SERVICE_TURN_ON, "switch.heater_2")
+    )
+    await asyncio.sleep(0)
+
+    with command_priority(CommandPriority.SAFETY):
+        await _call(scheduler, SERVICE_TURN_OFF, "switch.heater_1")
+
+    assert len(calls_off) == 1
+    assert scheduler.diagnostics()["buckets"]["switch"]["safety_bypassed"] == 1
+
+    pending.cancel()
+    scheduler.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_drained_by_priority(hass: HomeAssistant) -> None:
+    order = []
+    scheduler = CommandScheduler(hass, rate=50, burst=1)
+
+    async def _mock_service(call):
+        order.append(call.data[ATTR_ENTITY_ID])
+
+    hass.services.async_register(HA_DOMAIN, SERVICE_TURN_ON, _mock_service)
+
+    await _call(scheduler, SERVICE_TURN_ON, "switch.first")
+    keep_alive = hass.async_create_task(
+        _call(
+            scheduler,
+            SERVICE_TURN_ON,
+            "switch.keep_alive",
+            priority=CommandPriority.KEEP_ALIVE,
+        )
+    )
+    normal = hass.async_create_task(_call(scheduler, SERVICE_TURN_ON, "switch.normal"))
+    await asyncio.gather(keep_alive, normal)
+
+    assert order == ["switch.first", "switch.normal", "switch.keep_alive"]
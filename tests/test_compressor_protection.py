@@ -0,0 +1,221 @@
+"""Tests for the compressor protection of the heating and cooling actuators."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE
+from homeassistant.const import (
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_CLOSED,
+    STATE_OFF,
+    STATE_ON,
+    STATE_OPEN,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import (
+    ATTR_HVAC_ACTION_REASON,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.hvac_action_reason.hvac_action_reason import (
+    HVACActionReason,
+)
+
+from . import common, setup_floor_sensor, setup_sensor, setup_switch
+
+ENT_WINDOW = "binary_sensor.window"
+
+
+async def _setup(hass: HomeAssistant, temperature: float, **protection) -> list:
+    setup_sensor(hass, temperature)
+    calls = setup_switch(hass, False, common.ENT_HEATER)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_HEATER,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": "heat",
+                "target_temp": 21,
+                **protection,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    return calls
+
+
+async def _read(hass: HomeAssistant, temperature: float) -> None:
+    setup_sensor(hass, temperature)
+    await hass.async_block_till_done()
+
+
+def _reason(hass: HomeAssistant) -> str:
+    return hass.states.get(common.ENTITY).attributes.get(ATTR_HVAC_ACTION_REASON)
+
+
+async def _wait(hass: HomeAssistant, freezer: FrozenDateTimeFactory, **delta) -> None:
+    freezer.tick(timedelta(**delta))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_start_waits_for_min_off_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup(hass, 21, min_off_time={"minutes": 10})
+    await _wait(hass, freezer, minutes=4)
+
+    await _read(hass, 18)
+    assert calls == []
+    assert _reason(hass) == HVACActionReason.COMPRESSOR_PROTECTION
+
+    # The deferred start runs as soon as the heater was off for 10 minutes.
+    await _wait(hass, freezer, minutes=6)
+    assert [call.service for call in calls] == [SERVICE_TURN_ON]
+    assert _reason(hass) == HVACActionReason.TARGET_TEMP_NOT_REACHED
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_min_on_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup(hass, 21, min_on_time={"minutes": 10})
+
+    await _read(hass, 18)
+    hass.states.async_set(common.ENT_HEATER, STATE_ON)
+    await hass.async_block_till_done()
+    calls.clear()
+
+    await _wait(hass, freezer, minutes=2)
+    await _read(hass, 22)
+    assert calls == []
+    assert _reason(hass) == HVACActionReason.COMPRESSOR_PROTECTION
+
+    await _wait(hass, freezer, minutes=8)
+    assert [call.service for call in calls] == [SERVICE_TURN_OFF]
+
+
+@pytest.mark.asyncio
+async def test_deferred_start_is_dropped_when_warm_again(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup(hass, 21, min_off_time={"minutes": 10})
+    await _wait(hass, freezer, minutes=4)
+
+    await _read(hass, 18)
+    assert _reason(hass) == HVACActionReason.COMPRESSOR_PROTECTION
+
+    # Warm again before the start was allowed, the start is not wanted anymore.
+    await _read(hass, 22)
+    assert _reason(hass) == HVACActionReason.TARGET_TEMP_REACHED
+
+    await _wait(hass, freezer, minutes=6)
+    assert calls == []
+    assert _reason(hass) == HVACActionReason.TARGET_TEMP_REACHED
+
+
+@pytest.mark.asyncio
+async def test_deferred_stop_is_dropped_when_cold_again(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup(hass, 21, min_on_time={"minutes": 10})
+
+    await _read(hass, 18)
+    hass.states.async_set(common.ENT_HEATER, STATE_ON)
+    await hass.async_block_till_done()
+    calls.clear()
+
+    await _wait(hass, freezer, minutes=2)
+    await _read(hass, 22)
+    assert _reason(hass) == HVACActionReason.COMPRESSOR_PROTECTION
+
+    # Cold again before the stop was allowed, the heater keeps running.
+    await _read(hass, 20)
+    assert _reason(hass) == HVACActionReason.TARGET_TEMP_NOT_REACHED
+
+    await _wait(hass, freezer, minutes=8)
+    assert calls == []
+    assert _reason(hass) == HVACActionReason.TARGET_TEMP_NOT_REACHED
+
+
+@pytest.mark.asyncio
+async def test_starts_per_hour_are_capped(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup(hass, 21, max_starts_per_hour=2)
+
+    for _ in range(2):
+        await _read(hass, 18)
+        hass.states.async_set(common.ENT_HEATER, STATE_ON)
+        await _wait(hass, freezer, minutes=5)
+        await _read(hass, 22)
+        hass.states.async_set(common.ENT_HEATER, STATE_OFF)
+        await _wait(hass, freezer, minutes=5)
+    assert [call.service for call in calls] == [
+        SERVICE_TURN_ON,
+        SERVICE_TURN_OFF,
+        SERVICE_TURN_ON,
+        SERVICE_TURN_OFF,
+    ]
+
+    calls.clear()
+    await _read(hass, 18)
+    assert calls == []
+    assert _reason(hass) == HVACActionReason.COMPRESSOR_PROTECTION
+
+    # The first start leaves the rolling hour 40 minutes later.
+    await _wait(hass, freezer, minutes=40)
+    assert [call.service for call in calls] == [SERVICE_TURN_ON]
+
+
+@pytest.mark.asyncio
+async def test_floor_overheat_stops_within_min_on_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    setup_floor_sensor(hass, 20)
+    calls = await _setup(
+        hass,
+        21,
+        min_on_time={"minutes": 10},
+        floor_sensor=common.ENT_FLOOR_SENSOR,
+        max_floor_temp=28,
+    )
+
+    await _read(hass, 18)
+    hass.states.async_set(common.ENT_HEATER, STATE_ON)
+    await hass.async_block_till_done()
+    calls.clear()
+
+    await _wait(hass, freezer, minutes=2)
+    setup_floor_sensor(hass, 30)
+    await hass.async_block_till_done()
+    assert [call.service for call in calls] == [SERVICE_TURN_OFF]
+    assert _reason(hass) == HVACActionReason.OVERHEAT
+
+
+@pytest.mark.asyncio
+async def test_open_window_stops_within_min_on_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    hass.states.async_set(ENT_WINDOW, STATE_CLOSED)
+    calls = await _setup(hass, 21, min_on_time={"minutes": 10}, openings=[ENT_WINDOW])
+
+    await _read(hass, 18)
+    hass.states.async_set(common.ENT_HEATER, STATE_ON)
+    await hass.async_block_till_done()
+    calls.clear()
+
+    await _wait(hass, freezer, minutes=2)
+    hass.states.async_set(ENT_WINDOW, STATE_OPEN)
+    await hass.async_block_till_done()
+    assert [call.service for call in calls] == [SERVICE_TURN_OFF]
+    assert _reason(hass) == HVACActionReason.OPENING
@@ -0,0 +1,87 @@
+"""Tests for the per-thermostat control loop metrics."""
+
+import time
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_ON
+from homeassistant.core import DOMAIN as HA_DOMAIN, HomeAssistant
+import pytest
+
+from custom_components.dual_smart_thermostat.command_scheduler import CommandScheduler
+from custom_components.dual_smart_thermostat.control_metrics import (
+    ControlMetrics,
+    ControlTrigger,
+    LatencyHistogram,
+)
+from custom_components.dual_smart_thermostat.decision_trace import (
+    DECISION_SKIPPED,
+    current_control_pass,
+)
+
+from . import common
+
+
+def test_histogram_buckets_and_percentiles() -> None:
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(0.001)
+    for _ in range(10):
+        histogram.record(0.5)
+
+    assert histogram.count == 100
+    assert histogram.max == 0.5
+    assert histogram.percentile(0.5) == pytest.approx(0.0016, rel=0.01)
+    assert histogram.percentile(0.95) == 0.5
+    assert sum(histogram.as_dict()["buckets_ms"].values()) == 100
+
+
+def test_histogram_memory_is_bounded() -> None:
+    histogram = LatencyHistogram()
+    histogram.record(0)
+    histogram.record(10_000)
+
+    assert len(histogram._counts) == LatencyHistogram.BUCKETS
+    assert histogram.percentile(1.0) == 10_000
+
+
+def test_measure_pass_records_trigger_and_decision() -> None:
+    metrics = ControlMetrics()
+
+    with metrics.measure_pass(ControlTrigger.SENSOR, time.perf_counter()) as run:
+        assert current_control_pass() is run
+        run.reason = "target_temp_reached"
+    with metrics.measure_pass(ControlTrigger.KEEP_ALIVE, time.perf_counter()):
+        pass
+
+    assert current_control_pass() is None
+    assert metrics.triggers[ControlTrigger.SENSOR] == 1
+    assert metrics.triggers[ControlTrigger.KEEP_ALIVE] == 1
+    assert metrics.decisions == {"target_temp_reached": 1, DECISION_SKIPPED: 1}
+    assert metrics.pass_time.count == 2
+    assert metrics.lock_wait.count == 2
+    assert metrics.passes_per_minute == 2
+
+
+def test_recent_passes_ring_is_bounded() -> None:
+    metrics = ControlMetrics()
+    for _ in range(ControlMetrics.RECENT_PASSES + 10):
+        with metrics.measure_pass(ControlTrigger.SENSOR, time.perf_counter()):
+            pass
+
+    assert metrics.passes_per_minute == ControlMetrics.RECENT_PASSES
+
+
+@pytest.mark.asyncio
+async def test_service_calls_are_attributed_to_the_pass(hass: HomeAssistant) -> None:
+    common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_ON)
+    scheduler = CommandScheduler(hass)
+    metrics = ControlMetrics()
+
+    await scheduler.async_call(
+        HA_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: "switch.outside_pass"}
+    )
+    with metrics.measure_pass(ControlTrigger.SERVICE, time.perf_counter()):
+        await scheduler.async_call(
+            HA_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: "switch.heater"}
+        )
+
+    assert metrics.service_call.count == 1
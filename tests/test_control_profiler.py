@@ -0,0 +1,97 @@
+"""Tests for the on-demand control pass profiler."""
+
+from datetime import timedelta
+from pathlib import Path
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.climate import SERVICE_PROFILE_CONTROL
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+from . import common, setup_sensor, setup_switch
+
+
+async def _setup(hass: HomeAssistant, tmp_path: Path) -> None:
+    hass.config.config_dir = str(tmp_path)
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_HEATER,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": "heat",
+                "target_temp": 21,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+async def _profile(hass: HomeAssistant, **data) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_CONTROL,
+        {ATTR_ENTITY_ID: common.ENTITY, **data},
+        blocking=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_profile_is_written_after_passes(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    await _setup(hass, tmp_path)
+
+    await _profile(hass, passes=2, memory=True)
+    for temperature in (19, 22, 18):
+        setup_sensor(hass, temperature)
+        await hass.async_block_till_done()
+
+    (prof,) = tmp_path.glob(f"{DOMAIN}_profile_test_*.prof")
+    report = prof.with_suffix(".txt").read_text(encoding="utf-8")
+    assert report.startswith(f"{common.ENTITY}: 2 control passes")
+    assert "Peak bytes allocated per pass" in report
+
+    # The session is over, so a new one can start.
+    await _profile(hass, passes=1)
+
+
+@pytest.mark.asyncio
+async def test_profile_stops_after_duration(
+    hass: HomeAssistant, tmp_path: Path, freezer: FrozenDateTimeFactory
+) -> None:
+    await _setup(hass, tmp_path)
+
+    await _profile(hass, passes=100, duration=60)
+    setup_sensor(hass, 19)
+    await hass.async_block_till_done()
+    assert not list(tmp_path.glob("*.prof"))
+
+    freezer.tick(timedelta(seconds=61))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    (prof,) = tmp_path.glob("*.prof")
+    report = prof.with_suffix(".txt").read_text(encoding="utf-8")
+    assert report.startswith(f"{common.ENTITY}: 1 control passes")
+
+
+@pytest.mark.asyncio
+async def test_one_session_at_a_time(hass: HomeAssistant, tmp_path: Path) -> None:
+    await _setup(hass, tmp_path)
+
+    await _profile(hass)
+    with pytest.raises(HomeAssistantError):
+        await _profile(hass)
@@ -0,0 +1,96 @@
+"""Tests for the bounded decision trace of the control loop."""
+
+import time
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF
+from homeassistant.core import DOMAIN as HA_DOMAIN, HomeAssistant
+import pytest
+
+from custom_components.dual_smart_thermostat.command_scheduler import CommandScheduler
+from custom_components.dual_smart_thermostat.control_metrics import (
+    ControlMetrics,
+    ControlTrigger,
+)
+from custom_components.dual_smart_thermostat.decision_trace import (
+    DecisionTrace,
+    trace_step,
+)
+
+from . import common
+
+
+def test_trace_step_outside_a_pass_is_ignored() -> None:
+    metrics = ControlMetrics()
+
+    trace_step(common.ENT_HEATER, "on, goal reached")
+
+    assert len(metrics.trace) == 0
+
+
+def test_trace_step_formats_only_while_traced() -> None:
+    metrics = ControlMetrics()
+
+    class Loud:
+        def __str__(self) -> str:
+            raise AssertionError("formatted outside a pass")
+
+    trace_step(common.ENT_HEATER, "deficit %s", Loud())
+    with metrics.measure_pass(ControlTrigger.SENSOR, time.perf_counter()):
+        trace_step(common.ENT_HEATER, "deficit %.2f, staging up", 0.456)
+
+    (record,) = metrics.trace.as_list()
+    assert record["steps"] == [f"{common.ENT_HEATER}: deficit 0.46, staging up"]
+
+
+def test_pass_is_recorded() -> None:
+    metrics = ControlMetrics()
+
+    with metrics.measure_pass(ControlTrigger.SENSOR, time.perf_counter()) as run:
+        run.inputs = (18.0, None, 21.0, None, None, "heat", False)
+        trace_step(common.ENT_HEATER, "off, goal not reached")
+        run.action = "heating"
+        run.reason = "target_temp_not_reached"
+
+    (record,) = metrics.trace.as_list()
+    assert record["trigger"] == "sensor"
+    assert record["inputs"]["cur_temp"] == 18.0
+    assert record["inputs"]["hvac_mode"] == "heat"
+    assert record["decision"] == "heating"
+    assert record["reason"] == "target_temp_not_reached"
+    assert record["steps"] == [f"{common.ENT_HEATER}: off, goal not reached"]
+    assert record["commands"] == []
+
+
+def test_trace_is_bounded() -> None:
+    metrics = ControlMetrics()
+    metrics.trace = DecisionTrace(capacity=3)
+
+    for trigger in (
+        ControlTrigger.SENSOR,
+        ControlTrigger.OPENING,
+        ControlTrigger.KEEP_ALIVE,
+        ControlTrigger.TEMPLATE,
+    ):
+        with metrics.measure_pass(trigger, time.perf_counter()):
+            pass
+
+    assert [record["trigger"] for record in metrics.trace.as_list()] == [
+        "opening",
+        "keep_alive",
+        "template",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_commands_are_recorded(hass: HomeAssistant) -> None:
+    common.async_mock_service(hass, HA_DOMAIN, SERVICE_TURN_OFF)
+    scheduler = CommandScheduler(hass)
+    metrics = ControlMetrics()
+
+    with metrics.measure_pass(ControlTrigger.OPENING, time.perf_counter()):
+        await scheduler.async_call(
+            HA_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: common.ENT_HEATER}
+        )
+
+    (record,) = metrics.trace.as_list()
+    assert record["commands"] == [f"{SERVICE_TURN_OFF} {common.ENT_HEATER}"]
@@ -0,0 +1,74 @@
+"""Tests for the config entry and device diagnostics."""
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_COLD_TOLERANCE,
+    CONF_HEATER,
+    CONF_HOT_TOLERANCE,
+    CONF_SENSOR,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.diagnostics import (
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+
+from . import common, setup_sensor, setup_switch
+
+
+async def _setup_entry(hass: HomeAssistant) -> MockConfigEntry:
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "name": "test",
+            CONF_HEATER: common.ENT_HEATER,
+            CONF_SENSOR: common.ENT_SENSOR,
+            CONF_COLD_TOLERANCE: 0.3,
+            CONF_HOT_TOLERANCE: 0.3,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
+    config_entry = await _setup_entry(hass)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["data"][CONF_HEATER] == common.ENT_HEATER
+    assert diagnostics["entry"]["data"]["name"] == REDACTED
+    thermostat = diagnostics["thermostat"]
+    assert thermostat["environment"]["state"]["cur_temp"] == 18
+    assert thermostat["environment"]["sensors"]["temperature"] == common.ENT_SENSOR
+    assert thermostat["hvac_device"]["controller"]["entity_id"] == common.ENT_HEATER
+    assert thermostat["openings"]["debounced_state"] == {}
+    assert thermostat["preset"]["env"]["templates"] == {}
+    assert thermostat["auto_decision"] is None
+    assert "pass_time" in thermostat["control_metrics"]
+    assert isinstance(thermostat["decision_trace"], list)
+    assert "buckets" in diagnostics["command_scheduler"]
+
+
+@pytest.mark.asyncio
+async def test_device_diagnostics(hass: HomeAssistant) -> None:
+    config_entry = await _setup_entry(hass)
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, config_entry.entry_id)}
+    )
+    assert device is not None
+
+    diagnostics = await async_get_device_diagnostics(hass, config_entry, device)
+
+    assert diagnostics["thermostat"]["power"]["level"] == 0
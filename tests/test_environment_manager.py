@@ -252,3 +252,78 @@ def test_is_too_hot_uses_raw_when_flag_off() -> None:
     env._cur_humidity = 80.0
     env._hvac_mode = HVACMode.COOL
     assert env.is_too_hot() is False
+
+
+def test_apparent_temp_is_memoized_until_inputs_change() -> None:
+    """The heat index is computed once per (temp, humidity, unit, stall) key."""
+    from unittest.mock import patch
+
+    from custom_components.dual_smart_thermostat.const import CONF_USE_APPARENT_TEMP
+
+    env = _make_env(**{CONF_USE_APPARENT_TEMP: True})
+    env._cur_temp = 32.0
+    env._cur_humidity = 80.0
+
+    with patch.object(
+        env, "_compute_apparent_temp", wraps=env._compute_apparent_temp
+    ) as compute:
+        first = env.apparent_temp
+        assert env.apparent_temp == first
+        assert compute.call_count == 1
+
+        env._cur_humidity = 60.0
+        assert env.apparent_temp < first
+        assert compute.call_count == 2
+
+        env.humidity_sensor_stalled = True
+        assert env.apparent_temp == 32.0
+        assert compute.call_count == 3
+
+
+def test_sensor_update_invalidates_apparent_temp_cache() -> None:
+    """update_temp_from_state / update_humidity_from_state drop the memo."""
+    from custom_components.dual_smart_thermostat.const import CONF_USE_APPARENT_TEMP
+
+    env = _make_env(**{CONF_USE_APPARENT_TEMP: True})
+    env._cur_temp = 32.0
+    env._cur_humidity = 80.0
+    env.apparent_temp
+
+    env.update_temp_from_state(MagicMock(state="33.0"))
+    assert env._apparent_temp_cache is None
+    env.apparent_temp
+
+    env.update_humidity_from_state(MagicMock(state="70.0"))
+    assert env._apparent_temp_cache is None
+
+
+def test_heat_index_lookup_table_matches_polynomial() -> None:
+    """The optional lookup table stays within 0.01 °C of the polynomial."""
+    from custom_components.dual_smart_thermostat.const import (
+        CONF_APPARENT_TEMP_LOOKUP,
+        CONF_USE_APPARENT_TEMP,
+    )
+
+    exact = _make_env(**{CONF_USE_APPARENT_TEMP: True})
+    table = _make_env(**{CONF_USE_APPARENT_TEMP: True, CONF_APPARENT_TEMP_LOOKUP: True})
+    for cur_temp, cur_humidity in ((27.0, 40.0), (32.1, 80.3), (45.7, 12.5)):
+        for env in (exact, table):
+            env._cur_temp = cur_temp
+            env._cur_humidity = cur_humidity
+        assert abs(table.apparent_temp - exact.apparent_temp) < 0.01
+
+
+def test_heat_index_lookup_table_falls_back_off_grid() -> None:
+    """Above the table range the polynomial is used directly."""
+    from custom_components.dual_smart_thermostat.const import (
+        CONF_APPARENT_TEMP_LOOKUP,
+        CONF_USE_APPARENT_TEMP,
+    )
+
+    env = _make_env(**{CONF_USE_APPARENT_TEMP: True, CONF_APPARENT_TEMP_LOOKUP: True})
+    env._cur_temp = 55.0
+    env._cur_humidity = 50.0
+
+    assert env._heat_index_table.lookup(55.0, 50.0) is None
+    expected_f = _rothfusz_heat_index_f(131.0, 50.0)
+    assert abs(env.apparent_temp - (expected_f - 32) * 5 / 9) < 1e-6
@@ -0,0 +1,247 @@
+"""Tests for planning against the weather forecast."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.const import SERVICE_TURN_ON, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+import pytest
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_FORECAST_WEATHER,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.managers.forecast_manager import (
+    COOL,
+    HEAT,
+    IDLE,
+    ForecastManager,
+    RoomModel,
+    parse_weather_forecast,
+    slot_outside,
+    solve_forecast_plan,
+)
+
+from . import common, setup_sensor, setup_switch, setup_switch_dual
+
+ENT_WEATHER = "weather.home"
+NOW = datetime(2026, 1, 1, tzinfo=dt_util.UTC)
+
+
+def _forecast(*temps: float) -> list[dict]:
+    return [
+        {"datetime": (NOW + timedelta(hours=hour)).isoformat(), "temperature": temp}
+        for hour, temp in enumerate(temps)
+    ]
+
+
+def test_parse_weather_forecast_converts_units() -> None:
+    items = [
+        {"datetime": NOW + timedelta(hours=1), "temperature": 50},
+        {"datetime": NOW.isoformat(), "temperature": "32"},
+        {"datetime": None, "temperature": 40},
+        {"datetime": NOW.isoformat()},
+    ]
+
+    points = parse_weather_forecast(
+        items, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS
+    )
+
+    assert points == [(NOW, 0.0), (NOW + timedelta(hours=1), pytest.approx(10.0))]
+    assert parse_weather_forecast(None, None, UnitOfTemperature.CELSIUS) == []
+
+
+def test_slot_outside_interpolates_between_points() -> None:
+    points = parse_weather_forecast(_forecast(0, 8), None, UnitOfTemperature.CELSIUS)
+
+    assert slot_outside(points, None, NOW) == [1.0, 3.0, 5.0, 7.0, 8.0]
+    assert slot_outside([], 5.0, NOW) == []
+
+
+def test_plan_coasts_into_a_warm_afternoon() -> None:
+    plan = solve_forecast_plan([30.0] * 16, 20.6, 21, 21, (IDLE, HEAT), 0.05, 2, 2, 1)
+
+    assert len(plan) == 16
+    assert plan[0][0] == IDLE
+    assert plan[0][1] > 20.6
+
+
+def test_plan_picks_the_mode_in_auto() -> None:
+    cold = solve_forecast_plan(
+        [-5.0] * 16, 19.0, 20, 23, (IDLE, HEAT, COOL), 0.05, 2, 2, 1
+    )
+    hot = solve_forecast_plan(
+        [35.0] * 16, 24.0, 20, 23, (IDLE, HEAT, COOL), 0.05, 2, 2, 1
+    )
+
+    assert cold[0][0] == HEAT
+    assert COOL not in [action for action, _ in cold]
+    assert hot[0][0] == COOL
+
+
+def test_plan_keeps_to_the_time_budget() -> None:
+    assert (
+        solve_forecast_plan([0.0] * 96, 20, 21, 21, (IDLE, HEAT), 0.05, 2, 2, 1, 0)
+        == []
+    )
+
+
+def test_room_model_learns_loss_and_gain() -> None:
+    model = RoomModel()
+    model.observe(20.0, 0.0, IDLE, 0)
+    model.observe(18.0, 0.0, IDLE, 3600)
+    assert model.loss > 0.1
+
+    model.observe(19.0, 0.0, HEAT, 3600)
+    model.observe(19.1, 0.0, HEAT, 3700)
+    # Readings closer than the learn interval wait for a later one.
+    assert model.heat_gain == 2.0
+    model.observe(21.0, 0.0, HEAT, 7200)
+    assert model.heat_gain > 2.0
+
+
+@pytest.mark.asyncio
+async def test_heater_waits_for_warm_forecast(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to(NOW)
+    hass.states.async_set(
+        ENT_WEATHER,
+        "sunny",
+        {
+            "temperature_unit": UnitOfTemperature.CELSIUS,
+            "forecast": _forecast(*[30] * 6),
+        },
+    )
+    setup_sensor(hass, 21)
+    calls = setup_switch(hass, False, common.ENT_SWITCH)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": "heat",
+                "target_temp": 21,
+                "forecast_weather": ENT_WEATHER,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    # 0.4 degrees below the target, but the warm afternoon will make up for it.
+    setup_sensor(hass, 20.6)
+    await hass.async_block_till_done()
+    assert SERVICE_TURN_ON not in [call.service for call in calls]
+    assert hass.states.get(common.ENTITY).attributes["temperature"] == 21
+
+    # A cold forecast makes the heater catch up instead.
+    hass.states.async_set(
+        ENT_WEATHER,
+        "snowy",
+        {
+            "temperature_unit": UnitOfTemperature.CELSIUS,
+            "forecast": _forecast(*[-15] * 6),
+        },
+    )
+    await hass.async_block_till_done()
+    assert [call.service for call in calls] == [SERVICE_TURN_ON]
+
+
+@pytest.mark.asyncio
+async def test_auto_range_heats_from_the_low_target(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to(NOW)
+    hass.states.async_set(
+        ENT_WEATHER,
+        "snowy",
+        {
+            "temperature_unit": UnitOfTemperature.CELSIUS,
+            "forecast": _forecast(*[-15] * 6),
+        },
+    )
+    setup_sensor(hass, 22)
+    calls = setup_switch_dual(hass, common.ENT_COOLER, False, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "cold_tolerance": 0.5,
+                "hot_tolerance": 0.5,
+                "heater": common.ENT_SWITCH,
+                "cooler": common.ENT_COOLER,
+                "target_sensor": common.ENT_SENSOR,
+                "heat_cool_mode": True,
+                "target_temp_low": 20,
+                "target_temp_high": 24,
+                "initial_hvac_mode": HVACMode.AUTO,
+                "forecast_weather": ENT_WEATHER,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    calls.clear()
+
+    # Within the cold tolerance of the low target, the room only heats
+    # because the cold forecast plans it, which moves the range up.
+    setup_sensor(hass, 19.6)
+    await hass.async_block_till_done()
+    state = hass.states.get(common.ENTITY)
+    assert state.state == HVACMode.AUTO
+    assert state.attributes["target_temp_low"] == 20
+    assert [(call.service, call.data["entity_id"]) for call in calls] == [
+        (SERVICE_TURN_ON, common.ENT_SWITCH)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replanning_keeps_one_slot_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, armed_slot_timers: set
+) -> None:
+    freezer.move_to(NOW)
+    environment = SimpleNamespace(
+        hvac_mode=HVACMode.HEAT,
+        target_temp=21.0,
+        cur_temp=20.0,
+        cur_outside_temp=None,
+        target_offset=0.0,
+        _get_active_tolerance_for_mode=lambda target_attr="_target_temp": (0.3, 0.3),
+    )
+    manager = ForecastManager(
+        hass,
+        {CONF_FORECAST_WEATHER: ENT_WEATHER},
+        environment,
+        SimpleNamespace(is_range_mode=False),
+    )
+
+    async def _plan_changed() -> None:
+        pass
+
+    stop = manager.async_start(_plan_changed)
+    manager.async_check(HVACMode.HEAT)
+    # Every new forecast makes a new plan, which replaces the old timer.
+    for temp in (0, 10, 20):
+        hass.states.async_set(
+            ENT_WEATHER,
+            "cloudy",
+            {
+                "temperature_unit": UnitOfTemperature.CELSIUS,
+                "forecast": _forecast(*[temp] * 6),
+            },
+        )
+        await hass.async_block_till_done()
+        assert len(armed_slot_timers) == 1
+
+    stop()
+    assert not armed_slot_timers
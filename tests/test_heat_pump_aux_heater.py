@@ -0,0 +1,135 @@
+"""Tests for choosing between the heat pump and the aux heater by efficiency."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components import input_boolean
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import (
+    ATTR_HVAC_ACTION_REASON,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.hvac_action_reason.hvac_action_reason import (
+    HVACActionReason,
+)
+from custom_components.dual_smart_thermostat.hvac_device.heat_pump_aux_heater_device import (
+    CopCurve,
+)
+
+from . import common, setup_comp_1, setup_outside_sensor, setup_sensor  # noqa: F401
+
+COP_CURVE = [
+    {"outside_temp": 10, "cop": 4.0},
+    {"outside_temp": -10, "cop": 1.5},
+    {"outside_temp": 0, "cop": 2.5},
+]
+
+
+def test_cop_curve_interpolates_and_clamps() -> None:
+    curve = CopCurve(COP_CURVE)
+    assert curve.cop(-5) == pytest.approx(2.0)
+    assert curve.cop(5) == pytest.approx(3.25)
+    assert curve.cop(-20) == 1.5
+    assert curve.cop(20) == 4.0
+
+
+async def _setup_thermostat(hass: HomeAssistant, outside: float, **protection) -> None:
+    assert await async_setup_component(
+        hass,
+        input_boolean.DOMAIN,
+        {"input_boolean": {"heat_pump": None, "aux": None}},
+    )
+    setup_sensor(hass, 18)
+    setup_outside_sensor(hass, outside)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": "input_boolean.heat_pump",
+                "secondary_heater": "input_boolean.aux",
+                "target_sensor": common.ENT_SENSOR,
+                "outside_sensor": common.ENT_OUTSIDE_SENSOR,
+                "heat_pump_cop_curve": COP_CURVE,
+                "heat_pump_balance_point": -8,
+                "heat_pump_min_cop": 2.0,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 21,
+                **protection,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+def _running(hass: HomeAssistant) -> tuple[str, str, str]:
+    return (
+        hass.states.get("input_boolean.heat_pump").state,
+        hass.states.get("input_boolean.aux").state,
+        hass.states.get(common.ENTITY).attributes[ATTR_HVAC_ACTION_REASON],
+    )
+
+
+@pytest.mark.asyncio
+async def test_heater_follows_outside_temperature(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    await _setup_thermostat(hass, 5)
+    assert _running(hass) == (
+        STATE_ON,
+        STATE_OFF,
+        HVACActionReason.HEAT_PUMP_EFFICIENT,
+    )
+
+    # At -6 degrees the COP of 1.9 is below heat_pump_min_cop.
+    setup_outside_sensor(hass, -6)
+    await hass.async_block_till_done()
+    assert _running(hass) == (STATE_OFF, STATE_ON, HVACActionReason.LOW_COP)
+
+    setup_outside_sensor(hass, -9)
+    await hass.async_block_till_done()
+    assert _running(hass) == (STATE_OFF, STATE_ON, HVACActionReason.BALANCE_POINT)
+
+    # Going back to the heat pump takes a degree more than leaving it.
+    setup_outside_sensor(hass, -4.5)
+    await hass.async_block_till_done()
+    assert _running(hass)[:2] == (STATE_OFF, STATE_ON)
+
+    setup_outside_sensor(hass, -3)
+    await hass.async_block_till_done()
+    assert _running(hass) == (
+        STATE_ON,
+        STATE_OFF,
+        HVACActionReason.HEAT_PUMP_EFFICIENT,
+    )
+
+
+@pytest.mark.asyncio
+async def test_switchover_waits_for_min_on_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, setup_comp_1  # noqa: F811
+) -> None:
+    await _setup_thermostat(hass, 5, min_on_time={"minutes": 10})
+    assert _running(hass)[:2] == (STATE_ON, STATE_OFF)
+
+    # The heat pump keeps heating until it ran for 10 minutes.
+    freezer.tick(timedelta(minutes=2))
+    setup_outside_sensor(hass, -6)
+    await hass.async_block_till_done()
+    assert _running(hass) == (
+        STATE_ON,
+        STATE_OFF,
+        HVACActionReason.COMPRESSOR_PROTECTION,
+    )
+
+    freezer.tick(timedelta(minutes=8))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert _running(hass) == (STATE_OFF, STATE_ON, HVACActionReason.LOW_COP)
@@ -0,0 +1,89 @@
+"""Tests for the modulating output driven by the HVAC power percent."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+from . import common, setup_sensor, setup_switch
+
+
+async def _setup_thermostat(hass: HomeAssistant, output: str, **options) -> None:
+    setup_sensor(hass, 20.5)
+    setup_switch(hass, True)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 21,
+                "hvac_power_output": output,
+                **options,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_valve_position_follows_power_outside_deadband(
+    hass: HomeAssistant,
+) -> None:
+    hass.states.async_set("valve.radiator", "open")
+    calls = common.async_mock_service(hass, "valve", "set_valve_position")
+    await _setup_thermostat(hass, "valve.radiator")
+
+    assert [call.data["position"] for call in calls] == [50]
+
+    # 52 % is within the default deadband of 5 %.
+    setup_sensor(hass, 20.48)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    setup_sensor(hass, 20.3)
+    await hass.async_block_till_done()
+    assert calls[-1].data["position"] == 70
+
+    await common.async_set_hvac_mode(hass, HVACMode.OFF)
+    await hass.async_block_till_done()
+    assert calls[-1].data["position"] == 0
+
+
+@pytest.mark.asyncio
+async def test_number_output_is_slew_limited(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    hass.states.async_set("number.valve", 0, {"min": 0, "max": 50})
+    calls = common.async_mock_service(hass, "number", "set_value")
+    await _setup_thermostat(hass, "number.valve", hvac_power_output_slew_rate=10)
+
+    # The first output is sent as is, scaled to the range of the number.
+    assert [call.data["value"] for call in calls] == [25]
+
+    setup_sensor(hass, 19.9)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    # 10 % per minute allows a 5 % step every 30 seconds.
+    for value in (27.5, 30):
+        freezer.tick(timedelta(seconds=30))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert calls[-1].data["value"] == value
+
+    # Closing is not slew limited.
+    await common.async_set_hvac_mode(hass, HVACMode.OFF)
+    await hass.async_block_till_done()
+    assert calls[-1].data["value"] == 0
+    assert len(calls) == 4
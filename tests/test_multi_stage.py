@@ -0,0 +1,167 @@
+"""Tests for heating and cooling with several stages."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components import input_boolean
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.power_budget import (
+    async_get_power_budget,
+)
+
+from . import common, setup_comp_1, setup_sensor  # noqa: F401
+
+STAGES = ("input_boolean.stage1", "input_boolean.stage2", "input_boolean.stage3")
+
+
+async def _setup_thermostat(hass: HomeAssistant, temp: float, **options) -> None:
+    assert await async_setup_component(
+        hass,
+        input_boolean.DOMAIN,
+        {"input_boolean": {"stage1": None, "stage2": None, "stage3": None}},
+    )
+    setup_sensor(hass, temp)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": STAGES[0],
+                "target_sensor": common.ENT_SENSOR,
+                "target_temp": 21,
+                **options,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+def _states(hass: HomeAssistant) -> list[str]:
+    return [hass.states.get(entity_id).state for entity_id in STAGES]
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_heating_stages_up_and_down(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, setup_comp_1  # noqa: F811
+) -> None:
+    await _setup_thermostat(
+        hass,
+        18.5,
+        initial_hvac_mode=HVACMode.HEAT,
+        heater_stages=[
+            {"entity_id": STAGES[1], "deficit": 1, "delay": "00:05:00"},
+            {"entity_id": STAGES[2], "deficit": 2, "delay": "00:05:00"},
+        ],
+    )
+    assert _states(hass) == [STATE_ON, STATE_OFF, STATE_OFF]
+
+    # Each stage waits for the stage below it to run for its delay.
+    await _tick(hass, freezer)
+    assert _states(hass) == [STATE_ON, STATE_ON, STATE_OFF]
+    await _tick(hass, freezer)
+    assert _states(hass) == [STATE_ON, STATE_ON, STATE_ON]
+
+    # A deficit of 1 is well below the threshold of the third stage only.
+    setup_sensor(hass, 20)
+    await hass.async_block_till_done()
+    assert _states(hass) == [STATE_ON, STATE_ON, STATE_OFF]
+
+    setup_sensor(hass, 21.5)
+    await hass.async_block_till_done()
+    assert _states(hass) == [STATE_OFF, STATE_OFF, STATE_OFF]
+
+
+@pytest.mark.asyncio
+async def test_cooling_stage_needs_deficit(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, setup_comp_1  # noqa: F811
+) -> None:
+    await _setup_thermostat(
+        hass,
+        22,
+        ac_mode=True,
+        initial_hvac_mode=HVACMode.COOL,
+        cooler_stages=[{"entity_id": STAGES[1], "deficit": 2}],
+    )
+    assert _states(hass)[:2] == [STATE_ON, STATE_OFF]
+
+    # The delay has passed, but the room is only 1.5 degrees too warm.
+    freezer.tick(timedelta(minutes=10))
+    setup_sensor(hass, 22.5)
+    await hass.async_block_till_done()
+    assert _states(hass)[:2] == [STATE_ON, STATE_OFF]
+
+    setup_sensor(hass, 23.5)
+    await hass.async_block_till_done()
+    assert _states(hass)[:2] == [STATE_ON, STATE_ON]
+
+
+@pytest.mark.asyncio
+async def test_stage_waits_for_the_power_budget(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, setup_comp_1  # noqa: F811
+) -> None:
+    budget = async_get_power_budget(hass)
+    budget.limit = 3000
+    await _setup_thermostat(
+        hass,
+        18.5,
+        initial_hvac_mode=HVACMode.HEAT,
+        actuator_power=2000,
+        heater_stages=[{"entity_id": STAGES[1], "deficit": 1, "delay": "00:05:00"}],
+    )
+    assert _states(hass)[:2] == [STATE_ON, STATE_OFF]
+
+    # The second stage is due, but does not fit next to the first one.
+    await _tick(hass, freezer)
+    assert _states(hass)[:2] == [STATE_ON, STATE_OFF]
+    assert budget.is_waiting(STAGES[1])
+
+    budget.limit = 4000
+    setup_sensor(hass, 18.4)
+    await hass.async_block_till_done()
+    assert _states(hass)[:2] == [STATE_ON, STATE_ON]
+    assert budget.used == 4000
+
+    # Once the room is warm enough the stage leaves nothing in the queue.
+    setup_sensor(hass, 21.5)
+    await hass.async_block_till_done()
+    assert _states(hass)[:2] == [STATE_OFF, STATE_OFF]
+    assert budget.used == 0
+
+
+@pytest.mark.asyncio
+async def test_stage_keeps_its_min_on_time(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, setup_comp_1  # noqa: F811
+) -> None:
+    await _setup_thermostat(
+        hass,
+        18.5,
+        initial_hvac_mode=HVACMode.HEAT,
+        min_on_time={"minutes": 10},
+        heater_stages=[{"entity_id": STAGES[1], "deficit": 1, "delay": "00:05:00"}],
+    )
+    await _tick(hass, freezer)
+    assert _states(hass)[:2] == [STATE_ON, STATE_ON]
+
+    # Well below the stage threshold, but the stage only ran for 5 minutes.
+    await _tick(hass, freezer)
+    setup_sensor(hass, 20.5)
+    await hass.async_block_till_done()
+    assert _states(hass)[:2] == [STATE_ON, STATE_ON]
+
+    await _tick(hass, freezer)
+    assert _states(hass)[:2] == [STATE_ON, STATE_OFF]
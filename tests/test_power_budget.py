@@ -0,0 +1,186 @@
+"""Tests for the site-wide power budget."""
+
+from homeassistant.components.climate import DOMAIN as CLIMATE
+from homeassistant.const import SERVICE_TURN_ON, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.setup import async_setup_component
+import pytest
+
+from custom_components.dual_smart_thermostat.const import (
+    ATTR_HVAC_ACTION_REASON,
+    DOMAIN,
+    POWER_BUDGET_SIGNAL,
+)
+from custom_components.dual_smart_thermostat.hvac_action_reason.hvac_action_reason import (
+    HVACActionReason,
+)
+from custom_components.dual_smart_thermostat.power_budget import (
+    PowerBudget,
+    async_get_power_budget,
+)
+
+from . import common, setup_sensor, setup_switch
+
+
+def _budget(hass: HomeAssistant, limit: float, *loads: str) -> PowerBudget:
+    budget = PowerBudget(hass, limit)
+    for entity_id in loads:
+        hass.states.async_set(entity_id, STATE_OFF)
+        budget.async_register(entity_id, 2000)
+    return budget
+
+
+@pytest.mark.asyncio
+async def test_largest_deficit_is_admitted_first(hass: HomeAssistant) -> None:
+    budget = _budget(hass, 3000, "switch.a", "switch.b", "switch.c")
+    offers = []
+
+    @callback
+    def _offered() -> None:
+        offers.append("switch.c")
+
+    async_dispatcher_connect(hass, POWER_BUDGET_SIGNAL.format("switch.c"), _offered)
+
+    assert budget.async_request("switch.a", 1.0)
+    assert not budget.async_request("switch.b", 1.0)
+    assert not budget.async_request("switch.c", 3.0)
+    assert budget.used == 2000
+
+    budget.async_release("switch.a")
+    await hass.async_block_till_done()
+    assert offers == ["switch.c"]
+
+    # switch.c is ahead in the queue even though switch.b asks first.
+    assert not budget.async_request("switch.b", 1.0)
+    assert budget.async_request("switch.c", 3.0)
+    assert [waiter["entity_id"] for waiter in budget.diagnostics()["queue"]] == [
+        "switch.b"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_withdrawn_zone_does_not_block_the_queue(hass: HomeAssistant) -> None:
+    budget = _budget(hass, 3000, "switch.a", "switch.b", "switch.c")
+
+    assert budget.async_request("switch.a", 0.0)
+    assert not budget.async_request("switch.b", 5.0)
+    assert not budget.async_request("switch.c", 1.0)
+
+    budget.async_withdraw("switch.b")
+    budget.async_release("switch.a")
+
+    assert not budget.is_waiting("switch.b")
+    assert budget.async_request("switch.c", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_load_over_the_budget_does_not_block_the_queue(
+    hass: HomeAssistant,
+) -> None:
+    budget = _budget(hass, 3000, "switch.a", "switch.b")
+    hass.states.async_set("switch.big", STATE_OFF)
+    budget.async_register("switch.big", 4000)
+
+    assert budget.async_request("switch.a", 0.0)
+    assert not budget.async_request("switch.big", 9.0)
+    assert not budget.is_waiting("switch.big")
+    assert not budget.async_request("switch.b", 0.0)
+
+    budget.async_release("switch.a")
+    assert budget.async_request("switch.b", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_running_actuator_is_always_admitted(hass: HomeAssistant) -> None:
+    budget = _budget(hass, 1000, "switch.a")
+    hass.states.async_set("switch.a", STATE_ON)
+
+    assert budget.async_request("switch.a", 0.0)
+    assert budget.used == 2000
+
+
+@pytest.mark.asyncio
+async def test_second_heater_waits_for_the_first(hass: HomeAssistant) -> None:
+    async_get_power_budget(hass).limit = 3000
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+    calls = setup_switch(hass, False, common.ENT_SWITCH)
+    heaters = {"zone1": common.ENT_HEATER, "zone2": common.ENT_SWITCH}
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": [
+                {
+                    "platform": DOMAIN,
+                    "name": name,
+                    "heater": heater,
+                    "target_sensor": common.ENT_SENSOR,
+                    "initial_hvac_mode": "heat",
+                    "target_temp": 21,
+                    "actuator_power": 2000,
+                }
+                for name, heater in heaters.items()
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    started = [call.data["entity_id"] for call in calls]
+    assert len(started) == 1
+    (waiting_name,) = [name for name, heater in heaters.items() if heater != started[0]]
+    reason = hass.states.get(f"climate.{waiting_name}").attributes
+    assert reason[ATTR_HVAC_ACTION_REASON] == HVACActionReason.POWER_BUDGET
+
+    hass.states.async_set(started[0], STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set(started[0], STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert [call.service for call in calls[1:]] == [SERVICE_TURN_ON]
+    assert calls[1].data["entity_id"] == heaters[waiting_name]
+
+
+@pytest.mark.asyncio
+async def test_cooler_leaves_the_queue_when_cool_enough(hass: HomeAssistant) -> None:
+    budget = async_get_power_budget(hass)
+    budget.limit = 3000
+    sensors = {"zone1": common.ENT_SENSOR, "zone2": "sensor.zone2"}
+    for sensor in sensors.values():
+        hass.states.async_set(sensor, 25)
+    setup_switch(hass, False, common.ENT_HEATER)
+    calls = setup_switch(hass, False, common.ENT_SWITCH)
+    coolers = {"zone1": common.ENT_HEATER, "zone2": common.ENT_SWITCH}
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": [
+                {
+                    "platform": DOMAIN,
+                    "name": name,
+                    "heater": coolers[name],
+                    "ac_mode": True,
+                    "target_sensor": sensors[name],
+                    "initial_hvac_mode": "cool",
+                    "target_temp": 21,
+                    "actuator_power": 2000,
+                }
+                for name in coolers
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    (started,) = [call.data["entity_id"] for call in calls]
+    (waiting_name,) = [name for name, cooler in coolers.items() if cooler != started]
+    assert budget.is_waiting(coolers[waiting_name])
+
+    # The waiting zone reached its target without ever starting.
+    hass.states.async_set(sensors[waiting_name], 20)
+    await hass.async_block_till_done()
+
+    assert not budget.is_waiting(coolers[waiting_name])
+    reason = hass.states.get(f"climate.{waiting_name}").attributes
+    assert reason[ATTR_HVAC_ACTION_REASON] == HVACActionReason.TARGET_TEMP_REACHED
@@ -0,0 +1,194 @@
+"""Tests for the per-actuator runtime, cycle and duty-cycle accounting."""
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_HEATER,
+    CONF_SENSOR,
+    DOMAIN,
+)
+from custom_components.dual_smart_thermostat.runtime_stats import (
+    SAVE_DELAY,
+    STORAGE_KEY,
+    ActuatorRuntime,
+    DutyCycleWindow,
+    async_get_runtime_store,
+)
+
+from . import common, setup_sensor, setup_switch
+
+HOUR = 3600.0
+
+
+def test_window_drops_old_buckets() -> None:
+    window = DutyCycleWindow(HOUR, 60)
+
+    window.add(0, 600)
+    assert window.on_time(600) == 600
+    window.add(HOUR, HOUR + 60)
+
+    # The first 10 minutes are more than an hour old now.
+    assert window.on_time(HOUR + 600) == 60
+    assert window.on_time(10 * HOUR) == 0
+
+
+def test_cycles_and_short_cycles() -> None:
+    runtime = ActuatorRuntime(timedelta(minutes=5))
+
+    runtime.record(False, 0)
+    runtime.record(True, 60)
+    runtime.record(False, 120)
+    runtime.record(True, 600)
+    runtime.record(False, 1800)
+    # A repeated state is not a new cycle.
+    assert not runtime.record(False, 1900)
+
+    assert runtime.cycles == 2
+    assert runtime.short_cycles == 1
+    assert runtime.total_on_time(2000) == 60 + 1200
+
+
+def test_first_state_on_is_not_a_cycle() -> None:
+    runtime = ActuatorRuntime()
+
+    runtime.record(True, 0)
+    runtime.record(False, 60)
+
+    assert runtime.cycles == 0
+    assert runtime.short_cycles == 0
+    assert runtime.total_on_time(120) == 60
+
+
+def test_duty_cycle_includes_the_running_cycle() -> None:
+    runtime = ActuatorRuntime()
+    assert runtime.duty_cycle(runtime.hour, 0) is None
+
+    runtime.record(False, 0)
+    runtime.record(True, HOUR / 2)
+
+    assert runtime.duty_cycle(runtime.hour, 0.75 * HOUR) == pytest.approx(1 / 3)
+    assert runtime.duty_cycle(runtime.hour, 2 * HOUR) == pytest.approx(1.0)
+    assert runtime.duty_cycle(runtime.day, 2 * HOUR) == pytest.approx(0.75)
+
+
+def test_counters_survive_a_round_trip() -> None:
+    runtime = ActuatorRuntime()
+    runtime.record(False, 0)
+    runtime.record(True, 60)
+    runtime.record(False, 660)
+
+    restored = ActuatorRuntime()
+    restored.restore(runtime.as_dict(700))
+
+    assert restored.cycles == 1
+    assert restored.total_on_time(700) == 600
+    assert restored.duty_cycle(restored.hour, 700) == pytest.approx(600 / 700)
+
+
+async def _setup_thermostat(hass: HomeAssistant) -> None:
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_HEATER,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": "off",
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_actuator_transitions_are_counted_and_saved(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict[str, Any],
+) -> None:
+    await _setup_thermostat(hass)
+
+    for _ in range(3):
+        hass.states.async_set(common.ENT_HEATER, STATE_ON)
+        freezer.tick(timedelta(minutes=10))
+        hass.states.async_set(common.ENT_HEATER, STATE_OFF)
+        freezer.tick(timedelta(minutes=10))
+    await hass.async_block_till_done()
+
+    runtime = async_get_runtime_store(hass).actuators[common.ENT_HEATER]
+    assert runtime.cycles == 3
+    assert runtime.short_cycles == 0
+    assert runtime.on_time == 1800
+
+    freezer.tick(timedelta(seconds=SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    saved = hass_storage[STORAGE_KEY]["data"]["actuators"][common.ENT_HEATER]
+    assert saved["cycles"] == 3
+    assert saved["on_time"] == 1800
+
+
+@pytest.mark.asyncio
+async def test_counters_are_restored(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    saved = ActuatorRuntime()
+    saved.record(False, 0)
+    saved.record(True, 0)
+    saved.record(False, 7200)
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {"actuators": {common.ENT_HEATER: saved.as_dict(7200)}},
+    }
+
+    await _setup_thermostat(hass)
+
+    runtime = async_get_runtime_store(hass).actuators[common.ENT_HEATER]
+    assert runtime.cycles == 1
+    assert runtime.on_time == 7200
+
+
+@pytest.mark.asyncio
+async def test_entry_sensors_follow_the_hvac_device(hass: HomeAssistant) -> None:
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "name": "test",
+            CONF_HEATER: common.ENT_HEATER,
+            CONF_SENSOR: common.ENT_SENSOR,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    unique_ids = {
+        entry.unique_id
+        for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+    }
+    prefix = f"{config_entry.entry_id}_{common.ENT_HEATER}"
+    assert {f"{prefix}_runtime", f"{prefix}_cycles", f"{prefix}_duty_cycle"} <= (
+        unique_ids
+    )
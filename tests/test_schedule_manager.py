@@ -0,0 +1,123 @@
+"""Tests for the weekly schedule."""
+
+from datetime import datetime, time, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import (
+    ATTR_PRESET_MODE,
+    DOMAIN as CLIMATE,
+    PRESET_AWAY,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.managers.schedule_manager import (
+    ScheduleManager,
+    TargetChange,
+)
+
+from . import common, setup_sensor, setup_switch
+
+SCHEDULE = [
+    {"weekday": ["mon", "tue", "wed", "thu", "fri"], "at": "06:00", "temperature": 21},
+    {"at": "22:00", "preset_mode": PRESET_AWAY},
+]
+
+
+def _local(day: int, hour: int, minute: int = 0) -> datetime:
+    """Return a local time in the week of Monday 2026-10-19."""
+    return datetime(
+        2026, 10, 19 + day, hour, minute, tzinfo=dt_util.get_default_time_zone()
+    )
+
+
+@pytest.mark.asyncio
+async def test_active_slot_and_next_transition(hass: HomeAssistant) -> None:
+    schedule = ScheduleManager(
+        hass,
+        {
+            "schedule": [
+                {"weekday": ["mon"], "at": time(6), "temperature": 21},
+                {"weekday": ["mon", "sat"], "at": time(22), "temperature": 17},
+            ]
+        },
+    )
+
+    assert schedule.current(_local(0, 6)) == TargetChange(temperature=21)
+    assert schedule.current(_local(0, 23)) == TargetChange(temperature=17)
+    assert schedule.current(_local(3, 12)) == TargetChange(temperature=17)
+    # Before the first transition of the week the last one still holds.
+    assert schedule.current(_local(0, 5)) == TargetChange(temperature=17)
+
+    assert schedule._next_transition(_local(0, 5)) == _local(0, 6)
+    assert schedule._next_transition(_local(0, 6)) == _local(0, 22)
+    assert schedule._next_transition(_local(5, 22)) == _local(7, 6)
+
+
+async def _setup_thermostat(hass: HomeAssistant) -> None:
+    setup_sensor(hass, 18)
+    setup_switch(hass, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 19,
+                "away": {"temperature": 14},
+                "schedule": SCHEDULE,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_schedule_follows_transitions(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to(_local(0, 7))
+    await _setup_thermostat(hass)
+
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes[ATTR_TEMPERATURE] == 21
+
+    freezer.move_to(_local(0, 22))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes[ATTR_PRESET_MODE] == PRESET_AWAY
+    assert state.attributes[ATTR_TEMPERATURE] == 14
+
+    freezer.tick(timedelta(hours=8))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(common.ENTITY).attributes[ATTR_TEMPERATURE] == 21
+
+
+@pytest.mark.asyncio
+async def test_missed_transition_is_applied_on_restore(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    common.mock_restore_cache(
+        hass,
+        (State(common.ENTITY, HVACMode.HEAT, {ATTR_TEMPERATURE: "19"}),),
+    )
+    freezer.move_to(_local(1, 23))
+    await _setup_thermostat(hass)
+
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes[ATTR_PRESET_MODE] == PRESET_AWAY
+    assert state.attributes[ATTR_TEMPERATURE] == 14
@@ -0,0 +1,100 @@
+"""Tests for the aggregation of several sensors."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    DOMAIN as CLIMATE,
+    HVACMode,
+)
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.managers.sensor_aggregator import (
+    Aggregation,
+    SensorAggregator,
+)
+
+from . import common, setup_switch
+
+SENSORS = ("sensor.a", "sensor.b", "sensor.c")
+
+
+def test_weighted_mean_and_median() -> None:
+    aggregator = SensorAggregator({"sensor.a": 1.0, "sensor.b": 3.0})
+    aggregator.update("sensor.a", 20.0)
+    assert aggregator.update("sensor.b", 22.0) == 21.5
+    # A new reading replaces the previous one of the same sensor.
+    assert aggregator.update("sensor.a", 24.0) == 22.5
+
+    aggregator.aggregation = Aggregation.MEDIAN
+    aggregator.update("sensor.c", 21.0)
+    assert aggregator.value() == 22.0
+    assert aggregator.discard("sensor.b") == 22.5
+
+
+def test_outlier_is_rejected() -> None:
+    aggregator = SensorAggregator(dict.fromkeys(SENSORS, 1.0))
+    aggregator.update("sensor.a", 20.0)
+    aggregator.update("sensor.b", 20.4)
+    assert aggregator.update("sensor.c", 27.0) == pytest.approx(20.2)
+    assert aggregator.outliers == {"sensor.c"}
+
+    aggregator.aggregation = Aggregation.MAX
+    assert aggregator.value() == 20.4
+
+    # A close reading is not an outlier, however well the others agree.
+    aggregator.update("sensor.c", 21.0)
+    assert aggregator.outliers == frozenset()
+    assert aggregator.value() == 21.0
+
+
+def test_stale_sensor_is_excluded(freezer: FrozenDateTimeFactory) -> None:
+    aggregator = SensorAggregator(
+        dict.fromkeys(SENSORS, 1.0), stale_duration=timedelta(minutes=10)
+    )
+    aggregator.update("sensor.a", 18.0)
+    freezer.tick(timedelta(minutes=6))
+    aggregator.update("sensor.b", 20.0)
+    freezer.tick(timedelta(minutes=6))
+
+    assert aggregator.update("sensor.c", 22.0) == 21.0
+    assert "sensor.a" not in aggregator.diagnostics()["readings"]
+
+
+@pytest.mark.asyncio
+async def test_thermostat_reads_all_sensors(hass: HomeAssistant) -> None:
+    for entity_id, temp in zip(SENSORS, (19.0, 19.4, 35.0)):
+        hass.states.async_set(entity_id, temp)
+    setup_switch(hass, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": SENSORS[0],
+                "target_sensors": [SENSORS[1], {"entity_id": SENSORS[2]}],
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 21,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    # sensor.c is an outlier.
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes[ATTR_CURRENT_TEMPERATURE] == pytest.approx(19.2)
+
+    hass.states.async_set(SENSORS[0], STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+
+    # With two sensors left there is no outlier rejection.
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes[ATTR_CURRENT_TEMPERATURE] == pytest.approx(27.2)
@@ -0,0 +1,77 @@
+"""Tests for the integration-wide StartupCoordinator."""
+
+from unittest.mock import AsyncMock
+
+from homeassistant.core import CoreState, HomeAssistant
+import pytest
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.startup_coordinator import (
+    DATA_STARTUP_COORDINATOR,
+    StartupCoordinator,
+    async_get_startup_coordinator,
+)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_is_shared_in_hass_data(hass: HomeAssistant) -> None:
+    coordinator = async_get_startup_coordinator(hass)
+
+    assert async_get_startup_coordinator(hass) is coordinator
+    assert hass.data[DOMAIN][DATA_STARTUP_COORDINATOR] is coordinator
+
+
+@pytest.mark.asyncio
+async def test_first_control_runs_inline_when_running(hass: HomeAssistant) -> None:
+    coordinator = StartupCoordinator(hass, jitter=5, rate=0.1)
+    action = AsyncMock()
+
+    coordinator.async_begin("climate.a")
+    assert await coordinator.async_run_first_control("climate.a", action) is None
+    assert await coordinator.async_run_first_control("climate.b", action) is None
+
+    assert action.await_count == 2
+    assert coordinator.timings["climate.a"].first_control_done is not None
+
+
+@pytest.mark.asyncio
+async def test_first_controls_are_staggered_while_starting(
+    hass: HomeAssistant,
+) -> None:
+    hass.set_state(CoreState.starting)
+    coordinator = StartupCoordinator(hass, jitter=0, rate=2)
+    first = AsyncMock()
+    second = AsyncMock()
+    third = AsyncMock()
+
+    assert await coordinator.async_run_first_control("climate.a", first) is None
+    cancel_second = await coordinator.async_run_first_control("climate.b", second)
+    cancel_third = await coordinator.async_run_first_control("climate.c", third)
+
+    first.assert_awaited_once()
+    second.assert_not_awaited()
+    assert cancel_second is not None
+    assert cancel_third is not None
+    assert coordinator.timings["climate.b"].first_control_delay == pytest.approx(
+        0.5, abs=0.05
+    )
+    assert coordinator.timings["climate.c"].first_control_delay == pytest.approx(
+        1.0, abs=0.05
+    )
+
+    cancel_second()
+    cancel_third()
+    hass.set_state(CoreState.running)
+
+
+@pytest.mark.asyncio
+async def test_forget_drops_timings(hass: HomeAssistant) -> None:
+    coordinator = StartupCoordinator(hass)
+    coordinator.async_begin("climate.a")
+    coordinator.async_mark_prepared("climate.a")
+
+    assert coordinator.timings["climate.a"].prepared is not None
+
+    coordinator.async_forget("climate.a")
+
+    assert "climate.a" not in coordinator.timings
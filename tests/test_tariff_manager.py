@@ -0,0 +1,177 @@
+"""Tests for the time-of-use tariff planner."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACMode
+from homeassistant.const import SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import CONF_TARIFF_SENSOR, DOMAIN
+from custom_components.dual_smart_thermostat.managers.tariff_manager import (
+    SLOT,
+    TariffManager,
+    ThermalModel,
+    parse_price_forecast,
+    slot_prices,
+    solve_plan,
+)
+
+from . import common, setup_sensor, setup_switch
+
+ENT_PRICE = "sensor.electricity_price"
+NOW = datetime(2026, 1, 1, tzinfo=dt_util.UTC)
+
+
+def test_parse_price_forecast() -> None:
+    state = State(
+        ENT_PRICE,
+        "0.3",
+        {
+            "raw_today": [
+                {"start": "2026-01-01T01:00:00+00:00", "value": "0.2"},
+                {"start": "2026-01-01T00:00:00+00:00", "value": 0.3},
+                {"start": None, "value": 0.1},
+            ],
+            "forecast": [{"hour": NOW + timedelta(hours=2), "price": 0.1}],
+        },
+    )
+
+    assert parse_price_forecast(state) == [
+        (NOW, 0.3),
+        (NOW + timedelta(hours=1), 0.2),
+        (NOW + timedelta(hours=2), 0.1),
+    ]
+
+
+def test_slot_prices_hold_the_last_price() -> None:
+    points = [(NOW, 0.3), (NOW + timedelta(hours=1), 0.2)]
+
+    prices = slot_prices(points, 0.3, NOW)
+
+    assert prices == [0.3] * 4 + [0.2] * 4
+    assert slot_prices([], None, NOW) == []
+    assert len(slot_prices([], 0.3, NOW)) == 96
+
+
+def test_plan_runs_in_cheap_slots_within_the_band() -> None:
+    prices = [0.1] * 8 + [1.0] * 8 + [0.1] * 8
+
+    plan = solve_plan(prices, 20.0, 19.0, 21.0, 2.0, 0.5)
+
+    assert len(plan) == len(prices)
+    assert all(19.0 - 1e-9 <= temp <= 21.0 + 1e-9 for temp in plan)
+    heated = [
+        slot
+        for slot, (before, after) in enumerate(zip([20.0, *plan], plan))
+        if after > before
+    ]
+    assert heated
+    assert all(prices[slot] == 0.1 for slot in heated)
+
+
+def test_thermal_model_learns_rates() -> None:
+    model = ThermalModel()
+    model.observe(20.0, True, 0)
+    model.observe(21.5, True, 1800)
+    assert model.gain > 2.0
+
+    model.observe(21.0, False, 1800)
+    model.observe(20.9, False, 1900)
+    # Readings closer than the learn interval wait for a later one.
+    assert model.loss == 0.5
+    model.observe(20.0, False, 5400)
+    assert model.loss > 0.5
+
+
+@pytest.mark.asyncio
+async def test_heater_preheats_in_cheap_slot(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to(NOW)
+    hass.states.async_set(
+        ENT_PRICE,
+        "0.1",
+        {
+            "forecast": [
+                {"start": NOW.isoformat(), "value": 0.1},
+                {"start": (NOW + SLOT).isoformat(), "value": 1.0},
+                {"start": (NOW + timedelta(hours=4)).isoformat(), "value": 1.0},
+            ]
+        },
+    )
+    setup_sensor(hass, 21)
+    calls = setup_switch(hass, False, common.ENT_SWITCH)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": "heat",
+                "target_temp": 21,
+                "tariff_sensor": ENT_PRICE,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    # The room is at its target, but heating now is cheaper than later.
+    assert [call.service for call in calls] == [SERVICE_TURN_ON]
+    assert hass.states.get(common.ENTITY).attributes["temperature"] == 21
+
+
+def _set_prices(hass: HomeAssistant, *prices: float) -> None:
+    hass.states.async_set(
+        ENT_PRICE,
+        str(prices[0]),
+        {
+            "forecast": [
+                {"start": (NOW + hour * SLOT * 4).isoformat(), "value": price}
+                for hour, price in enumerate(prices)
+            ]
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_replanning_keeps_one_slot_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, armed_slot_timers: set
+) -> None:
+    armed = armed_slot_timers
+    freezer.move_to(NOW)
+    _set_prices(hass, 0.1, 1.0, 1.0)
+    environment = SimpleNamespace(
+        hvac_mode=HVACMode.HEAT, target_temp=21.0, cur_temp=21.0, target_offset=0.0
+    )
+    manager = TariffManager(hass, {CONF_TARIFF_SENSOR: ENT_PRICE}, environment)
+
+    async def _plan_changed() -> None:
+        pass
+
+    stop = manager.async_start(_plan_changed)
+    manager.async_check()
+    await hass.async_block_till_done()
+    assert len(armed) == 1
+
+    # Every new plan replaces the timer of the previous one.
+    for prices in ((1.0, 0.1, 1.0), (1.0, 1.0, 0.1)):
+        _set_prices(hass, *prices)
+        await hass.async_block_till_done()
+        assert len(armed) == 1
+
+    freezer.tick(SLOT)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(armed) == 1
+
+    stop()
+    assert not armed
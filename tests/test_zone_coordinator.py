@@ -0,0 +1,163 @@
+"""Tests for the shared-plant zone coordinator."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import DOMAIN as CLIMATE, HVACAction
+from homeassistant.const import (
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.zone_coordinator import (
+    async_get_zone_coordinators,
+    async_join_zone,
+    async_leave_zone,
+)
+
+from . import common, setup_sensor, setup_switch
+
+PLANT = "switch.boiler"
+
+
+@pytest.mark.asyncio
+async def test_demand_is_aggregated(hass: HomeAssistant) -> None:
+    zone = async_join_zone(hass, PLANT, "climate.a")
+    assert async_join_zone(hass, PLANT, "climate.b") is zone
+
+    zone.async_update("climate.a", HVACAction.HEATING, 60)
+    zone.async_update("climate.b", HVACAction.HEATING, 100)
+    assert zone.any_calling
+    assert zone.demand_percent == 80
+
+    zone.async_update("climate.a", HVACAction.IDLE, 0)
+    assert zone.calling == {"climate.b"}
+    assert zone.demand_percent == 50
+
+    await async_leave_zone(hass, PLANT, "climate.b")
+    assert not zone.any_calling
+    assert zone.demand_percent == 0
+
+    await async_leave_zone(hass, PLANT, "climate.a")
+    assert PLANT not in async_get_zone_coordinators(hass)
+    await hass.async_block_till_done()
+
+
+async def _setup_zones(hass: HomeAssistant, **plant) -> list:
+    setup_sensor(hass, 18)
+    setup_switch(hass, False, common.ENT_HEATER)
+    setup_switch(hass, False, common.ENT_SWITCH)
+    calls = setup_switch(hass, False, PLANT)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": [
+                {
+                    "platform": DOMAIN,
+                    "name": name,
+                    "heater": heater,
+                    "target_sensor": common.ENT_SENSOR,
+                    "initial_hvac_mode": "heat",
+                    "target_temp": 21,
+                    "plant": PLANT,
+                    **plant,
+                }
+                for name, heater in (
+                    ("zone1", common.ENT_HEATER),
+                    ("zone2", common.ENT_SWITCH),
+                )
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    return calls
+
+
+def _plant_calls(calls: list) -> list[str]:
+    return [call.service for call in calls if call.data["entity_id"] == PLANT]
+
+
+async def _set(hass: HomeAssistant, entity_id: str, state: str) -> None:
+    hass.states.async_set(entity_id, state)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_plant_follows_any_calling_zone(hass: HomeAssistant) -> None:
+    calls = await _setup_zones(hass)
+    assert _plant_calls(calls) == []
+
+    await _set(hass, common.ENT_HEATER, STATE_ON)
+    assert _plant_calls(calls) == [SERVICE_TURN_ON]
+
+    await _set(hass, PLANT, STATE_ON)
+    await _set(hass, common.ENT_SWITCH, STATE_ON)
+    await _set(hass, common.ENT_HEATER, STATE_OFF)
+    # Zone 2 still calls.
+    assert _plant_calls(calls) == [SERVICE_TURN_ON]
+
+    await _set(hass, common.ENT_SWITCH, STATE_OFF)
+    assert _plant_calls(calls) == [SERVICE_TURN_ON, SERVICE_TURN_OFF]
+
+
+@pytest.mark.asyncio
+async def test_plant_min_cycle_defers_the_start(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    calls = await _setup_zones(hass, plant_min_cycle_duration={"minutes": 10})
+
+    await _set(hass, common.ENT_HEATER, STATE_ON)
+    assert _plant_calls(calls) == []
+
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert _plant_calls(calls) == [SERVICE_TURN_ON]
+
+
+@pytest.mark.asyncio
+async def test_plant_stops_when_the_last_zone_is_removed(
+    hass: HomeAssistant,
+) -> None:
+    calls = setup_switch(hass, True, PLANT)
+    zone = async_join_zone(
+        hass, PLANT, "climate.a", min_cycle_duration=timedelta(minutes=10)
+    )
+    zone.async_update("climate.a", HVACAction.HEATING, 100)
+    await hass.async_block_till_done()
+    assert _plant_calls(calls) == []
+
+    # The plant just started, but with no zone left nothing else stops it.
+    await async_leave_zone(hass, PLANT, "climate.a")
+    await hass.async_block_till_done()
+    assert _plant_calls(calls) == [SERVICE_TURN_OFF]
+    assert PLANT not in async_get_zone_coordinators(hass)
+
+
+@pytest.mark.asyncio
+async def test_plant_is_switched_once_it_is_available(hass: HomeAssistant) -> None:
+    calls = setup_switch(hass, False, PLANT)
+    hass.states.async_set(PLANT, STATE_UNAVAILABLE)
+    zone = async_join_zone(hass, PLANT, "climate.a")
+    zone.async_update("climate.a", HVACAction.HEATING, 100)
+    await hass.async_block_till_done()
+    assert _plant_calls(calls) == []
+
+    await _set(hass, PLANT, STATE_OFF)
+    assert _plant_calls(calls) == [SERVICE_TURN_ON]
+
+    # Switched off by hand while the zone still calls.
+    await _set(hass, PLANT, STATE_ON)
+    await _set(hass, PLANT, STATE_OFF)
+    assert _plant_calls(calls) == [SERVICE_TURN_ON, SERVICE_TURN_ON]
+
+    await async_leave_zone(hass, PLANT, "climate.a")
@@ -0,0 +1,159 @@
+"""Unit tests for the config/options flow schema cache."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.const import UnitOfTemperature
+import pytest
+
+from custom_components.dual_smart_thermostat.const import (
+    CONF_COLD_TOLERANCE,
+    CONF_HEATER,
+    CONF_HOT_TOLERANCE,
+    CONF_SENSOR,
+    SYSTEM_TYPE_HEATER_COOLER,
+)
+from custom_components.dual_smart_thermostat.schema_cache import (
+    SCHEMA_CACHE,
+    SchemaCache,
+    cached_schema,
+    defaults_fingerprint,
+)
+from custom_components.dual_smart_thermostat.schemas import (
+    get_core_schema,
+    get_tolerance_fields,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    """Start every test with an empty global cache."""
+    SCHEMA_CACHE.clear()
+    SCHEMA_CACHE.enabled = True
+    yield
+    SCHEMA_CACHE.clear()
+
+
+def _hass(unit: str = UnitOfTemperature.CELSIUS) -> MagicMock:
+    hass = MagicMock()
+    hass.config.units.temperature_unit = unit
+    return hass
+
+
+class TestSchemaCache:
+    """Tests for the SchemaCache container."""
+
+    def test_hit_and_miss_counters(self):
+        cache = SchemaCache(max_size=4)
+        build = MagicMock(return_value="schema")
+
+        assert cache.get_or_build("a", build) == "schema"
+        assert cache.get_or_build("a", build) == "schema"
+
+        assert build.call_count == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SchemaCache(max_size=2)
+        cache.get_or_build("a", lambda: 1)
+        cache.get_or_build("b", lambda: 2)
+        # Touch "a" so "b" becomes the eviction candidate.
+        cache.get_or_build("a", lambda: 1)
+        cache.get_or_build("c", lambda: 3)
+
+        assert len(cache) == 2
+        rebuilt = MagicMock(return_value=2)
+        cache.get_or_build("b", rebuilt)
+        rebuilt.assert_called_once()
+
+    def test_disabled_cache_always_builds(self):
+        cache = SchemaCache()
+        cache.enabled = False
+        build = MagicMock(return_value="schema")
+
+        cache.get_or_build("a", build)
+        cache.get_or_build("a", build)
+
+        assert build.call_count == 2
+        assert len(cache) == 0
+
+
+class TestDefaultsFingerprint:
+    """Tests for defaults_fingerprint."""
+
+    def test_unrelated_keys_are_ignored(self):
+        keys = (CONF_COLD_TOLERANCE,)
+        assert defaults_fingerprint(
+            {CONF_COLD_TOLERANCE: 0.3, "other": 1}, keys
+        ) == defaults_fingerprint({CONF_COLD_TOLERANCE: 0.3, "other": 2}, keys)
+
+    def test_unhashable_values_are_frozen(self):
+        fingerprint = defaults_fingerprint(
+            {"a": {"hours": 1}, "b": ["x"], "c": timedelta(minutes=5)},
+            ("a", "b", "c"),
+        )
+        hash(fingerprint)
+
+    def test_missing_and_none_differ(self):
+        keys = (CONF_HEATER,)
+        assert defaults_fingerprint({"x": 1}, keys) != defaults_fingerprint(
+            {CONF_HEATER: None}, keys
+        )
+
+
+class TestCachedSchema:
+    """Tests for the cached_schema decorator on real builders."""
+
+    def test_repeated_render_reuses_schema(self):
+        hass = _hass()
+        first = get_core_schema(SYSTEM_TYPE_HEATER_COOLER, hass=hass)
+        second = get_core_schema(SYSTEM_TYPE_HEATER_COOLER, hass=hass)
+
+        assert first is second
+        assert SCHEMA_CACHE.hits == 1
+
+    def test_changed_default_rebuilds(self):
+        hass = _hass()
+        first = get_core_schema(
+            SYSTEM_TYPE_HEATER_COOLER,
+            defaults={CONF_SENSOR: "sensor.a"},
+            hass=hass,
+        )
+        second = get_core_schema(
+            SYSTEM_TYPE_HEATER_COOLER,
+            defaults={CONF_SENSOR: "sensor.b"},
+            hass=hass,
+        )
+
+        assert first is not second
+
+    def test_unit_is_part_of_the_key(self):
+        celsius = get_tolerance_fields(hass=_hass(), defaults={CONF_HOT_TOLERANCE: 1})
+        fahrenheit = get_tolerance_fields(
+            hass=_hass(UnitOfTemperature.FAHRENHEIT),
+            defaults={CONF_HOT_TOLERANCE: 1},
+        )
+
+        assert SCHEMA_CACHE.misses == 2
+        assert celsius is not fahrenheit
+
+    def test_dict_results_are_copied(self):
+        first = get_tolerance_fields(hass=_hass())
+        first.clear()
+        second = get_tolerance_fields(hass=_hass())
+
+        assert second
+
+    def test_positional_and_keyword_calls_share_an_entry(self):
+        calls = []
+
+        @cached_schema(("x",))
+        def builder(flag, hass=None, defaults=None):
+            calls.append(flag)
+            return flag
+
+        builder(True, None, {"x": 1})
+        builder(flag=True, defaults={"x": 1})
+
+        assert calls == [True]